@@ -0,0 +1,52 @@
+"""Add activity_daily_stats, rollup_watermarks and user_activities.inserted_at
+
+Revision ID: 5a9d3e7c1b28
+Revises: e7b2c94f1a60
+Create Date: 2026-10-17 19:12:47.530861
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '5a9d3e7c1b28'
+down_revision: Union[str, None] = 'e7b2c94f1a60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Создание суточной сводки активностей, отметок сводок и времени вставки активностей.
+
+    Сводка заполняется фоновой задачей приложения: первый запуск переносит
+    в нее всю историю активностей пачками, до этого аналитика считается по
+    user_activities.
+
+    Значение по умолчанию inserted_at стабильно в пределах запроса, поэтому
+    столбец добавляется без перезаписи таблицы: существующие активности
+    получают время миграции.
+    """
+    op.add_column('user_activities', sa.Column('inserted_at', sa.DateTime(timezone=True),
+                  server_default=sa.text('statement_timestamp()'), nullable=False))
+    op.create_table('activity_daily_stats',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('activity_type', sa.String(length=50), nullable=False),
+        sa.Column('menu_item_id', sa.Integer(), nullable=False, comment='ID пункта меню, 0 - активности без пункта меню'),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('day', 'activity_type', 'menu_item_id')
+    )
+    op.create_table('rollup_watermarks',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('last_id', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    """Удаление суточной сводки активностей, отметок сводок и времени вставки активностей."""
+    op.drop_column('user_activities', 'inserted_at')
+    op.drop_table('rollup_watermarks')
+    op.drop_table('activity_daily_stats')
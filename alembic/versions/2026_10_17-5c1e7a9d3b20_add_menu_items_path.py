@@ -0,0 +1,44 @@
+"""Add menu_items.path
+
+Revision ID: 5c1e7a9d3b20
+Revises: 448b0bbbad8c
+Create Date: 2026-10-17 10:12:41.507312
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e7a9d3b20'
+down_revision: Union[str, None] = '448b0bbbad8c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Добавление материализованного пути пунктов меню."""
+    op.add_column('menu_items',
+        sa.Column('path', sa.Text(collation='C'), server_default='/', nullable=False,
+                  comment='Материализованный путь: ID предков от корня, например /1/5/ (у корневых пунктов /)')
+    )
+
+    # Заполнение путей существующих пунктов обходом дерева от корневых пунктов
+    op.execute("""
+        WITH RECURSIVE tree (id, path) AS (
+            SELECT id, '/'::text FROM menu_items WHERE parent_id IS NULL
+            UNION ALL
+            SELECT child.id, tree.path || tree.id || '/'
+            FROM menu_items AS child JOIN tree ON child.parent_id = tree.id
+        )
+        UPDATE menu_items SET path = tree.path FROM tree WHERE menu_items.id = tree.id
+    """)
+
+    op.create_index('ix_menu_items_path', 'menu_items', ['path'], unique=False)
+
+
+def downgrade() -> None:
+    """Удаление материализованного пути пунктов меню."""
+    op.drop_index('ix_menu_items_path', table_name='menu_items')
+    op.drop_column('menu_items', 'path')
@@ -0,0 +1,36 @@
+"""Add menu_items.search_vector
+
+Revision ID: 9f4b2d6e8a13
+Revises: 5c1e7a9d3b20
+Create Date: 2026-10-17 12:40:18.224905
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '9f4b2d6e8a13'
+down_revision: Union[str, None] = '5c1e7a9d3b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Добавление вычисляемого tsvector для полнотекстового поиска и GIN индекса."""
+    op.add_column('menu_items',
+        sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(
+            "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('russian', coalesce(description, '')), 'B')",
+            persisted=True,
+        ), nullable=True)
+    )
+    op.create_index('ix_menu_items_search_vector', 'menu_items', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Удаление полнотекстового поиска пунктов меню."""
+    op.drop_index('ix_menu_items_search_vector', table_name='menu_items', postgresql_using='gin')
+    op.drop_column('menu_items', 'search_vector')
@@ -0,0 +1,39 @@
+"""Add pg_trgm indexes for menu_items
+
+Revision ID: c3a81f5e0d47
+Revises: 9f4b2d6e8a13
+Create Date: 2026-10-17 15:05:52.901736
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3a81f5e0d47'
+down_revision: Union[str, None] = '9f4b2d6e8a13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Создание расширения pg_trgm и GIN индексов триграмм, если расширение доступно на сервере."""
+    available = op.get_bind().execute(
+        sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    ).scalar()
+    if not available:
+        # Нечеткий поиск необязателен: без pg_trgm SEARCH_TRIGRAM_ENABLED должен оставаться false
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index('ix_menu_items_title_trgm', 'menu_items', ['title'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'})
+    op.create_index('ix_menu_items_description_trgm', 'menu_items', ['description'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Удаление индексов триграмм (расширение pg_trgm остается)."""
+    op.execute("DROP INDEX IF EXISTS ix_menu_items_description_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_menu_items_title_trgm")
@@ -0,0 +1,90 @@
+"""Add search_logs and search_query_daily
+
+Revision ID: e7b2c94f1a60
+Revises: c3a81f5e0d47
+Create Date: 2026-10-17 17:41:09.215384
+
+"""
+import hashlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b2c94f1a60'
+down_revision: Union[str, None] = 'c3a81f5e0d47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Создание журнала поисковых запросов и суточной сводки, заполнение их по активностям поиска."""
+    op.create_table('search_logs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('telegram_user_id', sa.Integer(), nullable=False),
+        sa.Column('query', sa.Text(), nullable=False, comment='Нормализованный запрос в нижнем регистре'),
+        sa.Column('query_hash', sa.BigInteger(), nullable=False, comment='Хэш нормализованного запроса'),
+        sa.Column('results', sa.Integer(), nullable=False, comment='Количество найденных материалов'),
+        sa.Column('zero_results', sa.Boolean(), nullable=False, comment='Поиск без результатов'),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['telegram_user_id'], ['telegram_users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_search_logs_created_at', 'search_logs', ['created_at'], unique=False)
+    op.create_index('ix_search_logs_telegram_user_id', 'search_logs', ['telegram_user_id'], unique=False)
+    op.create_table('search_query_daily',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('query_hash', sa.BigInteger(), nullable=False),
+        sa.Column('query', sa.Text(), nullable=False),
+        sa.Column('searches', sa.Integer(), nullable=False),
+        sa.Column('zero_result_searches', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('day', 'query_hash')
+    )
+
+    # Активности поиска хранили запрос строкой "Поиск: '<запрос>' (результатов: N)".
+    # Нижний регистр и хэш считаются в Python, как в search_query_hash (backend/crud/search_log.py):
+    # lower() PostgreSQL зависит от локали базы
+    bind = op.get_bind()
+    parsed = bind.execute(sa.text("""
+        SELECT telegram_user_id, created_at,
+               substring(search_query FROM '^Поиск: ''(.*)'' \\(результатов: [0-9]+\\)$') AS query,
+               substring(search_query FROM '\\(результатов: ([0-9]+)\\)$')::integer AS results
+        FROM user_activities
+        WHERE activity_type = 'search'
+        ORDER BY id
+    """))
+    search_logs = sa.table('search_logs', *(sa.column(name) for name in (
+        'telegram_user_id', 'query', 'query_hash', 'results', 'zero_results', 'created_at'
+    )))
+    while rows := parsed.fetchmany(10000):
+        logs = []
+        for row in rows:
+            if row.query is None or row.results is None:
+                continue
+            query = row.query.lower()
+            logs.append({
+                'telegram_user_id': row.telegram_user_id,
+                'query': query,
+                'query_hash': int.from_bytes(hashlib.md5(query.encode('utf-8')).digest()[:8], 'big', signed=True),
+                'results': row.results,
+                'zero_results': row.results == 0,
+                'created_at': row.created_at,
+            })
+        if logs:
+            op.bulk_insert(search_logs, logs)
+
+    op.execute("""
+        INSERT INTO search_query_daily (day, query_hash, query, searches, zero_result_searches)
+        SELECT (created_at AT TIME ZONE 'UTC')::date, query_hash, min(query), count(*), count(*) FILTER (WHERE zero_results)
+        FROM search_logs
+        GROUP BY 1, 2
+    """)
+
+
+def downgrade() -> None:
+    """Удаление журнала поисковых запросов и суточной сводки."""
+    op.drop_table('search_query_daily')
+    op.drop_index('ix_search_logs_telegram_user_id', table_name='search_logs')
+    op.drop_index('ix_search_logs_created_at', table_name='search_logs')
+    op.drop_table('search_logs')
@@ -7,8 +7,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.core.db import get_session
 from backend.core.dependencies import ModeratorOrAdmin
-from backend.schemas.admin.analytics import AdminAnalyticsRequest, AdminAnalyticsResponse
+from backend.schemas.admin.analytics import (
+    ActivityLogStatsResponse,
+    AdminAnalyticsRequest,
+    AdminAnalyticsResponse,
+    SearchCacheStatsResponse,
+)
 from backend.services.analytics import analytics_service
+from backend.services.menu_item import menu_item_service
 
 
 router = APIRouter(prefix="/analytics", tags=["Admin Analytics"])
@@ -38,6 +44,9 @@ async def get_analytics(
     ),
     start_date: Optional[str] = Query(None, description="Начальная дата фильтрации (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="Конечная дата фильтрации (YYYY-MM-DD)"),
+    section_id: Optional[int] = Query(
+        None, description="ID раздела верхнего уровня для статистики контента и активностей", gt=0
+    ),
     db: AsyncSession = Depends(get_session),
 ) -> AdminAnalyticsResponse:
     """Получение комплексной аналитики и статистики системы по дням.
@@ -53,5 +62,48 @@ async def get_analytics(
             period=period,
             start_date=start_date,
             end_date=end_date,
+            section_id=section_id,
         ),
     )
+
+
+@router.get(
+    "/search-cache",
+    response_model=SearchCacheStatsResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Получение статистики кэша результатов поиска",
+    description="Возвращает счетчики попаданий и промахов кэша результатов поиска, долю попаданий и версию меню",
+    responses={
+        200: {"description": "Статистика успешно получена"},
+        401: {"description": "Не авторизован"},
+        403: {"description": "Недостаточно прав доступа"},
+    },
+)
+async def get_search_cache_stats(current_admin: ModeratorOrAdmin) -> SearchCacheStatsResponse:
+    """Получение статистики кэша результатов поиска.
+
+    Счетчики накапливаются с запуска процесса; изменение меню или контента
+    через админку увеличивает версию меню и сбрасывает устаревшие наборы.
+    """
+    return menu_item_service.get_search_cache_stats()
+
+
+@router.get(
+    "/activity-log",
+    response_model=ActivityLogStatsResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Получение статистики отложенной записи активностей поиска",
+    description="Возвращает глубину очереди записи активностей поиска и количество отброшенных активностей",
+    responses={
+        200: {"description": "Статистика успешно получена"},
+        401: {"description": "Не авторизован"},
+        403: {"description": "Недостаточно прав доступа"},
+    },
+)
+async def get_activity_log_stats(current_admin: ModeratorOrAdmin) -> ActivityLogStatsResponse:
+    """Получение статистики отложенной записи активностей поиска.
+
+    Счетчики накапливаются с запуска процесса; отброшенные активности
+    означают, что очередь не успевает записываться в БД.
+    """
+    return analytics_service.get_activity_log_stats()
@@ -2,6 +2,7 @@
 
 from fastapi import APIRouter
 
+from .menu import router as menu_router
 from .message_template import router as message_template_router
 from .telegram_user import router as telegram_user_router
 
@@ -12,3 +13,4 @@ router = APIRouter(prefix="/bot")
 # Подключение всех bot подроутеров
 router.include_router(telegram_user_router)
 router.include_router(message_template_router)
+router.include_router(menu_router)
@@ -0,0 +1,40 @@
+"""Bot API эндпоинты для навигации по меню."""
+
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.db import get_session
+from backend.schemas.bot.menu import BotMenuNavigateRequest, BotMenuNavigateResponse
+from backend.services.menu_item import menu_item_service
+
+
+router = APIRouter(prefix="/menu", tags=["Bot Menu API"])
+
+
+@router.post(
+    "/navigate",
+    response_model=BotMenuNavigateResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Навигация по меню",
+    description=(
+        "Возвращает все данные для обработки нажатия на пункт меню в боте: пункт с контентом, "
+        "дочерние пункты, родителя и цепочку разделов, и записывает активность навигации"
+    ),
+    responses={
+        200: {"description": "Пункт меню открыт, активность записана"},
+        400: {"description": "Требуется доступ к премиум контенту"},
+        403: {"description": "Родительский пункт меню неактивен"},
+        404: {"description": "Пользователь не найден или пункт меню не найден"},
+        422: {"description": "Ошибка валидации входных данных"},
+        500: {"description": "Внутренняя ошибка сервера"},
+    },
+)
+async def navigate_menu(
+    request: BotMenuNavigateRequest, db: AsyncSession = Depends(get_session)
+) -> BotMenuNavigateResponse:
+    """Обработка нажатия на пункт меню одним запросом.
+
+    Заменяет отдельные запросы контента пункта меню, пунктов родительского
+    раздела и записи активности.
+    """
+    return await menu_item_service.navigate(request, db)
@@ -2,17 +2,26 @@
 
 from typing import Optional
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Header, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.core.db import get_session
 from backend.schemas.public.menu import MenuContentResponse, MenuItemListResponse
 from backend.services.menu_item import menu_item_service
+from backend.services.menu_snapshot import SnapshotEntry, etag_matches
 
 
 router = APIRouter(prefix="/menu-items")
 
 
+def snapshot_response(entry: SnapshotEntry, if_none_match: Optional[str]) -> Response:
+    """Отдает готовое тело ответа из снимка меню или 304, если у клиента актуальная версия."""
+    headers = {"ETag": entry.etag}
+    if etag_matches(if_none_match, entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
 @router.get(
     "/",
     response_model=MenuItemListResponse,
@@ -21,6 +30,7 @@ router = APIRouter(prefix="/menu-items")
     description="Возвращает структуру меню для пользователя с возможностью фильтрации по родительскому элементу",
     responses={
         200: {"description": "Структура меню успешно получена"},
+        304: {"description": "Структура меню не изменилась с версии из If-None-Match"},
         400: {"description": "Ошибка валидации параметров запроса"},
         404: {"description": "Пользователь не найден или родительский пункт меню не найден"},
         422: {"description": "Ошибка валидации входных данных"},
@@ -30,14 +40,16 @@ router = APIRouter(prefix="/menu-items")
 async def get_menu_items(
     telegram_user_id: int = Query(..., description="ID пользователя в Telegram", gt=0),
     parent_id: Optional[int] = Query(None, description="ID родительского пункта меню (null для корневого уровня)"),
+    if_none_match: Optional[str] = Header(None, description="ETag ранее полученного ответа"),
     db: AsyncSession = Depends(get_session),
-) -> MenuItemListResponse:
+) -> Response:
     """Получение пунктов меню для пользователя (один уровень).
 
     Пользователь должен быть зарегистрирован через Bot API.
     Возвращает только один уровень меню для простоты MVP.
     """
-    return await menu_item_service.get_menu_items(telegram_user_id=telegram_user_id, parent_id=parent_id, db=db)
+    entry = await menu_item_service.get_menu_items_entry(telegram_user_id=telegram_user_id, parent_id=parent_id, db=db)
+    return snapshot_response(entry, if_none_match)
 
 
 @router.get(
@@ -48,6 +60,7 @@ async def get_menu_items(
     description="Возвращает полный контент конкретного пункта меню включая файлы и дочерние элементы",
     responses={
         200: {"description": "Контент пункта меню успешно получен"},
+        304: {"description": "Контент пункта меню не изменился с версии из If-None-Match"},
         400: {"description": "Ошибка валидации параметров запроса"},
         403: {"description": "Недостаточно прав для доступа к контенту"},
         404: {"description": "Пользователь не найден или пункт меню не найден"},
@@ -58,11 +71,13 @@ async def get_menu_items(
 async def get_menu_item_content(
     id: int,
     telegram_user_id: int = Query(..., description="ID пользователя в Telegram", gt=0),
+    if_none_match: Optional[str] = Header(None, description="ETag ранее полученного ответа"),
     db: AsyncSession = Depends(get_session),
-) -> MenuContentResponse:
+) -> Response:
     """Получение контента конкретного пункта меню с дочерними элементами.
 
     Проверяет права доступа пользователя к контенту.
     Возвращает контент и прямых дочерних элементов.
     """
-    return await menu_item_service.get_menu_item_content(menu_id=id, telegram_user_id=telegram_user_id, db=db)
+    entry = await menu_item_service.get_menu_item_content_entry(menu_id=id, telegram_user_id=telegram_user_id, db=db)
+    return snapshot_response(entry, if_none_match)
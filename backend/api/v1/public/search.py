@@ -1,5 +1,7 @@
 """Публичные эндпоинты для поиска по материалам."""
 
+from typing import Optional
+
 from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -19,7 +21,7 @@ router = APIRouter(prefix="/search")
     description="Возвращает список пунктов меню соответствующих поисковому запросу с учетом уровня доступа пользователя",
     responses={
         200: {"description": "Результаты поиска успешно получены"},
-        400: {"description": "Ошибка валидации параметров запроса"},
+        400: {"description": "Ошибка валидации параметров запроса или курсора"},
         404: {"description": "Пользователь не найден"},
         422: {"description": "Ошибка валидации входных данных"},
         500: {"description": "Внутренняя ошибка сервера"},
@@ -28,12 +30,18 @@ router = APIRouter(prefix="/search")
 async def search_materials(
     telegram_user_id: int = Query(..., description="ID пользователя в Telegram", gt=0),
     query: str = Query(..., description="Поисковый запрос", min_length=2, max_length=100),
-    limit: int = Query(10, description="Лимит результатов (по умолчанию 10)", gt=0, le=100),
+    limit: int = Query(10, description="Количество результатов на странице (по умолчанию 10)", gt=0, le=100),
+    section_id: Optional[int] = Query(None, description="ID раздела верхнего уровня для ограничения поиска", gt=0),
+    cursor: Optional[str] = Query(
+        None, description="Курсор страницы из next_cursor предыдущего ответа с тем же запросом", max_length=64
+    ),
     db: AsyncSession = Depends(get_session),
 ) -> SearchListResponse:
     """Поиск по материалам системы.
 
     Выполняет поиск по названию и описанию пунктов меню с учетом уровня доступа пользователя.
+    Возвращает страницу результатов и курсор следующей страницы: следующие страницы
+    берутся из сохраненного набора результатов без повторного поиска.
     Требует наличия пользователя в системе (регистрация через Bot API).
     """
     return await menu_item_service.search_menu_items(
@@ -41,4 +49,6 @@ async def search_materials(
         query=query,
         limit=limit,
         db=db,
+        section_id=section_id,
+        cursor=cursor,
     )
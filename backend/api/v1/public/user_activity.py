@@ -4,7 +4,12 @@ from fastapi import APIRouter, Depends, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.core.db import get_session
-from backend.schemas.public.user_activity import UserActivityRequest, UserActivityResponse
+from backend.schemas.public.user_activity import (
+    UserActivityBatchRequest,
+    UserActivityBatchResponse,
+    UserActivityRequest,
+    UserActivityResponse,
+)
 from backend.services.user_activity import user_activity_service
 
 
@@ -34,3 +39,26 @@ async def record_user_activity(
     Автоматически проверяет существование пользователя и создает запись активности.
     """
     return await user_activity_service.record_activity(request, db)
+
+
+@router.post(
+    "/batch",
+    response_model=UserActivityBatchResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Пакетная запись активностей пользователей",
+    description="Записывает пачку активностей одним запросом. Некорректные активности пропускаются и "
+    "возвращаются в списке ошибок",
+    responses={
+        201: {"description": "Пачка активностей обработана"},
+        422: {"description": "Ошибка валидации входных данных"},
+        500: {"description": "Внутренняя ошибка сервера"},
+    },
+)
+async def record_user_activities_batch(
+    request: UserActivityBatchRequest, db: AsyncSession = Depends(get_session)
+) -> UserActivityBatchResponse:
+    """Пакетная запись активностей пользователей.
+
+    Используется ботом для фоновой отправки накопленных активностей.
+    """
+    return await user_activity_service.record_activities_batch(request, db)
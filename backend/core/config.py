@@ -58,6 +58,78 @@ class Settings(BaseSettings):
     # Email валидация
     email_dns_check: bool = Field(default=True, description="Проверять DNS при валидации email")
 
+    # Отложенная запись активности пользователей
+    user_touch_max_staleness: float = Field(
+        default=5.0, description="Максимальная задержка записи счетчиков и времени активности пользователей (сек)"
+    )
+    user_touch_max_pending: int = Field(
+        default=5000, description="Количество пользователей в буфере, при котором запись начинается сразу"
+    )
+
+    # Отложенная запись счетчиков материалов
+    menu_counters_max_staleness: float = Field(
+        default=5.0, description="Максимальная задержка записи счетчиков просмотров и скачиваний (сек)"
+    )
+    menu_counters_max_pending: int = Field(
+        default=5000, description="Количество материалов в буфере, при котором запись начинается сразу"
+    )
+
+    # Отложенная запись активностей поиска
+    activity_log_max_queue: int = Field(
+        default=10000, description="Максимальное количество активностей в очереди записи, лишние отбрасываются"
+    )
+    activity_log_batch_size: int = Field(default=500, description="Количество активностей в одном INSERT")
+    activity_log_max_staleness: float = Field(
+        default=1.0, description="Максимальная задержка записи активностей поиска (сек)"
+    )
+
+    # Суточная сводка активностей для аналитики
+    activity_rollup_interval: float = Field(
+        default=60.0, description="Интервал обновления суточной сводки активностей (сек)"
+    )
+    activity_rollup_lag: float = Field(
+        default=30.0, description="Минимальный возраст активностей, попадающих в суточную сводку (сек)"
+    )
+    activity_rollup_batch_size: int = Field(
+        default=100000, description="Максимальное количество активностей в одной транзакции обновления сводки"
+    )
+
+    # Кэш пользователей Telegram и их уровня доступа
+    user_access_cache_ttl: float = Field(default=60.0, description="Время жизни записи кэша пользователя (сек)")
+    user_access_cache_max_users: int = Field(default=10000, description="Максимальное количество пользователей в кэше")
+
+    # Снимок меню в памяти
+    menu_snapshot_ttl: float = Field(
+        default=300.0, description="Максимальное время жизни снимка меню без изменений через админку (сек)"
+    )
+
+    # Поиск по материалам через инвертированный индекс в памяти
+    search_in_memory_index: bool = Field(
+        default=True, description="Искать по индексу в памяти процесса вместо полнотекстового индекса PostgreSQL"
+    )
+    search_index_ttl: float = Field(
+        default=300.0, description="Максимальное время между полными перестроениями поискового индекса (сек)"
+    )
+
+    # Постраничная выдача результатов поиска
+    search_max_results: int = Field(
+        default=100, gt=0, description="Максимальное количество результатов поиска, доступных по страницам"
+    )
+    search_results_cache_ttl: float = Field(
+        default=60.0, description="Время жизни набора результатов поиска для следующих страниц (сек)"
+    )
+    search_results_cache_max_entries: int = Field(
+        default=1000, description="Максимальное количество наборов результатов поиска в кэше"
+    )
+
+    # Нечеткий поиск по материалам (требует расширения pg_trgm)
+    search_trigram_enabled: bool = Field(
+        default=False, description="Искать с учетом опечаток через pg_trgm, если полнотекстовый поиск ничего не нашел"
+    )
+    search_trigram_threshold: float = Field(
+        default=0.4, ge=0.0, le=1.0, description="Минимальное сходство запроса с названием или описанием (0..1)"
+    )
+
     # Логирование
     log_level: str = Field(default="INFO", description="Уровень логирования")
 
@@ -1,6 +1,8 @@
 """Подключение к БД."""
 
-from typing import AsyncGenerator
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncGenerator, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_scoped_session, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base
@@ -31,16 +33,37 @@ async_session_factory = async_sessionmaker(
     autoflush=False,
 )
 
-# Scoped session для thread-local безопасности в многопоточной среде
-AsyncSessionLocal = async_scoped_session(async_session_factory, scopefunc=lambda: None)
+# Идентификатор текущей области сессии (запроса или фоновой операции)
+_session_scope: ContextVar[Optional[object]] = ContextVar("session_scope", default=None)
+
+# Scoped session: у каждого запроса собственная сессия, ключ области берется из contextvar
+AsyncSessionLocal = async_scoped_session(async_session_factory, scopefunc=_session_scope.get)
+
+
+@asynccontextmanager
+async def session_scope() -> AsyncGenerator[AsyncSession, None]:
+    """Открывает новую область сессии и закрывает ее сессию при выходе.
+
+    Каждая область получает уникальный ключ в contextvar, поэтому параллельные
+    запросы и фоновые операции никогда не делят одну AsyncSession и одно
+    соединение из пула. При выходе сессия закрывается, возвращает соединение
+    в пул и удаляется из реестра AsyncSessionLocal.
+    """
+    token = _session_scope.set(object())
+    try:
+        yield AsyncSessionLocal()
+    finally:
+        await AsyncSessionLocal.remove()
+        _session_scope.reset(token)
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
-    """Получение сессии базы данных.
+    """Получение сессии базы данных для запроса.
 
     AsyncSession обеспечивает автоматическое управление транзакциями:
-    - Контекстный менеджер автоматически закрывает сессию
+    - Каждый запрос получает собственную сессию в отдельной области
+    - После обработки запроса сессия закрывается и удаляется из реестра
     - Для управления транзакциями используется async with session.begin()
     """
-    async with AsyncSessionLocal() as session:
+    async with session_scope() as session:
         yield session
@@ -1,5 +1,6 @@
 """Инициализация CRUD пакета."""
 
+from .activity_stats import ActivityStatsCRUD, activity_stats_crud
 from .analytics import AnalyticsCRUD, analytics_crud
 from .base import BaseCRUD
 from .content_file import ContentFileCRUD, content_file_crud
@@ -7,11 +8,13 @@ from .menu_item import MenuItemCRUD, menu_item_crud
 from .message_template import MessageTemplateCRUD, message_template_crud
 from .notification import NotificationCRUD, notification_crud
 from .question import QuestionCRUD, question_crud
+from .search_log import SearchLogCRUD, search_log_crud
 from .telegram_user import TelegramUserCRUD, telegram_user_crud
 from .user_activity import UserActivityCRUD, user_activity_crud
 
 
 __all__ = [
+    "ActivityStatsCRUD",
     "AnalyticsCRUD",
     "BaseCRUD",
     "MenuItemCRUD",
@@ -21,6 +24,8 @@ __all__ = [
     "MessageTemplateCRUD",
     "TelegramUserCRUD",
     "UserActivityCRUD",
+    "SearchLogCRUD",
+    "activity_stats_crud",
     "analytics_crud",
     "menu_item_crud",
     "content_file_crud",
@@ -29,4 +34,5 @@ __all__ = [
     "message_template_crud",
     "telegram_user_crud",
     "user_activity_crud",
+    "search_log_crud",
 ]
@@ -0,0 +1,160 @@
+"""CRUD операции для суточной сводки активностей."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Optional
+
+from sqlalchemy import Date, cast, func, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from backend.models import ActivityDailyStats, MenuItem, RollupWatermark, UserActivity
+
+from .base import BaseCRUD
+
+
+# Имя отметки суточной сводки активностей в rollup_watermarks
+ACTIVITY_ROLLUP = "activity_daily_stats"
+
+
+class ActivityStatsCRUD(BaseCRUD[ActivityDailyStats, dict, dict]):
+    """CRUD операции для суточной сводки активностей.
+
+    Сводка содержит активности с ID не больше отметки ``last_id``,
+    остальные (хвост) считаются по user_activities. Отметка и сводка
+    меняются одной транзакцией, а статистика читается одним запросом,
+    поэтому каждая активность учитывается ровно один раз.
+    """
+
+    def __init__(self):
+        """Инициализация CRUD для суточной сводки активностей."""
+        super().__init__(ActivityDailyStats)
+
+    async def roll_up(self, db: AsyncSession, lag: timedelta, batch_size: int) -> int:
+        """Добавить в сводку следующую пачку активностей после отметки.
+
+        Пачка - не больше batch_size активностей подряд по ID, вставленных
+        раньше чем lag назад (по inserted_at, времени вставки по часам БД).
+        Пачка заканчивается перед первой более новой активностью: за время
+        lag транзакции, которые вставляют активности с меньшими ID, успевают
+        зафиксироваться, и отметка не проходит мимо еще не видимых строк.
+
+        Args:
+            db: Сессия базы данных
+            lag: Минимальный возраст активностей, попадающих в сводку
+            batch_size: Максимальное количество активностей за один вызов
+
+        Returns:
+            Количество активностей, добавленных в сводку
+        """
+        await db.execute(
+            pg_insert(RollupWatermark)
+            .values(name=ACTIVITY_ROLLUP, last_id=0, updated_at=datetime.now(timezone.utc))
+            .on_conflict_do_nothing(index_elements=["name"])
+        )
+        # Блокировка отметки: параллельные вызовы обрабатывают пачки по очереди
+        last_id = (
+            await db.execute(
+                select(RollupWatermark.last_id).where(RollupWatermark.name == ACTIVITY_ROLLUP).with_for_update()
+            )
+        ).scalar_one()
+
+        candidates = (
+            select(UserActivity.id, UserActivity.inserted_at)
+            .where(UserActivity.id > last_id)
+            .order_by(UserActivity.id)
+            .limit(batch_size)
+            .cte("candidates")
+        )
+        first_recent_id = (
+            select(func.min(candidates.c.id))
+            .where(candidates.c.inserted_at >= func.statement_timestamp() - lag)
+            .scalar_subquery()
+        )
+        batch_stats = (
+            await db.execute(
+                select(func.max(candidates.c.id), func.count()).where(
+                    or_(first_recent_id.is_(None), candidates.c.id < first_recent_id)
+                )
+            )
+        ).one()
+        upper_id, rolled_up = batch_stats
+        if not rolled_up:
+            await self._commit(db)
+            return 0
+
+        # Пачка - все видимые активности в (last_id, upper_id], поэтому сводка получает ровно rolled_up активностей
+        day = cast(func.timezone("UTC", UserActivity.created_at), Date)
+        menu_item_id = func.coalesce(UserActivity.menu_item_id, 0)
+        stmt = pg_insert(ActivityDailyStats).from_select(
+            ["day", "activity_type", "menu_item_id", "count"],
+            select(day, UserActivity.activity_type, menu_item_id, func.count())
+            .where(UserActivity.id > last_id, UserActivity.id <= upper_id)
+            .group_by(day, UserActivity.activity_type, menu_item_id),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["day", "activity_type", "menu_item_id"],
+            set_={"count": ActivityDailyStats.count + stmt.excluded.count},
+        )
+        await db.execute(stmt)
+        await db.execute(
+            update(RollupWatermark)
+            .where(RollupWatermark.name == ACTIVITY_ROLLUP)
+            .values(last_id=upper_id, updated_at=datetime.now(timezone.utc))
+        )
+        await self._commit(db)
+        return rolled_up
+
+    async def get_counts_by_type(
+        self,
+        db: AsyncSession,
+        start_day: Optional[date] = None,
+        end_day: Optional[date] = None,
+        section_id: Optional[int] = None,
+    ) -> Dict[str, int]:
+        """Получить количество активностей каждого типа за период по сводке и хвосту.
+
+        Args:
+            db: Сессия базы данных
+            start_day: Первый день периода (UTC)
+            end_day: Последний день периода (UTC)
+            section_id: ID раздела верхнего уровня; учитываются только активности с пунктами меню этого раздела
+
+        Returns:
+            Количество активностей по типам
+        """
+        last_id = select(RollupWatermark.last_id).where(RollupWatermark.name == ACTIVITY_ROLLUP).scalar_subquery()
+
+        rolled_up: Select = select(ActivityDailyStats.activity_type, ActivityDailyStats.count.label("count"))
+        if start_day:
+            rolled_up = rolled_up.where(ActivityDailyStats.day >= start_day)
+        if end_day:
+            rolled_up = rolled_up.where(ActivityDailyStats.day <= end_day)
+
+        tail: Select = select(UserActivity.activity_type, literal(1).label("count")).where(
+            UserActivity.id > func.coalesce(last_id, 0)
+        )
+        if start_day:
+            tail = tail.where(UserActivity.created_at >= datetime.combine(start_day, time.min, timezone.utc))
+        if end_day:
+            tail = tail.where(
+                UserActivity.created_at < datetime.combine(end_day + timedelta(days=1), time.min, timezone.utc)
+            )
+
+        if section_id is not None:
+            section_items = select(MenuItem.id).where(MenuItem.in_section(section_id))
+            rolled_up = rolled_up.where(ActivityDailyStats.menu_item_id.in_(section_items))
+            tail = tail.where(UserActivity.menu_item_id.in_(section_items))
+
+        # Сводка и хвост читаются одним запросом - в одном снимке данных с отметкой
+        activities = rolled_up.union_all(tail).subquery()
+        query = select(activities.c.activity_type, func.sum(activities.c.count).label("count")).group_by(
+            activities.c.activity_type
+        )
+        result = await db.execute(query)
+        return {row.activity_type: int(row.count) for row in result}
+
+
+activity_stats_crud = ActivityStatsCRUD()
@@ -71,8 +71,8 @@ class AdminUserCRUD(BaseCRUD[AdminUser, dict, dict]):
 
         admin = AdminUser(**admin_data)
         db.add(admin)
-        await db.commit()
-        await db.refresh(admin)
+        await self._commit(db)
+        await self._refresh(db, admin)
         return admin
 
     async def update_password(self, db: AsyncSession, *, admin: AdminUser, password_hash: str) -> AdminUser:
@@ -85,40 +85,40 @@ class AdminUserCRUD(BaseCRUD[AdminUser, dict, dict]):
         """
         admin.password_hash = password_hash
         db.add(admin)
-        await db.commit()
-        await db.refresh(admin)
+        await self._commit(db)
+        await self._refresh(db, admin)
         return admin
 
     async def update_role(self, db: AsyncSession, *, admin: AdminUser, role: AdminRole) -> AdminUser:
         """Обновить роль администратора."""
         admin.role = role
         db.add(admin)
-        await db.commit()
-        await db.refresh(admin)
+        await self._commit(db)
+        await self._refresh(db, admin)
         return admin
 
     async def deactivate(self, db: AsyncSession, *, admin: AdminUser) -> AdminUser:
         """Деактивировать администратора."""
         admin.is_active = False
         db.add(admin)
-        await db.commit()
-        await db.refresh(admin)
+        await self._commit(db)
+        await self._refresh(db, admin)
         return admin
 
     async def activate(self, db: AsyncSession, *, admin: AdminUser) -> AdminUser:
         """Активировать администратора."""
         admin.is_active = True
         db.add(admin)
-        await db.commit()
-        await db.refresh(admin)
+        await self._commit(db)
+        await self._refresh(db, admin)
         return admin
 
     async def update_email(self, db: AsyncSession, *, admin: AdminUser, email: EmailStr) -> AdminUser:
         """Обновить email администратора."""
         admin.email = email
         db.add(admin)
-        await db.commit()
-        await db.refresh(admin)
+        await self._commit(db)
+        await self._refresh(db, admin)
         return admin
 
     async def update_admin_info(
@@ -142,8 +142,8 @@ class AdminUserCRUD(BaseCRUD[AdminUser, dict, dict]):
             admin.is_active = is_active
 
         db.add(admin)
-        await db.commit()
-        await db.refresh(admin)
+        await self._commit(db)
+        await self._refresh(db, admin)
         return admin
 
     async def get_all_admins(self, db: AsyncSession) -> List[AdminUser]:
@@ -8,9 +8,22 @@ from typing import Optional
 from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.models import MenuItem, TelegramUser, UserActivity, UserQuestion
+from backend.models import MenuItem, TelegramUser, UserQuestion
 from backend.models.enums import ActivityType
 
+from .activity_stats import activity_stats_crud
+from .search_log import search_log_crud
+
+
+# Типы активностей, которые входят в total_views
+VIEW_STATISTICS_TYPES = (
+    ActivityType.TEXT_VIEW,
+    ActivityType.IMAGE_VIEW,
+    ActivityType.VIDEO_VIEW,
+    ActivityType.MEDIA_VIEW,
+    ActivityType.NAVIGATION,
+)
+
 
 class AnalyticsCRUD:
     """CRUD для аналитических запросов и статистики.
@@ -75,47 +88,34 @@ class AnalyticsCRUD:
 
         """
         now_utc = datetime.now(timezone.utc)
-
-        # Общее количество пользователей
-        total_query = select(func.count(TelegramUser.id))
-        if start_date and end_date:
-            # Если указан диапазон дат, считаем пользователей в этом диапазоне
-            total_query = self._apply_date_conditions(total_query, TelegramUser.created_at, start_date, end_date)
-        elif start_date:
-            total_query = self._apply_date_conditions(total_query, TelegramUser.created_at, start_date, None)
-        elif end_date:
-            total_query = self._apply_date_conditions(total_query, TelegramUser.created_at, None, end_date)
-
-        total_result = await db.execute(total_query)
-        total = total_result.scalar()
-
-        # Активные пользователи сегодня
         today_start = datetime.combine(date.today(), datetime.min.time(), timezone.utc)
-        today_query = select(func.count(TelegramUser.id)).where(TelegramUser.last_activity >= today_start)
-        today_result = await db.execute(today_query)
-        active_today = today_result.scalar()
-
-        # Активные пользователи за неделю
         week_ago = now_utc - timedelta(days=7)
-        week_query = select(func.count(TelegramUser.id)).where(
-            and_(TelegramUser.last_activity >= week_ago, TelegramUser.last_activity.is_not(None))
-        )
-        week_result = await db.execute(week_query)
-        active_week = week_result.scalar()
-
-        # Активные пользователи за месяц
         month_ago = now_utc - timedelta(days=30)
-        month_query = select(func.count(TelegramUser.id)).where(
-            and_(TelegramUser.last_activity >= month_ago, TelegramUser.last_activity.is_not(None))
-        )
-        month_result = await db.execute(month_query)
-        active_month = month_result.scalar()
+
+        # Общее количество пользователей: при указанном диапазоне дат - зарегистрированных в нем
+        created_conditions = []
+        if start_date:
+            created_conditions.append(TelegramUser.created_at >= start_date)
+        if end_date:
+            created_conditions.append(TelegramUser.created_at <= end_date)
+        total = func.count().filter(and_(*created_conditions)) if created_conditions else func.count()
+
+        # Все счетчики за один проход по таблице пользователей
+        stats_query = select(
+            total.label("total"),
+            func.count().filter(TelegramUser.last_activity >= today_start).label("active_today"),
+            func.count().filter(TelegramUser.last_activity >= week_ago).label("active_week"),
+            func.count().filter(TelegramUser.last_activity >= month_ago).label("active_month"),
+        ).select_from(TelegramUser)
+
+        stats_result = await db.execute(stats_query)
+        stats_row = stats_result.first()
 
         return {
-            "total": total or 0,
-            "active_today": active_today or 0,
-            "active_week": active_week or 0,
-            "active_month": active_month or 0,
+            "total": stats_row.total or 0,
+            "active_today": stats_row.active_today or 0,
+            "active_week": stats_row.active_week or 0,
+            "active_month": stats_row.active_month or 0,
         }
 
     async def get_content_statistics(
@@ -123,6 +123,7 @@ class AnalyticsCRUD:
         db: AsyncSession,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
+        section_id: Optional[int] = None,
     ) -> dict:
         """Получить статистику контента.
 
@@ -130,6 +131,7 @@ class AnalyticsCRUD:
             db: Сессия базы данных
             start_date: Начальная дата фильтрации
             end_date: Конечная дата фильтрации
+            section_id: ID раздела верхнего уровня для отбора пунктов меню
 
         Returns:
             Словарь со статистикой контента
@@ -137,6 +139,8 @@ class AnalyticsCRUD:
         """
         # Общее количество активных элементов меню
         total_query = select(func.count(MenuItem.id)).where(MenuItem.is_active)
+        if section_id is not None:
+            total_query = total_query.where(MenuItem.in_section(section_id))
         if start_date or end_date:
             total_query = self._apply_date_conditions(total_query, MenuItem.created_at, start_date, end_date)
 
@@ -147,6 +151,8 @@ class AnalyticsCRUD:
         most_viewed_query = select(
             MenuItem.id, MenuItem.title, MenuItem.view_count, MenuItem.download_count, MenuItem.average_rating
         ).where(MenuItem.is_active)
+        if section_id is not None:
+            most_viewed_query = most_viewed_query.where(MenuItem.in_section(section_id))
 
         if start_date or end_date:
             most_viewed_query = self._apply_date_conditions(
@@ -171,6 +177,8 @@ class AnalyticsCRUD:
         most_rated_query = select(MenuItem.id, MenuItem.title, MenuItem.average_rating, MenuItem.rating_count).where(
             MenuItem.is_active, MenuItem.rating_count > 0
         )
+        if section_id is not None:
+            most_rated_query = most_rated_query.where(MenuItem.in_section(section_id))
 
         if start_date or end_date:
             most_rated_query = self._apply_date_conditions(most_rated_query, MenuItem.created_at, start_date, end_date)
@@ -201,6 +209,7 @@ class AnalyticsCRUD:
         db: AsyncSession,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
+        section_id: Optional[int] = None,
     ) -> dict:
         """Получить статистику активностей.
 
@@ -208,52 +217,29 @@ class AnalyticsCRUD:
             db: Сессия базы данных
             start_date: Начальная дата фильтрации
             end_date: Конечная дата фильтрации
+            section_id: ID раздела верхнего уровня; счетчики учитывают только активности
+                с пунктами меню этого раздела, поисковые запросы не фильтруются
+            (период округляется до суток UTC)
 
         Returns:
             Словарь со статистикой активностей
         """
-        # Базовый запрос для статистики активностей
-        base_query = select(
-            func.count().filter(UserActivity.activity_type == ActivityType.TEXT_VIEW).label("text_views"),
-            func.count().filter(UserActivity.activity_type == ActivityType.IMAGE_VIEW).label("image_views"),
-            func.count().filter(UserActivity.activity_type == ActivityType.VIDEO_VIEW).label("video_views"),
-            func.count().filter(UserActivity.activity_type == ActivityType.PDF_DOWNLOAD).label("pdf_downloads"),
-            func.count().filter(UserActivity.activity_type == ActivityType.MEDIA_VIEW).label("media_views"),
-            func.count().filter(UserActivity.activity_type == ActivityType.RATING).label("ratings"),
-            func.count().filter(UserActivity.activity_type == ActivityType.SEARCH).label("searches"),
-            func.count().filter(UserActivity.activity_type == ActivityType.NAVIGATION).label("navigation"),
-        ).select_from(UserActivity)
-
-        # Применяем фильтры по датам
-        if start_date or end_date:
-            base_query = self._apply_date_conditions(base_query, UserActivity.created_at, start_date, end_date)
-
-        stats_result = await db.execute(base_query)
-        stats_row = stats_result.first()
-
-        # Популярные поисковые запросы
-        searches_query = select(UserActivity.search_query, func.count().label("count")).where(
-            UserActivity.activity_type == ActivityType.SEARCH, UserActivity.search_query.is_not(None)
-        )
-
-        if start_date or end_date:
-            searches_query = self._apply_date_conditions(searches_query, UserActivity.created_at, start_date, end_date)
-
-        searches_query = searches_query.group_by(UserActivity.search_query).order_by(func.count().desc()).limit(10)
-        searches_result = await db.execute(searches_query)
+        # Статистика считается по суткам UTC: суточная сводка плюс еще не попавшие в нее активности
+        start_day = start_date.astimezone(timezone.utc).date() if start_date else None
+        end_day = end_date.astimezone(timezone.utc).date() if end_date else None
+        counts = await activity_stats_crud.get_counts_by_type(db, start_day, end_day, section_id)
 
-        search_queries = [{"query": row.search_query, "count": row.count} for row in searches_result]
+        # Популярные запросы и запросы без результатов - по суточной сводке журнала поиска
+        search_queries = await search_log_crud.get_top_queries(db, start_day, end_day)
+        zero_result_queries = await search_log_crud.get_top_queries(db, start_day, end_day, zero_results=True)
 
         return {
-            "total_views": (stats_row.text_views or 0)
-            + (stats_row.image_views or 0)
-            + (stats_row.video_views or 0)
-            + (stats_row.media_views or 0)
-            + (stats_row.navigation or 0),
-            "total_downloads": stats_row.pdf_downloads or 0,
-            "total_ratings": stats_row.ratings or 0,
-            "total_searches": stats_row.searches or 0,
+            "total_views": sum(counts.get(activity_type, 0) for activity_type in VIEW_STATISTICS_TYPES),
+            "total_downloads": counts.get(ActivityType.PDF_DOWNLOAD, 0),
+            "total_ratings": counts.get(ActivityType.RATING, 0),
+            "total_searches": counts.get(ActivityType.SEARCH, 0),
             "search_queries": search_queries,
+            "zero_result_queries": zero_result_queries,
         }
 
     async def get_questions_statistics(
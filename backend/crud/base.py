@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Generic, List, Optional, Type, TypeVar, Union
 
 from pydantic import BaseModel
 from sqlalchemy import func, select
@@ -15,6 +16,68 @@ ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+# Ключ в AsyncSession.info, отмечающий активную единицу работы
+UNIT_OF_WORK_KEY = "unit_of_work"
+# Ключ в AsyncSession.info со списком действий после фиксации единицы работы
+AFTER_COMMIT_KEY = "unit_of_work_after_commit"
+
+
+def in_unit_of_work(db: AsyncSession) -> bool:
+    """Выполняется ли сессия внутри единицы работы."""
+    return bool(db.info.get(UNIT_OF_WORK_KEY))
+
+
+def after_commit(db: AsyncSession, callback: Callable[[], None]) -> None:
+    """Выполняет действие после фиксации текущей единицы работы.
+
+    При откате единицы работы действие отбрасывается. Вне единицы работы
+    действие выполняется сразу.
+
+    Args:
+        db: Сессия базы данных
+        callback: Действие без аргументов
+    """
+    if not in_unit_of_work(db):
+        callback()
+        return
+    db.info[AFTER_COMMIT_KEY].append(callback)
+
+
+@asynccontextmanager
+async def unit_of_work(db: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """Единица работы: все изменения CRUD операций внутри блока фиксируются одним коммитом.
+
+    Внутри блока CRUD методы выполняют flush вместо commit и не перечитывают
+    объекты через refresh. При выходе из блока транзакция фиксируется, при
+    исключении - откатывается. Вложенный блок присоединяется к внешнему.
+    Действия, отложенные через ``after_commit``, выполняются только после
+    успешной фиксации.
+
+    Args:
+        db: Сессия базы данных
+
+    Yields:
+        Та же сессия базы данных
+    """
+    if in_unit_of_work(db):
+        yield db
+        return
+
+    db.info[UNIT_OF_WORK_KEY] = True
+    callbacks = db.info[AFTER_COMMIT_KEY] = []
+    try:
+        yield db
+        await db.commit()
+    except BaseException:
+        await db.rollback()
+        raise
+    finally:
+        db.info.pop(UNIT_OF_WORK_KEY, None)
+        db.info.pop(AFTER_COMMIT_KEY, None)
+
+    for callback in callbacks:
+        callback()
+
 
 class BaseCRUD(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """Базовый класс для CRUD операций."""
@@ -27,6 +90,20 @@ class BaseCRUD(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         self.model = model
 
+    @staticmethod
+    async def _commit(db: AsyncSession) -> None:
+        """Зафиксировать изменения: commit, а внутри единицы работы - только flush."""
+        if in_unit_of_work(db):
+            await db.flush()
+        else:
+            await db.commit()
+
+    @staticmethod
+    async def _refresh(db: AsyncSession, db_obj: Any) -> None:
+        """Перечитать объект из БД после коммита; внутри единицы работы объект уже актуален после flush."""
+        if not in_unit_of_work(db):
+            await db.refresh(db_obj)
+
     async def get(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
         """Получить объект по ID."""
         result = await db.execute(select(self.model).where(self.model.id == id))
@@ -47,8 +124,8 @@ class BaseCRUD(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db_obj = self.model(**obj_in_data)
 
         db.add(db_obj)
-        await db.commit()
-        await db.refresh(db_obj)
+        await self._commit(db)
+        await self._refresh(db, db_obj)
 
         return db_obj
 
@@ -70,8 +147,8 @@ class BaseCRUD(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
                 setattr(db_obj, field, value)
 
         db.add(db_obj)
-        await db.commit()
-        await db.refresh(db_obj)
+        await self._commit(db)
+        await self._refresh(db, db_obj)
 
         return db_obj
 
@@ -80,7 +157,7 @@ class BaseCRUD(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         obj = await self.get(db, id=id)
         if obj:
             await db.delete(obj)
-            await db.commit()
+            await self._commit(db)
         return obj
 
     async def count(self, db: AsyncSession) -> int:
@@ -2,14 +2,16 @@
 
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
-from sqlalchemy import or_, select, update
+from pydantic import BaseModel
+from sqlalchemy import Integer, Text, case, column, func, literal, or_, select, update, values
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from backend.models import MenuItem
 from backend.models.enums import AccessLevel
+from backend.models.menu_item import SEARCH_CONFIG
 
 from .base import BaseCRUD
 
@@ -21,6 +23,56 @@ class MenuItemCRUD(BaseCRUD[MenuItem, dict, dict]):
         """Инициализация CRUD для пунктов меню."""
         super().__init__(MenuItem)
 
+    async def create(self, db: AsyncSession, *, obj_in: Union[BaseModel, Dict[str, Any]]) -> MenuItem:
+        """Создать пункт меню с материализованным путем по родителю."""
+        obj_in_data = dict(obj_in) if isinstance(obj_in, dict) else obj_in.model_dump(exclude_unset=True)
+        obj_in_data["path"] = await self._path_under(db, obj_in_data.get("parent_id"))
+        return await super().create(db, obj_in=obj_in_data)
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: MenuItem,
+        obj_in: Union[BaseModel, Dict[str, Any]],
+    ) -> MenuItem:
+        """Обновить пункт меню, при смене родителя перенести пути всего поддерева одним UPDATE."""
+        update_data = dict(obj_in) if isinstance(obj_in, dict) else obj_in.model_dump(exclude_unset=True)
+
+        if "parent_id" in update_data and update_data["parent_id"] != db_obj.parent_id:
+            old_subtree_path = db_obj.subtree_path
+            update_data["path"] = await self._path_under(db, update_data["parent_id"])
+            new_subtree_path = f"{update_data['path']}{db_obj.id}/"
+            await db.execute(
+                update(MenuItem)
+                .where(MenuItem.path_startswith(old_subtree_path))
+                .values(path=new_subtree_path + func.substr(MenuItem.path, len(old_subtree_path) + 1))
+                .execution_options(synchronize_session="fetch")
+            )
+
+        return await super().update(db, db_obj=db_obj, obj_in=update_data)
+
+    async def _path_under(self, db: AsyncSession, parent_id: Optional[int]) -> str:
+        """Материализованный путь пункта, родителем которого будет parent_id."""
+        if not parent_id:
+            return "/"
+        parent_path = (await db.execute(select(MenuItem.path).where(MenuItem.id == parent_id))).scalar_one()
+        return f"{parent_path}{parent_id}/"
+
+    async def get_descendants(self, db: AsyncSession, menu_item: MenuItem) -> List[MenuItem]:
+        """Получить всех потомков пункта меню одним запросом по индексу пути.
+
+        Args:
+            db: Сессия базы данных
+            menu_item: Пункт меню
+
+        Returns:
+            Потомки пункта, упорядоченные по пути и ID
+        """
+        query = select(MenuItem).where(MenuItem.path_startswith(menu_item.subtree_path))
+        result = await db.execute(query.order_by(MenuItem.path, MenuItem.id))
+        return list(result.scalars().all())
+
     async def get_by_parent_id(
         self,
         db: AsyncSession,
@@ -69,31 +121,42 @@ class MenuItemCRUD(BaseCRUD[MenuItem, dict, dict]):
         result = await db.execute(query)
         return result.scalar_one_or_none()
 
-    async def get_with_content_and_children(
-        self, db: AsyncSession, menu_id: int, access_level: AccessLevel
-    ) -> Optional[MenuItem]:
-        """Получить пункт меню с контентом и прямыми дочерними элементами.
+    async def get_all_with_content(self, db: AsyncSession) -> List[MenuItem]:
+        """Получить все пункты меню с контентом для построения снимка меню.
 
         Args:
             db: Сессия базы данных
-            menu_id: ID пункта меню
-            access_level: Уровень доступа пользователя
         """
-        # Загружаем пункт меню с контентом
         query = (
-            select(MenuItem).options(selectinload(MenuItem.content)).where(MenuItem.id == menu_id, MenuItem.is_active)
+            select(MenuItem)
+            .options(selectinload(MenuItem.content))
+            .order_by(MenuItem.id)
+            .execution_options(populate_existing=True)
         )
 
         result = await db.execute(query)
-        menu_item = result.scalar_one_or_none()
+        return list(result.scalars().all())
+
+    async def get_with_content_by_ids(self, db: AsyncSession, ids: Iterable[int]) -> List[MenuItem]:
+        """Получить пункты меню с контентом по набору ID одним запросом (для обновления поискового индекса).
+
+        Args:
+            db: Сессия базы данных
+            ids: ID пунктов меню
+        """
+        ids = list(set(ids))
+        if not ids:
+            return []
 
-        if menu_item:
-            # Загружаем дочерние элементы отдельным запросом для простоты
-            children = await self.get_children_by_parent_id(db, menu_id, True, access_level)
-            # Создаем простой объект без SQLAlchemy отношений
-            menu_item._children = children
+        query = (
+            select(MenuItem)
+            .where(MenuItem.id.in_(ids))
+            .options(selectinload(MenuItem.content))
+            .execution_options(populate_existing=True)
+        )
 
-        return menu_item
+        result = await db.execute(query)
+        return list(result.scalars().all())
 
     async def get_admin_menu_items(
         self,
@@ -127,14 +190,24 @@ class MenuItemCRUD(BaseCRUD[MenuItem, dict, dict]):
         query: str,
         access_level: AccessLevel,
         limit: int = 10,
+        section_id: Optional[int] = None,
+        trigram_threshold: Optional[float] = None,
     ) -> List[MenuItem]:
         """Поиск пунктов меню по запросу.
 
+        Ищет по полнотекстовому индексу (websearch_to_tsquery, ранжирование
+        ts_rank_cd). Если полнотекстовый поиск ничего не нашел, например по
+        части слова или из-за опечатки, выполняется поиск по сходству триграмм
+        (если задан порог) или поиск подстроки по названию и описанию.
+
         Args:
             db: Сессия базы данных
             query: Поисковый запрос (уже валидированный)
             access_level: Уровень доступа пользователя
             limit: Максимальное количество результатов
+            section_id: ID раздела верхнего уровня для ограничения поиска
+            trigram_threshold: Порог сходства для поиска через pg_trgm (None - поиск подстроки)
+
         Returns:
             List[MenuItem]: Список найденных пунктов меню
         """
@@ -145,6 +218,62 @@ class MenuItemCRUD(BaseCRUD[MenuItem, dict, dict]):
         if not words:
             return []
 
+        items = await self.search_by_text(db, query, access_level, limit, section_id)
+        if items:
+            return items
+
+        if trigram_threshold is not None:
+            return await self.search_by_similarity(db, query, access_level, limit, section_id, trigram_threshold)
+
+        return await self.search_by_substring(db, words, access_level, limit, section_id)
+
+    async def search_by_text(
+        self,
+        db: AsyncSession,
+        query: str,
+        access_level: AccessLevel,
+        limit: int = 10,
+        section_id: Optional[int] = None,
+    ) -> List[MenuItem]:
+        """Полнотекстовый поиск пунктов меню по GIN индексу search_vector.
+
+        Args:
+            db: Сессия базы данных
+            query: Поисковый запрос в синтаксисе websearch_to_tsquery
+            access_level: Уровень доступа пользователя
+            limit: Максимальное количество результатов
+            section_id: ID раздела верхнего уровня для ограничения поиска
+        Returns:
+            List[MenuItem]: Пункты меню по убыванию релевантности
+        """
+        ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+        stmt = self._filter_search(
+            select(MenuItem).where(MenuItem.search_vector.bool_op("@@")(ts_query)), access_level, section_id
+        )
+        stmt = stmt.order_by(func.ts_rank_cd(MenuItem.search_vector, ts_query).desc(), MenuItem.id).limit(limit)
+
+        result = await db.execute(stmt)
+        return list(result.scalars().all())
+
+    async def search_by_substring(
+        self,
+        db: AsyncSession,
+        words: List[str],
+        access_level: AccessLevel,
+        limit: int = 10,
+        section_id: Optional[int] = None,
+    ) -> List[MenuItem]:
+        """Поиск пунктов меню, в названии или описании которых есть каждое из слов.
+
+        Args:
+            db: Сессия базы данных
+            words: Слова поискового запроса
+            access_level: Уровень доступа пользователя
+            limit: Максимальное количество результатов
+            section_id: ID раздела верхнего уровня для ограничения поиска
+        Returns:
+            List[MenuItem]: Пункты меню, начинающиеся с запроса - первыми
+        """
         conditions = []
         for word in words:
             pattern = f"%{word}%"
@@ -155,20 +284,70 @@ class MenuItemCRUD(BaseCRUD[MenuItem, dict, dict]):
                 )
             )
 
-        stmt = select(MenuItem).where(MenuItem.is_active, *conditions)
+        stmt = self._filter_search(select(MenuItem).where(*conditions), access_level, section_id)
+        stmt = stmt.order_by(MenuItem.title.ilike(f"{' '.join(words)}%").desc(), MenuItem.id).limit(limit)
+
+        result = await db.execute(stmt)
+        return list(result.scalars().all())
+
+    async def search_by_similarity(
+        self,
+        db: AsyncSession,
+        query: str,
+        access_level: AccessLevel,
+        limit: int = 10,
+        section_id: Optional[int] = None,
+        threshold: float = 0.4,
+    ) -> List[MenuItem]:
+        """Поиск пунктов меню с учетом опечаток по сходству триграмм (pg_trgm).
+
+        Отбор идет оператором <% по GIN индексам триграмм названия и описания,
+        порог задается на время транзакции через pg_trgm.word_similarity_threshold.
+
+        Args:
+            db: Сессия базы данных
+            query: Поисковый запрос
+            access_level: Уровень доступа пользователя
+            limit: Максимальное количество результатов
+            section_id: ID раздела верхнего уровня для ограничения поиска
+            threshold: Минимальное сходство запроса с названием или описанием (0..1)
+
+        Returns:
+            List[MenuItem]: Пункты меню по убыванию сходства
+        """
+        await db.execute(select(func.set_config("pg_trgm.word_similarity_threshold", str(threshold), True)))
+
+        query_text = literal(query, Text)
+        similarity = func.greatest(
+            func.word_similarity(query_text, MenuItem.title),
+            func.coalesce(func.word_similarity(query_text, MenuItem.description), 0),
+        )
+        stmt = self._filter_search(
+            select(MenuItem).where(or_(query_text.op("<%")(MenuItem.title), query_text.op("<%")(MenuItem.description))),
+            access_level,
+            section_id,
+        )
+        stmt = stmt.order_by(similarity.desc(), MenuItem.id).limit(limit)
+
+        result = await db.execute(stmt)
+        return list(result.scalars().all())
+
+    def _filter_search(self, stmt, access_level: AccessLevel, section_id: Optional[int]):
+        """Ограничить поиск активными пунктами, доступными пользователю, и разделом."""
+        stmt = stmt.where(MenuItem.is_active)
 
         if access_level == AccessLevel.FREE:
             stmt = stmt.where(MenuItem.access_level == AccessLevel.FREE)
 
-        stmt = stmt.order_by(MenuItem.title.ilike(f"{query}%").desc(), MenuItem.id).limit(limit)
+        if section_id is not None:
+            stmt = stmt.where(MenuItem.in_section(section_id))
 
-        result = await db.execute(stmt)
-        return result.scalars().all()
+        return stmt
 
     async def increment_view_count(self, db: AsyncSession, *, menu_id: int) -> None:
         """Увеличить счетчик просмотров."""
         await db.execute(update(MenuItem).where(MenuItem.id == menu_id).values(view_count=MenuItem.view_count + 1))
-        await db.commit()
+        await self._commit(db)
 
     async def update_rating_stats(self, db: AsyncSession, *, menu_id: int, rating: int) -> None:
         """Обновить статистику оценок материалов.
@@ -188,14 +367,62 @@ class MenuItemCRUD(BaseCRUD[MenuItem, dict, dict]):
                 average_rating=(MenuItem.rating_sum + rating) / (MenuItem.rating_count + 1),
             )
         )
-        await db.commit()
+        await self._commit(db)
+
+    async def get_by_ids(self, db: AsyncSession, ids: Iterable[int]) -> List[MenuItem]:
+        """Получить пункты меню по набору ID одним запросом."""
+        ids = list(set(ids))
+        if not ids:
+            return []
+
+        result = await db.execute(select(MenuItem).where(MenuItem.id.in_(ids)))
+        return list(result.scalars().all())
+
+    async def apply_activity_deltas(self, db: AsyncSession, deltas: Dict[int, Tuple[int, int, int, int]]) -> None:
+        """Применить приросты счетчиков нескольких пунктов меню одним UPDATE ... FROM (VALUES ...).
+
+        Args:
+            db: Сессия базы данных
+            deltas: ID пункта меню -> (просмотры, скачивания, сумма оценок, количество оценок)
+        """
+        if not deltas:
+            return
+
+        delta_values = values(
+            column("id", Integer),
+            column("views", Integer),
+            column("downloads", Integer),
+            column("rating_sum", Integer),
+            column("rating_count", Integer),
+            name="deltas",
+        ).data([(menu_id, *counters) for menu_id, counters in sorted(deltas.items())])
+
+        await db.execute(
+            update(MenuItem)
+            .where(MenuItem.id == delta_values.c.id)
+            .values(
+                view_count=MenuItem.view_count + delta_values.c.views,
+                download_count=MenuItem.download_count + delta_values.c.downloads,
+                rating_sum=MenuItem.rating_sum + delta_values.c.rating_sum,
+                rating_count=MenuItem.rating_count + delta_values.c.rating_count,
+                average_rating=case(
+                    (
+                        delta_values.c.rating_count > 0,
+                        (MenuItem.rating_sum + delta_values.c.rating_sum)
+                        / (MenuItem.rating_count + delta_values.c.rating_count),
+                    ),
+                    else_=MenuItem.average_rating,
+                ),
+            )
+        )
+        await self._commit(db)
 
     async def increment_download_count(self, db: AsyncSession, *, menu_id: int) -> None:
         """Увеличить счетчик скачиваний."""
         await db.execute(
             update(MenuItem).where(MenuItem.id == menu_id).values(download_count=MenuItem.download_count + 1)
         )
-        await db.commit()
+        await self._commit(db)
 
 
 menu_item_crud = MenuItemCRUD()
@@ -70,8 +70,8 @@ class NotificationCRUD(BaseCRUD[Notification, dict, dict]):
 
         db_obj = self.model(**notification_data)
         db.add(db_obj)
-        await db.commit()
-        await db.refresh(db_obj)
+        await self._commit(db)
+        await self._refresh(db, db_obj)
         return db_obj
 
     async def delete(self, db: AsyncSession, notification_id: int) -> bool:
@@ -44,8 +44,8 @@ class QuestionCRUD(BaseCRUD[UserQuestion, dict, dict]):
 
         question = UserQuestion(**question_data)
         db.add(question)
-        await db.commit()
-        await db.refresh(question)
+        await self._commit(db)
+        await self._refresh(db, question)
         return question
 
     async def answer_question(
@@ -75,8 +75,8 @@ class QuestionCRUD(BaseCRUD[UserQuestion, dict, dict]):
             question.admin_user_id = admin_user_id
             question.answered_at = datetime.now(timezone.utc)
             db.add(question)
-            await db.commit()
-            await db.refresh(question)
+            await self._commit(db)
+            await self._refresh(db, question)
         return question
 
     async def get_questions_by_status(
@@ -0,0 +1,136 @@
+"""CRUD операции для журнала поисковых запросов."""
+
+from __future__ import annotations
+
+import hashlib
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models import SearchLog, SearchQueryDaily
+
+from .base import BaseCRUD
+
+
+def search_query_hash(query: str) -> int:
+    """Хэш нормализованного запроса: первые 8 байт MD5 как знаковое 64-битное число.
+
+    Хэш - ключ суточной сводки, поэтому он не должен меняться между версиями
+    (его повторяет миграция, заполнившая журнал по старым активностям).
+    """
+    return int.from_bytes(hashlib.md5(query.encode("utf-8")).digest()[:8], "big", signed=True)
+
+
+class SearchLogCRUD(BaseCRUD[SearchLog, dict, dict]):
+    """CRUD операции для журнала поисковых запросов и его суточной сводки."""
+
+    def __init__(self):
+        """Инициализация CRUD для журнала поисковых запросов."""
+        super().__init__(SearchLog)
+
+    async def log_searches(self, db: AsyncSession, rows: List[Dict[str, Any]]) -> int:
+        """Записать поиски в журнал и добавить их в суточную сводку.
+
+        Журнал пополняется одним многострочным INSERT, сводка - одним
+        INSERT ... ON CONFLICT DO UPDATE, прибавляющим поиски пачки к
+        счетчикам запроса за день.
+
+        Args:
+            db: Сессия базы данных
+            rows: Поиски (telegram_user_id - ID пользователя в БД, query - нормализованный
+                запрос, results - количество результатов, created_at - по умолчанию текущее время)
+
+        Returns:
+            Количество записанных поисков
+        """
+        if not rows:
+            return 0
+
+        now = datetime.now(timezone.utc)
+        logs = []
+        daily = defaultdict(lambda: [0, 0])
+        queries = {}
+        for row in rows:
+            query = row["query"].lower()
+            query_hash = search_query_hash(query)
+            created_at = row.get("created_at", now)
+            logs.append(
+                {
+                    "telegram_user_id": row["telegram_user_id"],
+                    "query": query,
+                    "query_hash": query_hash,
+                    "results": row["results"],
+                    "zero_results": row["results"] == 0,
+                    "created_at": created_at,
+                }
+            )
+            key = (created_at.astimezone(timezone.utc).date(), query_hash)
+            daily[key][0] += 1
+            daily[key][1] += row["results"] == 0
+            queries[query_hash] = query
+
+        await db.execute(insert(SearchLog).values(logs))
+
+        stmt = pg_insert(SearchQueryDaily).values(
+            [
+                {
+                    "day": day,
+                    "query_hash": query_hash,
+                    "query": queries[query_hash],
+                    "searches": searches,
+                    "zero_result_searches": zero_result_searches,
+                }
+                # Сортировка ключей задает порядок блокировок строк сводки в параллельных транзакциях
+                for (day, query_hash), (searches, zero_result_searches) in sorted(daily.items())
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["day", "query_hash"],
+            set_={
+                "searches": SearchQueryDaily.searches + stmt.excluded.searches,
+                "zero_result_searches": SearchQueryDaily.zero_result_searches + stmt.excluded.zero_result_searches,
+            },
+        )
+        await db.execute(stmt)
+        await self._commit(db)
+        return len(rows)
+
+    async def get_top_queries(
+        self,
+        db: AsyncSession,
+        start_day: Optional[date] = None,
+        end_day: Optional[date] = None,
+        limit: int = 10,
+        zero_results: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Получить самые частые запросы за период по суточной сводке.
+
+        Args:
+            db: Сессия базы данных
+            start_day: Первый день периода (UTC)
+            end_day: Последний день периода (UTC)
+            limit: Количество запросов
+            zero_results: Учитывать только поиски без результатов
+
+        Returns:
+            Запросы с количеством поисков по убыванию количества
+        """
+        counter = SearchQueryDaily.zero_result_searches if zero_results else SearchQueryDaily.searches
+        count = func.sum(counter).label("count")
+        query = select(SearchQueryDaily.query, count).group_by(SearchQueryDaily.query_hash, SearchQueryDaily.query)
+        if start_day:
+            query = query.where(SearchQueryDaily.day >= start_day)
+        if end_day:
+            query = query.where(SearchQueryDaily.day <= end_day)
+        if zero_results:
+            query = query.having(count > 0)
+
+        result = await db.execute(query.order_by(count.desc(), SearchQueryDaily.query).limit(limit))
+        return [{"query": row.query, "count": row.count} for row in result]
+
+
+search_log_crud = SearchLogCRUD()
@@ -3,9 +3,9 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from sqlalchemy import and_, func, select, update
+from sqlalchemy import DateTime, Integer, and_, column, func, literal_column, select, update, values
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -28,6 +28,16 @@ class TelegramUserCRUD(BaseCRUD[TelegramUser, dict, dict]):
         result = await db.execute(query)
         return result.scalar_one_or_none()
 
+    async def get_by_telegram_ids(self, db: AsyncSession, telegram_ids: Iterable[int]) -> List[TelegramUser]:
+        """Получить пользователей по набору Telegram ID одним запросом."""
+        telegram_ids = list(set(telegram_ids))
+        if not telegram_ids:
+            return []
+
+        query = select(TelegramUser).where(TelegramUser.telegram_id.in_(telegram_ids))
+        result = await db.execute(query)
+        return list(result.scalars().all())
+
     async def upsert_user(
         self,
         db: AsyncSession,
@@ -46,6 +56,39 @@ class TelegramUserCRUD(BaseCRUD[TelegramUser, dict, dict]):
             last_name: Фамилия пользователя (опционально)
             username: Username пользователя (опционально)
         """
+        user, _ = await self.upsert_user_with_status(
+            db, telegram_id=telegram_id, first_name=first_name, last_name=last_name, username=username
+        )
+        return user
+
+    async def upsert_user_with_status(
+        self,
+        db: AsyncSession,
+        *,
+        telegram_id: int,
+        first_name: str,
+        last_name: Optional[str] = None,
+        username: Optional[str] = None,
+        update_last_activity: bool = True,
+    ) -> Tuple[TelegramUser, bool]:
+        """Создать или обновить пользователя одним запросом.
+
+        INSERT ... ON CONFLICT DO UPDATE возвращает строку пользователя и
+        признак создания: у только что вставленной строки системный столбец
+        xmax равен 0, у обновленной - идентификатор обновившей транзакции.
+        Предварительный SELECT и refresh после коммита не нужны.
+
+        Args:
+            db: Сессия базы данных
+            telegram_id: Telegram ID пользователя
+            first_name: Имя пользователя
+            last_name: Фамилия пользователя (опционально)
+            username: Username пользователя (опционально)
+            update_last_activity: Обновлять ли время последней активности существующего пользователя
+
+        Returns:
+            Пользователь и True, если он был создан этим запросом
+        """
         current_time = datetime.now(timezone.utc)
 
         stmt = pg_insert(TelegramUser).values(
@@ -58,32 +101,31 @@ class TelegramUserCRUD(BaseCRUD[TelegramUser, dict, dict]):
             created_at=current_time,
         )
 
-        stmt = stmt.on_conflict_do_update(
-            index_elements=["telegram_id"],
-            set_={
-                "first_name": stmt.excluded.first_name,
-                "last_name": stmt.excluded.last_name,
-                "username": stmt.excluded.username,
-                "last_activity": stmt.excluded.last_activity,
-            },
-        )
+        set_ = {
+            "first_name": stmt.excluded.first_name,
+            "last_name": stmt.excluded.last_name,
+            "username": stmt.excluded.username,
+        }
+        if update_last_activity:
+            set_["last_activity"] = stmt.excluded.last_activity
 
-        stmt = stmt.returning(TelegramUser)
+        stmt = stmt.on_conflict_do_update(index_elements=["telegram_id"], set_=set_)
 
-        result = await db.execute(stmt)
-        user = result.scalar_one()
+        stmt = stmt.returning(TelegramUser, literal_column("xmax = 0").label("created"))
 
-        await db.commit()
-        await db.refresh(user)
+        result = await db.execute(stmt, execution_options={"populate_existing": True})
+        user, created = result.one()
 
-        return user
+        await self._commit(db)
+
+        return user, bool(created)
 
     async def update_last_activity(self, db: AsyncSession, *, telegram_id: int, last_activity: datetime) -> None:
         """Обновить время последней активности."""
         stmt = update(TelegramUser).where(TelegramUser.telegram_id == telegram_id).values(last_activity=last_activity)
 
         await db.execute(stmt)
-        await db.commit()
+        await self._commit(db)
 
     async def get_all_users(self, db: AsyncSession) -> List[TelegramUser]:
         """Получить всех пользователей для админского интерфейса."""
@@ -110,7 +152,36 @@ class TelegramUserCRUD(BaseCRUD[TelegramUser, dict, dict]):
             .where(TelegramUser.id == telegram_user_id)
             .values(activities_count=TelegramUser.activities_count + increment)
         )
-        await db.commit()
+        await self._commit(db)
+
+    async def apply_user_touches(self, db: AsyncSession, touches: Dict[int, Tuple[int, Optional[datetime]]]) -> None:
+        """Обновить счетчики и время последней активности пользователей одним UPDATE ... FROM (VALUES ...).
+
+        Время последней активности только сдвигается вперед: GREATEST
+        игнорирует NULL, поэтому пустая отметка не затирает сохраненную.
+
+        Args:
+            db: Сессия базы данных
+            touches: ID пользователя в БД -> (прирост счетчика активностей, время последней активности)
+        """
+        if not touches:
+            return
+
+        touch_values = values(
+            column("id", Integer),
+            column("increment", Integer),
+            column("touched_at", DateTime(timezone=True)),
+            name="touches",
+        ).data([(user_id, increment, touched_at) for user_id, (increment, touched_at) in sorted(touches.items())])
+        await db.execute(
+            update(TelegramUser)
+            .where(TelegramUser.id == touch_values.c.id)
+            .values(
+                activities_count=TelegramUser.activities_count + touch_values.c.increment,
+                last_activity=func.greatest(TelegramUser.last_activity, touch_values.c.touched_at),
+            )
+        )
+        await self._commit(db)
 
     async def increment_questions_count(self, db: AsyncSession, *, telegram_user_id: int, increment: int = 1) -> None:
         """Увеличить счетчик вопросов пользователя."""
@@ -119,7 +190,7 @@ class TelegramUserCRUD(BaseCRUD[TelegramUser, dict, dict]):
             .where(TelegramUser.id == telegram_user_id)
             .values(questions_count=TelegramUser.questions_count + increment)
         )
-        await db.commit()
+        await self._commit(db)
 
     async def get_inactive_users(
         self, db: AsyncSession, inactive_days: int = 10, days_since_last_reminder: int = 10
@@ -169,7 +240,7 @@ class TelegramUserCRUD(BaseCRUD[TelegramUser, dict, dict]):
         await db.execute(
             update(TelegramUser).where(TelegramUser.id == telegram_user_id).values(reminder_sent_at=sent_at)
         )
-        await db.commit()
+        await self._commit(db)
 
 
 telegram_user_crud = TelegramUserCRUD()
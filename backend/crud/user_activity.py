@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
-from typing import List, Optional
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
 
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.models import UserActivity
@@ -40,10 +41,40 @@ class UserActivityCRUD(BaseCRUD[UserActivity, dict, dict]):
 
         activity = UserActivity(**activity_data)
         db.add(activity)
-        await db.commit()
-        await db.refresh(activity)
+        await self._commit(db)
+        await self._refresh(db, activity)
         return activity
 
+    async def bulk_create_activities(self, db: AsyncSession, rows: List[Dict[str, Any]]) -> int:
+        """Создать записи активности одним многострочным INSERT.
+
+        Args:
+            db: Сессия базы данных
+            rows: Данные активностей (telegram_user_id - ID пользователя в БД, created_at - по умолчанию текущее время)
+
+        Returns:
+            Количество созданных записей
+        """
+        if rows:
+            created_at = datetime.now(timezone.utc)
+            await db.execute(
+                insert(UserActivity).values(
+                    [
+                        {
+                            "telegram_user_id": row["telegram_user_id"],
+                            "menu_item_id": row.get("menu_item_id"),
+                            "activity_type": row["activity_type"],
+                            "search_query": row.get("search_query"),
+                            "rating": row.get("rating"),
+                            "created_at": row.get("created_at", created_at),
+                        }
+                        for row in rows
+                    ]
+                )
+            )
+        await self._commit(db)
+        return len(rows)
+
     async def get_user_activities(self, db: AsyncSession, telegram_user_id: int, limit: int = 50) -> List[UserActivity]:
         """Получить активность пользователя."""
         query = (
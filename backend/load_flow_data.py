@@ -11,7 +11,7 @@ from sqlalchemy import delete, select
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from backend.core.db import AsyncSessionLocal
+from backend.core.db import session_scope
 from backend.core.security import get_password_hash
 from backend.crud import ContentFileCRUD, MenuItemCRUD
 from backend.models.admin_user import AdminUser
@@ -288,6 +288,7 @@ class FlowDataLoader:
 
     async def _create_subitems(self, session, parent_id: int, subitems: List[Dict[str, Any]]):
         """Создать подразделы для родительского пункта меню."""
+        parent = await session.get(MenuItem, parent_id)
         for subitem_data in subitems:
             # Создаем пункт меню
             menu_item = MenuItem(
@@ -295,6 +296,7 @@ class FlowDataLoader:
                 description=subitem_data["description"],
                 bot_message=subitem_data["bot_message"],
                 parent_id=parent_id,
+                path=parent.subtree_path,
                 item_type=subitem_data["item_type"],
                 is_active=True,
                 access_level=AccessLevel.FREE,
@@ -550,7 +552,7 @@ class FlowDataLoader:
 
     async def load_all_data(self):
         """Загрузить все данные."""
-        async with AsyncSessionLocal() as session:
+        async with session_scope() as session:
             try:
                 await self.clear_existing_data(session)
 
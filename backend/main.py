@@ -12,8 +12,12 @@ from sqlalchemy import select
 
 from backend.api.routers import api_router
 from backend.core.config import settings
-from backend.core.db import AsyncSessionLocal
+from backend.core.db import session_scope
 from backend.core.exception_handlers import register_exception_handlers
+from backend.services.activity_log import activity_log_writer
+from backend.services.activity_rollup import activity_rollup_job
+from backend.services.menu_counters import menu_counter_writer
+from backend.services.user_touch import user_touch_writer
 from backend.utils.ensure_default_admin import ensure_default_admin
 
 
@@ -26,9 +30,17 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Запуск приложения FastAPI")
     await ensure_default_admin()
+    user_touch_writer.start()
+    menu_counter_writer.start()
+    activity_log_writer.start()
+    activity_rollup_job.start()
     yield
     # Shutdown
     logger.info("Завершение работы приложения FastAPI")
+    await user_touch_writer.stop()
+    await menu_counter_writer.stop()
+    await activity_log_writer.stop()
+    await activity_rollup_job.stop()
 
 
 def create_app() -> FastAPI:
@@ -75,7 +87,7 @@ async def api_health_check():
     """Проверка работоспособности API."""
     try:
         # Проверяем подключение к базе данных
-        async with AsyncSessionLocal() as session:
+        async with session_scope() as session:
             await session.execute(select(1))
 
         return {"status": "healthy", "service": "api", "version": "1.0.0", "database": "connected"}
@@ -2,6 +2,7 @@
 
 from backend.core.db import Base
 
+from .activity_stats import ActivityDailyStats, RollupWatermark
 from .admin_user import AdminUser
 from .content_file import ContentFile
 from .enums import (
@@ -17,6 +18,7 @@ from .menu_item import MenuItem
 from .message_template import MessageTemplate
 from .notification import Notification
 from .question import UserQuestion
+from .search_log import SearchLog, SearchQueryDaily
 from .telegram_user import TelegramUser
 from .user_activity import UserActivity
 
@@ -28,6 +30,10 @@ __all__ = [
     "MenuItem",
     "ContentFile",
     "UserActivity",
+    "SearchLog",
+    "SearchQueryDaily",
+    "ActivityDailyStats",
+    "RollupWatermark",
     "UserQuestion",
     "Notification",
     "MessageTemplate",
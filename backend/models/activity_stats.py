@@ -0,0 +1,48 @@
+"""Модели суточной сводки активностей и отметок обработки сводок."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+
+from sqlalchemy import Date, DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.core.db import Base
+
+from .enums import ActivityType
+
+
+class ActivityDailyStats(Base):
+    """Суточная сводка активностей: количество по дню (UTC), типу активности и пункту меню."""
+
+    __tablename__ = "activity_daily_stats"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    activity_type: Mapped[ActivityType] = mapped_column(String(50), primary_key=True)
+    menu_item_id: Mapped[int] = mapped_column(
+        Integer, primary_key=True, comment="ID пункта меню, 0 - активности без пункта меню"
+    )
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        """Строковое представление для отладки."""
+        return (
+            f"<ActivityDailyStats(day={self.day}, activity_type={self.activity_type}, "
+            f"menu_item_id={self.menu_item_id}, count={self.count})>"
+        )
+
+
+class RollupWatermark(Base):
+    """Отметка сводки: до какого ID исходной таблицы строки уже учтены в сводке."""
+
+    __tablename__ = "rollup_watermarks"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    last_id: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False
+    )
+
+    def __repr__(self) -> str:
+        """Строковое представление для отладки."""
+        return f"<RollupWatermark(name='{self.name}', last_id={self.last_id})>"
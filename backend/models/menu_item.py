@@ -6,7 +6,8 @@ from datetime import datetime, timezone
 from decimal import Decimal
 from typing import TYPE_CHECKING, List, Optional
 
-from sqlalchemy import DECIMAL, Boolean, DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy import DECIMAL, Boolean, Computed, DateTime, ForeignKey, Index, Integer, String, Text, and_, or_
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from backend.core.db import Base
@@ -19,6 +20,10 @@ if TYPE_CHECKING:
     from .user_activity import UserActivity
 
 
+# Конфигурация полнотекстового поиска: русский стемминг, латиница через english_stem
+SEARCH_CONFIG = "russian"
+
+
 class MenuItem(Base):
     """Модель пунктов меню с унифицированным контентом."""
 
@@ -30,6 +35,13 @@ class MenuItem(Base):
 
     # Иерархия меню
     parent_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("menu_items.id"), nullable=True, index=True)
+    path: Mapped[str] = mapped_column(
+        Text(collation="C"),
+        default="/",
+        server_default="/",
+        nullable=False,
+        comment="Материализованный путь: ID предков от корня, например /1/5/ (у корневых пунктов /)",
+    )
 
     item_type: Mapped[ItemType] = mapped_column(
         String(20),
@@ -39,6 +51,17 @@ class MenuItem(Base):
         comment="Тип: navigation (имеет children) или content (имеет content)",
     )
 
+    # Полнотекстовый поиск: название с весом A, описание с весом B
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
+
     # Сообщение бота
     bot_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
@@ -87,7 +110,38 @@ class MenuItem(Base):
         """Является ли пункт контентным (имеет прикрепленный контент)."""
         return self.item_type == ItemType.CONTENT
 
+    @property
+    def subtree_path(self) -> str:
+        """Путь потомков пункта: все потомки имеют путь, начинающийся с этого префикса."""
+        return f"{self.path}{self.id}/"
+
+    @property
+    def section_id(self) -> int:
+        """ID раздела верхнего уровня, в который входит пункт (для корневого пункта - его собственный ID)."""
+        ancestors = self.path.strip("/")
+        return int(ancestors.split("/", 1)[0]) if ancestors else self.id
+
+    def is_under(self, ancestor_id: int) -> bool:
+        """Находится ли пункт в поддереве пункта ancestor_id."""
+        return f"/{ancestor_id}/" in self.path
+
+    @classmethod
+    def path_startswith(cls, prefix: str):
+        """Условие отбора пунктов, путь которых начинается с prefix (оканчивающегося на /).
+
+        Записано диапазоном, а не LIKE, чтобы индекс пути использовался и в
+        подготовленных запросах: в сортировке C за символом / следует 0.
+        """
+        return and_(cls.path >= prefix, cls.path < f"{prefix[:-1]}0")
+
+    @classmethod
+    def in_section(cls, section_id: int):
+        """Условие отбора пункта верхнего уровня section_id и всех его потомков."""
+        return or_(cls.id == section_id, cls.path_startswith(f"/{section_id}/"))
+
     __table_args__ = (
         Index("ix_menu_items_active_parent", "is_active", "parent_id"),
         Index("ix_menu_items_type_active", "item_type", "is_active"),
+        Index("ix_menu_items_path", "path"),
+        Index("ix_menu_items_search_vector", "search_vector", postgresql_using="gin"),
     )
@@ -0,0 +1,48 @@
+"""Модели журнала поисковых запросов и его суточной сводки."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+
+from sqlalchemy import BigInteger, Boolean, Date, DateTime, ForeignKey, Integer, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.core.db import Base
+
+
+class SearchLog(Base):
+    """Запись журнала поисковых запросов пользователей."""
+
+    __tablename__ = "search_logs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    telegram_user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("telegram_users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    query: Mapped[str] = mapped_column(Text, nullable=False, comment="Нормализованный запрос в нижнем регистре")
+    query_hash: Mapped[int] = mapped_column(BigInteger, nullable=False, comment="Хэш нормализованного запроса")
+    results: Mapped[int] = mapped_column(Integer, nullable=False, comment="Количество найденных материалов")
+    zero_results: Mapped[bool] = mapped_column(Boolean, nullable=False, comment="Поиск без результатов")
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), index=True
+    )
+
+    def __repr__(self) -> str:
+        """Строковое представление для отладки."""
+        return f"<SearchLog(id={self.id}, query='{self.query}', results={self.results})>"
+
+
+class SearchQueryDaily(Base):
+    """Суточная сводка поисковых запросов: одна строка на запрос за день (UTC)."""
+
+    __tablename__ = "search_query_daily"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    query_hash: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    query: Mapped[str] = mapped_column(Text, nullable=False)
+    searches: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    zero_result_searches: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        """Строковое представление для отладки."""
+        return f"<SearchQueryDaily(day={self.day}, query='{self.query}', searches={self.searches})>"
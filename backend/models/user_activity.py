@@ -5,7 +5,7 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from backend.core.db import Base
@@ -32,6 +32,12 @@ class UserActivity(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), index=True
     )
+    # Время вставки строки по часам БД (created_at задается приложением и может быть
+    # раньше вставки, например при постановке в очередь записи); по нему суточная
+    # сводка определяет, какие активности уже можно учесть
+    inserted_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.statement_timestamp(), nullable=False
+    )
 
     # Связи
     telegram_user: Mapped["TelegramUser"] = relationship("TelegramUser", back_populates="activities")
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Literal, Optional
+from typing import Dict, Literal, Optional
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
@@ -18,6 +18,9 @@ class AdminAnalyticsRequest(BaseModel):
     end_date: Optional[str] = Field(
         default=None, description="Конечная дата фильтрации (YYYY-MM-DD)", pattern=r"^\d{4}-\d{2}-\d{2}$"
     )
+    section_id: Optional[int] = Field(
+        default=None, gt=0, description="ID раздела верхнего уровня для статистики контента и активностей"
+    )
 
     model_config = ConfigDict(
         json_schema_extra={"example": {"period": "month", "start_date": "2024-01-01", "end_date": "2024-01-31"}}
@@ -98,8 +101,67 @@ class AdminAnalyticsResponse(BaseModel):
                     "total_downloads": 890,
                     "total_ratings": 340,
                     "search_queries": [{"query": "слуховые аппараты", "count": 45}],
+                    "zero_result_queries": [{"query": "сурдопереводчик", "count": 7}],
                 },
                 "questions": {"total": 150, "pending": 25, "answered": 125},
             }
         }
     )
+
+
+class SearchCacheStatsResponse(BaseModel):
+    """Схема ответа статистики кэша результатов поиска."""
+
+    hits: int = Field(..., description="Запросы, результаты которых взяты из кэша")
+    misses: int = Field(..., description="Запросы, для которых выполнен поиск")
+    stale: int = Field(..., description="Наборы результатов, отброшенные после изменения меню")
+    evictions: int = Field(..., description="Наборы результатов, вытесненные из-за ограничения размера кэша")
+    entries: int = Field(..., description="Наборов результатов в кэше")
+    hit_rate: float = Field(..., description="Доля запросов, обслуженных из кэша")
+    menu_version: int = Field(..., description="Текущая версия меню")
+    index: Dict[str, int] = Field(..., description="Счетчики поискового индекса в памяти")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "hits": 930,
+                "misses": 70,
+                "stale": 12,
+                "evictions": 0,
+                "entries": 58,
+                "hit_rate": 0.93,
+                "menu_version": 4,
+                "index": {"searches": 70, "rebuilds": 1, "updates": 3, "documents": 240},
+            }
+        }
+    )
+
+
+class ActivityLogStatsResponse(BaseModel):
+    """Схема ответа статистики отложенной записи активностей поиска."""
+
+    enqueued: int = Field(..., description="Активности, помещенные в очередь")
+    dropped: int = Field(..., description="Активности, отброшенные из-за переполнения очереди")
+    batches: int = Field(..., description="Записанные пачки активностей")
+    rows_written: int = Field(..., description="Записанные активности")
+    failed_batches: int = Field(..., description="Пачки, которые не удалось записать")
+    failed_rows: int = Field(..., description="Активности из пачек, которые не удалось записать")
+    queue_depth: int = Field(..., description="Активности, ожидающие записи")
+    max_queue: int = Field(..., description="Максимальный размер очереди")
+    running: bool = Field(..., description="Запущена ли фоновая запись")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "enqueued": 15230,
+                "dropped": 0,
+                "batches": 412,
+                "rows_written": 15218,
+                "failed_batches": 0,
+                "failed_rows": 0,
+                "queue_depth": 12,
+                "max_queue": 10000,
+                "running": True,
+            }
+        }
+    )
@@ -0,0 +1,108 @@
+"""Схемы навигации по меню для Bot API."""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from backend.models.enums import ActivityType
+from backend.schemas.public.menu import MenuContentResponse, MenuItemResponse
+
+
+class BotMenuNavigateRequest(BaseModel):
+    """Схема запроса навигации по меню для POST /api/v1/bot/menu/navigate."""
+
+    telegram_user_id: int = Field(..., gt=0, description="ID пользователя Telegram")
+    menu_item_id: int = Field(..., gt=0, description="ID нажатого пункта меню")
+    back: bool = Field(False, description="Вернуться к родительскому разделу пункта меню")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "telegram_user_id": 123456789,
+                "menu_item_id": 2,
+                "back": False,
+            }
+        }
+    )
+
+
+class MenuBreadcrumb(BaseModel):
+    """Пункт цепочки разделов от корня меню до открытого пункта."""
+
+    id: int = Field(..., description="ID пункта меню")
+    title: str = Field(..., description="Название пункта меню")
+
+
+class BotMenuNavigateResponse(BaseModel):
+    """Схема ответа навигации по меню для POST /api/v1/bot/menu/navigate."""
+
+    item: Optional[MenuContentResponse] = Field(
+        None, description="Открытый пункт меню с контентом (None при возврате на корневой уровень)"
+    )
+    children: list[MenuItemResponse] = Field(
+        default_factory=list, description="Дочерние пункты открытого пункта или пункты корневого уровня"
+    )
+    parent: Optional[MenuItemResponse] = Field(None, description="Родительский пункт открытого пункта меню")
+    breadcrumbs: list[MenuBreadcrumb] = Field(
+        default_factory=list, description="Цепочка разделов от корня меню до открытого пункта включительно"
+    )
+    activity_type: Optional[ActivityType] = Field(None, description="Тип записанной активности")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "item": {
+                    "id": 2,
+                    "title": "Типы слуховых аппаратов",
+                    "description": "Обзор различных типов",
+                    "bot_message": "Выберите тип:",
+                    "item_type": "navigation",
+                    "content_files": [],
+                    "children": [
+                        {
+                            "id": 5,
+                            "title": "Заушные аппараты",
+                            "description": None,
+                            "parent_id": 2,
+                            "bot_message": None,
+                            "is_active": True,
+                            "access_level": "free",
+                            "item_type": "content",
+                            "children": [],
+                        }
+                    ],
+                },
+                "children": [
+                    {
+                        "id": 5,
+                        "title": "Заушные аппараты",
+                        "description": None,
+                        "parent_id": 2,
+                        "bot_message": None,
+                        "is_active": True,
+                        "access_level": "free",
+                        "item_type": "content",
+                        "children": [],
+                    }
+                ],
+                "parent": {
+                    "id": 1,
+                    "title": "Слуховые аппараты",
+                    "description": "Информация о слуховых аппаратах",
+                    "parent_id": None,
+                    "bot_message": "Выберите интересующий вас раздел:",
+                    "is_active": True,
+                    "access_level": "free",
+                    "item_type": "navigation",
+                    "children": [],
+                },
+                "breadcrumbs": [
+                    {"id": 1, "title": "Слуховые аппараты"},
+                    {"id": 2, "title": "Типы слуховых аппаратов"},
+                ],
+                "activity_type": "navigation",
+            }
+        }
+    )
@@ -4,7 +4,13 @@ from .menu import ContentFileResponse, MenuContentResponse, MenuItemListResponse
 from .question import UserQuestionCreate, UserQuestionResponse
 from .ratings import RatingRequest, RatingResponse
 from .search import SearchListResponse
-from .user_activity import UserActivityRequest, UserActivityResponse
+from .user_activity import (
+    UserActivityBatchError,
+    UserActivityBatchRequest,
+    UserActivityBatchResponse,
+    UserActivityRequest,
+    UserActivityResponse,
+)
 
 
 __all__ = [
@@ -21,6 +27,9 @@ __all__ = [
     # User Activities
     "UserActivityRequest",
     "UserActivityResponse",
+    "UserActivityBatchRequest",
+    "UserActivityBatchResponse",
+    "UserActivityBatchError",
     # User Questions
     "UserQuestionCreate",
     "UserQuestionResponse",
@@ -28,6 +28,13 @@ class SearchListResponse(BaseModel):
     """Схема ответа списка результатов поиска для GET /api/v1/search."""
 
     items: list[SearchItemResponse] = Field(..., description="Список результатов поиска")
+    cursor: Optional[str] = Field(
+        None, description="Курсор этой страницы: повторный показ страницы по нему не записывается как новый поиск"
+    )
+    next_cursor: Optional[str] = Field(
+        None, description="Курсор следующей страницы (передается в параметре cursor), None - страница последняя"
+    )
+    total: int = Field(0, description="Количество найденных материалов, доступных по страницам")
 
     model_config = ConfigDict(
         json_schema_extra={
@@ -43,7 +50,10 @@ class SearchListResponse(BaseModel):
                         "access_level": "free",
                         "item_type": "navigation",
                     }
-                ]
+                ],
+                "cursor": "MDozZjljMWEwYjdkMmU",
+                "next_cursor": "MTA6M2Y5YzFhMGI3ZDJl",
+                "total": 23,
             }
         }
     )
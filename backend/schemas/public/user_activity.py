@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -52,3 +52,49 @@ class UserActivityResponse(BaseModel):
             }
         },
     )
+
+
+class UserActivityBatchRequest(BaseModel):
+    """Схема запроса пакетной записи активностей для POST /api/v1/user-activities/batch."""
+
+    activities: List[UserActivityRequest] = Field(
+        ..., min_length=1, max_length=1000, description="Активности пользователей (до 1000 за запрос)"
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "activities": [
+                    {"telegram_user_id": 123456789, "menu_item_id": 1, "activity_type": "navigation"},
+                    {"telegram_user_id": 987654321, "activity_type": "search", "search_query": "слуховой аппарат"},
+                ]
+            }
+        }
+    )
+
+
+class UserActivityBatchError(BaseModel):
+    """Отклоненная активность из пакета."""
+
+    index: int = Field(..., description="Позиция активности в пакете")
+    detail: str = Field(..., description="Причина отклонения")
+
+
+class UserActivityBatchResponse(BaseModel):
+    """Схема ответа пакетной записи активностей для POST /api/v1/user-activities/batch."""
+
+    accepted: int = Field(..., description="Количество записанных активностей")
+    rejected: int = Field(..., description="Количество отклоненных активностей")
+    errors: List[UserActivityBatchError] = Field(default_factory=list, description="Причины отклонения")
+    message: str = Field(..., description="Сообщение об успешной операции")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "accepted": 1,
+                "rejected": 1,
+                "errors": [{"index": 1, "detail": "Пункт меню не найден"}],
+                "message": "Активности успешно записаны",
+            }
+        }
+    )
@@ -0,0 +1,180 @@
+"""Отложенная запись некритичных активностей пользователей (поиск)."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.config import settings
+from backend.core.db import session_scope
+from backend.crud.base import unit_of_work
+from backend.crud.search_log import search_log_crud
+from backend.crud.user_activity import user_activity_crud
+
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityLogWriter:
+    """Ограниченная очередь активностей, которые записываются в БД пачками в фоне.
+
+    В отличие от ``WriteBehindBuffer`` активности не объединяются по ключу:
+    каждая становится отдельной строкой user_activities. Пока фоновая задача
+    запущена (в lifespan приложения), активности помещаются в очередь не
+    больше ``max_queue`` элементов и записываются многострочным INSERT по
+    ``batch_size`` строк не реже раза в ``max_staleness`` секунд. При
+    переполненной очереди активность отбрасывается: запрос пользователя не
+    ждет записи статистики. Без фоновой задачи (скрипты, тесты) активность
+    записывается сразу в сессии вызывающего кода.
+
+    Активность поиска с количеством результатов (ключ ``results``)
+    дополнительно попадает в журнал поисковых запросов и его суточную сводку.
+    """
+
+    name = "activity-log-writer"
+
+    def __init__(self, max_queue: int = 10000, batch_size: int = 500, max_staleness: float = 1.0):
+        """Инициализация очереди.
+
+        Args:
+            max_queue: Максимальное количество ожидающих записи активностей
+            batch_size: Количество активностей в одном INSERT и в очереди, при котором запись начинается сразу
+            max_staleness: Максимальная задержка записи активностей в секундах
+        """
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.max_staleness = max_staleness
+        self.user_activity_crud = user_activity_crud
+        self.search_log_crud = search_log_crud
+
+        self._queue: asyncio.Queue[Dict[str, Any]] = asyncio.Queue(maxsize=max_queue)
+        self._flush_requested = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._writer: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._stats = {
+            "enqueued": 0,
+            "dropped": 0,
+            "batches": 0,
+            "rows_written": 0,
+            "failed_batches": 0,
+            "failed_rows": 0,
+        }
+
+    @property
+    def is_running(self) -> bool:
+        """Запущена ли фоновая запись."""
+        return self._writer is not None and not self._writer.done()
+
+    def start(self) -> None:
+        """Запускает фоновую задачу записи."""
+        if self.is_running:
+            return
+        self._stopping = False
+        self._writer = asyncio.create_task(self._run(), name=self.name)
+        logger.info(f"Отложенная запись {self.name} запущена: очередь до {self.max_queue} активностей")
+
+    async def stop(self) -> None:
+        """Останавливает фоновую задачу и записывает оставшиеся в очереди активности."""
+        if self._writer is not None:
+            self._stopping = True
+            self._flush_requested.set()
+            await self._writer
+            self._writer = None
+        await self.flush()
+        logger.info(f"Отложенная запись {self.name} остановлена: {self.get_stats()}")
+
+    def enqueue(self, row: Dict[str, Any]) -> bool:
+        """Помещает активность в очередь.
+
+        Args:
+            row: Данные активности в формате bulk_create_activities, у поиска - с ключом results
+
+        Returns:
+            False, если очередь переполнена и активность отброшена
+        """
+        try:
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            self._stats["dropped"] += 1
+            if self._stats["dropped"] % self.batch_size == 1:
+                logger.warning(f"Очередь {self.name} переполнена, отброшено активностей: {self._stats['dropped']}")
+            return False
+
+        self._stats["enqueued"] += 1
+        if self._queue.qsize() >= self.batch_size:
+            self._flush_requested.set()
+        return True
+
+    async def record(self, db: AsyncSession, row: Dict[str, Any]) -> None:
+        """Учитывает активность: в очереди, если фоновая запись запущена, иначе сразу в сессии db.
+
+        Args:
+            db: Сессия базы данных вызывающего кода
+            row: Данные активности (telegram_user_id - ID пользователя в БД)
+        """
+        if not self.is_running:
+            await self._write(db, [row])
+            return
+
+        self.enqueue(row)
+
+    async def flush(self) -> int:
+        """Записывает активности из очереди пачками по batch_size строк.
+
+        Returns:
+            Количество записанных активностей
+        """
+        written = 0
+        async with self._flush_lock:
+            while not self._queue.empty():
+                batch: List[Dict[str, Any]] = []
+                while len(batch) < self.batch_size and not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+
+                try:
+                    async with session_scope() as db:
+                        await self._write(db, batch)
+                except Exception as e:
+                    # Статистика некритична: неудачная пачка не возвращается в очередь.
+                    # Ее активности учитываются в failed_rows, dropped - только переполнение очереди
+                    self._stats["failed_batches"] += 1
+                    self._stats["failed_rows"] += len(batch)
+                    logger.error(f"Ошибка отложенной записи {self.name} ({len(batch)} активностей): {e}")
+                    continue
+
+                self._stats["batches"] += 1
+                self._stats["rows_written"] += len(batch)
+                written += len(batch)
+        return written
+
+    def get_stats(self) -> Dict[str, int]:
+        """Возвращает счетчики очереди и количество ожидающих записи активностей."""
+        return {**self._stats, "queue_depth": self._queue.qsize(), "max_queue": self.max_queue}
+
+    async def _write(self, db: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+        """Записывает активности и поиски из них одной транзакцией."""
+        searches = [{**row, "query": row["search_query"]} for row in rows if row.get("results") is not None]
+        async with unit_of_work(db):
+            await self.user_activity_crud.bulk_create_activities(db, rows)
+            await self.search_log_crud.log_searches(db, searches)
+
+    async def _run(self) -> None:
+        """Цикл фоновой записи: по таймеру или при накоплении пачки."""
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), timeout=self.max_staleness)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            await self.flush()
+
+
+activity_log_writer = ActivityLogWriter(
+    max_queue=settings.activity_log_max_queue,
+    batch_size=settings.activity_log_batch_size,
+    max_staleness=settings.activity_log_max_staleness,
+)
@@ -0,0 +1,110 @@
+"""Фоновое обновление суточной сводки активностей."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import timedelta
+from typing import Dict, Optional
+
+from backend.core.config import settings
+from backend.core.db import session_scope
+from backend.crud.activity_stats import activity_stats_crud
+
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityRollupJob:
+    """Фоновая задача, переносящая новые активности в суточную сводку.
+
+    Пока задача запущена (в lifespan приложения), раз в ``interval`` секунд
+    активности после отметки сводки, вставленные раньше чем ``lag`` секунд
+    назад, добавляются в activity_daily_stats пачками по ``batch_size``.
+    Если пачка заполнена полностью, следующая обрабатывается сразу, поэтому
+    первый запуск на существующей базе догоняет всю историю. Аналитика не
+    зависит от задачи: активности после отметки считаются по исходной
+    таблице.
+    """
+
+    name = "activity-rollup"
+
+    def __init__(self, interval: float = 60.0, lag: float = 30.0, batch_size: int = 100_000):
+        """Инициализация задачи.
+
+        Args:
+            interval: Интервал обновления сводки в секундах
+            lag: Минимальный возраст активностей, попадающих в сводку, в секундах
+            batch_size: Максимальное количество активностей в одной транзакции
+        """
+        self.interval = interval
+        self.lag = lag
+        self.batch_size = batch_size
+        self.activity_stats_crud = activity_stats_crud
+
+        self._stop_requested = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {"runs": 0, "rolled_up": 0, "failed_runs": 0}
+
+    @property
+    def is_running(self) -> bool:
+        """Запущена ли фоновая задача."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Запускает фоновую задачу."""
+        if self.is_running:
+            return
+        self._stop_requested.clear()
+        self._task = asyncio.create_task(self._run(), name=self.name)
+        logger.info(f"Обновление сводки {self.name} запущено: раз в {self.interval} с")
+
+    async def stop(self) -> None:
+        """Останавливает фоновую задачу после текущей пачки."""
+        if self._task is not None:
+            self._stop_requested.set()
+            await self._task
+            self._task = None
+        logger.info(f"Обновление сводки {self.name} остановлено: {self.get_stats()}")
+
+    async def run_once(self) -> int:
+        """Переносит в сводку все накопившиеся активности.
+
+        Returns:
+            Количество активностей, добавленных в сводку
+        """
+        total = 0
+        while not self._stop_requested.is_set():
+            async with session_scope() as db:
+                rolled_up = await self.activity_stats_crud.roll_up(db, timedelta(seconds=self.lag), self.batch_size)
+            total += rolled_up
+            if rolled_up < self.batch_size:
+                break
+
+        self._stats["runs"] += 1
+        self._stats["rolled_up"] += total
+        return total
+
+    def get_stats(self) -> Dict[str, int]:
+        """Возвращает счетчики задачи."""
+        return dict(self._stats)
+
+    async def _run(self) -> None:
+        """Цикл обновления сводки по таймеру."""
+        while not self._stop_requested.is_set():
+            try:
+                await self.run_once()
+            except Exception as e:
+                self._stats["failed_runs"] += 1
+                logger.error(f"Ошибка обновления сводки {self.name}: {e}")
+            try:
+                await asyncio.wait_for(self._stop_requested.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+activity_rollup_job = ActivityRollupJob(
+    interval=settings.activity_rollup_interval,
+    lag=settings.activity_rollup_lag,
+    batch_size=settings.activity_rollup_batch_size,
+)
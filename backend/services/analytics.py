@@ -2,11 +2,16 @@
 
 from __future__ import annotations
 
+import asyncio
+from typing import Any, Awaitable, Callable
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.core.db import async_session_factory
 from backend.crud.analytics import analytics_crud
 from backend.models.admin_user import AdminUser
-from backend.schemas.admin.analytics import AdminAnalyticsRequest, AdminAnalyticsResponse
+from backend.schemas.admin.analytics import ActivityLogStatsResponse, AdminAnalyticsRequest, AdminAnalyticsResponse
+from backend.services.activity_log import activity_log_writer
 from backend.validators.analytics import analytics_validator
 
 
@@ -26,6 +31,11 @@ class AnalyticsService:
     ) -> AdminAnalyticsResponse:
         """Получение комплексной аналитики системы по дням.
 
+        Четыре группы статистики выполняются параллельно: пользователи - в
+        сессии запроса, контент, активности и вопросы - в отдельных сессиях
+        со своими соединениями из пула. Группы читают данные в разных
+        транзакциях, поэтому ответ не является согласованным снимком.
+
         Args:
             db: Сессия базы данных
             current_admin: Текущий администратор
@@ -41,24 +51,26 @@ class AnalyticsService:
         # Парсинг дат из предварительно валидированного запроса
         parsed_start_date, parsed_end_date = self.validator.parse_and_validate_dates(request.model_dump())
 
-        # Получение статистики пользователей
-        users_stats = await self.analytics_crud.get_users_statistics(
-            db=db, start_date=parsed_start_date, end_date=parsed_end_date
-        )
-
-        # Получение статистики контента
-        content_stats = await self.analytics_crud.get_content_statistics(
-            db=db, start_date=parsed_start_date, end_date=parsed_end_date
-        )
-
-        # Получение статистики активностей
-        activities_stats = await self.analytics_crud.get_activities_statistics(
-            db=db, start_date=parsed_start_date, end_date=parsed_end_date
-        )
-
-        # Получение статистики вопросов
-        questions_stats = await self.analytics_crud.get_questions_statistics(
-            db=db, start_date=parsed_start_date, end_date=parsed_end_date
+        # Группы статистики независимы и выполняются параллельно, каждая в своем соединении
+        users_stats, content_stats, activities_stats, questions_stats = await asyncio.gather(
+            self.analytics_crud.get_users_statistics(db=db, start_date=parsed_start_date, end_date=parsed_end_date),
+            self._in_separate_session(
+                db,
+                self.analytics_crud.get_content_statistics,
+                start_date=parsed_start_date,
+                end_date=parsed_end_date,
+                section_id=request.section_id,
+            ),
+            self._in_separate_session(
+                db,
+                self.analytics_crud.get_activities_statistics,
+                start_date=parsed_start_date,
+                end_date=parsed_end_date,
+                section_id=request.section_id,
+            ),
+            self._in_separate_session(
+                db, self.analytics_crud.get_questions_statistics, start_date=parsed_start_date, end_date=parsed_end_date
+            ),
         )
 
         return AdminAnalyticsResponse(
@@ -68,5 +80,35 @@ class AnalyticsService:
             questions=questions_stats,
         )
 
+    @staticmethod
+    async def _in_separate_session(db: AsyncSession, query: Callable[..., Awaitable[dict]], **kwargs: Any) -> dict:
+        """Выполняет запрос статистики в отдельной сессии того же engine, что и db.
+
+        AsyncSession не допускает параллельных запросов, поэтому каждая
+        параллельная группа статистики получает свою сессию и свое соединение
+        из пула. Сессия создается фабрикой приложения и работает в своей
+        транзакции, вне транзакции db: группы статистики читают разные снимки
+        данных, а изменения, не зафиксированные в db (например, в тестах с
+        переопределенной сессией), видны только статистике пользователей.
+
+        Args:
+            db: Сессия запроса, engine которой используется
+            query: Метод AnalyticsCRUD
+            **kwargs: Параметры метода
+
+        Returns:
+            Результат метода
+        """
+        async with async_session_factory(bind=db.bind) as session:
+            return await query(db=session, **kwargs)
+
+    def get_activity_log_stats(self) -> ActivityLogStatsResponse:
+        """Статистика отложенной записи активностей поиска.
+
+        Returns:
+            Глубина очереди, количество отброшенных и записанных активностей
+        """
+        return ActivityLogStatsResponse(**activity_log_writer.get_stats(), running=activity_log_writer.is_running)
+
 
 analytics_service = AnalyticsService()
@@ -9,6 +9,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from backend.crud.content_file import content_file_crud
 from backend.crud.menu_item import menu_item_crud
 from backend.schemas.admin.menu import AdminContentFileCreate, AdminContentFileResponse, AdminContentFileUpdate
+from backend.services.menu_snapshot import menu_snapshot
+from backend.services.search_engine import search_engine
 from backend.validators.content_file import content_file_validator
 
 
@@ -101,6 +103,8 @@ class ContentFileService:
         content_file_data = request.model_dump()
         content_file_data["menu_item_id"] = menu_item_id
         content_file = await self.content_file_crud.create(db, obj_in=content_file_data)
+        menu_snapshot.invalidate()
+        search_engine.invalidate(menu_item_id)
 
         return AdminContentFileResponse(
             id=content_file.id,
@@ -159,6 +163,8 @@ class ContentFileService:
             self.validator.validate_telegram_file_id_format(request.telegram_file_id)
 
         updated_file = await self.content_file_crud.update(db, db_obj=content_file, obj_in=request)
+        menu_snapshot.invalidate()
+        search_engine.invalidate(updated_file.menu_item_id)
 
         return AdminContentFileResponse(
             id=updated_file.id,
@@ -190,6 +196,8 @@ class ContentFileService:
         self.validator.validate_content_file_exists(content_file)
 
         await self.content_file_crud.remove(db, id=file_id)
+        menu_snapshot.invalidate()
+        search_engine.invalidate(content_file.menu_item_id)
 
 
 content_file_service = ContentFileService()
@@ -2,23 +2,36 @@
 
 from __future__ import annotations
 
-from typing import Optional
+from datetime import datetime, timezone
+from typing import List, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.core.config import settings
+from backend.crud.base import unit_of_work
 from backend.crud.menu_item import menu_item_crud
-from backend.crud.telegram_user import telegram_user_crud
-from backend.crud.user_activity import user_activity_crud
 from backend.models.enums import AccessLevel, ActivityType, ItemType
+from backend.schemas.admin.analytics import SearchCacheStatsResponse
 from backend.schemas.admin.menu import (
     AdminMenuItemCreate,
     AdminMenuItemListResponse,
     AdminMenuItemResponse,
     AdminMenuItemUpdate,
 )
-from backend.schemas.public.menu import ContentFileResponse, MenuContentResponse, MenuItemListResponse, MenuItemResponse
+from backend.schemas.bot.menu import BotMenuNavigateRequest, BotMenuNavigateResponse, MenuBreadcrumb
+from backend.schemas.public.menu import MenuContentResponse, MenuItemListResponse
 from backend.schemas.public.search import SearchItemResponse, SearchListResponse
-from backend.schemas.public.user_activity import UserActivityRequest
+from backend.services.activity_log import activity_log_writer
+from backend.services.menu_snapshot import SnapshotEntry, menu_snapshot
+from backend.services.search_engine import search_engine
+from backend.services.search_results import (
+    SearchResultKey,
+    decode_search_cursor,
+    encode_search_cursor,
+    search_result_cache,
+)
+from backend.services.user_access import user_access_resolver
+from backend.services.user_activity import user_activity_service
 from backend.validators.menu_item import menu_item_validator
 
 
@@ -28,7 +41,8 @@ class MenuItemService:
     def __init__(self):
         """Инициализация сервиса Menu Item."""
         self.menu_item_crud = menu_item_crud
-        self.telegram_user_crud = telegram_user_crud
+        self.user_access_resolver = user_access_resolver
+        self.user_activity_service = user_activity_service
         self.validator = menu_item_validator
 
     async def get_menu_items(
@@ -47,36 +61,34 @@ class MenuItemService:
         Returns:
             Список пунктов меню одного уровня
         """
-        user = await self.telegram_user_crud.get_by_telegram_id(db, telegram_user_id)
-        self.validator.validate_user_exists(user)
+        entry = await self.get_menu_items_entry(telegram_user_id, parent_id, db)
+        return entry.response
 
-        if parent_id is not None:
-            parent_item = await self.menu_item_crud.get(db, parent_id)
-            self.validator.validate_parent_menu_item(parent_item)
+    async def get_menu_items_entry(
+        self,
+        telegram_user_id: int,
+        parent_id: Optional[int] = None,
+        db: AsyncSession = None,
+    ) -> SnapshotEntry:
+        """Получение готового ответа со списком пунктов меню из снимка меню.
 
-        user_access_level = (
-            AccessLevel.PREMIUM if getattr(user, "subscription_type", None) == "premium" else AccessLevel.FREE
-        )
+        Args:
+            telegram_user_id: ID пользователя в Telegram
+            parent_id: ID родительского пункта меню (None для корневого уровня)
+            db: Сессия базы данных
 
-        # Загружаем только один уровень
-        items = await self.menu_item_crud.get_by_parent_id(db, parent_id, True, user_access_level)
+        Returns:
+            Ответ со списком пунктов меню, его сериализованное тело и ETag
+        """
+        user = await self.user_access_resolver.resolve(db, telegram_user_id)
+        self.validator.validate_user_exists(user)
 
-        items_data = [
-            MenuItemResponse(
-                id=item.id,
-                title=item.title,
-                description=item.description,
-                parent_id=item.parent_id,
-                bot_message=item.bot_message,
-                is_active=item.is_active,
-                access_level=item.access_level,
-                item_type=item.item_type,
-                children=[],  # Всегда пустой список для MVP
-            )
-            for item in items
-        ]
+        snapshot = await menu_snapshot.get(db)
+
+        if parent_id is not None:
+            self.validator.validate_parent_menu_item(snapshot.get_item(parent_id))
 
-        return MenuItemListResponse(items=items_data)
+        return snapshot.menu_items_entry(parent_id, user.access_level)
 
     async def get_menu_item_content(
         self, menu_id: int, telegram_user_id: int, db: AsyncSession = None
@@ -91,74 +103,87 @@ class MenuItemService:
         Returns:
             Контент пункта меню с дочерними элементами
         """
-        user = await self.telegram_user_crud.get_by_telegram_id(db, telegram_user_id)
+        entry = await self.get_menu_item_content_entry(menu_id, telegram_user_id, db)
+        return entry.response
+
+    async def get_menu_item_content_entry(
+        self, menu_id: int, telegram_user_id: int, db: AsyncSession = None
+    ) -> SnapshotEntry:
+        """Получение готового ответа с контентом пункта меню из снимка меню.
+
+        Args:
+            menu_id: ID пункта меню
+            telegram_user_id: ID пользователя в Telegram
+            db: Сессия базы данных
+
+        Returns:
+            Ответ с контентом пункта меню, его сериализованное тело и ETag
+        """
+        user = await self.user_access_resolver.resolve(db, telegram_user_id)
         self.validator.validate_user_exists(user)
 
-        user_access_level = (
-            AccessLevel.PREMIUM if getattr(user, "subscription_type", None) == "premium" else AccessLevel.FREE
-        )
+        snapshot = await menu_snapshot.get(db)
 
-        menu_item = await self.menu_item_crud.get_with_content_and_children(db, menu_id, user_access_level)
+        menu_item = snapshot.get_item(menu_id)
         self.validator.validate_menu_item_exists(menu_item)
         self.validator.validate_menu_item_active(menu_item)
-        self.validator.validate_access_level(user_access_level, menu_item.access_level)
-
-        # Проверяем логику типа кнопки
-        if menu_item.item_type == ItemType.NAVIGATION and not getattr(menu_item, "_children", []):
-            # Навигационная кнопка без дочерних элементов - возвращаем пустой контент
-            return MenuContentResponse(
-                id=menu_item.id,
-                title=menu_item.title,
-                description=menu_item.description,
-                bot_message="Раздел пока пуст. Попробуйте позже.",
-                item_type=menu_item.item_type,
-                content_files=[],
-                children=[],
-            )
+        self.validator.validate_access_level(user.access_level, menu_item.access_level)
 
-        children = [
-            MenuItemResponse(
-                id=child.id,
-                title=child.title,
-                description=child.description,
-                parent_id=child.parent_id,
-                bot_message=child.bot_message,
-                is_active=child.is_active,
-                access_level=child.access_level,
-                item_type=child.item_type,
-                children=[],  # Всегда пустой список для MVP
-            )
-            for child in getattr(menu_item, "_children", [])
-        ]
+        return snapshot.content_entry(menu_id, user.access_level)
+
+    async def navigate(self, request: BotMenuNavigateRequest, db: AsyncSession) -> BotMenuNavigateResponse:
+        """Навигация бота по меню: все данные для обработки нажатия на пункт меню.
+
+        Возвращает открытый пункт меню с контентом, его дочерние пункты,
+        родителя и цепочку разделов и записывает активность навигации по
+        разделу или открытия материала. Пункты меню берутся из снимка меню,
+        активность фиксируется одним коммитом. При возврате (``back``)
+        открывается родительский раздел пункта, активность не записывается.
+
+        Args:
+            request: Данные нажатия на пункт меню
+            db: Сессия базы данных
+
+        Returns:
+            Открытый пункт меню, его дочерние пункты, родитель и цепочка разделов
+        """
+        user = await self.user_access_resolver.resolve(db, request.telegram_user_id)
+        self.validator.validate_user_exists(user)
 
-        # Формируем content_files в правильном формате
-        content_files = []
-        if menu_item.content:
-            content_files = [
-                ContentFileResponse(
-                    content_type=menu_item.content.content_type,
-                    caption=menu_item.content.caption,
-                    text_content=menu_item.content.text_content,
-                    external_url=menu_item.content.external_url,
-                    web_app_short_name=menu_item.content.web_app_short_name,
-                    telegram_file_id=menu_item.content.telegram_file_id,
-                    file_size=menu_item.content.file_size,
-                    mime_type=menu_item.content.mime_type,
-                    width=menu_item.content.width,
-                    height=menu_item.content.height,
-                    duration=menu_item.content.duration,
-                    thumbnail_telegram_file_id=menu_item.content.thumbnail_telegram_file_id,
+        snapshot = await menu_snapshot.get(db)
+
+        # Неактивные пункты меню для пользователей не существуют
+        menu_item = snapshot.get_item(request.menu_item_id)
+        self.validator.validate_menu_item_exists(menu_item if menu_item and menu_item.is_active else None)
+
+        if request.back:
+            if menu_item.parent_id is None:
+                # Возврат из пункта верхнего уровня - на корневой уровень меню
+                return BotMenuNavigateResponse(children=snapshot.children(None, user.access_level))
+            menu_item = snapshot.get_item(menu_item.parent_id)
+            self.validator.validate_parent_menu_item(menu_item)
+
+        self.validator.validate_access_level(user.access_level, menu_item.access_level)
+
+        content = snapshot.content_entry(menu_item.id, user.access_level).response
+        ancestors = snapshot.ancestors(menu_item.id)
+
+        activity_type = None
+        if not request.back:
+            activity_type = (
+                ActivityType.NAVIGATION if menu_item.item_type == ItemType.NAVIGATION else ActivityType.MATERIAL_OPEN
+            )
+            async with unit_of_work(db):
+                await self.user_activity_service.record_validated_activity(
+                    db, user_id=user.id, menu_item_id=menu_item.id, activity_type=activity_type
                 )
-            ]
 
-        return MenuContentResponse(
-            id=menu_item.id,
-            title=menu_item.title,
-            description=menu_item.description,
-            bot_message=menu_item.bot_message,
-            item_type=menu_item.item_type,
-            content_files=content_files,
-            children=children,
+        return BotMenuNavigateResponse(
+            item=content,
+            children=content.children,
+            parent=ancestors[-1] if ancestors else None,
+            breadcrumbs=[MenuBreadcrumb(id=item.id, title=item.title) for item in (*ancestors, menu_item)],
+            activity_type=activity_type,
         )
 
     async def get_admin_menu_items(
@@ -225,6 +250,8 @@ class MenuItemService:
             self.validator.validate_parent_menu_item(parent_item)
 
         menu_item = await self.menu_item_crud.create(db, obj_in=request)
+        menu_snapshot.invalidate()
+        search_engine.invalidate(menu_item.id)
 
         return AdminMenuItemResponse(
             id=menu_item.id,
@@ -266,8 +293,16 @@ class MenuItemService:
             if request.parent_id:
                 parent_item = await self.menu_item_crud.get(db, request.parent_id)
                 self.validator.validate_parent_menu_item(parent_item)
+                self.validator.validate_menu_item_no_cycle(parent_item.is_under(menu_id))
 
+        previous_path = menu_item.path
         updated_item = await self.menu_item_crud.update(db, db_obj=menu_item, obj_in=request)
+        menu_snapshot.invalidate()
+        search_engine.invalidate(menu_id)
+        if updated_item.path != previous_path:
+            # Перемещенное поддерево попадает в другой раздел верхнего уровня
+            descendants = await self.menu_item_crud.get_descendants(db, updated_item)
+            search_engine.invalidate(*(item.id for item in descendants))
 
         return AdminMenuItemResponse(
             id=updated_item.id,
@@ -301,6 +336,8 @@ class MenuItemService:
         self.validator.validate_menu_item_no_children(children)
 
         await self.menu_item_crud.remove(db, id=menu_id)
+        menu_snapshot.invalidate()
+        search_engine.invalidate(menu_id)
 
     async def search_menu_items(
         self,
@@ -308,59 +345,99 @@ class MenuItemService:
         query: str,
         limit: int,
         db: AsyncSession,
+        section_id: Optional[int] = None,
+        cursor: Optional[str] = None,
     ) -> SearchListResponse:
-        """Поиск по материалам (пунктам меню).
+        """Поиск по материалам (пунктам меню) с постраничной выдачей.
+
+        Набор результатов ищется один раз для нормализованного запроса,
+        уровня доступа и раздела и хранится в кэше до изменения меню или
+        истечения TTL; страницы по курсору и повторы запроса берутся из
+        набора. Активность поиска записывается только для запроса без курсора
+        и отложенно, без ожидания INSERT; повторный показ первой страницы
+        выполняется по ее курсору из ответа и новым поиском не считается.
 
         Args:
             telegram_user_id: ID пользователя в Telegram
             query: Поисковый запрос (будет валидирован)
-            limit: Максимальное количество результатов
+            limit: Количество результатов на странице
             db: Сессия базы данных
+            section_id: ID раздела верхнего уровня для ограничения поиска
+            cursor: Курсор страницы из next_cursor предыдущего ответа
         Returns:
-            SearchListResponse: Список найденных пунктов меню
+            SearchListResponse: Страница найденных пунктов меню, ее курсор и курсор следующей
         Raises:
-            HTTPException: Если пользователь не найден или запрос некорректен
+            HTTPException: Если пользователь не найден, запрос или курсор некорректен
         """
-        user = await telegram_user_crud.get_by_telegram_id(db, telegram_user_id)
+        user = await self.user_access_resolver.resolve(db, telegram_user_id)
         menu_item_validator.validate_user_exists(user)
 
         normalized_query = menu_item_validator.validate_search_query(query)
 
-        user_access_level = (
-            AccessLevel.PREMIUM if getattr(user, "subscription_type", None) == "premium" else AccessLevel.FREE
-        )
+        key = SearchResultKey.build(normalized_query, user.access_level, section_id)
+        offset = 0
+        if cursor is not None:
+            offset = menu_item_validator.validate_search_cursor(decode_search_cursor(cursor, key))
+
+        items_data = search_result_cache.get(key)
+        if items_data is None:
+            # Версия фиксируется до поиска: изменение меню во время поиска оставит набор устаревшим
+            version = menu_snapshot.version
+            items_data = await self._search(db, normalized_query, user.access_level, section_id)
+            search_result_cache.put(key, items_data, version)
+
+        if cursor is None:
+            # Активность поиска записывается в фоне (переход по страницам - не новый поиск)
+            await activity_log_writer.record(
+                db,
+                {
+                    "telegram_user_id": user.id,
+                    "activity_type": ActivityType.SEARCH,
+                    "search_query": key.query,
+                    "results": len(items_data),
+                    "created_at": datetime.now(timezone.utc),
+                },
+            )
 
-        items = await menu_item_crud.search_by_query(
-            db=db,
-            query=normalized_query,
-            access_level=user_access_level,
-            limit=limit,
+        next_offset = offset + limit
+        return SearchListResponse(
+            items=items_data[offset:next_offset],
+            cursor=encode_search_cursor(key, offset),
+            next_cursor=encode_search_cursor(key, next_offset) if next_offset < len(items_data) else None,
+            total=len(items_data),
         )
 
-        items_data = [
-            SearchItemResponse(
-                id=item.id,
-                title=item.title,
-                description=item.description,
-                parent_id=item.parent_id,
-                bot_message=item.bot_message,
-                is_active=item.is_active,
-                access_level=item.access_level,
-                item_type=item.item_type,
+    async def _search(
+        self, db: AsyncSession, query: str, access_level: AccessLevel, section_id: Optional[int]
+    ) -> List[SearchItemResponse]:
+        """Полный набор результатов поиска (не больше search_max_results) по убыванию релевантности."""
+        limit = settings.search_max_results
+        trigram_threshold = settings.search_trigram_threshold if settings.search_trigram_enabled else None
+        if settings.search_in_memory_index:
+            items_data = await search_engine.search(db, query, access_level, limit, section_id)
+            if items_data or trigram_threshold is None:
+                return items_data
+            items = await menu_item_crud.search_by_similarity(
+                db, query, access_level, limit, section_id, trigram_threshold
             )
-            for item in items
-        ]
+        else:
+            items = await menu_item_crud.search_by_query(
+                db=db,
+                query=query,
+                access_level=access_level,
+                limit=limit,
+                section_id=section_id,
+                trigram_threshold=trigram_threshold,
+            )
+        return [SearchItemResponse.model_validate(item) for item in items]
 
-        # Записываем активность поиска пользователя
-        search_activity = UserActivityRequest(
-            telegram_user_id=user.id,
-            menu_item_id=None,
-            activity_type=ActivityType.SEARCH,
-            search_query=f"Поиск: '{normalized_query}' (результатов: {len(items)})",
-        )
-        await user_activity_crud.create(db=db, obj_in=search_activity)
+    def get_search_cache_stats(self) -> SearchCacheStatsResponse:
+        """Статистика кэша результатов поиска и поискового индекса.
 
-        return SearchListResponse(items=items_data)
+        Returns:
+            Счетчики попаданий и промахов кэша, доля попаданий и версия меню
+        """
+        return SearchCacheStatsResponse(**search_result_cache.get_stats(), index=search_engine.get_stats())
 
 
 menu_item_service = MenuItemService()
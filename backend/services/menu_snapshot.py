@@ -0,0 +1,246 @@
+"""Снимок активного дерева меню в памяти с готовыми ответами публичных эндпоинтов."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional
+
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.config import settings
+from backend.crud.menu_item import menu_item_crud
+from backend.models.enums import AccessLevel, ItemType
+from backend.schemas.public.menu import ContentFileResponse, MenuContentResponse, MenuItemListResponse, MenuItemResponse
+
+
+logger = logging.getLogger(__name__)
+
+EMPTY_SECTION_MESSAGE = "Раздел пока пуст. Попробуйте позже."
+
+
+@dataclass(frozen=True)
+class SnapshotEntry:
+    """Готовый ответ эндпоинта: модель, сериализованное тело и его ETag."""
+
+    response: BaseModel
+    body: bytes
+    etag: str
+
+    @classmethod
+    def build(cls, response: BaseModel) -> "SnapshotEntry":
+        """Сериализует ответ и вычисляет ETag по содержимому тела."""
+        body = response.model_dump_json().encode("utf-8")
+        return cls(response=response, body=body, etag=f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"')
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Совпадает ли заголовок If-None-Match с ETag ответа (слабое сравнение).
+
+    Args:
+        if_none_match: Значение заголовка If-None-Match
+        etag: ETag текущего ответа
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = (tag.strip() for tag in if_none_match.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+
+class MenuSnapshot:
+    """Неизменяемый снимок пунктов меню и их контента.
+
+    Ответы эндпоинтов для пары (пункт меню, уровень доступа) строятся при
+    первом обращении и переиспользуются до замены снимка.
+    """
+
+    def __init__(
+        self,
+        version: int,
+        items: Dict[int, MenuItemResponse],
+        content: Dict[int, ContentFileResponse],
+    ):
+        """Инициализация снимка.
+
+        Args:
+            version: Версия меню, для которой построен снимок
+            items: Все пункты меню по ID
+            content: Контент пунктов меню по ID пункта
+        """
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self._items = items
+        self._content = content
+        self._children: Dict[Optional[int], List[MenuItemResponse]] = {}
+        for item in items.values():
+            if item.is_active:
+                self._children.setdefault(item.parent_id, []).append(item)
+        self._entries: Dict[Hashable, SnapshotEntry] = {}
+
+    def get_item(self, menu_id: int) -> Optional[MenuItemResponse]:
+        """Возвращает пункт меню по ID (в том числе неактивный)."""
+        return self._items.get(menu_id)
+
+    def ancestors(self, menu_id: int) -> List[MenuItemResponse]:
+        """Возвращает цепочку родительских пунктов от корня меню до родителя пункта menu_id."""
+        chain: List[MenuItemResponse] = []
+        seen = {menu_id}
+        item = self._items.get(menu_id)
+        while item is not None and item.parent_id is not None and item.parent_id not in seen:
+            seen.add(item.parent_id)
+            item = self._items.get(item.parent_id)
+            if item is not None:
+                chain.append(item)
+        chain.reverse()
+        return chain
+
+    def children(self, parent_id: Optional[int], access_level: AccessLevel) -> List[MenuItemResponse]:
+        """Возвращает активные дочерние пункты, доступные на уровне access_level."""
+        children = self._children.get(parent_id, [])
+        if access_level == AccessLevel.FREE:
+            return [child for child in children if child.access_level == AccessLevel.FREE]
+        return list(children)
+
+    def menu_items_entry(self, parent_id: Optional[int], access_level: AccessLevel) -> SnapshotEntry:
+        """Ответ GET /menu-items для уровня меню parent_id."""
+        key = ("items", parent_id, access_level)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = SnapshotEntry.build(MenuItemListResponse(items=self.children(parent_id, access_level)))
+            self._entries[key] = entry
+        return entry
+
+    def content_entry(self, menu_id: int, access_level: AccessLevel) -> SnapshotEntry:
+        """Ответ GET /menu-items/{id}/content для существующего активного пункта меню."""
+        key = ("content", menu_id, access_level)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = SnapshotEntry.build(self._build_content(menu_id, access_level))
+            self._entries[key] = entry
+        return entry
+
+    def _build_content(self, menu_id: int, access_level: AccessLevel) -> MenuContentResponse:
+        """Формирует ответ с контентом пункта меню и его прямыми дочерними элементами."""
+        item = self._items[menu_id]
+        children = self.children(menu_id, access_level)
+
+        if item.item_type == ItemType.NAVIGATION and not children:
+            # Навигационная кнопка без дочерних элементов - возвращаем пустой контент
+            return MenuContentResponse(
+                id=item.id,
+                title=item.title,
+                description=item.description,
+                bot_message=EMPTY_SECTION_MESSAGE,
+                item_type=item.item_type,
+                content_files=[],
+                children=[],
+            )
+
+        content = self._content.get(menu_id)
+        return MenuContentResponse(
+            id=item.id,
+            title=item.title,
+            description=item.description,
+            bot_message=item.bot_message,
+            item_type=item.item_type,
+            content_files=[content] if content is not None else [],
+            children=children,
+        )
+
+
+class MenuSnapshotCache:
+    """Кэш снимка меню с глобальной версией.
+
+    Изменения пунктов меню и файлов контента через админку увеличивают
+    версию меню; снимок с устаревшей версией перестраивается одним запросом
+    при следующем обращении. Снимок также перестраивается по истечении
+    ``ttl`` - на случай изменений в БД в обход сервисов (скрипты, миграции).
+    """
+
+    def __init__(self, ttl: float = 300.0):
+        """Инициализация кэша.
+
+        Args:
+            ttl: Максимальное время жизни снимка в секундах
+        """
+        self.ttl = ttl
+        self.version = 0
+
+        self._snapshot: Optional[MenuSnapshot] = None
+        self._lock = asyncio.Lock()
+        self._stats = {"hits": 0, "rebuilds": 0, "invalidations": 0}
+
+    def invalidate(self) -> None:
+        """Увеличивает версию меню после изменения пунктов меню или контента."""
+        self.version += 1
+        self._stats["invalidations"] += 1
+
+    async def get(self, db: AsyncSession) -> MenuSnapshot:
+        """Возвращает актуальный снимок меню, перестраивая его при необходимости.
+
+        Args:
+            db: Сессия базы данных для загрузки снимка
+        """
+        snapshot = self._snapshot
+        if self._is_current(snapshot):
+            self._stats["hits"] += 1
+            return snapshot
+
+        async with self._lock:
+            snapshot = self._snapshot
+            if self._is_current(snapshot):
+                self._stats["hits"] += 1
+                return snapshot
+
+            # Версия фиксируется до загрузки: изменение во время загрузки
+            # оставит снимок устаревшим, и следующий запрос построит его заново
+            version = self.version
+            snapshot = await self._load(db, version)
+            self._snapshot = snapshot
+            self._stats["rebuilds"] += 1
+            logger.debug(f"Снимок меню перестроен: версия {version}")
+            return snapshot
+
+    def get_stats(self) -> Dict[str, int]:
+        """Возвращает счетчики кэша и текущую версию меню."""
+        return {**self._stats, "version": self.version}
+
+    def _is_current(self, snapshot: Optional[MenuSnapshot]) -> bool:
+        """Соответствует ли снимок текущей версии и не истек ли его срок жизни."""
+        return (
+            snapshot is not None
+            and snapshot.version == self.version
+            and time.monotonic() - snapshot.loaded_at < self.ttl
+        )
+
+    async def _load(self, db: AsyncSession, version: int) -> MenuSnapshot:
+        """Загружает все пункты меню с контентом одним запросом."""
+        menu_items = await menu_item_crud.get_all_with_content(db)
+
+        items = {
+            item.id: MenuItemResponse(
+                id=item.id,
+                title=item.title,
+                description=item.description,
+                parent_id=item.parent_id,
+                bot_message=item.bot_message,
+                is_active=item.is_active,
+                access_level=item.access_level,
+                item_type=item.item_type,
+                children=[],  # Всегда пустой список для MVP
+            )
+            for item in menu_items
+        }
+        content = {
+            item.id: ContentFileResponse.model_validate(item.content) for item in menu_items if item.content is not None
+        }
+        return MenuSnapshot(version, items, content)
+
+
+menu_snapshot = MenuSnapshotCache(ttl=settings.menu_snapshot_ttl)
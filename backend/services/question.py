@@ -4,11 +4,12 @@ from __future__ import annotations
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.crud.base import unit_of_work
 from backend.crud.question import question_crud
-from backend.crud.telegram_user import telegram_user_crud
 from backend.schemas.admin.question import AdminQuestionAnswer, AdminQuestionListResponse, AdminQuestionResponse
 from backend.schemas.public.question import UserQuestionCreate, UserQuestionResponse
 from backend.services.telegram_user import telegram_user_service
+from backend.services.user_access import user_access_resolver
 from backend.validators.question import user_question_validator
 
 
@@ -18,7 +19,7 @@ class UserQuestionService:
     def __init__(self):
         """Инициализация сервиса User Question."""
         self.question_crud = question_crud
-        self.telegram_user_crud = telegram_user_crud
+        self.user_access_resolver = user_access_resolver
         self.validator = user_question_validator
 
     async def create_user_question(self, request: UserQuestionCreate, db: AsyncSession) -> UserQuestionResponse:
@@ -35,16 +36,18 @@ class UserQuestionService:
         self.validator.validate_question_text(request.question_text)
 
         # Потом проверяем существование пользователя
-        user = await self.telegram_user_crud.get_by_telegram_id(db, request.telegram_user_id)
+        user = await self.user_access_resolver.resolve(db, request.telegram_user_id)
         self.validator.validate_user_exists(user)
 
-        question = await self.question_crud.create_question(
-            db=db,
-            telegram_user_id=user.id,
-            question_text=request.question_text,
-        )
+        # Вопрос и счетчик вопросов пользователя фиксируются одним коммитом
+        async with unit_of_work(db):
+            question = await self.question_crud.create_question(
+                db=db,
+                telegram_user_id=user.id,
+                question_text=request.question_text,
+            )
 
-        await telegram_user_service.increment_user_questions_count(db=db, telegram_user_id=user.id)
+            await telegram_user_service.increment_user_questions_count(db=db, telegram_user_id=user.id)
 
         return UserQuestionResponse(
             question_text=question.question_text,
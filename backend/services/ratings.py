@@ -4,11 +4,12 @@ from __future__ import annotations
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.crud.base import unit_of_work
 from backend.crud.menu_item import menu_item_crud
-from backend.crud.telegram_user import telegram_user_crud
 from backend.crud.user_activity import user_activity_crud
-from backend.models.enums import AccessLevel, ActivityType
+from backend.models.enums import ActivityType
 from backend.schemas.public.ratings import RatingRequest, RatingResponse
+from backend.services.user_access import user_access_resolver
 from backend.validators.menu_item import menu_item_validator
 from backend.validators.telegram_user import telegram_user_validator
 from backend.validators.user_activity import user_activity_validator
@@ -20,7 +21,7 @@ class RatingService:
     def __init__(self):
         """Инициализация сервиса Rating."""
         self.menu_item_crud = menu_item_crud
-        self.telegram_user_crud = telegram_user_crud
+        self.user_access_resolver = user_access_resolver
         self.user_activity_crud = user_activity_crud
         self.user_activity_validator = user_activity_validator
         self.menu_item_validator = menu_item_validator
@@ -36,32 +37,30 @@ class RatingService:
             Ответ с результатом оценки
 
         """
-        user = await self.telegram_user_crud.get_by_telegram_id(db, request.telegram_user_id)
+        user = await self.user_access_resolver.resolve(db, request.telegram_user_id)
         telegram_user_validator.validate_user_exists(user)
 
         menu_item = await self.menu_item_crud.get(db, request.menu_item_id)
         self.menu_item_validator.validate_menu_item_exists(menu_item)
         self.menu_item_validator.validate_menu_item_active(menu_item)
 
-        user_access_level = (
-            AccessLevel.PREMIUM if getattr(user, "subscription_type", None) == "premium" else AccessLevel.FREE
-        )
-        self.menu_item_validator.validate_access_level(user_access_level, menu_item.access_level)
+        self.menu_item_validator.validate_access_level(user.access_level, menu_item.access_level)
 
         # Проверяем, что оценка корректна
         self.user_activity_validator.validate_rating(request.rating, ActivityType.RATING)
 
-        # Создаем активность оценки
-        await self.user_activity_crud.create_activity(
-            db=db,
-            telegram_user_id=user.id,
-            menu_item_id=request.menu_item_id,
-            activity_type=ActivityType.RATING,
-            rating=request.rating,
-        )
-
-        # Обновляем статистику оценок материала
-        await self.menu_item_crud.update_rating_stats(db=db, menu_id=request.menu_item_id, rating=request.rating)
+        # Активность оценки и статистика материала фиксируются одним коммитом
+        async with unit_of_work(db):
+            await self.user_activity_crud.create_activity(
+                db=db,
+                telegram_user_id=user.id,
+                menu_item_id=request.menu_item_id,
+                activity_type=ActivityType.RATING,
+                rating=request.rating,
+            )
+
+            # Обновляем статистику оценок материала
+            await self.menu_item_crud.update_rating_stats(db=db, menu_id=request.menu_item_id, rating=request.rating)
 
         return RatingResponse(
             menu_item_id=request.menu_item_id, rating=request.rating, message="Оценка успешно сохранена"
@@ -0,0 +1,435 @@
+"""Поиск по материалам через инвертированный индекс в памяти.
+
+Корпус поиска (названия и описания пунктов меню, текст и подписи их
+контента) невелик и целиком помещается в память процесса. Индекс хранит
+для каждой основы слова массивы ID пунктов меню и весов вхождений и
+ранжирует результаты по BM25, так что поиск не обращается к PostgreSQL.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import math
+import re
+import time
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.config import settings
+from backend.crud.menu_item import menu_item_crud
+from backend.models import MenuItem
+from backend.models.enums import AccessLevel
+from backend.schemas.public.search import SearchItemResponse
+from backend.utils.stemmer import stem
+
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[0-9a-zа-яё]+")
+
+# Служебные слова не индексируются (как в конфигурации russian PostgreSQL)
+STOP_WORDS = frozenset(
+    """
+    и в во не что он на я с со как а то все она так его но да ты к у же вы за бы по только ее мне было
+    вот от меня еще нет о из ему теперь когда даже ну вдруг ли если уже или ни быть был него до вас
+    нибудь опять уж вам ведь там потом себя ничего ей может они тут где есть надо ней для мы тебя их
+    чем была сам чтоб без будто чего раз тоже себе под будет ж тогда кто этот того потому этого какой
+    совсем ним здесь этом один почти мой тем чтобы нее сейчас были куда зачем всех никогда можно при
+    наконец два об другой хоть после над больше тот через эти нас про всего них какая много разве
+    три эту моя впрочем хорошо свою этой перед иногда лучше чуть том нельзя такой им более всегда
+    конечно всю между
+    """.split()
+)
+
+# Вес вхождения слова в название (в описание и контент - 1)
+TITLE_WEIGHT = 2.0
+
+
+def analyze(text: Optional[str]) -> List[str]:
+    """Разбивает текст на основы слов без служебных слов."""
+    if not text:
+        return []
+    return [stem(token) for token in TOKEN_PATTERN.findall(text.lower().replace("ё", "е")) if token not in STOP_WORDS]
+
+
+@dataclass(frozen=True)
+class SearchDocument:
+    """Пункт меню в индексе: готовый элемент ответа, раздел верхнего уровня и веса основ слов."""
+
+    item: SearchItemResponse
+    section_id: int
+    terms: Dict[str, float]
+    length: float
+
+    @classmethod
+    def from_menu_item(cls, menu_item: MenuItem) -> "SearchDocument":
+        """Строит документ по пункту меню с загруженным контентом."""
+        terms: Dict[str, float] = {}
+        for token in analyze(menu_item.title):
+            terms[token] = terms.get(token, 0.0) + TITLE_WEIGHT
+        content = menu_item.content
+        texts = [menu_item.description] + ([content.text_content, content.caption] if content is not None else [])
+        for text in texts:
+            for token in analyze(text):
+                terms[token] = terms.get(token, 0.0) + 1.0
+
+        return cls(
+            item=SearchItemResponse.model_validate(menu_item),
+            section_id=menu_item.section_id,
+            terms=terms,
+            length=sum(terms.values()),
+        )
+
+
+class Posting:
+    """Список вхождений основы слова: ID пунктов меню по возрастанию и веса вхождений."""
+
+    __slots__ = ("ids", "weights")
+
+    def __init__(self):
+        """Инициализация пустого списка вхождений."""
+        self.ids = array("I")
+        self.weights = array("f")
+
+    def __len__(self) -> int:
+        """Количество пунктов меню, содержащих основу."""
+        return len(self.ids)
+
+    def add(self, menu_id: int, weight: float) -> None:
+        """Добавляет вхождение основы в пункт меню."""
+        position = bisect_left(self.ids, menu_id)
+        self.ids.insert(position, menu_id)
+        self.weights.insert(position, weight)
+
+    def remove(self, menu_id: int) -> None:
+        """Удаляет вхождение основы в пункт меню."""
+        position = bisect_left(self.ids, menu_id)
+        del self.ids[position]
+        del self.weights[position]
+
+
+class SearchIndex:
+    """Инвертированный индекс активных пунктов меню с ранжированием BM25.
+
+    Запрос находит пункты меню, содержащие все его слова (как полнотекстовый
+    поиск PostgreSQL). Если таких нет, каждое слово запроса сопоставляется со
+    всеми основами индекса, начинающимися с него, - замена поиска подстроки
+    для незаконченных слов.
+
+    Оценки BM25 пунктов меню по основе вычисляются при первом запросе с ней
+    и переиспользуются до изменения индекса: добавление или удаление пункта
+    меняет число пунктов и среднюю длину, от которых зависят все оценки.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, cache_size: int = 4096):
+        """Инициализация пустого индекса.
+
+        Args:
+            k1: Насыщение веса частоты слова BM25
+            b: Влияние длины документа BM25
+            cache_size: Максимальное количество основ с вычисленными оценками
+        """
+        self.k1 = k1
+        self.b = b
+        self.cache_size = cache_size
+        self._documents: Dict[int, SearchDocument] = {}
+        self._postings: Dict[str, Posting] = {}
+        self._total_length = 0.0
+        self._restricted: Set[int] = set()
+        self._sections: Dict[int, Set[int]] = {}
+        self._vocabulary: Optional[List[str]] = None
+        self._scores: Dict[str, Dict[int, float]] = {}
+        self._ranked: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        """Количество пунктов меню в индексе."""
+        return len(self._documents)
+
+    def __contains__(self, menu_id: int) -> bool:
+        """Есть ли пункт меню в индексе."""
+        return menu_id in self._documents
+
+    def add(self, document: SearchDocument) -> None:
+        """Добавляет или заменяет пункт меню в индексе."""
+        menu_id = document.item.id
+        self.remove(menu_id)
+
+        self._documents[menu_id] = document
+        self._total_length += document.length
+        if document.item.access_level != AccessLevel.FREE:
+            self._restricted.add(menu_id)
+        self._sections.setdefault(document.section_id, set()).add(menu_id)
+        for token, weight in document.terms.items():
+            posting = self._postings.get(token)
+            if posting is None:
+                posting = self._postings[token] = Posting()
+                self._vocabulary = None
+            posting.add(menu_id, weight)
+        self._scores.clear()
+        self._ranked.clear()
+
+    def remove(self, menu_id: int) -> None:
+        """Удаляет пункт меню из индекса (если он есть)."""
+        document = self._documents.pop(menu_id, None)
+        if document is None:
+            return
+        self._total_length -= document.length
+        self._restricted.discard(menu_id)
+        section = self._sections[document.section_id]
+        section.discard(menu_id)
+        if not section:
+            del self._sections[document.section_id]
+        for token in document.terms:
+            posting = self._postings[token]
+            posting.remove(menu_id)
+            if not posting:
+                del self._postings[token]
+                self._vocabulary = None
+        self._scores.clear()
+        self._ranked.clear()
+
+    def search(
+        self,
+        query: str,
+        access_level: AccessLevel,
+        limit: int = 10,
+        section_id: Optional[int] = None,
+    ) -> List[SearchItemResponse]:
+        """Поиск пунктов меню, доступных пользователю.
+
+        Args:
+            query: Поисковый запрос
+            access_level: Уровень доступа пользователя
+            limit: Максимальное количество результатов
+            section_id: ID раздела верхнего уровня для ограничения поиска
+
+        Returns:
+            Пункты меню по убыванию BM25, при равенстве - по возрастанию ID
+        """
+        tokens = list(dict.fromkeys(analyze(query)))
+        if limit <= 0 or not tokens:
+            return []
+
+        excluded = self._restricted if access_level == AccessLevel.FREE else set()
+        section = None if section_id is None else self._sections.get(section_id, set())
+
+        found = self._rank([[token] for token in tokens], limit, excluded, section)
+        if not found:
+            found = self._rank([self._expand(token) for token in tokens], limit, excluded, section)
+        return [self._documents[menu_id].item for menu_id in found]
+
+    def _rank(self, terms: List[List[str]], limit: int, excluded: Set[int], section: Optional[Set[int]]) -> List[int]:
+        """ID лучших пунктов меню, содержащих хотя бы одну основу из каждой группы terms."""
+        groups = [self._group_scores(group) for group in terms]
+        if not groups or not all(groups):
+            return []
+
+        if len(terms) == 1 and len(terms[0]) == 1:
+            # Запрос из одного слова: пункты меню уже упорядочены по оценке
+            matched = (
+                menu_id
+                for menu_id in self._ranked_ids(terms[0][0])
+                if menu_id not in excluded and (section is None or menu_id in section)
+            )
+            return list(islice(matched, limit))
+
+        groups.sort(key=len)
+        candidates = set(groups[0]).difference(excluded)
+        if section is not None:
+            candidates.intersection_update(section)
+        for scores in groups[1:]:
+            candidates = set(filter(scores.__contains__, candidates))
+
+        return heapq.nsmallest(
+            limit, candidates, key=lambda menu_id: (-sum(scores[menu_id] for scores in groups), menu_id)
+        )
+
+    def _group_scores(self, tokens: List[str]) -> Dict[int, float]:
+        """Суммарные оценки пунктов меню по основам группы."""
+        if len(tokens) == 1:
+            return self._token_scores(tokens[0])
+        merged: Dict[int, float] = {}
+        for token in tokens:
+            for menu_id, score in self._token_scores(token).items():
+                merged[menu_id] = merged.get(menu_id, 0.0) + score
+        return merged
+
+    def _token_scores(self, token: str) -> Dict[int, float]:
+        """Оценки BM25 пунктов меню, содержащих основу."""
+        scores = self._scores.get(token)
+        if scores is not None:
+            return scores
+        posting = self._postings.get(token)
+        if posting is None:
+            return {}
+
+        count = len(self._documents)
+        idf = math.log(1.0 + (count - len(posting) + 0.5) / (len(posting) + 0.5))
+        k1, b, average_length = self.k1, self.b, self._total_length / count
+        scores = {
+            menu_id: idf
+            * weight
+            * (k1 + 1.0)
+            / (weight + k1 * (1.0 - b + b * self._documents[menu_id].length / average_length))
+            for menu_id, weight in zip(posting.ids, posting.weights)
+        }
+        if len(self._scores) >= self.cache_size:
+            self._scores.clear()
+            self._ranked.clear()
+        self._scores[token] = scores
+        return scores
+
+    def _ranked_ids(self, token: str) -> List[int]:
+        """ID пунктов меню, содержащих основу, по убыванию оценки и возрастанию ID."""
+        ranked = self._ranked.get(token)
+        if ranked is None:
+            scores = self._token_scores(token)
+            ranked = self._ranked[token] = sorted(scores, key=lambda menu_id: (-scores[menu_id], menu_id))
+        return ranked
+
+    def _expand(self, token: str) -> List[str]:
+        """Основы индекса, начинающиеся с token."""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        start = bisect_left(self._vocabulary, token)
+        end = bisect_left(self._vocabulary, token + "\uffff", start)
+        return self._vocabulary[start:end]
+
+
+class SearchEngine:
+    """Поисковый движок: индекс пунктов меню в памяти, обновляемый по изменениям.
+
+    Изменения пунктов меню и файлов контента через админку помечают пункты
+    меню устаревшими; при следующем поиске они перечитываются одним
+    запросом и переиндексируются. Индекс полностью перестраивается при
+    первом поиске и по истечении ``ttl`` - на случай изменений в БД в
+    обход сервисов (скрипты, миграции). Пока индекс обновляет один запрос,
+    остальные ищут по текущему индексу; полное перестроение выполняется в
+    отдельном потоке и не блокирует цикл событий.
+    """
+
+    def __init__(self, ttl: float = 300.0):
+        """Инициализация движка.
+
+        Args:
+            ttl: Максимальное время между полными перестроениями индекса в секундах
+        """
+        self.ttl = ttl
+
+        self._index: Optional[SearchIndex] = None
+        self._built_at = 0.0
+        self._dirty: Set[int] = set()
+        self._lock = asyncio.Lock()
+        self._stats = {"searches": 0, "rebuilds": 0, "updates": 0}
+
+    def invalidate(self, *menu_ids: int) -> None:
+        """Помечает пункты меню для переиндексации после их изменения или изменения их контента."""
+        self._dirty.update(menu_ids)
+
+    def invalidate_all(self) -> None:
+        """Требует полного перестроения индекса при следующем поиске."""
+        self._index = None
+        self._dirty.clear()
+
+    async def search(
+        self,
+        db: AsyncSession,
+        query: str,
+        access_level: AccessLevel,
+        limit: int = 10,
+        section_id: Optional[int] = None,
+    ) -> List[SearchItemResponse]:
+        """Поиск пунктов меню по актуальному индексу.
+
+        Args:
+            db: Сессия базы данных для обновления индекса
+            query: Поисковый запрос (уже валидированный)
+            access_level: Уровень доступа пользователя
+            limit: Максимальное количество результатов
+            section_id: ID раздела верхнего уровня для ограничения поиска
+
+        Returns:
+            Пункты меню по убыванию релевантности
+        """
+        index = await self.get(db)
+        self._stats["searches"] += 1
+        return index.search(query, access_level, limit, section_id)
+
+    async def get(self, db: AsyncSession) -> SearchIndex:
+        """Возвращает актуальный индекс, перестраивая или обновляя его при необходимости.
+
+        Args:
+            db: Сессия базы данных для загрузки пунктов меню
+        """
+        if self._is_current():
+            return self._index
+        if self._index is not None and self._lock.locked():
+            # Индекс уже обновляет другой запрос - не ждем его, ищем по текущему
+            return self._index
+
+        async with self._lock:
+            if self._index is None or time.monotonic() - self._built_at >= self.ttl:
+                # Изменения во время загрузки попадут в _dirty и будут применены при следующем поиске
+                self._dirty.clear()
+                built_at = time.monotonic()
+                self._index = await self._build(db)
+                self._built_at = built_at
+                self._stats["rebuilds"] += 1
+                logger.debug(f"Поисковый индекс перестроен: {len(self._index)} пунктов меню")
+            elif self._dirty:
+                dirty, self._dirty = self._dirty, set()
+                try:
+                    await self._update(db, self._index, dirty)
+                except Exception:
+                    self._dirty |= dirty
+                    raise
+                self._stats["updates"] += 1
+            return self._index
+
+    def get_stats(self) -> Dict[str, int]:
+        """Возвращает счетчики движка и размер индекса."""
+        return {**self._stats, "documents": len(self._index) if self._index is not None else 0}
+
+    def _is_current(self) -> bool:
+        """Построен ли индекс, применены ли изменения и не истек ли его срок жизни."""
+        return self._index is not None and not self._dirty and time.monotonic() - self._built_at < self.ttl
+
+    async def _build(self, db: AsyncSession) -> SearchIndex:
+        """Строит индекс по всем активным пунктам меню одним запросом.
+
+        Пункты меню загружаются в цикле событий, а выделение основ слов и
+        заполнение индекса на всем меню выполняются в отдельном потоке.
+        """
+        menu_items = [menu_item for menu_item in await menu_item_crud.get_all_with_content(db) if menu_item.is_active]
+        return await asyncio.to_thread(self._index_menu_items, menu_items)
+
+    @staticmethod
+    def _index_menu_items(menu_items: List[MenuItem]) -> SearchIndex:
+        """Заполняет новый индекс пунктами меню с загруженным контентом."""
+        index = SearchIndex()
+        for menu_item in menu_items:
+            index.add(SearchDocument.from_menu_item(menu_item))
+        return index
+
+    async def _update(self, db: AsyncSession, index: SearchIndex, menu_ids: Iterable[int]) -> None:
+        """Переиндексирует измененные пункты меню, удаленные и неактивные убирает из индекса."""
+        menu_ids = set(menu_ids)
+        menu_items = {
+            menu_item.id: menu_item for menu_item in await menu_item_crud.get_with_content_by_ids(db, menu_ids)
+        }
+        for menu_id in menu_ids:
+            menu_item = menu_items.get(menu_id)
+            if menu_item is not None and menu_item.is_active:
+                index.add(SearchDocument.from_menu_item(menu_item))
+            else:
+                index.remove(menu_id)
+
+
+search_engine = SearchEngine(ttl=settings.search_index_ttl)
@@ -0,0 +1,133 @@
+"""Кэш наборов результатов поиска для постраничной выдачи и повторяющихся запросов."""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from backend.core.config import settings
+from backend.models.enums import AccessLevel
+from backend.schemas.public.search import SearchItemResponse
+from backend.services.menu_snapshot import menu_snapshot
+
+
+@dataclass(frozen=True)
+class SearchResultKey:
+    """Ключ набора результатов: нормализованный запрос, уровень доступа и раздел."""
+
+    query: str
+    access_level: AccessLevel
+    section_id: Optional[int] = None
+
+    @classmethod
+    def build(cls, query: str, access_level: AccessLevel, section_id: Optional[int] = None) -> "SearchResultKey":
+        """Ключ для уже валидированного запроса без учета регистра."""
+        return cls(query=query.lower(), access_level=access_level, section_id=section_id)
+
+    @property
+    def fingerprint(self) -> str:
+        """Короткий отпечаток ключа, которым подписывается курсор страницы."""
+        raw = f"{self.query}\0{self.access_level}\0{self.section_id or ''}".encode("utf-8")
+        return hashlib.blake2b(raw, digest_size=6).hexdigest()
+
+
+def encode_search_cursor(key: SearchResultKey, offset: int) -> str:
+    """Курсор страницы результатов, начинающейся с позиции offset."""
+    raw = f"{offset}:{key.fingerprint}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_search_cursor(cursor: str, key: SearchResultKey) -> Optional[int]:
+    """Позиция страницы из курсора или None, если курсор поврежден или выдан для другого запроса."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+        offset, fingerprint = raw.split(":", 1)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+    if fingerprint != key.fingerprint or not offset.isdigit():
+        return None
+    return int(offset)
+
+
+class SearchResultCache:
+    """Ограниченный кэш наборов результатов поиска с коротким TTL.
+
+    Первая страница выполняет поиск и запоминает весь набор результатов
+    (не больше ``search_max_results``); следующие страницы и повторы
+    популярных запросов в пределах ``ttl`` берутся из набора без повторного
+    поиска. Набор запоминается с версией меню, для которой он найден:
+    изменение пунктов меню или контента через админку увеличивает версию,
+    и наборы прежних версий больше не используются. Курсор хранит только
+    позицию страницы, поэтому после вытеснения набора страница строится по
+    повторному поиску.
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl: float = 60.0, version: Callable[[], int] = lambda: 0):
+        """Инициализация кэша.
+
+        Args:
+            max_entries: Максимальное количество запоминаемых наборов результатов
+            ttl: Время жизни набора в секундах
+            version: Текущая версия меню
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.version = version
+
+        self._entries: "OrderedDict[SearchResultKey, Tuple[List[SearchItemResponse], float, int]]" = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "stale": 0, "evictions": 0}
+
+    def get(self, key: SearchResultKey) -> Optional[List[SearchItemResponse]]:
+        """Возвращает непросроченный набор результатов текущей версии меню и учитывает попадание или промах."""
+        cached = self._entries.get(key)
+        if cached is not None and cached[2] != self.version():
+            # Меню изменилось после поиска - набор устарел
+            del self._entries[key]
+            self._stats["stale"] += 1
+        elif cached is not None and time.monotonic() < cached[1]:
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return cached[0]
+
+        self._stats["misses"] += 1
+        return None
+
+    def put(self, key: SearchResultKey, items: List[SearchItemResponse], version: int) -> None:
+        """Запоминает набор результатов, вытесняя давно не запрашивавшиеся.
+
+        Args:
+            key: Ключ набора результатов
+            items: Результаты поиска по убыванию релевантности
+            version: Версия меню, зафиксированная до поиска
+        """
+        self._entries[key] = (items, time.monotonic() + self.ttl, version)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def invalidate(self) -> None:
+        """Сбрасывает все наборы результатов."""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, float]:
+        """Возвращает счетчики кэша, долю попаданий и текущую версию меню."""
+        total = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "entries": len(self._entries),
+            "hit_rate": round(self._stats["hits"] / total, 4) if total else 0.0,
+            "menu_version": self.version(),
+        }
+
+
+search_result_cache = SearchResultCache(
+    max_entries=settings.search_results_cache_max_entries,
+    ttl=settings.search_results_cache_ttl,
+    version=lambda: menu_snapshot.version,
+)
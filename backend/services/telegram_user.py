@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from datetime import datetime, timezone
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.crud.telegram_user import telegram_user_crud
@@ -12,6 +14,7 @@ from backend.schemas.bot.telegram_user import (
     TelegramUserRequest,
     TelegramUserResponse,
 )
+from backend.services.user_touch import user_touch_writer
 from backend.validators.telegram_user import telegram_user_validator
 
 
@@ -43,16 +46,18 @@ class TelegramUserService:
         telegram_id = user_data.get("id") if user_data else None
         self.validator.validate_telegram_id(telegram_id)
 
-        existing_user = await self.telegram_user_crud.get_by_telegram_id(db, telegram_id)
-        user_created = existing_user is None
-
-        user = await self.telegram_user_crud.upsert_user(
+        # При запущенной отложенной записи время активности существующего пользователя обновляется через буфер
+        touch_buffered = user_touch_writer.is_running
+        user, user_created = await self.telegram_user_crud.upsert_user_with_status(
             db=db,
             telegram_id=telegram_id,
             first_name=user_data.get("first_name") if user_data else None,
             last_name=user_data.get("last_name") if user_data else None,
             username=user_data.get("username") if user_data else None,
+            update_last_activity=not touch_buffered,
         )
+        if touch_buffered and not user_created:
+            user_touch_writer.touch(user.id, last_activity=datetime.now(timezone.utc))
 
         # Создаем словарь с данными пользователя для сериализации
         user_data = {
@@ -0,0 +1,135 @@
+"""Кэш соответствия Telegram ID пользователя его ID в БД и уровню доступа."""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.config import settings
+from backend.crud.telegram_user import telegram_user_crud
+from backend.models.enums import AccessLevel, SubscriptionType
+
+
+@dataclass(frozen=True)
+class ResolvedUser:
+    """Пользователь Telegram: ID в БД и уровень доступа к материалам."""
+
+    id: int
+    telegram_id: int
+    access_level: AccessLevel
+
+
+def access_level_for(subscription_type: Optional[str]) -> AccessLevel:
+    """Уровень доступа к материалам для типа подписки пользователя."""
+    return AccessLevel.PREMIUM if subscription_type == SubscriptionType.PREMIUM else AccessLevel.FREE
+
+
+class UserAccessResolver:
+    """Ограниченный кэш пользователей Telegram с TTL.
+
+    Публичные эндпоинты начинаются с поиска пользователя по Telegram ID и
+    определения его уровня доступа. Результат кэшируется на ``ttl`` секунд;
+    код, меняющий тип подписки, сбрасывает запись пользователя через
+    ``invalidate``. Ненайденные пользователи не кэшируются - они могут
+    зарегистрироваться в любой момент.
+    """
+
+    def __init__(self, max_users: int = 10000, ttl: float = 60.0):
+        """Инициализация кэша.
+
+        Args:
+            max_users: Максимальное количество запоминаемых пользователей
+            ttl: Время жизни записи в секундах
+        """
+        self.max_users = max_users
+        self.ttl = ttl
+        self.telegram_user_crud = telegram_user_crud
+
+        self._users: "OrderedDict[int, Tuple[ResolvedUser, float]]" = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    async def resolve(self, db: AsyncSession, telegram_id: int) -> Optional[ResolvedUser]:
+        """Возвращает пользователя по Telegram ID или None, если он не зарегистрирован.
+
+        Args:
+            db: Сессия базы данных
+            telegram_id: Telegram ID пользователя
+        """
+        cached = self._get(telegram_id)
+        if cached is not None:
+            return cached
+
+        user = await self.telegram_user_crud.get_by_telegram_id(db, telegram_id)
+        if user is None:
+            return None
+        return self._remember(user)
+
+    async def resolve_many(self, db: AsyncSession, telegram_ids: Iterable[int]) -> Dict[int, ResolvedUser]:
+        """Возвращает найденных пользователей по Telegram ID, недостающих - одним запросом.
+
+        Args:
+            db: Сессия базы данных
+            telegram_ids: Telegram ID пользователей
+        """
+        resolved: Dict[int, ResolvedUser] = {}
+        missing = []
+        for telegram_id in set(telegram_ids):
+            cached = self._get(telegram_id)
+            if cached is not None:
+                resolved[telegram_id] = cached
+            else:
+                missing.append(telegram_id)
+
+        if missing:
+            for user in await self.telegram_user_crud.get_by_telegram_ids(db, missing):
+                resolved[user.telegram_id] = self._remember(user)
+        return resolved
+
+    def invalidate(self, telegram_id: Optional[int] = None) -> None:
+        """Сбрасывает запись пользователя, без аргумента - весь кэш."""
+        if telegram_id is None:
+            self._users.clear()
+        else:
+            self._users.pop(telegram_id, None)
+
+    def get_stats(self) -> Dict[str, float]:
+        """Возвращает счетчики кэша и долю попаданий."""
+        total = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "users": len(self._users),
+            "hit_rate": round(self._stats["hits"] / total, 4) if total else 0.0,
+        }
+
+    def _get(self, telegram_id: int) -> Optional[ResolvedUser]:
+        """Возвращает непросроченную запись кэша и учитывает попадание или промах."""
+        cached = self._users.get(telegram_id)
+        if cached is not None and time.monotonic() < cached[1]:
+            self._users.move_to_end(telegram_id)
+            self._stats["hits"] += 1
+            return cached[0]
+
+        self._stats["misses"] += 1
+        return None
+
+    def _remember(self, user) -> ResolvedUser:
+        """Запоминает пользователя, вытесняя давно не обращавшихся."""
+        resolved = ResolvedUser(
+            id=user.id, telegram_id=user.telegram_id, access_level=access_level_for(user.subscription_type)
+        )
+        self._users[user.telegram_id] = (resolved, time.monotonic() + self.ttl)
+        self._users.move_to_end(user.telegram_id)
+        while len(self._users) > self.max_users:
+            self._users.popitem(last=False)
+            self._stats["evictions"] += 1
+        return resolved
+
+
+user_access_resolver = UserAccessResolver(
+    max_users=settings.user_access_cache_max_users,
+    ttl=settings.user_access_cache_ttl,
+)
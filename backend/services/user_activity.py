@@ -2,19 +2,47 @@
 
 from __future__ import annotations
 
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.crud.base import unit_of_work
 from backend.crud.menu_item import menu_item_crud
-from backend.crud.telegram_user import telegram_user_crud
 from backend.crud.user_activity import user_activity_crud
-from backend.models.enums import AccessLevel, ActivityType
-from backend.schemas.public.user_activity import UserActivityRequest, UserActivityResponse
-from backend.services.telegram_user import telegram_user_service
+from backend.models import UserActivity
+from backend.models.enums import ActivityType
+from backend.schemas.public.user_activity import (
+    UserActivityBatchError,
+    UserActivityBatchRequest,
+    UserActivityBatchResponse,
+    UserActivityRequest,
+    UserActivityResponse,
+)
+from backend.services.menu_counters import menu_counter_writer
+from backend.services.user_access import user_access_resolver
+from backend.services.user_touch import user_touch_writer
 from backend.validators.menu_item import menu_item_validator
 from backend.validators.telegram_user import telegram_user_validator
 from backend.validators.user_activity import user_activity_validator
 
 
+# Типы активности, увеличивающие счетчики материала
+VIEW_ACTIVITY_TYPES = frozenset(
+    {
+        ActivityType.NAVIGATION,
+        ActivityType.TEXT_VIEW,
+        ActivityType.IMAGE_VIEW,
+        ActivityType.VIDEO_VIEW,
+        ActivityType.MATERIAL_OPEN,
+        ActivityType.SECTION_ENTER,
+    }
+)
+DOWNLOAD_ACTIVITY_TYPES = frozenset({ActivityType.PDF_DOWNLOAD, ActivityType.MEDIA_VIEW})
+
+
 class UserActivityService:
     """Сервис для работы с активностью пользователей."""
 
@@ -22,7 +50,7 @@ class UserActivityService:
         """Инициализация сервиса User Activity."""
         self.user_activity_crud = user_activity_crud
         self.menu_item_crud = menu_item_crud
-        self.telegram_user_crud = telegram_user_crud
+        self.user_access_resolver = user_access_resolver
         self.user_activity_validator = user_activity_validator
         self.menu_item_validator = menu_item_validator
 
@@ -36,7 +64,7 @@ class UserActivityService:
         Returns:
             Ответ с данными созданной активности
         """
-        user = await self.telegram_user_crud.get_by_telegram_id(db, request.telegram_user_id)
+        user = await self.user_access_resolver.resolve(db, request.telegram_user_id)
         telegram_user_validator.validate_user_exists(user)
 
         menu_item = None
@@ -44,41 +72,20 @@ class UserActivityService:
             menu_item = await self.menu_item_crud.get(db, request.menu_item_id)
             self.menu_item_validator.validate_menu_item_exists(menu_item)
 
-            user_access_level = (
-                AccessLevel.PREMIUM if getattr(user, "subscription_type", None) == "premium" else AccessLevel.FREE
-            )
-            self.menu_item_validator.validate_access_level(user_access_level, menu_item.access_level)
+            self.menu_item_validator.validate_access_level(user.access_level, menu_item.access_level)
 
         self.user_activity_validator.validate_search_query(request.search_query)
 
-        activity = await self.user_activity_crud.create_activity(
-            db=db,
-            telegram_user_id=user.id,
-            menu_item_id=request.menu_item_id,
-            activity_type=request.activity_type,
-            search_query=request.search_query,
-        )
-
-        # Обновляем статистику материала в зависимости от типа активности
-        if request.menu_item_id is not None:
-            if request.activity_type in [
-                ActivityType.NAVIGATION,
-                ActivityType.TEXT_VIEW,
-                ActivityType.IMAGE_VIEW,
-                ActivityType.VIDEO_VIEW,
-                ActivityType.MATERIAL_OPEN,
-                ActivityType.SECTION_ENTER,
-            ]:
-                await self.menu_item_crud.increment_view_count(db=db, menu_id=request.menu_item_id)
-            elif request.activity_type in [ActivityType.PDF_DOWNLOAD, ActivityType.MEDIA_VIEW]:
-                await self.menu_item_crud.increment_download_count(db=db, menu_id=request.menu_item_id)
-            elif request.activity_type == ActivityType.RATING:
-                await self.menu_item_crud.update_rating_stats(
-                    db=db, menu_id=request.menu_item_id, rating=request.rating
-                )
-
-        # Обновляем счетчик активностей пользователя через сервис
-        await telegram_user_service.increment_user_activities_count(db=db, telegram_user_id=user.id)
+        # Запись активности и обновление счетчиков фиксируются одним коммитом
+        async with unit_of_work(db):
+            activity = await self.record_validated_activity(
+                db,
+                user_id=user.id,
+                menu_item_id=request.menu_item_id,
+                activity_type=request.activity_type,
+                search_query=request.search_query,
+                rating=request.rating,
+            )
 
         return UserActivityResponse(
             menu_item_id=activity.menu_item_id,
@@ -88,5 +95,141 @@ class UserActivityService:
             message="Активность успешно записана",
         )
 
+    async def record_validated_activity(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: int,
+        menu_item_id: Optional[int],
+        activity_type: ActivityType,
+        search_query: Optional[str] = None,
+        rating: Optional[int] = None,
+    ) -> UserActivity:
+        """Запись проверенной активности и обновление счетчиков материала и пользователя.
+
+        Вызывающий код проверяет пользователя, пункт меню и доступ к нему и
+        фиксирует изменения (обычно в блоке unit_of_work).
+
+        Args:
+            db: Сессия базы данных
+            user_id: ID пользователя в БД
+            menu_item_id: ID пункта меню
+            activity_type: Тип активности
+            search_query: Поисковый запрос
+            rating: Оценка материала
+
+        Returns:
+            Созданная активность
+        """
+        activity = await self.user_activity_crud.create_activity(
+            db=db,
+            telegram_user_id=user_id,
+            menu_item_id=menu_item_id,
+            activity_type=activity_type,
+            search_query=search_query,
+        )
+
+        # Обновляем статистику материала в зависимости от типа активности, просмотры и скачивания - отложенно
+        if menu_item_id is not None:
+            if activity_type in VIEW_ACTIVITY_TYPES:
+                await menu_counter_writer.record(db, {menu_item_id: (1, 0)})
+            elif activity_type in DOWNLOAD_ACTIVITY_TYPES:
+                await menu_counter_writer.record(db, {menu_item_id: (0, 1)})
+            elif activity_type == ActivityType.RATING:
+                await self.menu_item_crud.update_rating_stats(db=db, menu_id=menu_item_id, rating=rating)
+
+        # Счетчик и время активности пользователя записываются отложенно
+        await user_touch_writer.record(db, {user_id: (1, datetime.now(timezone.utc))})
+
+        return activity
+
+    async def record_activities_batch(
+        self, request: UserActivityBatchRequest, db: AsyncSession
+    ) -> UserActivityBatchResponse:
+        """Пакетная запись активностей пользователей.
+
+        Пользователи, которых нет в кэше, и пункты меню загружаются двумя
+        запросами на всю пачку, активности вставляются одним многострочным
+        INSERT, статистика оценок материалов обновляется агрегированным
+        UPDATE, счетчики просмотров, скачиваний и активностей пользователей
+        передаются в отложенную запись, вся пачка фиксируется одним коммитом.
+        Некорректные активности не прерывают запись пачки, а возвращаются в
+        списке ошибок.
+
+        Args:
+            request: Пачка активностей
+            db: Сессия базы данных
+
+        Returns:
+            Количество записанных и отклоненных активностей
+        """
+        activities = request.activities
+
+        users_by_telegram_id = await self.user_access_resolver.resolve_many(
+            db, (a.telegram_user_id for a in activities)
+        )
+
+        menu_items = await self.menu_item_crud.get_by_ids(
+            db, (a.menu_item_id for a in activities if a.menu_item_id is not None)
+        )
+        menu_items_by_id = {item.id: item for item in menu_items}
+
+        rows = []
+        errors = []
+        counter_deltas = defaultdict(lambda: [0, 0])
+        rating_deltas = defaultdict(lambda: [0, 0])
+        user_deltas = defaultdict(int)
+
+        for index, activity in enumerate(activities):
+            user = users_by_telegram_id.get(activity.telegram_user_id)
+            try:
+                telegram_user_validator.validate_user_exists(user)
+                if activity.menu_item_id is not None:
+                    menu_item = menu_items_by_id.get(activity.menu_item_id)
+                    self.menu_item_validator.validate_menu_item_exists(menu_item)
+
+                    self.menu_item_validator.validate_access_level(user.access_level, menu_item.access_level)
+
+                self.user_activity_validator.validate_search_query(activity.search_query)
+            except HTTPException as e:
+                errors.append(UserActivityBatchError(index=index, detail=str(e.detail)))
+                continue
+
+            rows.append(
+                {
+                    "telegram_user_id": user.id,
+                    "menu_item_id": activity.menu_item_id,
+                    "activity_type": activity.activity_type,
+                    "search_query": activity.search_query,
+                    "rating": activity.rating,
+                }
+            )
+            user_deltas[user.id] += 1
+
+            if activity.menu_item_id is not None:
+                if activity.activity_type in VIEW_ACTIVITY_TYPES:
+                    counter_deltas[activity.menu_item_id][0] += 1
+                elif activity.activity_type in DOWNLOAD_ACTIVITY_TYPES:
+                    counter_deltas[activity.menu_item_id][1] += 1
+                elif activity.activity_type == ActivityType.RATING and activity.rating is not None:
+                    rating_deltas[activity.menu_item_id][0] += activity.rating
+                    rating_deltas[activity.menu_item_id][1] += 1
+
+        async with unit_of_work(db):
+            accepted = await self.user_activity_crud.bulk_create_activities(db, rows)
+            await self.menu_item_crud.apply_activity_deltas(
+                db, {menu_id: (0, 0, *deltas) for menu_id, deltas in rating_deltas.items()}
+            )
+            await menu_counter_writer.record(db, {menu_id: tuple(deltas) for menu_id, deltas in counter_deltas.items()})
+            touched_at = datetime.now(timezone.utc)
+            await user_touch_writer.record(db, {user_id: (delta, touched_at) for user_id, delta in user_deltas.items()})
+
+        return UserActivityBatchResponse(
+            accepted=accepted,
+            rejected=len(errors),
+            errors=errors,
+            message="Активности успешно записаны",
+        )
+
 
 user_activity_service = UserActivityService()
@@ -0,0 +1,63 @@
+"""Отложенная запись счетчиков и времени последней активности пользователей Telegram."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.config import settings
+from backend.crud.telegram_user import telegram_user_crud
+from backend.services.write_behind import WriteBehindBuffer
+
+
+# Прирост счетчика активностей и время последней активности пользователя
+UserTouch = Tuple[int, Optional[datetime]]
+
+
+class UserTouchWriter(WriteBehindBuffer[int, UserTouch]):
+    """Буфер обновлений строк telegram_users.
+
+    Каждая активность увеличивает счетчик активностей пользователя, а
+    регистрация обновляет время его последней активности. В буфере приросты
+    счетчиков суммируются, из отметок времени остается самая поздняя, и все
+    изменения записываются одним UPDATE ... FROM (VALUES ...).
+    """
+
+    name = "user-touch-writer"
+
+    def __init__(self, max_staleness: float = 5.0, max_pending: int = 5000):
+        """Инициализация буфера.
+
+        Args:
+            max_staleness: Максимальная задержка записи изменений в секундах
+            max_pending: Количество пользователей в буфере, при котором запись начинается сразу
+        """
+        super().__init__(max_staleness=max_staleness, max_pending=max_pending)
+        self.telegram_user_crud = telegram_user_crud
+
+    def touch(self, user_id: int, activities: int = 0, last_activity: Optional[datetime] = None) -> None:
+        """Добавляет изменение строки пользователя в буфер.
+
+        Args:
+            user_id: ID пользователя в БД
+            activities: Прирост счетчика активностей
+            last_activity: Время последней активности
+        """
+        self.add(user_id, (activities, last_activity))
+
+    def _combine(self, current: UserTouch, value: UserTouch) -> UserTouch:
+        """Суммирует приросты счетчика и оставляет самую позднюю отметку времени."""
+        timestamps = [timestamp for timestamp in (current[1], value[1]) if timestamp is not None]
+        return current[0] + value[0], max(timestamps) if timestamps else None
+
+    async def _write(self, db: AsyncSession, changes: Dict[int, UserTouch]) -> None:
+        """Записывает изменения строк пользователей одним запросом."""
+        await self.telegram_user_crud.apply_user_touches(db, changes)
+
+
+user_touch_writer = UserTouchWriter(
+    max_staleness=settings.user_touch_max_staleness,
+    max_pending=settings.user_touch_max_pending,
+)
@@ -0,0 +1,160 @@
+"""Базовый буфер отложенной записи агрегируемых изменений в БД."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Dict, Generic, Hashable, Optional, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.db import session_scope
+from backend.crud.base import after_commit
+
+
+logger = logging.getLogger(__name__)
+
+KeyType = TypeVar("KeyType", bound=Hashable)
+ValueType = TypeVar("ValueType")
+
+
+class WriteBehindBuffer(Generic[KeyType, ValueType]):
+    """Буфер изменений, которые записываются в БД пачками в фоне.
+
+    Пока фоновая задача запущена (в lifespan приложения), изменения
+    накапливаются в памяти и объединяются по ключу методом ``_combine``. Не
+    реже раза в ``max_staleness`` секунд или при накоплении ``max_pending``
+    ключей буфер записывается методом ``_write`` в отдельной сессии. Без
+    фоновой задачи (скрипты, тесты) изменения записываются сразу в сессии
+    вызывающего кода.
+
+    Наследники реализуют ``_combine`` и ``_write``.
+    """
+
+    name = "write-behind"
+
+    def __init__(self, max_staleness: float = 5.0, max_pending: int = 5000):
+        """Инициализация буфера.
+
+        Args:
+            max_staleness: Максимальная задержка записи изменений в секундах
+            max_pending: Количество ключей в буфере, при котором запись начинается сразу
+        """
+        self.max_staleness = max_staleness
+        self.max_pending = max_pending
+
+        self._pending: Dict[KeyType, ValueType] = {}
+        self._flush_requested = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._flusher: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._stats = {"buffered": 0, "flushes": 0, "rows_written": 0, "failed_flushes": 0}
+
+    @property
+    def is_running(self) -> bool:
+        """Запущена ли фоновая запись."""
+        return self._flusher is not None and not self._flusher.done()
+
+    def start(self) -> None:
+        """Запускает фоновую задачу записи."""
+        if self.is_running:
+            return
+        self._stopping = False
+        self._flusher = asyncio.create_task(self._run(), name=self.name)
+        logger.info(f"Отложенная запись {self.name} запущена: задержка до {self.max_staleness} с")
+
+    async def stop(self) -> None:
+        """Останавливает фоновую задачу и записывает накопленные изменения."""
+        if self._flusher is not None:
+            self._stopping = True
+            self._flush_requested.set()
+            await self._flusher
+            self._flusher = None
+        await self.flush()
+        logger.info(f"Отложенная запись {self.name} остановлена: {self.get_stats()}")
+
+    def add(self, key: KeyType, value: ValueType) -> None:
+        """Добавляет изменение в буфер."""
+        self._merge(key, value)
+        self._stats["buffered"] += 1
+        if len(self._pending) >= self.max_pending:
+            self._flush_requested.set()
+
+    async def record(self, db: AsyncSession, changes: Dict[KeyType, ValueType]) -> None:
+        """Учитывает изменения: в буфере, если фоновая запись запущена, иначе сразу в сессии db.
+
+        Внутри единицы работы изменения попадают в буфер только после ее
+        фиксации: при откате транзакции вызывающего кода они отбрасываются
+        вместе с остальными ее изменениями.
+
+        Args:
+            db: Сессия базы данных вызывающего кода
+            changes: Изменения по ключам
+        """
+        if not self.is_running:
+            await self._write(db, changes)
+            return
+
+        after_commit(db, lambda: self._add_all(changes))
+
+    def _add_all(self, changes: Dict[KeyType, ValueType]) -> None:
+        """Добавляет изменения в буфер."""
+        for key, value in changes.items():
+            self.add(key, value)
+
+    def pending(self, key: KeyType) -> Optional[ValueType]:
+        """Возвращает еще не записанное изменение по ключу."""
+        return self._pending.get(key)
+
+    async def flush(self) -> int:
+        """Записывает накопленные изменения.
+
+        Returns:
+            Количество записанных ключей
+        """
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+
+            changes, self._pending = self._pending, {}
+            try:
+                async with session_scope() as db:
+                    await self._write(db, changes)
+            except Exception as e:
+                # Возвращаем изменения в буфер, чтобы записать их при следующей попытке
+                for key, value in changes.items():
+                    self._merge(key, value)
+                self._stats["failed_flushes"] += 1
+                logger.error(f"Ошибка отложенной записи {self.name} ({len(changes)} ключей): {e}")
+                return 0
+
+            self._stats["flushes"] += 1
+            self._stats["rows_written"] += len(changes)
+            return len(changes)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Возвращает счетчики буфера и количество ожидающих записи ключей."""
+        return {**self._stats, "pending": len(self._pending)}
+
+    def _merge(self, key: KeyType, value: ValueType) -> None:
+        """Объединяет изменение с уже накопленным по тому же ключу."""
+        current = self._pending.get(key)
+        self._pending[key] = value if current is None else self._combine(current, value)
+
+    def _combine(self, current: ValueType, value: ValueType) -> ValueType:
+        """Объединяет два изменения одного ключа."""
+        raise NotImplementedError
+
+    async def _write(self, db: AsyncSession, changes: Dict[KeyType, Any]) -> None:
+        """Записывает изменения в БД."""
+        raise NotImplementedError
+
+    async def _run(self) -> None:
+        """Цикл фоновой записи: по таймеру или при переполнении буфера."""
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), timeout=self.max_staleness)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            await self.flush()
@@ -20,6 +20,10 @@ from backend.core.dependencies import (
 )
 from backend.core.security import create_access_token
 from backend.main import app
+from backend.services.menu_snapshot import menu_snapshot
+from backend.services.search_engine import search_engine
+from backend.services.search_results import search_result_cache
+from backend.services.user_access import user_access_resolver
 
 from backend.tests.fixtures import (
     active_template,
@@ -35,6 +39,8 @@ from backend.tests.fixtures import (
     menu_item_crud,
     menu_items_fixture,
     moderator_user,
+    pooled_session_engine,
+    sql_counter,
     telegram_users_fixture,
     telegram_user_crud,
     user_free,
@@ -87,6 +93,12 @@ async def db_session(postgresql_async_engine) -> AsyncSession:
     for table in reversed(Base.metadata.sorted_tables):
         await session.execute(table.delete())
     await session.commit()
+    # Снимок меню, поисковый индекс, результаты поиска и кэш пользователей от предыдущего теста
+    # не соответствуют очищенной БД
+    menu_snapshot.invalidate()
+    search_engine.invalidate_all()
+    search_result_cache.invalidate()
+    user_access_resolver.invalidate()
 
     try:
         yield session
@@ -5,8 +5,10 @@ from datetime import timezone
 
 import pytest
 import pytest_asyncio
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 
+from backend.core.db import AsyncSessionLocal
 from backend.models.admin_user import AdminUser
 from backend.models.enums import AccessLevel, AdminRole, ItemType
 from backend.models.menu_item import MenuItem
@@ -201,7 +203,9 @@ async def menu_items_fixture(db_session: AsyncSession):
     premium_root = next(item for item in items if item.title == "Root Premium Item")
 
     free_content.parent_id = free_root.id
+    free_content.path = free_root.subtree_path
     premium_content.parent_id = premium_root.id
+    premium_content.path = premium_root.subtree_path
 
     await db_session.commit()
 
@@ -274,6 +278,45 @@ def user_activity_crud():
     return UserActivityCRUD()
 
 
+@pytest.fixture
+def sql_counter(db_session: AsyncSession):
+    """Счетчик SQL запросов и коммитов, выполненных через engine тестовой сессии."""
+
+    class SQLCounter:
+        statements = 0
+        commits = 0
+
+        def reset(self):
+            self.statements = 0
+            self.commits = 0
+
+    counter = SQLCounter()
+
+    def on_statement(*args):
+        counter.statements += 1
+
+    def on_commit(*args):
+        counter.commits += 1
+
+    sync_engine = db_session.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", on_statement)
+    event.listen(sync_engine, "commit", on_commit)
+    yield counter
+    event.remove(sync_engine, "before_cursor_execute", on_statement)
+    event.remove(sync_engine, "commit", on_commit)
+
+
+@pytest_asyncio.fixture
+async def pooled_session_engine(database_url: str):
+    """Engine с пулом соединений к тестовой БД, к которому привязан AsyncSessionLocal."""
+    engine = create_async_engine(database_url, pool_size=20, max_overflow=0)
+    original_bind = AsyncSessionLocal.session_factory.kw["bind"]
+    AsyncSessionLocal.session_factory.configure(bind=engine)
+    yield engine
+    AsyncSessionLocal.session_factory.configure(bind=original_bind)
+    await engine.dispose()
+
+
 # Фикстуры сервисов и утилит
 @pytest.fixture
 def analytics_crud():
@@ -1,12 +1,20 @@
 """Тесты аналитики и отчетности."""
 
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.crud.activity_stats import ACTIVITY_ROLLUP, activity_stats_crud
+from backend.crud.search_log import search_log_crud
+from backend.models.activity_stats import ActivityDailyStats, RollupWatermark
 from backend.models.admin_user import AdminUser
+from backend.models.enums import ActivityType
+from backend.models.menu_item import MenuItem
+from backend.models.telegram_user import TelegramUser
+from backend.models.user_activity import UserActivity
 from backend.schemas.admin.analytics import AdminAnalyticsRequest, AdminAnalyticsResponse
 
 
@@ -43,6 +51,26 @@ class TestAdminAnalyticsAPI:
         assert isinstance(data["content"], dict)
         assert "total_menu_items" in data["content"]
 
+    @pytest.mark.asyncio
+    async def test_get_analytics_section_filter(
+        self, async_client: AsyncClient, admin_token: str, menu_items_fixture: list[MenuItem]
+    ):
+        """Тест статистики контента по разделу верхнего уровня."""
+        # Arrange
+        free_root = next(item for item in menu_items_fixture if item.title == "Root Free Item")
+        endpoint = "/api/v1/admin/analytics"
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        params = {"section_id": free_root.id}
+
+        # Act
+        response = await async_client.get(endpoint, headers=headers, params=params)
+
+        # Assert
+        assert response.status_code == 200
+        content = response.json()["content"]
+        assert content["total_menu_items"] == 2
+        assert {item["title"] for item in content["most_viewed"]} == {"Root Free Item", "Free Content Item"}
+
     @pytest.mark.asyncio
     async def test_get_analytics_with_period(self, async_client: AsyncClient, admin_token: str):
         """Тест получения аналитики с различными периодами."""
@@ -269,6 +297,31 @@ class TestAnalyticsCRUD:
         assert isinstance(result, dict)
         assert "total" in result
 
+    @pytest.mark.asyncio
+    async def test_get_users_statistics_single_query(self, db: AsyncSession, analytics_crud, sql_counter):
+        """Тест подсчета пользователей и активных пользователей одним запросом."""
+        # Arrange
+        now = datetime.now(timezone.utc)
+        last_activities = [now, now - timedelta(days=3), now - timedelta(days=20), now - timedelta(days=60), None]
+        db.add_all(
+            TelegramUser(
+                telegram_id=900_000 + i,
+                first_name=f"Пользователь {i}",
+                created_at=now - timedelta(days=90 if i == 0 else 1),
+                last_activity=last_activity,
+            )
+            for i, last_activity in enumerate(last_activities)
+        )
+        await db.commit()
+        sql_counter.reset()
+
+        # Act
+        result = await analytics_crud.get_users_statistics(db, start_date=now - timedelta(days=30))
+
+        # Assert
+        assert sql_counter.statements == 1
+        assert result == {"total": 4, "active_today": 1, "active_week": 2, "active_month": 3}
+
     @pytest.mark.asyncio
     async def test_get_content_statistics_success(self, db: AsyncSession, analytics_crud, mocker):
         """Тест успешного получения статистики контента."""
@@ -315,6 +368,154 @@ class TestAnalyticsCRUD:
         assert isinstance(result, dict)
         assert "total_views" in result
 
+    @pytest.mark.asyncio
+    async def test_get_activities_statistics_search_rollup(
+        self, db: AsyncSession, analytics_crud, telegram_users_fixture: list[TelegramUser]
+    ):
+        """Тест популярных запросов и запросов без результатов по суточной сводке журнала поиска."""
+        # Arrange
+        user_id = telegram_users_fixture[0].id
+        today = datetime.now(timezone.utc)
+        searches = [
+            ("Слуховой аппарат", 3, today),
+            ("слуховой аппарат", 0, today),
+            ("слуховой аппарат", 2, today - timedelta(days=1)),
+            ("сурдопереводчик", 0, today),
+            ("сурдопереводчик", 0, today - timedelta(days=10)),
+            ("логопед", 1, today),
+        ]
+        await search_log_crud.log_searches(
+            db,
+            [
+                {"telegram_user_id": user_id, "query": query, "results": results, "created_at": created_at}
+                for query, results, created_at in searches
+            ],
+        )
+
+        # Act
+        result = await analytics_crud.get_activities_statistics(db, start_date=today - timedelta(days=3))
+
+        # Assert
+        assert result["search_queries"] == [
+            {"query": "слуховой аппарат", "count": 3},
+            {"query": "логопед", "count": 1},
+            {"query": "сурдопереводчик", "count": 1},
+        ]
+        assert result["zero_result_queries"] == [
+            {"query": "слуховой аппарат", "count": 1},
+            {"query": "сурдопереводчик", "count": 1},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_activity_rollup_incremental_refresh(
+        self, db: AsyncSession, telegram_users_fixture: list[TelegramUser], menu_items_fixture: list[MenuItem]
+    ):
+        """Тест пополнения суточной сводки активностей после отметки."""
+        # Arrange: третья активность вставлена недавно, хотя created_at у нее старый
+        # (как у активности, долго ждавшей в очереди записи)
+        user_id = telegram_users_fixture[0].id
+        free_content = next(item for item in menu_items_fixture if item.title == "Free Content Item")
+        now = datetime.now(timezone.utc)
+        activities = [
+            UserActivity(
+                telegram_user_id=user_id,
+                activity_type=ActivityType.TEXT_VIEW,
+                menu_item_id=free_content.id,
+                created_at=now - timedelta(hours=2),
+                inserted_at=now - timedelta(hours=2),
+            ),
+            UserActivity(
+                telegram_user_id=user_id,
+                activity_type=ActivityType.SEARCH,
+                created_at=now - timedelta(days=3),
+                inserted_at=now - timedelta(hours=2),
+            ),
+            UserActivity(
+                telegram_user_id=user_id,
+                activity_type=ActivityType.TEXT_VIEW,
+                menu_item_id=free_content.id,
+                created_at=now - timedelta(hours=2),
+                inserted_at=now,
+            ),
+            UserActivity(
+                telegram_user_id=user_id,
+                activity_type=ActivityType.SEARCH,
+                created_at=now - timedelta(hours=2),
+                inserted_at=now - timedelta(hours=2),
+            ),
+        ]
+        for activity in activities:
+            db.add(activity)
+            await db.flush()
+        await db.commit()
+
+        # Act
+        first = await activity_stats_crud.roll_up(db, lag=timedelta(minutes=1), batch_size=2)
+        second = await activity_stats_crud.roll_up(db, lag=timedelta(minutes=1), batch_size=2)
+
+        # Assert: пачка остановилась перед недавно вставленной активностью
+        assert (first, second) == (2, 0)
+        watermark = (
+            await db.execute(select(RollupWatermark).where(RollupWatermark.name == ACTIVITY_ROLLUP))
+        ).scalar_one()
+        assert watermark.last_id == activities[1].id
+        rows = (await db.execute(select(ActivityDailyStats))).scalars().all()
+        assert sum(row.count for row in rows) == first
+        assert {(row.activity_type, row.menu_item_id, row.count) for row in rows} == {
+            (ActivityType.TEXT_VIEW, free_content.id, 1),
+            (ActivityType.SEARCH, 0, 1),
+        }
+
+    @pytest.mark.asyncio
+    async def test_activity_counts_from_rollup_and_tail(
+        self, db: AsyncSession, telegram_users_fixture: list[TelegramUser], menu_items_fixture: list[MenuItem]
+    ):
+        """Тест совпадения статистики по сводке и хвосту со статистикой по исходной таблице."""
+        # Arrange
+        user_id = telegram_users_fixture[0].id
+        items = {item.title: item for item in menu_items_fixture}
+        free_root = items["Root Free Item"]
+        now = datetime.now(timezone.utc)
+
+        async def add_activities():
+            db.add_all(
+                [
+                    UserActivity(
+                        telegram_user_id=user_id,
+                        activity_type=ActivityType.VIDEO_VIEW,
+                        menu_item_id=items["Free Content Item"].id,
+                        created_at=now - timedelta(days=1),
+                    ),
+                    UserActivity(
+                        telegram_user_id=user_id,
+                        activity_type=ActivityType.PDF_DOWNLOAD,
+                        menu_item_id=items["Premium Content Item"].id,
+                        created_at=now - timedelta(days=1),
+                    ),
+                    UserActivity(
+                        telegram_user_id=user_id,
+                        activity_type=ActivityType.NAVIGATION,
+                        menu_item_id=free_root.id,
+                        created_at=now - timedelta(days=20),
+                    ),
+                ]
+            )
+            await db.commit()
+
+        await add_activities()
+        before = await activity_stats_crud.get_counts_by_type(db, start_day=(now - timedelta(days=7)).date())
+
+        # Act: половина активностей в сводке, половина в хвосте
+        await activity_stats_crud.roll_up(db, lag=timedelta(0), batch_size=100)
+        await add_activities()
+        counts = await activity_stats_crud.get_counts_by_type(db, start_day=(now - timedelta(days=7)).date())
+        section_counts = await activity_stats_crud.get_counts_by_type(db, section_id=free_root.id)
+
+        # Assert
+        assert before == {ActivityType.VIDEO_VIEW: 1, ActivityType.PDF_DOWNLOAD: 1}
+        assert counts == {ActivityType.VIDEO_VIEW: 2, ActivityType.PDF_DOWNLOAD: 2}
+        assert section_counts == {ActivityType.VIDEO_VIEW: 2, ActivityType.NAVIGATION: 2}
+
     @pytest.mark.asyncio
     async def test_get_questions_statistics_success(self, db: AsyncSession, analytics_crud, mocker):
         """Тест успешного получения статистики вопросов."""
@@ -1,11 +1,16 @@
 """Тесты интеграции с Telegram ботом."""
 
+import asyncio
+
 import pytest
 from fastapi import HTTPException
 from httpx import AsyncClient
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.models.menu_item import MenuItem
 from backend.models.telegram_user import TelegramUser
+from backend.models.user_activity import UserActivity
 from backend.schemas.bot.message_template import BotMessageTemplateResponse
 from backend.schemas.bot.telegram_user import (
     BotInactiveUserResponse,
@@ -15,6 +20,9 @@ from backend.schemas.bot.telegram_user import (
 )
 from backend.services.message_template import message_template_service
 from backend.services.telegram_user import telegram_user_service
+from bot.utils.activity_pipeline import ActivityPipeline
+from bot.utils.api_client import ACTIVITY, HOT_PATH, REMINDER, APIClient, APIClientError, BulkheadFullError, api_client
+from bot.utils.resilience import Bulkhead, CircuitBreaker, CircuitState, EndpointPolicy
 
 
 @pytest.mark.unit
@@ -352,6 +360,122 @@ class TestBotMessageTemplateAPI:
             assert field in data
 
 
+@pytest.mark.unit
+class TestBotMenuNavigateAPI:
+    """Тесты Bot API навигации по меню."""
+
+    endpoint = "/api/v1/bot/menu/navigate"
+
+    @pytest.mark.asyncio
+    async def test_navigate_to_section_returns_children_and_records_activity(
+        self,
+        async_client: AsyncClient,
+        db: AsyncSession,
+        telegram_users_fixture: list[TelegramUser],
+        menu_items_fixture: list[MenuItem],
+    ):
+        """Тест открытия раздела: дочерние пункты, цепочка разделов и запись навигации."""
+        # Arrange
+        free_user = next(user for user in telegram_users_fixture if user.subscription_type == "free")
+        free_root = next(item for item in menu_items_fixture if item.title == "Root Free Item")
+        payload = {"telegram_user_id": free_user.telegram_id, "menu_item_id": free_root.id}
+
+        # Act
+        response = await async_client.post(self.endpoint, json=payload)
+
+        # Assert
+        assert response.status_code == 200
+        data = response.json()
+        assert data["item"]["id"] == free_root.id
+        assert [child["title"] for child in data["children"]] == ["Free Content Item"]
+        assert data["parent"] is None
+        assert data["breadcrumbs"] == [{"id": free_root.id, "title": "Root Free Item"}]
+        assert data["activity_type"] == "navigation"
+        activities = (await db.execute(select(UserActivity).where(UserActivity.menu_item_id == free_root.id))).scalars()
+        assert [activity.activity_type for activity in activities] == ["navigation"]
+
+    @pytest.mark.asyncio
+    async def test_navigate_to_material_returns_content_and_parent(
+        self, async_client: AsyncClient, telegram_users_fixture: list[TelegramUser], menu_items_fixture: list[MenuItem]
+    ):
+        """Тест открытия материала: контент, родительский раздел и запись открытия материала."""
+        # Arrange
+        free_user = next(user for user in telegram_users_fixture if user.subscription_type == "free")
+        content_item = next(item for item in menu_items_fixture if item.title == "Free Content Item")
+        payload = {"telegram_user_id": free_user.telegram_id, "menu_item_id": content_item.id}
+
+        # Act
+        response = await async_client.post(self.endpoint, json=payload)
+
+        # Assert
+        assert response.status_code == 200
+        data = response.json()
+        assert data["item"]["item_type"] == "content"
+        assert data["parent"]["id"] == content_item.parent_id
+        assert [crumb["id"] for crumb in data["breadcrumbs"]] == [content_item.parent_id, content_item.id]
+        assert data["activity_type"] == "material_open"
+
+    @pytest.mark.asyncio
+    async def test_navigate_back_opens_parent_without_activity(
+        self,
+        async_client: AsyncClient,
+        db: AsyncSession,
+        telegram_users_fixture: list[TelegramUser],
+        menu_items_fixture: list[MenuItem],
+    ):
+        """Тест возврата из материала в родительский раздел без записи активности."""
+        # Arrange
+        free_user = next(user for user in telegram_users_fixture if user.subscription_type == "free")
+        content_item = next(item for item in menu_items_fixture if item.title == "Free Content Item")
+        payload = {"telegram_user_id": free_user.telegram_id, "menu_item_id": content_item.id, "back": True}
+
+        # Act
+        response = await async_client.post(self.endpoint, json=payload)
+
+        # Assert
+        assert response.status_code == 200
+        data = response.json()
+        assert data["item"]["id"] == content_item.parent_id
+        assert [child["id"] for child in data["children"]] == [content_item.id]
+        assert data["activity_type"] is None
+        assert (await db.execute(select(func.count(UserActivity.id)))).scalar() == 0
+
+    @pytest.mark.asyncio
+    async def test_navigate_back_from_root_item_returns_root_level(
+        self, async_client: AsyncClient, telegram_users_fixture: list[TelegramUser], menu_items_fixture: list[MenuItem]
+    ):
+        """Тест возврата из пункта верхнего уровня на корневой уровень меню."""
+        # Arrange
+        free_user = next(user for user in telegram_users_fixture if user.subscription_type == "free")
+        free_root = next(item for item in menu_items_fixture if item.title == "Root Free Item")
+        payload = {"telegram_user_id": free_user.telegram_id, "menu_item_id": free_root.id, "back": True}
+
+        # Act
+        response = await async_client.post(self.endpoint, json=payload)
+
+        # Assert
+        assert response.status_code == 200
+        data = response.json()
+        assert data["item"] is None
+        assert [child["title"] for child in data["children"]] == ["Root Free Item"]
+
+    @pytest.mark.asyncio
+    async def test_navigate_to_premium_item_as_free_user(
+        self, async_client: AsyncClient, telegram_users_fixture: list[TelegramUser], menu_items_fixture: list[MenuItem]
+    ):
+        """Тест запрета открытия премиум раздела бесплатным пользователем."""
+        # Arrange
+        free_user = next(user for user in telegram_users_fixture if user.subscription_type == "free")
+        premium_root = next(item for item in menu_items_fixture if item.title == "Root Premium Item")
+        payload = {"telegram_user_id": free_user.telegram_id, "menu_item_id": premium_root.id}
+
+        # Act
+        response = await async_client.post(self.endpoint, json=payload)
+
+        # Assert
+        assert response.status_code == 400
+
+
 @pytest.mark.unit
 class TestTelegramUserService:
     """Тесты сервиса TelegramUserService для Bot API."""
@@ -411,6 +535,35 @@ class TestTelegramUserService:
         assert result.user["telegram_id"] == existing_user.telegram_id
         assert result.user["first_name"] == request.message["from"]["first_name"]
 
+    @pytest.mark.asyncio
+    async def test_register_user_single_statement_reports_created(self, db: AsyncSession, sql_counter):
+        """Тест регистрации одним upsert без предварительного SELECT с признаком создания."""
+        # Arrange
+        request = TelegramUserRequest(
+            update_id=123458,
+            message={
+                "message_id": 3,
+                "from": {"id": 987650001, "first_name": "Fast", "username": "fastpath"},
+                "chat": {"id": 987650001},
+            },
+        )
+        sql_counter.reset()
+
+        # Act
+        created = await telegram_user_service.register_user(request, db)
+        statements_on_create = sql_counter.statements
+        updated = await telegram_user_service.register_user(request, db)
+
+        # Assert
+        assert statements_on_create == 1
+        assert sql_counter.statements == 2
+        assert sql_counter.commits == 2
+        assert created.user_created is True
+        assert created.user_updated is False
+        assert updated.user_created is False
+        assert updated.user_updated is True
+        assert updated.user["id"] == created.user["id"]
+
     @pytest.mark.asyncio
     async def test_get_inactive_users_success(self, db: AsyncSession, telegram_users_fixture: list[TelegramUser]):
         """Тест успешного получения неактивных пользователей."""
@@ -526,3 +679,101 @@ class TestMessageTemplateService:
         for attr in required_attributes:
             assert hasattr(result, attr)
         assert expected_placeholder in result.message_template
+
+
+@pytest.mark.unit
+class TestBotAPIClientResilience:
+    """Тесты отказоустойчивости HTTP клиента бота и очереди активностей."""
+
+    @staticmethod
+    def _client(max_concurrent: int = 1) -> APIClient:
+        """Клиент с цепью в HALF_OPEN и одним пробным запросом."""
+        policies = {
+            name: EndpointPolicy(
+                name=name,
+                timeout=1,
+                breaker=CircuitBreaker(name, failure_threshold=1, recovery_timeout=0, half_open_max_calls=1),
+                bulkhead=Bulkhead(name, max_concurrent=max_concurrent, acquire_timeout=0.01),
+            )
+            for name in (HOT_PATH, ACTIVITY, REMINDER)
+        }
+        client = APIClient("http://backend", retries=1, policies=policies)
+        policies[HOT_PATH].breaker.record_failure()
+        assert policies[HOT_PATH].breaker.state == CircuitState.HALF_OPEN
+        return client
+
+    @pytest.mark.asyncio
+    async def test_half_open_probe_rejected_by_bulkhead(self):
+        """Тест: отказ bulkhead не расходует пробный запрос HALF_OPEN."""
+        # Arrange
+        client = self._client()
+        policy = client.policies[HOT_PATH]
+        assert await policy.bulkhead.acquire()
+
+        # Act
+        with pytest.raises(BulkheadFullError):
+            await client._send_request("GET", "api/v1/bot/menu-items")
+        policy.bulkhead.release()
+
+        # Assert
+        assert policy.breaker.state == CircuitState.HALF_OPEN
+        assert policy.breaker.allow_request() is True
+
+    @pytest.mark.asyncio
+    async def test_cancelled_half_open_probe_released(self, mocker):
+        """Тест: отмененный пробный запрос возвращает слот HALF_OPEN."""
+        # Arrange
+        client = self._client()
+        policy = client.policies[HOT_PATH]
+        started = asyncio.Event()
+
+        async def hanging_session():
+            started.set()
+            await asyncio.Event().wait()
+
+        mocker.patch.object(client, "_get_session", side_effect=hanging_session)
+        task = asyncio.create_task(client._send_request("GET", "api/v1/bot/menu-items"))
+        await started.wait()
+
+        # Act
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        # Assert
+        assert policy.bulkhead.in_flight == 0
+        assert policy.breaker.state == CircuitState.HALF_OPEN
+        assert policy.breaker.allow_request() is True
+
+    @pytest.mark.parametrize("method,attempts", [("POST", 1), ("GET", 3)])
+    @pytest.mark.asyncio
+    async def test_timeout_retried_only_for_idempotent_methods(self, mocker, method: str, attempts: int):
+        """Тест: запрос POST после таймаута не повторяется, GET - повторяется."""
+        # Arrange
+        client = APIClient("http://backend", retries=3, retry_backoff_base=0)
+        session = mocker.MagicMock()
+        session.request.return_value.__aenter__.side_effect = asyncio.TimeoutError()
+        mocker.patch.object(client, "_get_session", return_value=session)
+
+        # Act
+        with pytest.raises(APIClientError):
+            await client._send_request(method, "api/v1/public/questions/")
+
+        # Assert
+        assert session.request.call_count == attempts
+
+    @pytest.mark.asyncio
+    async def test_activity_batch_unexpected_error_counted_as_failed(self, mocker):
+        """Тест: неожиданная ошибка отправки пачки активностей не останавливает очередь."""
+        # Arrange
+        pipeline = ActivityPipeline(batch_size=10)
+        mocker.patch.object(api_client, "_make_request", side_effect=ValueError("malformed response"))
+        batch = [{"telegram_user_id": 1, "activity_type": "navigation"}] * 3
+
+        # Act
+        await pipeline._send_batch(batch)
+
+        # Assert
+        stats = pipeline.get_stats()
+        assert stats["failed"] == 3
+        assert stats["sent"] == 0
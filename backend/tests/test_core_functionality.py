@@ -1,10 +1,14 @@
 """Тесты базовой инфраструктуры."""
 
+import asyncio
+from datetime import datetime, timezone
+
 import pytest
 from fastapi import HTTPException, status
+from sqlalchemy import text
 
 from backend.core.config import Settings
-from backend.core.db import Base, engine, get_session
+from backend.core.db import AsyncSessionLocal, Base, engine, get_session
 from backend.core.dependencies import get_current_admin, require_admin_role, require_moderator_or_admin_role
 from backend.core.security import (
     create_access_token,
@@ -16,6 +20,9 @@ from backend.core.security import (
     verify_token,
     verify_token_payload_for_password_reset,
 )
+from backend.crud.base import in_unit_of_work, unit_of_work
+from backend.crud.telegram_user import telegram_user_crud
+from backend.services.user_touch import UserTouchWriter
 from backend.validators.admin_user import admin_user_validator
 from backend.models.admin_user import AdminUser
 from backend.models.enums import AdminRole
@@ -305,6 +312,127 @@ class TestDatabaseConnection:
         assert hasattr(Base, "metadata")
         assert hasattr(Base.metadata, "tables")
 
+    @pytest.mark.asyncio
+    async def test_get_session_scopes_session_to_request(self, pooled_session_engine):
+        """Тест: внутри запроса AsyncSessionLocal возвращает сессию запроса, после запроса она удаляется."""
+        # Act
+        session_generator = get_session()
+        session = await session_generator.__anext__()
+        scoped = AsyncSessionLocal()
+        await session_generator.aclose()
+
+        # Assert
+        assert scoped is session
+        assert not AsyncSessionLocal.registry.has()
+
+    @pytest.mark.asyncio
+    async def test_parallel_requests_use_independent_sessions(self, pooled_session_engine):
+        """Стресс-тест: N параллельных запросов получают N разных сессий и N соединений из пула."""
+        # Arrange
+        requests_count = 15
+
+        async def handle_request():
+            session_generator = get_session()
+            session = await session_generator.__anext__()
+            try:
+                backend_pid = (await session.execute(text("SELECT pg_backend_pid()"))).scalar_one()
+                # Держим соединение, пока остальные запросы берут свои
+                await asyncio.sleep(0.2)
+                return session, backend_pid
+            finally:
+                await session_generator.aclose()
+
+        # Act
+        results = await asyncio.gather(*(handle_request() for _ in range(requests_count)))
+
+        # Assert
+        assert len({id(session) for session, _ in results}) == requests_count
+        assert len({backend_pid for _, backend_pid in results}) == requests_count
+        assert pooled_session_engine.pool.checkedout() == 0
+
+
+@pytest.mark.unit
+class TestUnitOfWork:
+    """Тесты единицы работы CRUD слоя."""
+
+    @pytest.mark.asyncio
+    async def test_unit_of_work_commits_once(self, db, sql_counter):
+        """Тест фиксации нескольких CRUD операций одним коммитом."""
+        # Arrange
+        sql_counter.reset()
+
+        # Act
+        async with unit_of_work(db):
+            user = await telegram_user_crud.create(db, obj_in={"telegram_id": 555000111, "first_name": "Test"})
+            await telegram_user_crud.increment_activities_count(db, telegram_user_id=user.id)
+            await telegram_user_crud.increment_questions_count(db, telegram_user_id=user.id)
+
+        # Assert
+        assert sql_counter.commits == 1
+        assert not in_unit_of_work(db)
+        stored = await telegram_user_crud.get_by_telegram_id(db, 555000111)
+        assert stored is not None
+
+    @pytest.mark.asyncio
+    async def test_unit_of_work_rollback_on_error(self, db):
+        """Тест отката всех операций единицы работы при исключении."""
+        # Act
+        with pytest.raises(RuntimeError):
+            async with unit_of_work(db):
+                await telegram_user_crud.create(db, obj_in={"telegram_id": 555000222, "first_name": "Test"})
+                raise RuntimeError("boom")
+
+        # Assert
+        assert not in_unit_of_work(db)
+        assert await telegram_user_crud.get_by_telegram_id(db, 555000222) is None
+
+    @pytest.mark.asyncio
+    async def test_nested_unit_of_work_joins_outer(self, db, sql_counter):
+        """Тест присоединения вложенной единицы работы к внешней."""
+        # Arrange
+        sql_counter.reset()
+
+        # Act
+        async with unit_of_work(db):
+            async with unit_of_work(db):
+                await telegram_user_crud.create(db, obj_in={"telegram_id": 555000333, "first_name": "Test"})
+            assert in_unit_of_work(db)
+            assert sql_counter.commits == 0
+
+        # Assert
+        assert sql_counter.commits == 1
+
+    @pytest.mark.asyncio
+    async def test_write_behind_buffers_only_committed_changes(self, db, mocker):
+        """Тест: отложенные изменения попадают в буфер только после фиксации единицы работы."""
+        # Arrange
+        writer = UserTouchWriter(max_staleness=60)
+        write = mocker.patch.object(writer, "_write", new_callable=mocker.AsyncMock)
+        touched_at = datetime.now(timezone.utc)
+        writer.start()
+
+        try:
+            # Act
+            with pytest.raises(RuntimeError):
+                async with unit_of_work(db):
+                    await writer.record(db, {1: (1, touched_at)})
+                    raise RuntimeError("boom")
+            rolled_back = writer.pending(1)
+
+            async with unit_of_work(db):
+                await writer.record(db, {2: (1, touched_at)})
+                uncommitted = writer.pending(2)
+            committed = writer.pending(2)
+        finally:
+            await writer.stop()
+
+        # Assert
+        assert rolled_back is None
+        assert uncommitted is None
+        assert committed is not None
+        write.assert_awaited_once()
+        assert set(write.await_args.args[1]) == {2}
+
 
 @pytest.mark.unit
 class TestDependencies:
@@ -300,6 +300,25 @@ class TestAdminMenuAPI:
         data = response.json()
         assert "дочерние элементы" in data["detail"].lower()
 
+    @pytest.mark.asyncio
+    async def test_update_menu_item_parent_cycle(
+        self, async_client: AsyncClient, admin_token: str, menu_items_fixture: list[MenuItem]
+    ):
+        """Тест запрета перемещения раздела в собственный подраздел."""
+        # Arrange
+        content_item = next(item for item in menu_items_fixture if item.title == "Free Content Item")
+        endpoint = f"/api/v1/admin/menu-items/{content_item.parent_id}"
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        update_data = {"parent_id": content_item.id}
+        expected_status_code = 400
+
+        # Act
+        response = await async_client.patch(endpoint, headers=headers, json=update_data)
+
+        # Assert
+        assert response.status_code == expected_status_code
+        assert "собственный подраздел" in response.json()["detail"]
+
 
 @pytest.mark.unit
 class TestMenuItemService:
@@ -572,3 +591,58 @@ class TestMenuItemCRUD:
         assert len(active_items) <= len(all_items)
         for item in active_items:
             assert item.is_active is True
+
+    @pytest.mark.asyncio
+    async def test_create_sets_materialized_path(
+        self, db: AsyncSession, menu_items_fixture: list[MenuItem], menu_item_crud
+    ):
+        """Тест заполнения материализованного пути при создании пункта меню."""
+        # Arrange
+        content_item = next(item for item in menu_items_fixture if item.title == "Free Content Item")
+        menu_data = {"title": "Вложенный пункт", "parent_id": content_item.id, "item_type": ItemType.CONTENT}
+
+        # Act
+        result = await menu_item_crud.create(db, obj_in=menu_data)
+
+        # Assert
+        assert result.path == f"/{content_item.parent_id}/{content_item.id}/"
+        assert result.section_id == content_item.parent_id
+        assert result.is_under(content_item.id) is True
+
+    @pytest.mark.asyncio
+    async def test_update_parent_moves_subtree_paths(
+        self, db: AsyncSession, menu_items_fixture: list[MenuItem], menu_item_crud
+    ):
+        """Тест переноса путей всего поддерева при смене родителя."""
+        # Arrange
+        free_root = next(item for item in menu_items_fixture if item.title == "Root Free Item")
+        premium_root = next(item for item in menu_items_fixture if item.title == "Root Premium Item")
+        grandchild = await menu_item_crud.create(
+            db, obj_in={"title": "Вложенный пункт", "parent_id": free_root.id, "item_type": ItemType.NAVIGATION}
+        )
+        leaf = await menu_item_crud.create(
+            db, obj_in={"title": "Лист", "parent_id": grandchild.id, "item_type": ItemType.CONTENT}
+        )
+        moved = await menu_item_crud.get(db, free_root.id)
+
+        # Act
+        await menu_item_crud.update(db, db_obj=moved, obj_in={"parent_id": premium_root.id})
+        descendants = await menu_item_crud.get_descendants(db, premium_root)
+
+        # Assert
+        paths = {item.id: item.path for item in descendants}
+        assert paths[free_root.id] == f"/{premium_root.id}/"
+        assert paths[grandchild.id] == f"/{premium_root.id}/{free_root.id}/"
+        assert paths[leaf.id] == f"/{premium_root.id}/{free_root.id}/{grandchild.id}/"
+
+    @pytest.mark.asyncio
+    async def test_get_descendants(self, db: AsyncSession, menu_items_fixture: list[MenuItem], menu_item_crud):
+        """Тест получения потомков пункта меню по материализованному пути."""
+        # Arrange
+        free_root = next(item for item in menu_items_fixture if item.title == "Root Free Item")
+
+        # Act
+        descendants = await menu_item_crud.get_descendants(db, free_root)
+
+        # Assert
+        assert [item.title for item in descendants] == ["Free Content Item"]
@@ -8,7 +8,8 @@ from backend.models.menu_item import MenuItem
 from backend.models.telegram_user import TelegramUser
 from backend.schemas.public.question import UserQuestionCreate
 from backend.schemas.public.ratings import RatingRequest
-from backend.schemas.public.user_activity import UserActivityRequest
+from backend.schemas.public.user_activity import UserActivityBatchRequest, UserActivityRequest
+from backend.services.menu_counters import menu_counter_writer
 from backend.services.menu_item import MenuItemService
 from backend.services.question import UserQuestionService
 from backend.services.ratings import RatingService
@@ -199,6 +200,89 @@ class TestPublicMenuAPI:
         # Assert
         assert response.status_code == expected_status_code
 
+    @pytest.mark.asyncio
+    async def test_get_menu_item_content_inactive_forbidden(
+        self, async_client: AsyncClient, telegram_users_fixture: list[TelegramUser], menu_items_fixture: list[MenuItem]
+    ):
+        """Тест отказа 403 в контенте существующего неактивного пункта меню."""
+        # Arrange
+        free_user = next(user for user in telegram_users_fixture if user.subscription_type == "free")
+        inactive_item = next(item for item in menu_items_fixture if item.title == "Inactive Root Item")
+        url = f"/api/v1/public/menu-items/{inactive_item.id}/content?telegram_user_id={free_user.telegram_id}"
+
+        # Act
+        response = await async_client.get(url)
+
+        # Assert
+        assert response.status_code == 403
+        assert "неактивен" in response.json()["detail"]
+
+    @pytest.mark.asyncio
+    async def test_get_menu_items_not_modified_by_etag(
+        self, async_client: AsyncClient, telegram_users_fixture: list[TelegramUser], menu_items_fixture: list[MenuItem]
+    ):
+        """Тест ответа 304 на повторный запрос меню с актуальным ETag."""
+        # Arrange
+        free_user = next(user for user in telegram_users_fixture if user.subscription_type == "free")
+        url = f"/api/v1/public/menu-items?telegram_user_id={free_user.telegram_id}"
+        first_response = await async_client.get(url)
+        etag = first_response.headers["ETag"]
+
+        # Act
+        response = await async_client.get(url, headers={"If-None-Match": etag})
+
+        # Assert
+        assert first_response.status_code == 200
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        assert response.content == b""
+
+    @pytest.mark.asyncio
+    async def test_get_menu_item_content_etag_changes_after_admin_update(
+        self, async_client: AsyncClient, telegram_users_fixture: list[TelegramUser], menu_items_fixture: list[MenuItem]
+    ):
+        """Тест обновления снимка меню и ETag после изменения пункта меню в админке."""
+        # Arrange
+        free_user = next(user for user in telegram_users_fixture if user.subscription_type == "free")
+        content_item = next(item for item in menu_items_fixture if item.title == "Free Content Item")
+        url = f"/api/v1/public/menu-items/{content_item.id}/content?telegram_user_id={free_user.telegram_id}"
+        etag = (await async_client.get(url)).headers["ETag"]
+
+        # Act
+        update_response = await async_client.patch(
+            f"/api/v1/admin/menu-items/{content_item.id}", json={"title": "Обновленный материал"}
+        )
+        response = await async_client.get(url, headers={"If-None-Match": etag})
+
+        # Assert
+        assert update_response.status_code == 200
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        assert response.json()["title"] == "Обновленный материал"
+
+    @pytest.mark.asyncio
+    async def test_get_menu_items_served_from_snapshot(
+        self,
+        async_client: AsyncClient,
+        telegram_users_fixture: list[TelegramUser],
+        menu_items_fixture: list[MenuItem],
+        sql_counter,
+    ):
+        """Тест отдачи меню из снимка и кэша пользователей без запросов к БД."""
+        # Arrange
+        premium_user = next(user for user in telegram_users_fixture if user.subscription_type == "premium")
+        url = f"/api/v1/public/menu-items?telegram_user_id={premium_user.telegram_id}"
+        await async_client.get(url)
+        sql_counter.reset()
+
+        # Act
+        response = await async_client.get(url)
+
+        # Assert
+        assert response.status_code == 200
+        # Пользователь берется из кэша, меню - из снимка
+        assert sql_counter.statements == 0
+
 
 @pytest.mark.unit
 class TestPublicQuestionAPI:
@@ -437,6 +521,71 @@ class TestPublicUserActivityAPI:
         assert expected_error_message in data["detail"]
 
 
+    @pytest.mark.asyncio
+    async def test_record_user_activities_batch_success(
+        self,
+        async_client: AsyncClient,
+        db: AsyncSession,
+        telegram_users_fixture: list[TelegramUser],
+        menu_items_fixture: list[MenuItem],
+    ):
+        """Тест пакетной записи активностей с частично некорректными событиями."""
+        # Arrange
+        endpoint = "/api/v1/public/user-activities/batch"
+        free_user = next(user for user in telegram_users_fixture if user.subscription_type == "free")
+        free_item = next(item for item in menu_items_fixture if item.title == "Free Content Item")
+        premium_item = next(item for item in menu_items_fixture if item.title == "Premium Content Item")
+        batch_data = {
+            "activities": [
+                {"telegram_user_id": free_user.telegram_id, "menu_item_id": free_item.id, "activity_type": "navigation"},
+                {"telegram_user_id": free_user.telegram_id, "menu_item_id": free_item.id, "activity_type": "text_view"},
+                {
+                    "telegram_user_id": free_user.telegram_id,
+                    "menu_item_id": free_item.id,
+                    "activity_type": "pdf_download",
+                },
+                {"telegram_user_id": free_user.telegram_id, "activity_type": "search", "search_query": "слух"},
+                {"telegram_user_id": 999999999, "activity_type": "navigation"},
+                {
+                    "telegram_user_id": free_user.telegram_id,
+                    "menu_item_id": premium_item.id,
+                    "activity_type": "navigation",
+                },
+            ]
+        }
+        expected_status_code = 201
+
+        # Act
+        response = await async_client.post(endpoint, json=batch_data)
+
+        # Assert
+        assert response.status_code == expected_status_code
+        data = response.json()
+        assert data["accepted"] == 4
+        assert data["rejected"] == 2
+        assert [error["index"] for error in data["errors"]] == [4, 5]
+        assert "Пользователь не найден" in data["errors"][0]["detail"]
+
+        stored_item = await db.get(MenuItem, free_item.id, populate_existing=True)
+        stored_user = await db.get(TelegramUser, free_user.id, populate_existing=True)
+        assert stored_item.view_count == free_item.view_count + 2
+        assert stored_item.download_count == free_item.download_count + 1
+        assert stored_user.activities_count == free_user.activities_count + 4
+
+    @pytest.mark.asyncio
+    async def test_record_user_activities_batch_empty(self, async_client: AsyncClient):
+        """Тест пакетной записи пустого списка активностей."""
+        # Arrange
+        endpoint = "/api/v1/public/user-activities/batch"
+        expected_status_code = 422
+
+        # Act
+        response = await async_client.post(endpoint, json={"activities": []})
+
+        # Assert
+        assert response.status_code == expected_status_code
+
+
 @pytest.mark.unit
 class TestPublicSearchAPI:
     """Тесты API эндпоинтов для поиска."""
@@ -971,6 +1120,26 @@ class TestUserQuestionService:
         assert expected_error_message in str(exc_info.value)
 
 
+    @pytest.mark.asyncio
+    async def test_create_user_question_single_commit(
+        self, db: AsyncSession, sql_counter, telegram_users_fixture: list[TelegramUser]
+    ):
+        """Тест создания вопроса и обновления счетчика вопросов одной транзакцией."""
+        # Arrange
+        service = UserQuestionService()
+        user = telegram_users_fixture[0]
+        question_data = UserQuestionCreate(telegram_user_id=user.telegram_id, question_text="Как подобрать аппарат?")
+        sql_counter.reset()
+
+        # Act
+        await service.create_user_question(question_data, db)
+
+        # Assert
+        # SELECT пользователя, INSERT вопроса, UPDATE счетчика вопросов
+        assert sql_counter.commits == 1
+        assert sql_counter.statements == 3
+
+
 @pytest.mark.unit
 class TestUserActivityService:
     """Тесты сервиса UserActivityService."""
@@ -1041,6 +1210,99 @@ class TestUserActivityService:
         assert expected_error_message in str(exc_info.value)
 
 
+    @pytest.mark.asyncio
+    async def test_record_activities_batch_matches_single_path(
+        self, db: AsyncSession, telegram_users_fixture: list[TelegramUser], menu_items_fixture: list[MenuItem]
+    ):
+        """Тест совпадения счетчиков после пакетной и одиночной записи одинаковых активностей."""
+        # Arrange
+        service = UserActivityService()
+        user = telegram_users_fixture[0]
+        menu_item = next(item for item in menu_items_fixture if item.title == "Free Content Item")
+        activities = [
+            UserActivityRequest(telegram_user_id=user.telegram_id, menu_item_id=menu_item.id, activity_type=activity)
+            for activity in ("navigation", "material_open", "media_view")
+        ]
+
+        # Act
+        for activity in activities:
+            await service.record_activity(activity, db)
+        result = await service.record_activities_batch(UserActivityBatchRequest(activities=activities), db)
+
+        # Assert
+        stored_item = await db.get(MenuItem, menu_item.id, populate_existing=True)
+        stored_user = await db.get(TelegramUser, user.id, populate_existing=True)
+        assert result.accepted == len(activities)
+        assert result.rejected == 0
+        assert stored_item.view_count == menu_item.view_count + 4
+        assert stored_item.download_count == menu_item.download_count + 2
+        assert stored_user.activities_count == user.activities_count + 6
+
+
+    @pytest.mark.asyncio
+    async def test_record_activity_single_commit(
+        self,
+        db: AsyncSession,
+        sql_counter,
+        telegram_users_fixture: list[TelegramUser],
+        menu_items_fixture: list[MenuItem],
+    ):
+        """Тест записи активности одной транзакцией без повторного чтения объектов."""
+        # Arrange
+        service = UserActivityService()
+        user = telegram_users_fixture[0]
+        menu_item = next(item for item in menu_items_fixture if item.title == "Free Content Item")
+        activity_data = UserActivityRequest(
+            telegram_user_id=user.telegram_id, menu_item_id=menu_item.id, activity_type="navigation"
+        )
+        sql_counter.reset()
+
+        # Act
+        await service.record_activity(activity_data, db)
+
+        # Assert
+        # SELECT пользователя, SELECT пункта меню, INSERT активности, два UPDATE счетчиков
+        assert sql_counter.commits == 1
+        assert sql_counter.statements == 5
+
+    @pytest.mark.asyncio
+    async def test_record_activity_buffers_menu_counters(
+        self,
+        db: AsyncSession,
+        pooled_session_engine,
+        telegram_users_fixture: list[TelegramUser],
+        menu_items_fixture: list[MenuItem],
+    ):
+        """Тест отложенной записи счетчиков просмотров и скачиваний одним обновлением."""
+        # Arrange
+        service = UserActivityService()
+        user = telegram_users_fixture[0]
+        menu_item = next(item for item in menu_items_fixture if item.title == "Free Content Item")
+        activity_types = ["navigation", "text_view", "pdf_download", "navigation"]
+        menu_counter_writer.start()
+
+        try:
+            # Act
+            for activity_type in activity_types:
+                await service.record_activity(
+                    UserActivityRequest(
+                        telegram_user_id=user.telegram_id, menu_item_id=menu_item.id, activity_type=activity_type
+                    ),
+                    db,
+                )
+            buffered_item = await db.get(MenuItem, menu_item.id, populate_existing=True)
+            pending = menu_counter_writer.pending(menu_item.id)
+        finally:
+            await menu_counter_writer.stop()
+
+        # Assert
+        assert buffered_item.view_count == menu_item.view_count
+        assert pending == (3, 1)
+        stored_item = await db.get(MenuItem, menu_item.id, populate_existing=True)
+        assert stored_item.view_count == menu_item.view_count + 3
+        assert stored_item.download_count == menu_item.download_count + 1
+
+
 @pytest.mark.unit
 class TestRatingService:
     """Тесты сервиса RatingService."""
@@ -1093,3 +1355,27 @@ class TestRatingService:
             await service.rate_material(rating_data, db)
 
         assert expected_error_message in str(exc_info.value)
+
+    @pytest.mark.asyncio
+    async def test_rate_material_single_commit(
+        self,
+        db: AsyncSession,
+        sql_counter,
+        telegram_users_fixture: list[TelegramUser],
+        menu_items_fixture: list[MenuItem],
+    ):
+        """Тест сохранения оценки одной транзакцией."""
+        # Arrange
+        service = RatingService()
+        user = telegram_users_fixture[0]
+        menu_item = next(item for item in menu_items_fixture if item.title == "Free Content Item")
+        rating_data = RatingRequest(telegram_user_id=user.telegram_id, menu_item_id=menu_item.id, rating=4)
+        sql_counter.reset()
+
+        # Act
+        await service.rate_material(rating_data, db)
+
+        # Assert
+        # SELECT пользователя, SELECT пункта меню, INSERT активности, UPDATE статистики оценок
+        assert sql_counter.commits == 1
+        assert sql_counter.statements == 4
@@ -1,13 +1,27 @@
 """Тесты поисковой функциональности."""
 
+import asyncio
+import threading
+
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import func, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.crud.menu_item import MenuItemCRUD
-from backend.models.enums import AccessLevel
+from backend.core.config import settings
+from backend.crud.menu_item import MenuItemCRUD, menu_item_crud
+from backend.models.content_file import ContentFile
+from backend.models.enums import AccessLevel, ActivityType, ContentType, ItemType
+from backend.models.menu_item import MenuItem
+from backend.models.search_log import SearchLog, SearchQueryDaily
+from backend.models.user_activity import UserActivity
+from backend.schemas.admin.menu import AdminMenuItemUpdate
 from backend.schemas.public.search import SearchListResponse
+from backend.services.activity_log import ActivityLogWriter, activity_log_writer
 from backend.services.menu_item import menu_item_service
+from backend.services.search_engine import SearchDocument, SearchEngine, SearchIndex, search_engine
+from backend.services.search_results import SearchResultKey, encode_search_cursor
+from backend.utils.stemmer import stem
 from backend.validators.menu_item import menu_item_validator
 
 
@@ -184,11 +198,109 @@ class TestMenuItemCRUD:
         # Assert
         assert len(results) <= expected_max
 
+    @pytest.mark.asyncio
+    async def test_search_by_query_section_filter(self, db: AsyncSession, menu_items_fixture):
+        """Тест поиска только внутри раздела верхнего уровня."""
+        # Arrange
+        crud = MenuItemCRUD()
+        free_root = next(item for item in menu_items_fixture if item.title == "Root Free Item")
+
+        # Act
+        results = await crud.search_by_query(
+            db=db, query="item", access_level=AccessLevel.PREMIUM, limit=10, section_id=free_root.id
+        )
+
+        # Assert
+        assert [item.title for item in results] == ["Root Free Item", "Free Content Item"]
+
+
+    @pytest.mark.asyncio
+    async def test_search_by_query_russian_stemming_and_rank(self, db: AsyncSession):
+        """Тест полнотекстового поиска: словоформы и приоритет совпадения в названии."""
+        # Arrange
+        crud = MenuItemCRUD()
+        in_description = MenuItem(title="Полезные советы", description="Как ухаживать за слуховыми аппаратами")
+        in_title = MenuItem(title="Слуховые аппараты", description="Обзор моделей")
+        unrelated = MenuItem(title="Кохлеарная имплантация", description="Подготовка к операции")
+        db.add_all([in_description, in_title, unrelated])
+        await db.commit()
+
+        # Act
+        results = await crud.search_by_query(db=db, query="слуховой аппарат", access_level=AccessLevel.FREE)
+        excluded = await crud.search_by_query(db=db, query="аппарат -советы", access_level=AccessLevel.FREE)
+
+        # Assert
+        assert [item.id for item in results] == [in_title.id, in_description.id]
+        assert [item.id for item in excluded] == [in_title.id]
+
+    @pytest.mark.asyncio
+    async def test_search_by_query_falls_back_to_substring(self, db: AsyncSession):
+        """Тест поиска по части слова, когда полнотекстовый поиск ничего не нашел."""
+        # Arrange
+        crud = MenuItemCRUD()
+        item = MenuItem(title="Слуховые аппараты", description="Обзор моделей")
+        db.add(item)
+        await db.commit()
+
+        # Act
+        by_text = await crud.search_by_text(db, "слухо", AccessLevel.FREE)
+        results = await crud.search_by_query(db=db, query="слухо", access_level=AccessLevel.FREE)
+
+        # Assert
+        assert by_text == []
+        assert [found.id for found in results] == [item.id]
+
+    @pytest.mark.asyncio
+    async def test_search_by_similarity_with_typo(self, db: AsyncSession):
+        """Тест поиска с опечаткой через pg_trgm (только на сервере с расширением pg_trgm)."""
+        # Arrange
+        available = await db.execute(text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'"))
+        if available.scalar() is None:
+            pytest.skip("Расширение pg_trgm недоступно на тестовом сервере PostgreSQL")
+        await db.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        crud = MenuItemCRUD()
+        item = MenuItem(title="Слуховые аппараты", description="Обзор моделей")
+        db.add(item)
+        await db.commit()
+
+        # Act
+        results = await crud.search_by_query(
+            db=db, query="слуховой апарат", access_level=AccessLevel.FREE, trigram_threshold=0.4
+        )
+
+        # Assert
+        assert [found.id for found in results] == [item.id]
+
 
 @pytest.mark.unit
 class TestMenuItemService:
     """Тесты сервиса MenuItemService."""
 
+    @pytest.mark.asyncio
+    async def test_search_menu_items_uses_trigram_threshold_from_settings(
+        self, db: AsyncSession, user_free, monkeypatch
+    ):
+        """Тест выбора поиска с учетом опечаток по настройкам."""
+        # Arrange
+        calls = []
+
+        async def search_by_similarity(db, query, access_level, limit, section_id, threshold):
+            calls.append((query, threshold))
+            return []
+
+        monkeypatch.setattr(settings, "search_trigram_enabled", True)
+        monkeypatch.setattr(settings, "search_trigram_threshold", 0.35)
+        monkeypatch.setattr(menu_item_crud, "search_by_similarity", search_by_similarity)
+
+        # Act
+        result = await menu_item_service.search_menu_items(
+            telegram_user_id=user_free, query="слуховой апарат", limit=10, db=db
+        )
+
+        # Assert
+        assert calls == [("слуховой апарат", 0.35)]
+        assert result.items == []
+
     @pytest.mark.asyncio
     async def test_search_menu_items_success_free_user(self, db: AsyncSession, user_free, menu_items_fixture):
         """Тест успешного поиска для бесплатного пользователя."""
@@ -450,3 +562,275 @@ class TestPublicSearchAPI:
         assert response.status_code == expected_status_code
         data = response.json()
         assert expected_error_message in data["detail"]
+
+    @pytest.mark.asyncio
+    async def test_search_materials_cursor_pagination(self, async_client: AsyncClient, db: AsyncSession, user_free):
+        """Тест постраничной выдачи и возврата на первую страницу по курсору без повторного поиска."""
+        # Arrange
+        endpoint = "/api/v1/public/search/"
+        items = [MenuItem(title=f"Слуховой аппарат {i}", is_active=True) for i in range(12)]
+        db.add_all(items)
+        await db.commit()
+        params = {"telegram_user_id": user_free, "query": "слуховой аппарат", "limit": 5}
+        searches = search_engine.get_stats()["searches"]
+
+        # Act
+        pages, cursor = [], None
+        while True:
+            response = await async_client.get(endpoint, params={**params, **({"cursor": cursor} if cursor else {})})
+            assert response.status_code == 200
+            pages.append(response.json())
+            cursor = pages[-1]["next_cursor"]
+            if cursor is None:
+                break
+        # Возврат на первую страницу по ее курсору - не новый поиск
+        first_again = await async_client.get(endpoint, params={**params, "cursor": pages[0]["cursor"]})
+        activities = await db.execute(select(func.count()).select_from(UserActivity))
+
+        # Assert
+        assert [len(page["items"]) for page in pages] == [5, 5, 2]
+        assert all(page["total"] == 12 for page in pages)
+        found = [item["id"] for page in pages for item in page["items"]]
+        assert sorted(found) == sorted(item.id for item in items)
+        assert first_again.json()["items"] == pages[0]["items"]
+        assert search_engine.get_stats()["searches"] == searches + 1
+        assert activities.scalar() == 1
+
+    @pytest.mark.parametrize("cursor_query", ["другой запрос", None])
+    @pytest.mark.asyncio
+    async def test_search_materials_invalid_cursor(self, async_client: AsyncClient, user_free, cursor_query):
+        """Тест отказа по поврежденному курсору или курсору другого запроса."""
+        # Arrange
+        endpoint = "/api/v1/public/search/"
+        key = SearchResultKey.build(cursor_query, AccessLevel.FREE) if cursor_query else None
+        cursor = encode_search_cursor(key, 5) if key else "not-a-cursor"
+        params = {"telegram_user_id": user_free, "query": "слуховой аппарат", "cursor": cursor}
+
+        # Act
+        response = await async_client.get(endpoint, params=params)
+
+        # Assert
+        assert response.status_code == 400
+        assert "курсор" in response.json()["detail"]
+
+    @pytest.mark.asyncio
+    async def test_search_materials_cache_invalidated_by_menu_change(
+        self, async_client: AsyncClient, db: AsyncSession, user_free
+    ):
+        """Тест повторного запроса из кэша и сброса кэша после изменения меню через админку."""
+        # Arrange
+        endpoint = "/api/v1/public/search/"
+        item = MenuItem(title="Слуховой аппарат", is_active=True)
+        db.add(item)
+        await db.commit()
+        params = {"telegram_user_id": user_free, "query": "  Слуховой   АППАРАТ "}
+        searches = search_engine.get_stats()["searches"]
+
+        # Act
+        first = await async_client.get(endpoint, params=params)
+        repeated = await async_client.get(endpoint, params={**params, "query": "слуховой аппарат"})
+        await menu_item_service.update_admin_menu_item(db, item.id, AdminMenuItemUpdate(is_active=False))
+        after_change = await async_client.get(endpoint, params=params)
+        stats = await async_client.get("/api/v1/admin/analytics/search-cache")
+
+        # Assert
+        assert first.json()["total"] == repeated.json()["total"] == 1
+        assert after_change.json()["total"] == 0
+        assert search_engine.get_stats()["searches"] == searches + 2
+        assert stats.status_code == 200
+        data = stats.json()
+        assert data["hits"] >= 1 and data["stale"] >= 1
+        assert 0 < data["hit_rate"] < 1
+        assert data["index"]["searches"] == searches + 2
+
+    @pytest.mark.asyncio
+    async def test_search_materials_activity_written_behind(
+        self, async_client: AsyncClient, db: AsyncSession, pooled_session_engine, user_free
+    ):
+        """Тест записи активности и журнала поиска в фоне после ответа."""
+        # Arrange
+        endpoint = "/api/v1/public/search/"
+        params = {"telegram_user_id": user_free, "query": "слуховой аппарат"}
+        count_query = select(func.count()).select_from(UserActivity)
+        activity_log_writer.start()
+
+        try:
+            # Act
+            response = await async_client.get(endpoint, params=params)
+            queued = activity_log_writer.get_stats()["queue_depth"]
+            buffered = (await db.execute(count_query)).scalar()
+        finally:
+            await activity_log_writer.stop()
+
+        # Assert
+        assert response.status_code == 200
+        assert queued == 1
+        assert buffered == 0
+        activity = (await db.execute(select(UserActivity))).scalar_one()
+        assert activity.activity_type == ActivityType.SEARCH
+        assert activity.search_query == "слуховой аппарат"
+        log = (await db.execute(select(SearchLog))).scalar_one()
+        assert (log.query, log.results, log.zero_results) == ("слуховой аппарат", 0, True)
+        daily = (await db.execute(select(SearchQueryDaily))).scalar_one()
+        assert (daily.query_hash, daily.searches, daily.zero_result_searches) == (log.query_hash, 1, 1)
+
+    def test_activity_log_writer_drops_when_queue_full(self):
+        """Тест отбрасывания активностей при переполненной очереди."""
+        # Arrange
+        writer = ActivityLogWriter(max_queue=2, batch_size=10)
+        row = {"telegram_user_id": 1, "activity_type": ActivityType.SEARCH}
+
+        # Act
+        accepted = [writer.enqueue(row) for _ in range(3)]
+
+        # Assert
+        assert accepted == [True, True, False]
+        stats = writer.get_stats()
+        assert stats["queue_depth"] == 2
+        assert stats["dropped"] == 1
+
+    @pytest.mark.asyncio
+    async def test_activity_log_writer_counts_failed_rows_separately(self, mocker):
+        """Тест учета активностей неудачной пачки отдельно от отброшенных при переполнении."""
+        # Arrange
+        writer = ActivityLogWriter(max_queue=10, batch_size=2)
+        row = {"telegram_user_id": 1, "activity_type": ActivityType.SEARCH}
+        mocker.patch.object(writer, "_write", side_effect=RuntimeError("database is unavailable"))
+        for _ in range(3):
+            writer.enqueue(row)
+
+        # Act
+        written = await writer.flush()
+
+        # Assert
+        assert written == 0
+        stats = writer.get_stats()
+        assert (stats["failed_batches"], stats["failed_rows"]) == (2, 3)
+        assert stats["dropped"] == 0
+        assert stats["queue_depth"] == 0
+
+
+@pytest.mark.unit
+class TestSearchEngine:
+    """Тесты поиска по инвертированному индексу в памяти."""
+
+    @pytest.mark.parametrize(
+        "word,expected",
+        [
+            ("слуховые", "слухов"),
+            ("аппаратами", "аппарат"),
+            ("имплантация", "имплантац"),
+            ("красивейшая", "красив"),
+            ("ёлки", "елк"),
+            ("free", "free"),
+        ],
+    )
+    def test_stem_russian_words(self, word, expected):
+        """Тест выделения основы русских слов."""
+        # Act & Assert
+        assert stem(word) == expected
+
+    def test_search_index_bm25_filters_and_prefix_fallback(self):
+        """Тест ранжирования BM25, фильтров доступа и раздела и поиска по началу слова."""
+        # Arrange
+        index = SearchIndex()
+        items = [
+            MenuItem(id=1, title="Слуховые аппараты", description="Обзор моделей", path="/"),
+            MenuItem(id=2, title="Полезные советы", description="Как ухаживать за слуховыми аппаратами", path="/1/"),
+            MenuItem(id=3, title="Аппараты для взрослых", description=None, path="/", access_level=AccessLevel.PREMIUM),
+            MenuItem(id=4, title="Кохлеарная имплантация", description="Подготовка к операции", path="/"),
+        ]
+        for item in items:
+            item.is_active, item.item_type = True, ItemType.CONTENT
+            item.access_level = item.access_level or AccessLevel.FREE
+            index.add(SearchDocument.from_menu_item(item))
+
+        # Act
+        free = index.search("слуховой аппарат", AccessLevel.FREE)
+        premium = index.search("аппараты", AccessLevel.PREMIUM)
+        in_section = index.search("аппараты", AccessLevel.PREMIUM, section_id=1)
+        by_prefix = index.search("импл", AccessLevel.FREE)
+        index.remove(1)
+        after_remove = index.search("слуховой аппарат", AccessLevel.FREE)
+
+        # Assert
+        assert [item.id for item in free] == [1, 2]
+        assert [item.id for item in premium][-1] == 2
+        assert {item.id for item in premium} == {1, 2, 3}
+        assert [item.id for item in in_section] == [1, 2]
+        assert [item.id for item in by_prefix] == [4]
+        assert [item.id for item in after_remove] == [2]
+
+    @pytest.mark.asyncio
+    async def test_search_engine_reindexes_changed_items(self, db: AsyncSession):
+        """Тест обновления индекса только по измененным через админку пунктам меню."""
+        # Arrange
+        item = MenuItem(title="Слуховые аппараты", description="Обзор моделей", is_active=True)
+        db.add(item)
+        await db.commit()
+        before = await search_engine.search(db, "аппарат", AccessLevel.FREE)
+        stats = search_engine.get_stats()
+
+        # Act
+        await menu_item_service.update_admin_menu_item(db, item.id, AdminMenuItemUpdate(title="Кохлеарные импланты"))
+        after = await search_engine.search(db, "импланты", AccessLevel.FREE)
+        stale = await search_engine.search(db, "аппарат", AccessLevel.FREE)
+
+        # Assert
+        assert [found.id for found in before] == [item.id]
+        assert [found.id for found in after] == [item.id]
+        assert stale == []
+        assert search_engine.get_stats()["rebuilds"] == stats["rebuilds"]
+        assert search_engine.get_stats()["updates"] == stats["updates"] + 1
+
+    @pytest.mark.asyncio
+    async def test_search_engine_rebuilds_off_event_loop(self, db: AsyncSession, monkeypatch):
+        """Тест перестроения индекса в отдельном потоке с поиском по прежнему индексу до его окончания."""
+        # Arrange
+        item = MenuItem(title="Слуховые аппараты", description="Обзор моделей", is_active=True)
+        db.add(item)
+        await db.commit()
+        engine = SearchEngine(ttl=0.0)
+        previous = await engine.search(db, "аппарат", AccessLevel.FREE)
+        started, released = threading.Event(), threading.Event()
+        index_menu_items = SearchEngine._index_menu_items
+
+        def blocked_index_menu_items(menu_items):
+            started.set()
+            released.wait(timeout=5)
+            return index_menu_items(menu_items)
+
+        monkeypatch.setattr(SearchEngine, "_index_menu_items", staticmethod(blocked_index_menu_items))
+
+        # Act
+        rebuild = asyncio.create_task(engine.search(db, "аппарат", AccessLevel.FREE))
+        while not started.is_set():
+            await asyncio.sleep(0.01)
+        during = await engine.search(db, "аппарат", AccessLevel.FREE)
+        rebuilding = not rebuild.done()
+        released.set()
+        rebuilt = await rebuild
+
+        # Assert
+        assert rebuilding is True
+        assert [found.id for found in previous] == [item.id]
+        assert [found.id for found in during] == [item.id]
+        assert [found.id for found in rebuilt] == [item.id]
+        assert engine.get_stats()["rebuilds"] == 2
+
+    @pytest.mark.asyncio
+    async def test_search_menu_items_uses_content_text(self, db: AsyncSession, user_free):
+        """Тест поиска сервисом по тексту контента пункта меню."""
+        # Arrange
+        item = MenuItem(title="Памятка", description=None, is_active=True, item_type=ItemType.CONTENT)
+        item.content = ContentFile(content_type=ContentType.TEXT, text_content="Как менять батарейки слухового аппарата")
+        db.add(item)
+        await db.commit()
+
+        # Act
+        result = await menu_item_service.search_menu_items(
+            telegram_user_id=user_free, query="батарейка", limit=10, db=db
+        )
+
+        # Assert
+        assert [found.id for found in result.items] == [item.id]
@@ -1,13 +1,16 @@
 """Тесты управления Telegram пользователями."""
 
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 import pytest
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.models.enums import AccessLevel
 from backend.models.telegram_user import TelegramUser
 from backend.services.telegram_user import TelegramUserService
+from backend.services.user_access import UserAccessResolver
+from backend.services.user_touch import UserTouchWriter
 from backend.validators.telegram_user import TelegramUserValidator
 
 
@@ -412,6 +415,161 @@ class TestTelegramUserCRUD:
         assert time_diff < 1
 
 
+@pytest.mark.unit
+class TestUserTouchWriter:
+    """Тесты отложенной записи счетчиков и времени активности пользователей."""
+
+    @pytest.mark.asyncio
+    async def test_record_writes_through_when_not_running(
+        self, db: AsyncSession, sql_counter, telegram_users_fixture: list[TelegramUser]
+    ):
+        """Тест немедленной записи одним UPDATE, когда фоновая запись не запущена."""
+        # Arrange
+        writer = UserTouchWriter(max_staleness=60)
+        first, second = telegram_users_fixture[0], telegram_users_fixture[1]
+        touched_at = datetime.now(timezone.utc)
+        sql_counter.reset()
+
+        # Act
+        await writer.record(db, {first.id: (2, touched_at), second.id: (1, None)})
+
+        # Assert
+        assert sql_counter.statements == 1
+        stored_first = await db.get(TelegramUser, first.id, populate_existing=True)
+        stored_second = await db.get(TelegramUser, second.id, populate_existing=True)
+        assert stored_first.activities_count == first.activities_count + 2
+        assert stored_first.last_activity == touched_at
+        assert stored_second.activities_count == second.activities_count + 1
+        assert stored_second.last_activity == second.last_activity
+
+    @pytest.mark.asyncio
+    async def test_buffered_touches_coalesce_into_one_update(
+        self, db: AsyncSession, pooled_session_engine, telegram_users_fixture: list[TelegramUser]
+    ):
+        """Тест суммирования приростов и выбора самой поздней отметки времени в буфере."""
+        # Arrange
+        writer = UserTouchWriter(max_staleness=60)
+        user = telegram_users_fixture[0]
+        latest = datetime.now(timezone.utc)
+        writer.start()
+
+        # Act
+        for touched_at in (latest - timedelta(minutes=5), latest, latest - timedelta(minutes=1)):
+            await writer.record(db, {user.id: (1, touched_at)})
+        pending_before_stop = writer.get_stats()["pending"]
+        await writer.stop()
+
+        # Assert
+        assert pending_before_stop == 1
+        stats = writer.get_stats()
+        assert stats["flushes"] == 1
+        assert stats["rows_written"] == 1
+        assert stats["pending"] == 0
+        stored = await db.get(TelegramUser, user.id, populate_existing=True)
+        assert stored.activities_count == user.activities_count + 3
+        assert stored.last_activity == latest
+
+    @pytest.mark.asyncio
+    async def test_last_activity_never_moves_backwards(
+        self, db: AsyncSession, telegram_users_fixture: list[TelegramUser]
+    ):
+        """Тест: более ранняя отметка времени не затирает сохраненную."""
+        # Arrange
+        writer = UserTouchWriter(max_staleness=60)
+        user = telegram_users_fixture[0]
+        latest = datetime.now(timezone.utc)
+        await writer.record(db, {user.id: (0, latest)})
+
+        # Act
+        await writer.record(db, {user.id: (0, latest - timedelta(hours=1))})
+
+        # Assert
+        stored = await db.get(TelegramUser, user.id, populate_existing=True)
+        assert stored.last_activity == latest
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_pending_touches(self, telegram_users_fixture: list[TelegramUser]):
+        """Тест возврата изменений в буфер при ошибке записи."""
+
+        # Arrange
+        class FailingCRUD:
+            async def apply_user_touches(self, db, touches):
+                raise RuntimeError("database unavailable")
+
+        writer = UserTouchWriter(max_staleness=60)
+        writer.telegram_user_crud = FailingCRUD()
+        user = telegram_users_fixture[0]
+        writer.touch(user.id, activities=2)
+
+        # Act
+        written = await writer.flush()
+
+        # Assert
+        assert written == 0
+        stats = writer.get_stats()
+        assert stats["failed_flushes"] == 1
+        assert stats["pending"] == 1
+
+
+@pytest.mark.unit
+class TestUserAccessResolver:
+    """Тесты кэша пользователей Telegram и их уровня доступа."""
+
+    @pytest.mark.asyncio
+    async def test_resolve_cached_user_without_query(
+        self, db: AsyncSession, sql_counter, telegram_users_fixture: list[TelegramUser]
+    ):
+        """Тест повторного определения пользователя без запроса к БД."""
+        # Arrange
+        resolver = UserAccessResolver(ttl=60)
+        premium_user = next(user for user in telegram_users_fixture if user.subscription_type == "premium")
+        await resolver.resolve(db, premium_user.telegram_id)
+        sql_counter.reset()
+
+        # Act
+        resolved = await resolver.resolve(db, premium_user.telegram_id)
+
+        # Assert
+        assert sql_counter.statements == 0
+        assert resolved.id == premium_user.id
+        assert resolved.access_level == AccessLevel.PREMIUM
+        assert resolver.get_stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_unknown_user_is_not_cached(self, db: AsyncSession, sql_counter):
+        """Тест: незарегистрированный пользователь не запоминается."""
+        # Arrange
+        resolver = UserAccessResolver(ttl=60)
+        unknown_telegram_id = 999999999
+
+        # Act
+        first = await resolver.resolve(db, unknown_telegram_id)
+        second = await resolver.resolve(db, unknown_telegram_id)
+
+        # Assert
+        assert first is None
+        assert second is None
+        assert sql_counter.statements == 2
+
+    @pytest.mark.asyncio
+    async def test_resolve_many_loads_only_missing_users(
+        self, db: AsyncSession, sql_counter, telegram_users_fixture: list[TelegramUser]
+    ):
+        """Тест загрузки одним запросом только пользователей, которых нет в кэше."""
+        # Arrange
+        resolver = UserAccessResolver(ttl=60)
+        first, second, third = telegram_users_fixture
+        await resolver.resolve(db, first.telegram_id)
+        sql_counter.reset()
+
+        # Act
+        resolved = await resolver.resolve_many(db, [first.telegram_id, second.telegram_id, third.telegram_id, 1])
+
+        # Assert
+        assert sql_counter.statements == 1
+        assert set(resolved) == {first.telegram_id, second.telegram_id, third.telegram_id}
+
+
 @pytest.mark.unit
 class TestTelegramUserValidator:
     """Тесты валидатора TelegramUserValidator."""
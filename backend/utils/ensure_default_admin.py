@@ -3,7 +3,7 @@ import logging
 from sqlalchemy import select
 
 from backend.core.config import settings
-from backend.core.db import AsyncSessionLocal
+from backend.core.db import session_scope
 from backend.core.security import get_password_hash
 from backend.models.admin_user import AdminUser
 from backend.models.enums import AdminRole
@@ -15,7 +15,7 @@ logger = logging.getLogger(__name__)
 async def ensure_default_admin() -> None:
     """Создание администратора по умолчанию при запуске."""
     try:
-        async with AsyncSessionLocal() as session:
+        async with session_scope() as session:
             # Проверяем существование администратора
             result = await session.execute(select(AdminUser).where(AdminUser.username == settings.admin_username))
             admin_user = result.scalar_one_or_none()
@@ -0,0 +1,128 @@
+"""Стеммер русского языка (алгоритм Snowball Russian).
+
+Реализация следует описанию алгоритма Портера для русского языка из
+проекта Snowball (https://snowballstem.org/algorithms/russian/stemmer.html),
+тем же алгоритмом пользуется конфигурация полнотекстового поиска russian
+в PostgreSQL.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import FrozenSet, Iterable, Optional, Tuple
+
+
+VOWELS = frozenset("аеиоуыэюя")
+
+# Окончания первой группы удаляются, только если им предшествует "а" или "я"
+Endings = Tuple[FrozenSet[str], FrozenSet[str]]
+
+
+def _endings(preceded: Iterable[str], plain: Iterable[str]) -> Endings:
+    """Группа окончаний: требующие "а" или "я" перед собой и остальные."""
+    return frozenset(preceded), frozenset(plain)
+
+
+PERFECTIVE_GERUND = _endings(("вшись", "вши", "в"), ("ившись", "ывшись", "ивши", "ывши", "ив", "ыв"))
+ADJECTIVE = _endings(
+    (),
+    (
+        "ими", "ыми", "его", "ого", "ему", "ому", "ее", "ие", "ые", "ое", "ей", "ий", "ый", "ой",
+        "ем", "им", "ым", "ом", "их", "ых", "ую", "юю", "ая", "яя", "ою", "ею",
+    ),
+)  # fmt: skip
+PARTICIPLE = _endings(("ем", "нн", "вш", "ющ", "щ"), ("ивш", "ывш", "ующ"))
+REFLEXIVE = _endings((), ("ся", "сь"))
+VERB = _endings(
+    ("ла", "на", "ете", "йте", "ли", "й", "л", "ем", "н", "ло", "но", "ет", "ют", "ны", "ть", "ешь", "нно"),
+    (
+        "ила", "ыла", "ена", "ейте", "уйте", "ите", "или", "ыли", "ей", "уй", "ил", "ыл", "им", "ым", "ен",
+        "ило", "ыло", "ено", "ят", "ует", "уют", "ит", "ыт", "ены", "ить", "ыть", "ишь", "ую", "ю",
+    ),
+)  # fmt: skip
+NOUN = _endings(
+    (),
+    (
+        "иями", "ями", "ами", "ией", "иям", "ием", "иях", "ев", "ов", "ие", "ье", "еи", "ии", "ей", "ой",
+        "ий", "ям", "ем", "ам", "ом", "ах", "ях", "ию", "ью", "ия", "ья", "а", "е", "и", "й", "о", "у",
+        "ы", "ь", "ю", "я",
+    ),
+)  # fmt: skip
+SUPERLATIVE = _endings((), ("ейше", "ейш"))
+DERIVATIONAL = _endings((), ("ость", "ост"))
+
+# Длина самого длинного окончания ("ившись")
+ENDING_MAX_LENGTH = 6
+
+
+def _regions(word: str) -> Tuple[int, int]:
+    """Начала областей RV и R2 слова."""
+    rv = next((i + 1 for i, char in enumerate(word) if char in VOWELS), len(word))
+
+    def after_vowel_consonant(start: int) -> int:
+        for i in range(start + 1, len(word)):
+            if word[i] not in VOWELS and word[i - 1] in VOWELS:
+                return i + 1
+        return len(word)
+
+    return rv, after_vowel_consonant(after_vowel_consonant(0))
+
+
+def _strip(word: str, rv: int, endings: Endings) -> Optional[str]:
+    """Удаляет самое длинное окончание из endings в области RV, возвращает None, если его нет."""
+    region = word[rv:]
+    preceded, plain = endings
+    for length in range(min(len(region), ENDING_MAX_LENGTH), 0, -1):
+        ending = region[-length:]
+        if ending in plain:
+            return word[:-length]
+        if ending in preceded:
+            if length < len(region) and region[-length - 1] in "ая":
+                return word[:-length]
+            return None
+    return None
+
+
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    """Возвращает основу русского слова в нижнем регистре.
+
+    Args:
+        word: Слово в нижнем регистре
+
+    Returns:
+        Основа слова (слова без русских гласных возвращаются без изменений)
+    """
+    word = word.replace("ё", "е")
+    rv, r2 = _regions(word)
+    if rv >= len(word):
+        return word
+
+    # Шаг 1: деепричастие, иначе возвратная частица и прилагательное, глагол или существительное
+    stripped = _strip(word, rv, PERFECTIVE_GERUND)
+    if stripped is None:
+        word = _strip(word, rv, REFLEXIVE) or word
+        adjective = _strip(word, rv, ADJECTIVE)
+        if adjective is not None:
+            stripped = _strip(adjective, rv, PARTICIPLE) or adjective
+        else:
+            stripped = _strip(word, rv, VERB) or _strip(word, rv, NOUN)
+    word = stripped if stripped is not None else word
+
+    # Шаг 2: окончание "и"
+    if word[rv:].endswith("и"):
+        word = word[:-1]
+
+    # Шаг 3: словообразующий суффикс в области R2
+    derivational = _strip(word, max(rv, r2), DERIVATIONAL)
+    word = derivational if derivational is not None else word
+
+    # Шаг 4: превосходная степень, удвоенная "н" и мягкий знак
+    superlative = _strip(word, rv, SUPERLATIVE)
+    if superlative is not None:
+        word = superlative
+    if word[rv:].endswith("нн"):
+        word = word[:-1]
+    elif superlative is None and word[rv:].endswith("ь"):
+        word = word[:-1]
+    return word
@@ -98,6 +98,21 @@ class MenuItemValidator:
             status_code=status.HTTP_400_BAD_REQUEST, detail="Пункт меню не может быть родителем самому себе"
         )
 
+    def validate_menu_item_no_cycle(self, creates_cycle: bool) -> None:
+        """Проверка, что новый родитель не находится в поддереве пункта меню.
+
+        Args:
+            creates_cycle: Появится ли цикл при смене родителя
+
+        Raises:
+            HTTPException: Если пункт меню станет потомком самого себя
+        """
+        if creates_cycle:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Пункт меню не может быть перемещен в собственный подраздел",
+            )
+
     def validate_menu_item_no_children(self, children: list) -> None:
         """Проверка, что у пункта меню нет дочерних элементов.
 
@@ -140,5 +155,21 @@ class MenuItemValidator:
 
         return normalized_query
 
+    def validate_search_cursor(self, offset: Optional[int]) -> int:
+        """Валидация курсора страницы результатов поиска.
+
+        Args:
+            offset: Позиция страницы из курсора (None, если курсор не разобран)
+
+        Raises:
+            HTTPException: Если курсор поврежден или выдан для другого запроса
+        """
+        if offset is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Некорректный курсор поиска: начните поиск заново",
+            )
+        return offset
+
 
 menu_item_validator = MenuItemValidator()
@@ -0,0 +1,106 @@
+"""Бенчмарк записи активностей в Backend: одиночный эндпоинт против пакетного.
+
+Одинаковый поток активностей записывается через POST /user-activities/
+(по одной) и через POST /user-activities/batch (пачками). Измеряется
+пропускная способность (активностей в секунду), число SQL запросов и
+коммитов на одну активность.
+
+Запуск (таблицы в базе BENCHMARK_DATABASE_URL будут пересозданы):
+    BENCHMARK_DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.backend_activity_ingest --events 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+from typing import List
+
+from benchmarks.backend_db import StatementCounter, api_client, create_benchmark_engine, seed_users_and_menu
+
+
+SINGLE_ENDPOINT = "/api/v1/public/user-activities/"
+BATCH_ENDPOINT = "/api/v1/public/user-activities/batch"
+
+
+def build_events(count: int, telegram_ids: List[int], menu_ids: List[int], seed: int = 42) -> List[dict]:
+    """Формирует поток активностей, похожий на поток от бота."""
+    rng = random.Random(seed)
+    events = []
+    for _ in range(count):
+        activity_type = rng.choice(["navigation", "navigation", "text_view", "pdf_download", "search"])
+        event = {"telegram_user_id": rng.choice(telegram_ids), "activity_type": activity_type}
+        if activity_type == "search":
+            event["search_query"] = rng.choice(["слуховой аппарат", "кохлеарный имплант", "развитие речи"])
+        else:
+            event["menu_item_id"] = rng.choice(menu_ids)
+        events.append(event)
+    return events
+
+
+async def run_single(client, events: List[dict], concurrency: int) -> float:
+    """Записывает активности по одной, возвращает затраченное время."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(event: dict) -> None:
+        async with semaphore:
+            response = await client.post(SINGLE_ENDPOINT, json=event)
+            response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(event) for event in events))
+    return time.perf_counter() - started
+
+
+async def run_batch(client, events: List[dict], batch_size: int) -> float:
+    """Записывает активности пачками, возвращает затраченное время."""
+    started = time.perf_counter()
+    for offset in range(0, len(events), batch_size):
+        response = await client.post(BATCH_ENDPOINT, json={"activities": events[offset : offset + batch_size]})
+        response.raise_for_status()
+    return time.perf_counter() - started
+
+
+async def main(events_count: int, users: int, menu_items: int, concurrency: int, batch_sizes: List[int]) -> None:
+    """Сравнивает одиночную и пакетную запись активностей."""
+    engine = await create_benchmark_engine()
+    counter = StatementCounter(engine)
+    try:
+        telegram_ids, menu_ids = await seed_users_and_menu(engine, users, menu_items)
+        events = build_events(events_count, telegram_ids, menu_ids)
+
+        results = []
+        async with api_client(engine) as client:
+            counter.reset()
+            elapsed = await run_single(client, events, concurrency)
+            results.append((f"одиночный, c={concurrency}", elapsed, counter.statements, counter.commits))
+
+            for batch_size in batch_sizes:
+                counter.reset()
+                elapsed = await run_batch(client, events, batch_size)
+                results.append((f"пакетный, batch={batch_size}", elapsed, counter.statements, counter.commits))
+
+        print(f"\nЗапись {events_count} активностей ({users} пользователей, {menu_items} материалов)")
+        print(f"{'вариант':<28}{'время, с':>10}{'событий/с':>12}{'SQL/событие':>14}{'коммитов/событие':>18}")
+        for name, elapsed, statements, commits in results:
+            print(
+                f"{name:<28}{elapsed:>10.2f}{events_count / elapsed:>12.0f}"
+                f"{statements / events_count:>14.2f}{commits / events_count:>18.3f}"
+            )
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=2000, help="Количество активностей")
+    parser.add_argument("--users", type=int, default=500, help="Количество пользователей")
+    parser.add_argument("--menu-items", type=int, default=100, help="Количество материалов")
+    parser.add_argument("--concurrency", type=int, default=10, help="Параллельных одиночных запросов")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[50, 200, 500], help="Размеры пачек")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    asyncio.run(main(args.events, args.users, args.menu_items, args.concurrency, args.batch_sizes))
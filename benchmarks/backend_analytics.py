@@ -0,0 +1,233 @@
+"""Бенчмарк аналитики админки: GET /api/v1/admin/analytics на большой базе.
+
+База заполняется пользователями, материалами, активностями, вопросами и
+суточной сводкой поисковых запросов. Задержка GET /api/v1/admin/analytics
+измеряется для текущей реализации (статистика пользователей одним
+запросом с COUNT(*) FILTER, четыре группы статистики параллельно в
+отдельных соединениях) и для прежней (четыре COUNT по таблице
+пользователей, группы одна за другой в сессии запроса). Отдельно
+сравниваются два варианта статистики пользователей.
+
+Запуск (таблицы в базе BENCHMARK_DATABASE_URL будут пересозданы):
+    BENCHMARK_DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.backend_analytics --users 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+from unittest.mock import patch
+
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from backend.core.security import create_access_token
+from backend.crud.analytics import analytics_crud
+from backend.models import AdminUser, MenuItem, TelegramUser
+from backend.models.enums import AccessLevel, AdminRole, ItemType
+from backend.schemas.admin.analytics import AdminAnalyticsRequest, AdminAnalyticsResponse
+from backend.services.analytics import analytics_service
+from benchmarks.backend_db import api_client, create_benchmark_engine
+from benchmarks.utils import print_report, summarize, timer
+
+
+ENDPOINT = "/api/v1/admin/analytics/"
+
+# Типы активностей по кругу: каждая восьмая активность - поиск, каждая восьмая - оценка
+ACTIVITY_TYPES = [
+    "navigation",
+    "text_view",
+    "pdf_download",
+    "video_view",
+    "search",
+    "rating",
+    "navigation",
+    "text_view",
+]
+
+# Количество различных поисковых запросов в суточной сводке
+QUERIES = 200
+
+
+async def seed(engine: AsyncEngine, users: int, menu_items: int, activities: int, questions: int, days: int) -> str:
+    """Заполняет базу и возвращает JWT токен администратора."""
+    params = {"users": users, "menu_items": menu_items, "days": days}
+    async with engine.begin() as conn:
+        admin_id = (
+            await conn.execute(
+                insert(AdminUser)
+                .values(username="benchmark", email="benchmark@example.com", password_hash="-", role=AdminRole.ADMIN)
+                .returning(AdminUser.id)
+            )
+        ).scalar_one()
+        await conn.execute(
+            insert(MenuItem),
+            [
+                {
+                    "title": f"Материал {i}",
+                    "item_type": ItemType.CONTENT,
+                    "is_active": True,
+                    "access_level": AccessLevel.FREE,
+                    "view_count": i * 7 % 1000,
+                    "rating_count": i % 50,
+                    "average_rating": 1 + i % 5,
+                }
+                for i in range(menu_items)
+            ],
+        )
+        # Регистрации распределены по году, последняя активность - по двум месяцам
+        await conn.execute(
+            text("""
+                INSERT INTO telegram_users (telegram_id, first_name, subscription_type, activities_count,
+                                            questions_count, created_at, last_activity)
+                SELECT 10000000 + i, 'Пользователь ' || i, 'free', 0, 0,
+                       now() - (i % 365) * interval '1 day', now() - (i % 1440) * interval '1 hour'
+                FROM generate_series(1, :users) AS i
+            """),
+            params,
+        )
+        await conn.execute(
+            text("""
+                INSERT INTO user_activities (telegram_user_id, activity_type, menu_item_id, search_query, rating,
+                                             created_at)
+                SELECT u.first_id + i % :users, t.types[1 + i % 8],
+                       CASE WHEN t.types[1 + i % 8] <> 'search' THEN m.first_id + i % :menu_items END,
+                       CASE WHEN t.types[1 + i % 8] = 'search' THEN 'запрос ' || i % 200 END,
+                       CASE WHEN t.types[1 + i % 8] = 'rating' THEN 1 + i % 5 END,
+                       now() - (i % (:days * 24)) * interval '1 hour'
+                FROM generate_series(1, :activities) AS i,
+                     (SELECT min(id) AS first_id FROM telegram_users) AS u,
+                     (SELECT min(id) AS first_id FROM menu_items) AS m,
+                     (SELECT CAST(:types AS text[]) AS types) AS t
+            """),
+            {**params, "activities": activities, "types": ACTIVITY_TYPES},
+        )
+        await conn.execute(
+            text("""
+                INSERT INTO user_questions (telegram_user_id, question_text, status, created_at)
+                SELECT u.first_id + i % :users, 'Вопрос ' || i, (ARRAY['pending', 'answered', 'closed'])[1 + i % 3],
+                       now() - (i % (:days * 24)) * interval '1 hour'
+                FROM generate_series(1, :questions) AS i, (SELECT min(id) AS first_id FROM telegram_users) AS u
+            """),
+            {**params, "questions": questions},
+        )
+        await conn.execute(
+            text("""
+                INSERT INTO search_query_daily (day, query_hash, query, searches, zero_result_searches)
+                SELECT CAST(now() AS date) - d, ('x' || substr(md5('запрос ' || q), 1, 16))::bit(64)::bigint,
+                       'запрос ' || q, 1 + (q * d) % 40, (q * d) % 3
+                FROM generate_series(0, :days - 1) AS d, generate_series(0, :queries - 1) AS q
+            """),
+            {**params, "queries": QUERIES},
+        )
+        # Статистика планировщика, которую в рабочей базе собирает autovacuum
+        for table in ("telegram_users", "user_activities", "user_questions", "menu_items", "search_query_daily"):
+            await conn.execute(text(f"ANALYZE {table}"))
+
+    return create_access_token({"sub": str(admin_id), "username": "benchmark", "role": AdminRole.ADMIN})
+
+
+async def users_statistics_separate_counts(
+    db: AsyncSession, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None
+) -> dict:
+    """Прежняя статистика пользователей: отдельный COUNT на каждый показатель."""
+    now_utc = datetime.now(timezone.utc)
+    today_start = datetime.combine(date.today(), datetime.min.time(), timezone.utc)
+    total_query = analytics_crud._apply_date_conditions(
+        select(func.count(TelegramUser.id)), TelegramUser.created_at, start_date, end_date
+    )
+
+    async def active_since(moment: datetime) -> int:
+        query = select(func.count(TelegramUser.id)).where(TelegramUser.last_activity >= moment)
+        return (await db.execute(query)).scalar() or 0
+
+    return {
+        "total": (await db.execute(total_query)).scalar() or 0,
+        "active_today": await active_since(today_start),
+        "active_week": await active_since(now_utc - timedelta(days=7)),
+        "active_month": await active_since(now_utc - timedelta(days=30)),
+    }
+
+
+async def sequential_get_analytics(
+    db: AsyncSession, current_admin: AdminUser, request: AdminAnalyticsRequest
+) -> AdminAnalyticsResponse:
+    """Прежний AnalyticsService.get_analytics: группы статистики одна за другой в сессии запроса."""
+    start_date, end_date = analytics_service.validator.parse_and_validate_dates(request.model_dump())
+    return AdminAnalyticsResponse(
+        users=await users_statistics_separate_counts(db, start_date, end_date),
+        content=await analytics_crud.get_content_statistics(db, start_date, end_date, request.section_id),
+        activities=await analytics_crud.get_activities_statistics(db, start_date, end_date, request.section_id),
+        questions=await analytics_crud.get_questions_statistics(db, start_date, end_date),
+    )
+
+
+async def measure_endpoint(engine: AsyncEngine, token: str, repeat: int, period: str) -> list[float]:
+    """Выполняет GET /api/v1/admin/analytics repeat раз, возвращает задержки."""
+    latencies: list[float] = []
+    async with api_client(engine) as client:
+        headers = {"Authorization": f"Bearer {token}"}
+        for _ in range(repeat + 1):
+            with timer(latencies):
+                response = await client.get(ENDPOINT, headers=headers, params={"period": period})
+            response.raise_for_status()
+    # Первый запрос прогревает пул соединений и кэши
+    return latencies[1:]
+
+
+async def measure_users_statistics(engine: AsyncEngine, repeat: int) -> dict:
+    """Сравнивает статистику пользователей отдельными COUNT и одним запросом."""
+    variants = {
+        "4 x COUNT": users_statistics_separate_counts,
+        "COUNT(*) FILTER": analytics_crud.get_users_statistics,
+    }
+    start_date = datetime.now(timezone.utc) - timedelta(days=30)
+    rows = {}
+    async with AsyncSession(engine) as db:
+        for name, statistics in variants.items():
+            latencies: list[float] = []
+            await statistics(db, start_date, None)
+            for _ in range(repeat):
+                with timer(latencies):
+                    await statistics(db, start_date, None)
+            rows[name] = summarize(latencies)
+    return rows
+
+
+async def main(users: int, menu_items: int, activities: int, questions: int, days: int, repeat: int) -> None:
+    """Сравнивает прежнюю и текущую реализацию аналитики."""
+    engine = await create_benchmark_engine()
+    try:
+        token = await seed(engine, users, menu_items, activities, questions, days)
+
+        endpoint_rows = {}
+        for period in ("week", "month"):
+            with patch.object(analytics_service, "get_analytics", sequential_get_analytics):
+                endpoint_rows[f"последовательно, {period}"] = summarize(
+                    await measure_endpoint(engine, token, repeat, period)
+                )
+            endpoint_rows[f"параллельно, {period}"] = summarize(await measure_endpoint(engine, token, repeat, period))
+        users_rows = await measure_users_statistics(engine, repeat)
+    finally:
+        await engine.dispose()
+
+    dataset = f"{users} пользователей, {activities} активностей, {questions} вопросов"
+    print_report(f"GET {ENDPOINT}: {dataset}", endpoint_rows)
+    print_report("Статистика пользователей за месяц", users_rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=200_000, help="Количество пользователей")
+    parser.add_argument("--menu-items", type=int, default=1000, help="Количество материалов")
+    parser.add_argument("--activities", type=int, default=2_000_000, help="Количество активностей")
+    parser.add_argument("--questions", type=int, default=20_000, help="Количество вопросов")
+    parser.add_argument("--days", type=int, default=90, help="Глубина истории в днях")
+    parser.add_argument("--repeat", type=int, default=20, help="Повторов каждого варианта")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    asyncio.run(main(args.users, args.menu_items, args.activities, args.questions, args.days, args.repeat))
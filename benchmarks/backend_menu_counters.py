@@ -0,0 +1,108 @@
+"""Бенчмарк отложенной записи счетчиков просмотров популярных материалов.
+
+Множество пользователей одновременно открывают несколько популярных
+материалов через POST /user-activities/. Сравниваются немедленный UPDATE
+строки материала в каждом запросе (все запросы конкурируют за блокировку
+одной строки) и отложенная запись, которая суммирует приросты в памяти.
+
+Запуск (таблицы в базе BENCHMARK_DATABASE_URL будут пересозданы):
+    BENCHMARK_DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.backend_menu_counters --events 3000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import random
+from typing import List
+
+from sqlalchemy import event
+
+from backend.core.db import AsyncSessionLocal
+from backend.services.menu_counters import menu_counter_writer
+from backend.services.user_touch import user_touch_writer
+from benchmarks.backend_db import api_client, create_benchmark_engine, seed_users_and_menu
+from benchmarks.utils import print_report, summarize, timer
+
+
+ACTIVITY_ENDPOINT = "/api/v1/public/user-activities/"
+
+
+async def run(client, events: List[dict], concurrency: int) -> List[float]:
+    """Отправляет активности с заданной параллельностью, возвращает задержки."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def one(payload: dict) -> None:
+        async with semaphore:
+            with timer(latencies):
+                response = await client.post(ACTIVITY_ENDPOINT, json=payload)
+            response.raise_for_status()
+
+    await asyncio.gather(*(one(payload) for payload in events))
+    return latencies
+
+
+async def main(events_count: int, users: int, popular_items: int, concurrency: int, staleness: float) -> None:
+    """Сравнивает немедленную и отложенную запись счетчиков материалов."""
+    engine = await create_benchmark_engine()
+    AsyncSessionLocal.session_factory.configure(bind=engine)
+    menu_updates = {"count": 0}
+
+    def count_menu_updates(conn, cursor, statement, *args) -> None:
+        if statement.lstrip().startswith("UPDATE menu_items"):
+            menu_updates["count"] += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count_menu_updates)
+
+    rng = random.Random(42)
+    rows, updates = {}, {}
+    try:
+        telegram_ids, menu_ids = await seed_users_and_menu(engine, users, popular_items)
+        events = [
+            {
+                "telegram_user_id": rng.choice(telegram_ids),
+                "menu_item_id": rng.choice(menu_ids),
+                "activity_type": rng.choice(["text_view", "text_view", "pdf_download"]),
+            }
+            for _ in range(events_count)
+        ]
+
+        # Счетчики пользователей пишутся отложенно в обоих вариантах, чтобы сравнивать только материалы
+        user_touch_writer.max_staleness = staleness
+        user_touch_writer.start()
+        async with api_client(engine) as client:
+            menu_updates["count"] = 0
+            rows["немедленный UPDATE"] = summarize(await run(client, events, concurrency))
+            updates["немедленный UPDATE"] = menu_updates["count"]
+
+            menu_counter_writer.max_staleness = staleness
+            menu_updates["count"] = 0
+            menu_counter_writer.start()
+            latencies = await run(client, events, concurrency)
+            await menu_counter_writer.stop()
+            name = f"отложенная запись, {staleness} с"
+            rows[name] = summarize(latencies)
+            updates[name] = menu_updates["count"]
+        await user_touch_writer.stop()
+    finally:
+        await engine.dispose()
+
+    print_report(f"{events_count} просмотров {popular_items} материалов, параллельность {concurrency}", rows)
+    print(f"\n{'вариант':<32}{'UPDATE menu_items':>20}")
+    for name, count in updates.items():
+        print(f"{name:<32}{count:>20}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=3000, help="Количество просмотров")
+    parser.add_argument("--users", type=int, default=500, help="Количество пользователей")
+    parser.add_argument("--popular-items", type=int, default=3, help="Количество популярных материалов")
+    parser.add_argument("--concurrency", type=int, default=20, help="Параллельных запросов")
+    parser.add_argument("--staleness", type=float, default=1.0, help="Максимальная задержка записи (сек)")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    asyncio.run(main(args.events, args.users, args.popular_items, args.concurrency, args.staleness))
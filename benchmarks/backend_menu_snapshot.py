@@ -0,0 +1,205 @@
+"""Бенчмарк снимка меню: готовые ответы из памяти и 304 по ETag.
+
+Поток навигации пользователей по дереву меню (списки пунктов и контент
+материалов) проходит через публичные эндпоинты меню в двух режимах:
+    прежний - каждый запрос читает пункты меню и контент из БД и заново
+        сериализует ответ;
+    снимок - ответы берутся из снимка меню в памяти, повторный запрос с
+        актуальным ETag получает 304 без тела.
+Часть запросов, как кэш меню в боте, ревалидирует ранее полученный ответ
+заголовком If-None-Match. Измеряются задержка, число SQL запросов и доля 304.
+
+Запуск (таблицы в базе BENCHMARK_DATABASE_URL будут пересозданы):
+    BENCHMARK_DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.backend_menu_snapshot --requests 3000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import random
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from backend.crud.menu_item import menu_item_crud
+from backend.crud.telegram_user import telegram_user_crud
+from backend.models import MenuItem
+from backend.models.enums import AccessLevel
+from backend.schemas.public.menu import ContentFileResponse, MenuContentResponse, MenuItemListResponse, MenuItemResponse
+from backend.services.menu_item import MenuItemService
+from backend.services.menu_snapshot import SnapshotEntry
+from benchmarks.backend_db import (
+    StatementCounter,
+    api_client,
+    create_benchmark_engine,
+    seed_menu_tree,
+    seed_users_and_menu,
+)
+from benchmarks.utils import print_report, summarize, timer
+
+
+MENU_ENDPOINT = "/api/v1/public/menu-items"
+
+
+def item_response(item) -> MenuItemResponse:
+    """Ответ пункта меню из модели, как в прежнем сервисе."""
+    return MenuItemResponse(
+        id=item.id,
+        title=item.title,
+        description=item.description,
+        parent_id=item.parent_id,
+        bot_message=item.bot_message,
+        is_active=item.is_active,
+        access_level=item.access_level,
+        item_type=item.item_type,
+        children=[],
+    )
+
+
+@contextmanager
+def legacy_mode() -> Iterator[None]:
+    """Возвращает прежнее чтение меню из БД и сериализацию ответа на каждый запрос."""
+    original_items = MenuItemService.get_menu_items_entry
+    original_content = MenuItemService.get_menu_item_content_entry
+
+    async def user_level(db, telegram_user_id: int) -> AccessLevel:
+        user = await telegram_user_crud.get_by_telegram_id(db, telegram_user_id)
+        return AccessLevel.PREMIUM if user.subscription_type == "premium" else AccessLevel.FREE
+
+    async def legacy_items(self, telegram_user_id, parent_id=None, db=None):
+        level = await user_level(db, telegram_user_id)
+        if parent_id is not None:
+            await menu_item_crud.get(db, parent_id)
+        items = await menu_item_crud.get_by_parent_id(db, parent_id, True, level)
+        return SnapshotEntry.build(MenuItemListResponse(items=[item_response(item) for item in items]))
+
+    async def legacy_content(self, menu_id, telegram_user_id, db=None):
+        level = await user_level(db, telegram_user_id)
+        query = (
+            select(MenuItem).options(selectinload(MenuItem.content)).where(MenuItem.id == menu_id, MenuItem.is_active)
+        )
+        item = (await db.execute(query)).scalar_one()
+        children = await menu_item_crud.get_children_by_parent_id(db, menu_id, True, level)
+        response = MenuContentResponse(
+            id=item.id,
+            title=item.title,
+            description=item.description,
+            bot_message=item.bot_message,
+            item_type=item.item_type,
+            content_files=[ContentFileResponse.model_validate(item.content)] if item.content else [],
+            children=[item_response(child) for child in children],
+        )
+        return SnapshotEntry.build(response)
+
+    MenuItemService.get_menu_items_entry = legacy_items
+    MenuItemService.get_menu_item_content_entry = legacy_content
+    try:
+        yield
+    finally:
+        MenuItemService.get_menu_items_entry = original_items
+        MenuItemService.get_menu_item_content_entry = original_content
+
+
+def build_requests(
+    count: int,
+    telegram_ids: List[int],
+    navigation_ids: List[int],
+    materials: Dict[int, AccessLevel],
+    seed: int = 42,
+) -> List[Tuple[str, tuple]]:
+    """Формирует поток запросов: половина - списки пунктов, половина - контент материалов.
+
+    Для каждого запроса возвращается URL и ключ кэша бота: ответы меню в боте
+    кэшируются по уровню доступа, а не по пользователю.
+    """
+    rng = random.Random(seed)
+    free_materials = [menu_id for menu_id, level in materials.items() if level == AccessLevel.FREE]
+    all_materials = list(materials)
+    requests = []
+    for _ in range(count):
+        index = rng.randrange(len(telegram_ids))
+        telegram_id = telegram_ids[index]
+        # Пользователи с каждым пятым telegram_id - премиум (см. seed_users_and_menu)
+        premium = index % 5 == 0
+        if rng.random() < 0.5:
+            parent_id: Optional[int] = rng.choice([None, *navigation_ids])
+            parent = "" if parent_id is None else f"&parent_id={parent_id}"
+            requests.append((f"{MENU_ENDPOINT}/?telegram_user_id={telegram_id}{parent}", ("items", parent_id, premium)))
+        else:
+            menu_id = rng.choice(all_materials if premium else free_materials)
+            url = f"{MENU_ENDPOINT}/{menu_id}/content?telegram_user_id={telegram_id}"
+            requests.append((url, ("content", menu_id, premium)))
+    return requests
+
+
+async def run(
+    client, requests: List[Tuple[str, tuple]], revalidate_rate: float, concurrency: int
+) -> Tuple[List[float], int]:
+    """Отправляет запросы, ревалидируя часть ранее полученных ответов; возвращает задержки и число 304."""
+    rng = random.Random(7)
+    semaphore = asyncio.Semaphore(concurrency)
+    etags: Dict[tuple, str] = {}
+    latencies: List[float] = []
+    not_modified = 0
+
+    async def one(url: str, key: tuple) -> None:
+        nonlocal not_modified
+        async with semaphore:
+            etag = etags.get(key) if rng.random() < revalidate_rate else None
+            with timer(latencies):
+                response = await client.get(url, headers={"If-None-Match": etag} if etag else None)
+        if response.status_code == 304:
+            not_modified += 1
+            return
+        response.raise_for_status()
+        etags[key] = response.headers["ETag"]
+
+    await asyncio.gather(*(one(url, key) for url, key in requests))
+    return latencies, not_modified
+
+
+async def main(requests_count: int, users: int, sections: int, revalidate_rate: float, concurrency: int) -> None:
+    """Сравнивает чтение меню из БД и из снимка на одном потоке запросов."""
+    engine = await create_benchmark_engine()
+    counter = StatementCounter(engine)
+    rows, totals = {}, []
+    try:
+        telegram_ids, _ = await seed_users_and_menu(engine, users, 0)
+        navigation_ids, materials = await seed_menu_tree(engine, sections, subsections=8, materials=10)
+        requests = build_requests(requests_count, telegram_ids, navigation_ids, materials)
+
+        async with api_client(engine) as client:
+            # Прежние эндпоинты не отдавали ETag, поэтому ревалидации в прежнем режиме нет
+            variants = (("прежний", legacy_mode, 0.0), ("снимок меню", nullcontext, revalidate_rate))
+            for name, mode, rate in variants:
+                with mode():
+                    counter.reset()
+                    latencies, not_modified = await run(client, requests, rate, concurrency)
+                rows[name] = summarize(latencies)
+                totals.append((name, counter.statements, not_modified))
+    finally:
+        await engine.dispose()
+
+    print_report(
+        f"{requests_count} запросов меню от {users} пользователей, {len(navigation_ids) + len(materials)} пунктов", rows
+    )
+    print(f"\n{'вариант':<24}{'SQL запросов':>14}{'ответов 304':>14}")
+    for name, statements, not_modified in totals:
+        print(f"{name:<24}{statements:>14}{not_modified:>14}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=3000, help="Количество запросов")
+    parser.add_argument("--users", type=int, default=200, help="Количество пользователей")
+    parser.add_argument("--sections", type=int, default=10, help="Количество разделов верхнего уровня")
+    parser.add_argument("--revalidate-rate", type=float, default=0.5, help="Доля запросов с If-None-Match")
+    parser.add_argument("--concurrency", type=int, default=20, help="Параллельных запросов")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    asyncio.run(main(args.requests, args.users, args.sections, args.revalidate_rate, args.concurrency))
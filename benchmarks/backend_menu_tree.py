@@ -0,0 +1,197 @@
+"""Бенчмарк обхода дерева меню: запрос на каждый уровень и материализованный путь.
+
+На глубоком дереве (цепочка разделов) и широком дереве (раздел с тысячами
+прямых потомков) сравниваются получение поддерева, цепочки предков и
+проверка цикла при смене родителя. Поуровневый вариант повторяет прежний
+подход: get_by_parent_id для каждого раздела и get для каждого предка.
+Вариант по пути выбирает потомков по индексу пути, предков - по ID из
+пути пункта, а цикл проверяет по пути нового родителя, как
+update_admin_menu_item. Дополнительно сравнивается поддерево раздела в
+дереве меню обычной формы (разделы, подразделы, материалы). Глубина
+цепочки ограничена индексом пути: путь из нескольких сотен ID уже не
+помещается в строку индекса.
+Измеряются время операции и число SQL запросов.
+
+Запуск (таблицы в базе BENCHMARK_DATABASE_URL будут пересозданы):
+    BENCHMARK_DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.backend_menu_tree --deep 200 --wide 5000 --sections 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from backend.crud.menu_item import menu_item_crud
+from backend.models import MenuItem
+from backend.models.enums import AccessLevel, ItemType
+from benchmarks.backend_db import StatementCounter, create_benchmark_engine, seed_menu_tree
+from benchmarks.utils import print_report, summarize, timer
+
+
+async def seed_tree(engine: AsyncEngine, first_id: int, size: int, parent_of: Callable[[int], Optional[int]]) -> None:
+    """Создает дерево из size пунктов с ID от first_id, parent_of(i) задает ID родителя i-го пункта.
+
+    Родитель пункта должен иметь меньший номер, чтобы его путь был известен заранее.
+    """
+    paths: Dict[Optional[int], str] = {None: ""}
+    for i in range(size):
+        parent_id = parent_of(i)
+        paths[first_id + i] = f"{paths[parent_id]}{parent_id or ''}/"
+    async with engine.begin() as conn:
+        await conn.execute(
+            insert(MenuItem),
+            [
+                {
+                    "id": first_id + i,
+                    "title": f"Раздел {i}",
+                    "parent_id": parent_of(i),
+                    "path": paths[first_id + i],
+                    "item_type": ItemType.NAVIGATION,
+                    "access_level": AccessLevel.FREE,
+                    "is_active": True,
+                }
+                for i in range(size)
+            ],
+        )
+
+
+async def subtree_by_levels(db: AsyncSession, menu_id: int) -> List[MenuItem]:
+    """Поддерево обходом в ширину с запросом дочерних пунктов каждого раздела."""
+    items = [await menu_item_crud.get(db, menu_id)]
+    queue = [menu_id]
+    while queue:
+        children = await menu_item_crud.get_by_parent_id(db, queue.pop())
+        items.extend(children)
+        queue.extend(child.id for child in children)
+    return items
+
+
+async def ancestors_by_levels(db: AsyncSession, menu_id: int) -> List[MenuItem]:
+    """Цепочка предков подъемом к корню с запросом каждого родителя."""
+    chain: List[MenuItem] = []
+    item = await menu_item_crud.get(db, menu_id)
+    while item is not None and item.parent_id is not None:
+        item = await menu_item_crud.get(db, item.parent_id)
+        chain.append(item)
+    return chain[::-1]
+
+
+async def creates_cycle_by_levels(db: AsyncSession, menu_id: int, parent_id: int) -> bool:
+    """Проверка цикла подъемом от нового родителя к корню."""
+    return parent_id == menu_id or any(item.id == menu_id for item in await ancestors_by_levels(db, parent_id))
+
+
+async def measure(
+    engine: AsyncEngine, counter: StatementCounter, operation: Callable[[AsyncSession], Awaitable], repeat: int
+) -> tuple[dict, int]:
+    """Выполняет операцию repeat раз в новых сессиях, возвращает статистику и число запросов на операцию."""
+    latencies: List[float] = []
+    counter.reset()
+    for _ in range(repeat):
+        async with AsyncSession(engine) as db:
+            with timer(latencies):
+                await operation(db)
+    return summarize(latencies), counter.statements // repeat
+
+
+async def descendants_by_path(db: AsyncSession, menu_id: int) -> List[MenuItem]:
+    """Потомки пункта по материализованному пути."""
+    return await menu_item_crud.get_descendants(db, await menu_item_crud.get(db, menu_id))
+
+
+async def ancestors_by_path(db: AsyncSession, menu_id: int) -> List[MenuItem]:
+    """Цепочка предков по ID из материализованного пути пункта."""
+    item = await menu_item_crud.get(db, menu_id)
+    ids = [int(ancestor_id) for ancestor_id in item.path.strip("/").split("/") if ancestor_id]
+    ancestors = {ancestor.id: ancestor for ancestor in await menu_item_crud.get_by_ids(db, ids)}
+    return [ancestors[ancestor_id] for ancestor_id in ids]
+
+
+async def creates_cycle_by_path(db: AsyncSession, menu_id: int, parent_id: int) -> bool:
+    """Проверка цикла по материализованному пути нового родителя."""
+    parent = await menu_item_crud.get(db, parent_id)
+    return parent_id == menu_id or parent.is_under(menu_id)
+
+
+async def main(deep: int, wide: int, sections: int, repeat: int) -> None:
+    """Сравнивает поуровневый обход дерева меню и материализованный путь."""
+    engine = await create_benchmark_engine()
+    counter = StatementCounter(engine)
+    reports: Dict[str, dict] = {}
+    try:
+        navigation, _ = await seed_menu_tree(engine, sections, 10, 20)
+        section_root = navigation[0]
+        # ID цепочки и широкого раздела задаются явно, выше ID из последовательности
+        deep_root, wide_root = 1_000_000, 2_000_000
+        await seed_tree(engine, deep_root, deep, lambda i: deep_root + i - 1 if i else None)
+        await seed_tree(engine, wide_root, wide, lambda i: wide_root if i else None)
+        async with engine.begin() as conn:
+            # Статистика планировщика, которую в рабочей базе собирает autovacuum
+            await conn.execute(text("ANALYZE menu_items"))
+        deep_leaf, wide_leaf = deep_root + deep - 1, wide_root + wide - 1
+
+        cases = {
+            f"глубокое дерево ({deep} уровней)": {
+                "поддерево": {
+                    "по уровням": lambda db: subtree_by_levels(db, deep_root),
+                    "по пути": lambda db: descendants_by_path(db, deep_root),
+                },
+                "предки": {
+                    "по уровням": lambda db: ancestors_by_levels(db, deep_leaf),
+                    "по пути": lambda db: ancestors_by_path(db, deep_leaf),
+                },
+                "проверка цикла": {
+                    "по уровням": lambda db: creates_cycle_by_levels(db, deep_root, deep_leaf),
+                    "по пути": lambda db: creates_cycle_by_path(db, deep_root, deep_leaf),
+                },
+            },
+            f"широкое дерево ({wide} потомков)": {
+                "поддерево": {
+                    "по уровням": lambda db: subtree_by_levels(db, wide_root),
+                    "по пути": lambda db: descendants_by_path(db, wide_root),
+                },
+                "проверка цикла": {
+                    "по уровням": lambda db: creates_cycle_by_levels(db, wide_root + 1, wide_leaf),
+                    "по пути": lambda db: creates_cycle_by_path(db, wide_root + 1, wide_leaf),
+                },
+            },
+            f"меню из {sections} разделов": {
+                "поддерево раздела": {
+                    "по уровням": lambda db: subtree_by_levels(db, section_root),
+                    "по пути": lambda db: descendants_by_path(db, section_root),
+                },
+            },
+        }
+
+        for tree, operations in cases.items():
+            rows, statements = {}, []
+            for name, variants in operations.items():
+                for variant, operation in variants.items():
+                    rows[f"{name}, {variant}"], per_operation = await measure(engine, counter, operation, repeat)
+                    statements.append((f"{name}, {variant}", per_operation))
+            reports[tree] = {"rows": rows, "statements": statements}
+    finally:
+        await engine.dispose()
+
+    for tree, report in reports.items():
+        print_report(f"{tree}, {repeat} повторов", report["rows"])
+        print(f"\n{'вариант':<40}{'SQL запросов на операцию':>26}")
+        for name, statements in report["statements"]:
+            print(f"{name:<40}{statements:>26}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--deep", type=int, default=200, help="Глубина цепочки разделов")
+    parser.add_argument("--wide", type=int, default=5000, help="Количество потомков широкого раздела")
+    parser.add_argument("--sections", type=int, default=10, help="Разделов в меню обычной формы")
+    parser.add_argument("--repeat", type=int, default=5, help="Повторов каждой операции")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    asyncio.run(main(args.deep, args.wide, args.sections, args.repeat))
@@ -0,0 +1,123 @@
+"""Бенчмарк регистрации пользователей: кэш в боте и upsert одним запросом.
+
+Поток событий от пользователей (большинство - уже известные) проходит
+через регистрацию в трех вариантах:
+    прежний - каждое событие: SELECT + INSERT ... ON CONFLICT + commit + refresh;
+    upsert - каждое событие: один INSERT ... ON CONFLICT ... RETURNING;
+    upsert + кэш бота - запрос уходит только для новых пользователей,
+        пользователей с изменившимся профилем и после истечения TTL кэша.
+Измеряются задержка события, число запросов к API и SQL запросов.
+
+Запуск (таблицы в базе BENCHMARK_DATABASE_URL будут пересозданы):
+    BENCHMARK_DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.backend_registration --events 3000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import random
+from contextlib import contextmanager, nullcontext
+from typing import Iterator, List, Optional
+
+from backend.crud.telegram_user import telegram_user_crud
+from benchmarks.backend_db import StatementCounter, api_client, create_benchmark_engine
+from benchmarks.utils import print_report, summarize, timer
+from bot.utils.registration_cache import RegistrationCache
+
+
+REGISTER_ENDPOINT = "/api/v1/bot/telegram-user/register"
+
+
+def build_events(count: int, users: int, rename_rate: float, seed: int = 42) -> List[dict]:
+    """Формирует поток событий; часть событий приходит с измененным username."""
+    rng = random.Random(seed)
+    events = []
+    for index in range(count):
+        telegram_id = 20_000_000 + rng.randrange(users)
+        username = f"user{telegram_id}" if rng.random() >= rename_rate else f"user{telegram_id}_{index}"
+        events.append({"id": telegram_id, "first_name": "Пользователь", "last_name": None, "username": username})
+    return events
+
+
+def registration_payload(user: dict) -> dict:
+    """Тело запроса регистрации в формате middleware бота."""
+    return {
+        "update_id": user["id"],
+        "message": {"message_id": 1, "from": user, "chat": {"id": user["id"], "type": "private"}, "text": ""},
+        "callback_query": None,
+    }
+
+
+@contextmanager
+def legacy_mode() -> Iterator[None]:
+    """Возвращает прежнюю регистрацию: SELECT, upsert, commit и refresh."""
+    original = telegram_user_crud.upsert_user_with_status
+
+    async def legacy_upsert(db, **user_fields):
+        existing = await telegram_user_crud.get_by_telegram_id(db, user_fields["telegram_id"])
+        user, _ = await original(db, **user_fields)
+        await db.refresh(user)
+        return user, existing is None
+
+    telegram_user_crud.upsert_user_with_status = legacy_upsert
+    try:
+        yield
+    finally:
+        telegram_user_crud.upsert_user_with_status = original
+
+
+async def main(events_count: int, users: int, rename_rate: float) -> None:
+    """Сравнивает варианты регистрации на одном потоке событий."""
+    engine = await create_benchmark_engine()
+    counter = StatementCounter(engine)
+    events = build_events(events_count, users, rename_rate)
+    variants = [
+        ("прежний", legacy_mode, None),
+        ("upsert", nullcontext, None),
+        ("upsert + кэш бота", nullcontext, RegistrationCache(max_users=users, ttl=300)),
+    ]
+    rows, totals = {}, []
+    try:
+        async with api_client(engine) as client:
+            for name, mode, cache in variants:
+                latencies: List[float] = []
+                api_calls = 0
+                with mode():
+                    counter.reset()
+                    for user in events:
+                        with timer(latencies):
+                            api_calls += await register(client, cache, user)
+                rows[name] = summarize(latencies)
+                totals.append((name, api_calls, counter.statements))
+    finally:
+        await engine.dispose()
+
+    print_report(f"Регистрация: {events_count} событий от {users} пользователей", rows)
+    print(f"\n{'вариант':<32}{'запросов к API':>16}{'SQL запросов':>14}")
+    for name, api_calls, statements in totals:
+        print(f"{name:<32}{api_calls:>16}{statements:>14}")
+
+
+async def register(client, cache: Optional[RegistrationCache], user: dict) -> int:
+    """Регистрирует пользователя через API, пропуская недавно зарегистрированных."""
+    profile = (user["first_name"], user["last_name"], user["username"])
+    if cache is not None and cache.is_registered(user["id"], profile):
+        return 0
+    response = await client.post(REGISTER_ENDPOINT, json=registration_payload(user))
+    response.raise_for_status()
+    if cache is not None:
+        cache.remember(user["id"], profile)
+    return 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=3000, help="Количество событий")
+    parser.add_argument("--users", type=int, default=300, help="Количество пользователей")
+    parser.add_argument("--rename-rate", type=float, default=0.01, help="Доля событий с измененным username")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    asyncio.run(main(args.events, args.users, args.rename_rate))
@@ -0,0 +1,239 @@
+"""Бенчмарк поиска по материалам: ILIKE по подстрокам, полнотекстовый индекс и индекс в памяти.
+
+Для каждого размера меню таблица заполняется пунктами с русскими
+названиями и описаниями, после чего одинаковый набор запросов выполняется
+поиском подстрок (прежняя реализация search_by_query), полнотекстовым
+поиском по GIN индексу и поиском по инвертированному индексу в памяти
+(BM25). Для индекса в памяти также измеряются полное построение и
+переиндексация нескольких измененных пунктов меню. Если на сервере доступно расширение pg_trgm,
+дополнительно измеряется нечеткий поиск по триграммам на запросах с
+опечатками. Измеряется задержка запроса.
+
+Запуск (таблицы в базе BENCHMARK_DATABASE_URL будут пересозданы):
+    BENCHMARK_DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.backend_search --sizes 10000 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import math
+import random
+import time
+from typing import List
+
+from sqlalchemy import delete, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from backend.crud.menu_item import menu_item_crud
+from backend.models import MenuItem
+from backend.models.enums import AccessLevel, ItemType
+from backend.services.search_engine import SearchEngine
+from benchmarks.backend_db import create_benchmark_engine
+from benchmarks.utils import print_report, summarize, timer
+
+
+WORDS = [
+    "слуховой",
+    "слуховые",
+    "аппарат",
+    "аппараты",
+    "аппаратов",
+    "ребенок",
+    "ребенка",
+    "детский",
+    "взрослый",
+    "нарушение",
+    "нарушения",
+    "слуха",
+    "слух",
+    "тугоухость",
+    "имплант",
+    "кохлеарная",
+    "имплантация",
+    "операция",
+    "реабилитация",
+    "занятия",
+    "логопед",
+    "сурдолог",
+    "консультация",
+    "диагностика",
+    "обследование",
+    "аудиометрия",
+    "настройка",
+    "батарейки",
+    "уход",
+    "советы",
+    "родители",
+    "школа",
+    "детский сад",
+    "общение",
+    "жестовый",
+    "язык",
+    "льготы",
+    "документы",
+    "инвалидность",
+    "компенсация",
+    "выбор",
+    "модели",
+    "заушные",
+    "внутриушные",
+    "шум",
+]
+QUERIES = [
+    "слуховой аппарат",
+    "кохлеарная имплантация",
+    "ребенок",
+    "настройка аппаратов",
+    "льготы документы",
+    "сурдолог",
+    "уход за аппаратом",
+    "жестовый язык",
+    "реабилитация ребенка",
+    "диагностика слуха",
+]
+TYPO_QUERIES = [
+    "слуховй апарат",
+    "кохлеарная имплонтация",
+    "ребнок",
+    "настройка апаратов",
+    "льготы дакументы",
+    "сурдалог",
+    "уход за апаратом",
+    "жестовый изык",
+    "реабилитацыя ребенка",
+    "диагностика слха",
+]
+
+
+# Количество пунктов меню, переиндексируемых после изменения через админку
+UPDATED_ITEMS = 10
+
+SYLLABLES = ["ка", "ро", "ми", "ле", "ту", "на", "вос", "пра", "ди", "го", "зе", "шу", "ло", "бер", "ти", "ско"]
+
+
+def word(rng: random.Random, domain_share: float) -> str:
+    """Слово предметной области с вероятностью domain_share, иначе случайное слово из слогов."""
+    if rng.random() < domain_share:
+        return rng.choice(WORDS)
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+def phrase(rng: random.Random, words: int, domain_share: float) -> str:
+    """Случайная фраза, в которой встречаются слова предметной области."""
+    return " ".join(word(rng, domain_share) for _ in range(words)).capitalize()
+
+
+async def seed_items(engine: AsyncEngine, count: int, seed: int = 42, batch: int = 10_000) -> None:
+    """Заменяет пункты меню на count пунктов со случайными названиями и описаниями."""
+    rng = random.Random(seed)
+    async with engine.begin() as conn:
+        await conn.execute(delete(MenuItem))
+        for start in range(0, count, batch):
+            await conn.execute(
+                insert(MenuItem),
+                [
+                    {
+                        "title": phrase(rng, 3, 0.3),
+                        "description": phrase(rng, 12, 0.1),
+                        "item_type": ItemType.CONTENT,
+                        "is_active": True,
+                        "access_level": AccessLevel.FREE,
+                    }
+                    for _ in range(start, min(count, start + batch))
+                ],
+            )
+        # Статистика планировщика, которую в рабочей базе собирает autovacuum
+        await conn.execute(text("ANALYZE menu_items"))
+
+
+async def create_trigram_indexes(engine: AsyncEngine) -> bool:
+    """Создает расширение pg_trgm и индексы триграмм, как миграция; возвращает False, если расширения нет."""
+    async with engine.begin() as conn:
+        available = (await conn.execute(text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'"))).scalar()
+        if not available:
+            return False
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        for column in ("title", "description"):
+            await conn.execute(
+                text(
+                    f"CREATE INDEX IF NOT EXISTS ix_menu_items_{column}_trgm "
+                    f"ON menu_items USING gin ({column} gin_trgm_ops)"
+                )
+            )
+    return True
+
+
+async def measure_index_maintenance(engine: AsyncEngine, search_engine: SearchEngine) -> tuple[float, float]:
+    """Строит индекс в памяти и переиндексирует UPDATED_ITEMS пунктов меню, возвращает время в мс."""
+    async with AsyncSession(engine) as db:
+        started = time.perf_counter()
+        await search_engine.get(db)
+        build = (time.perf_counter() - started) * 1000
+
+        menu_ids = (await db.execute(select(MenuItem.id).limit(UPDATED_ITEMS))).scalars().all()
+        search_engine.invalidate(*menu_ids)
+        started = time.perf_counter()
+        await search_engine.get(db)
+        update = (time.perf_counter() - started) * 1000
+    return build, update
+
+
+async def run(engine: AsyncEngine, search, repeat: int, queries: List[str] = QUERIES) -> List[float]:
+    """Выполняет каждый запрос набора repeat раз, возвращает задержки."""
+    latencies: List[float] = []
+    async with AsyncSession(engine) as db:
+        for _ in range(repeat):
+            for query in queries:
+                with timer(latencies):
+                    await search(db, query)
+    return latencies
+
+
+async def main(sizes: List[int], repeat: int) -> None:
+    """Сравнивает поиск подстрок и полнотекстовый поиск на меню разного размера."""
+    engine = await create_benchmark_engine()
+    variants = {
+        "ILIKE по подстрокам": lambda db, query: menu_item_crud.search_by_substring(
+            db, query.split(), AccessLevel.FREE, 10
+        ),
+        "tsvector + GIN": lambda db, query: menu_item_crud.search_by_text(db, query, AccessLevel.FREE, 10),
+    }
+    trigram_variants = {
+        "ILIKE по подстрокам, опечатки": variants["ILIKE по подстрокам"],
+        "pg_trgm + GIN, опечатки": lambda db, query: menu_item_crud.search_by_similarity(
+            db, query, AccessLevel.FREE, 10
+        ),
+    }
+    reports, maintenance = {}, {}
+    try:
+        trigram = await create_trigram_indexes(engine)
+        for size in sizes:
+            await seed_items(engine, size)
+            search_engine = SearchEngine(ttl=math.inf)
+            maintenance[size] = await measure_index_maintenance(engine, search_engine)
+            variants["индекс в памяти (BM25)"] = lambda db, query: search_engine.search(db, query, AccessLevel.FREE, 10)
+            reports[size] = {name: summarize(await run(engine, search, repeat)) for name, search in variants.items()}
+            if trigram:
+                for name, search in trigram_variants.items():
+                    reports[size][name] = summarize(await run(engine, search, repeat, TYPO_QUERIES))
+    finally:
+        await engine.dispose()
+
+    for size, rows in reports.items():
+        print_report(f"{size} пунктов меню, {len(QUERIES)} запросов x {repeat}", rows)
+        build, update = maintenance[size]
+        print(f"индекс в памяти: построение {build:.1f} мс, переиндексация {UPDATED_ITEMS} пунктов {update:.1f} мс")
+    if not trigram:
+        print("\nРасширение pg_trgm недоступно на сервере, нечеткий поиск не измерялся")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000], help="Размеры меню")
+    parser.add_argument("--repeat", type=int, default=5, help="Повторов набора запросов")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    asyncio.run(main(args.sizes, args.repeat))
@@ -0,0 +1,113 @@
+"""Бенчмарк единицы работы CRUD слоя: коммиты и SQL запросы на один запрос API.
+
+Запись активности, оценка материала и создание вопроса выполняются в двух
+режимах: с единицей работы (все изменения фиксируются одним коммитом) и в
+прежнем режиме, где каждая CRUD операция коммитит и перечитывает объект
+сама. Прежний режим включается подменой ``backend.crud.base.in_unit_of_work``.
+
+Запуск (таблицы в базе BENCHMARK_DATABASE_URL будут пересозданы):
+    BENCHMARK_DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.backend_unit_of_work --requests 300
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Iterator, List
+
+import backend.crud.base as crud_base
+from benchmarks.backend_db import StatementCounter, api_client, create_benchmark_engine, seed_users_and_menu
+
+
+ACTIVITY_ENDPOINT = "/api/v1/public/user-activities/"
+RATING_ENDPOINT = "/api/v1/public/ratings/"
+QUESTION_ENDPOINT = "/api/v1/public/user-questions/"
+
+
+@contextmanager
+def legacy_mode() -> Iterator[None]:
+    """Отключает единицу работы: CRUD операции снова коммитят каждая отдельно."""
+    original = crud_base.in_unit_of_work
+    crud_base.in_unit_of_work = lambda db: False
+    try:
+        yield
+    finally:
+        crud_base.in_unit_of_work = original
+
+
+def build_payloads(kind: str, count: int, offset: int, telegram_ids: List[int], menu_ids: List[int]) -> List[dict]:
+    """Формирует тела запросов; оценки получают уникальные пары пользователь/материал."""
+    payloads = []
+    for i in range(offset, offset + count):
+        telegram_id = telegram_ids[i % len(telegram_ids)]
+        if kind == "activity":
+            payloads.append(
+                {
+                    "telegram_user_id": telegram_id,
+                    "menu_item_id": menu_ids[i % len(menu_ids)],
+                    "activity_type": "text_view",
+                }
+            )
+        elif kind == "rating":
+            menu_id = menu_ids[(i // len(telegram_ids)) % len(menu_ids)]
+            payloads.append({"telegram_user_id": telegram_id, "menu_item_id": menu_id, "rating": 1 + i % 5})
+        else:
+            payloads.append({"telegram_user_id": telegram_id, "question_text": f"Вопрос для бенчмарка номер {i}"})
+    return payloads
+
+
+async def run(client, endpoint: str, payloads: List[dict]) -> float:
+    """Отправляет запросы последовательно, возвращает затраченное время."""
+    started = time.perf_counter()
+    for payload in payloads:
+        response = await client.post(endpoint, json=payload)
+        response.raise_for_status()
+    return time.perf_counter() - started
+
+
+async def main(requests_count: int, users: int, menu_items: int) -> None:
+    """Сравнивает число коммитов и SQL запросов с единицей работы и без нее."""
+    engine = await create_benchmark_engine()
+    counter = StatementCounter(engine)
+    try:
+        telegram_ids, menu_ids = await seed_users_and_menu(engine, users, menu_items)
+        scenarios = [
+            ("активность", "activity", ACTIVITY_ENDPOINT),
+            ("оценка", "rating", RATING_ENDPOINT),
+            ("вопрос", "question", QUESTION_ENDPOINT),
+        ]
+
+        results = []
+        async with api_client(engine) as client:
+            for mode_index, (mode_name, mode) in enumerate((("прежний", legacy_mode), ("единица работы", nullcontext))):
+                for index, (name, kind, endpoint) in enumerate(scenarios):
+                    offset = requests_count * (2 * index + mode_index)
+                    payloads = build_payloads(kind, requests_count, offset, telegram_ids, menu_ids)
+                    with mode():
+                        counter.reset()
+                        elapsed = await run(client, endpoint, payloads)
+                    results.append((f"{name}, {mode_name}", elapsed, counter.statements, counter.commits))
+
+        print(f"\n{requests_count} запросов каждого типа ({users} пользователей, {menu_items} материалов)")
+        print(f"{'вариант':<32}{'мс/запрос':>12}{'SQL/запрос':>12}{'коммитов/запрос':>17}")
+        for name, elapsed, statements, commits in results:
+            print(
+                f"{name:<32}{elapsed * 1000 / requests_count:>12.2f}"
+                f"{statements / requests_count:>12.2f}{commits / requests_count:>17.2f}"
+            )
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=300, help="Количество запросов каждого типа")
+    parser.add_argument("--users", type=int, default=500, help="Количество пользователей")
+    parser.add_argument("--menu-items", type=int, default=100, help="Количество материалов")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    asyncio.run(main(args.requests, args.users, args.menu_items))
@@ -0,0 +1,98 @@
+"""Бенчмарк кэша пользователей Telegram и их уровня доступа.
+
+Поток запросов публичных эндпоинтов (меню, контент, активности) от группы
+пользователей выполняется в двух режимах: с поиском пользователя в БД в
+каждом запросе (TTL кэша 0) и с кэшем пользователей. Измеряются задержка
+запросов, число SQL запросов и доля попаданий в кэш.
+
+Запуск (таблицы в базе BENCHMARK_DATABASE_URL будут пересозданы):
+    BENCHMARK_DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.backend_user_access --requests 3000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import random
+from typing import List, Tuple
+
+from backend.services.user_access import user_access_resolver
+from benchmarks.backend_db import StatementCounter, api_client, create_benchmark_engine, seed_users_and_menu
+from benchmarks.utils import print_report, summarize, timer
+
+
+MENU_ENDPOINT = "/api/v1/public/menu-items"
+ACTIVITY_ENDPOINT = "/api/v1/public/user-activities/"
+
+
+def build_requests(count: int, telegram_ids: List[int], item_ids: List[int], seed: int = 42) -> List[Tuple[str, dict]]:
+    """Формирует поток запросов: меню, контент материала и запись активности."""
+    rng = random.Random(seed)
+    requests = []
+    for _ in range(count):
+        telegram_id = rng.choice(telegram_ids)
+        menu_id = rng.choice(item_ids)
+        kind = rng.randrange(3)
+        if kind == 0:
+            requests.append(("GET", {"url": f"{MENU_ENDPOINT}/?telegram_user_id={telegram_id}"}))
+        elif kind == 1:
+            requests.append(("GET", {"url": f"{MENU_ENDPOINT}/{menu_id}/content?telegram_user_id={telegram_id}"}))
+        else:
+            payload = {"telegram_user_id": telegram_id, "menu_item_id": menu_id, "activity_type": "text_view"}
+            requests.append(("POST", {"url": ACTIVITY_ENDPOINT, "json": payload}))
+    return requests
+
+
+async def run(client, requests: List[Tuple[str, dict]], concurrency: int) -> List[float]:
+    """Отправляет запросы с заданной параллельностью, возвращает задержки."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def one(method: str, kwargs: dict) -> None:
+        async with semaphore:
+            with timer(latencies):
+                response = await client.request(method, **kwargs)
+            response.raise_for_status()
+
+    await asyncio.gather(*(one(method, kwargs) for method, kwargs in requests))
+    return latencies
+
+
+async def main(requests_count: int, users: int, concurrency: int) -> None:
+    """Сравнивает поиск пользователя в каждом запросе и кэш пользователей."""
+    engine = await create_benchmark_engine()
+    counter = StatementCounter(engine)
+    rows, totals = {}, []
+    ttl = user_access_resolver.ttl
+    try:
+        telegram_ids, item_ids = await seed_users_and_menu(engine, users, 50)
+        requests = build_requests(requests_count, telegram_ids, item_ids)
+
+        async with api_client(engine) as client:
+            for name, variant_ttl in (("поиск в каждом запросе", 0.0), ("кэш пользователей", ttl)):
+                user_access_resolver.ttl = variant_ttl
+                user_access_resolver.invalidate()
+                hits_before = user_access_resolver.get_stats()["hits"]
+                counter.reset()
+                rows[name] = summarize(await run(client, requests, concurrency))
+                totals.append((name, counter.statements, user_access_resolver.get_stats()["hits"] - hits_before))
+    finally:
+        user_access_resolver.ttl = ttl
+        await engine.dispose()
+
+    print_report(f"{requests_count} запросов от {users} пользователей, параллельность {concurrency}", rows)
+    print(f"\n{'вариант':<28}{'SQL запросов':>14}{'попаданий в кэш':>18}")
+    for name, statements, hits in totals:
+        print(f"{name:<28}{statements:>14}{hits:>18}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=3000, help="Количество запросов")
+    parser.add_argument("--users", type=int, default=200, help="Количество пользователей")
+    parser.add_argument("--concurrency", type=int, default=20, help="Параллельных запросов")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    asyncio.run(main(args.requests, args.users, args.concurrency))
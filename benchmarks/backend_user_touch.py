@@ -0,0 +1,103 @@
+"""Бенчмарк отложенной записи счетчиков и времени активности пользователей.
+
+Поток активностей небольшой группы активных пользователей записывается через
+POST /user-activities/ в двух режимах: с немедленным UPDATE строки
+пользователя в каждом запросе и с отложенной записью, которая суммирует
+изменения в памяти и записывает их одним UPDATE ... FROM (VALUES ...).
+Измеряются задержка запросов и число UPDATE строк telegram_users.
+
+Запуск (таблицы в базе BENCHMARK_DATABASE_URL будут пересозданы):
+    BENCHMARK_DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.backend_user_touch --events 3000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import random
+from typing import List
+
+from sqlalchemy import event
+
+from backend.core.db import AsyncSessionLocal
+from backend.services.user_touch import user_touch_writer
+from benchmarks.backend_db import api_client, create_benchmark_engine, seed_users_and_menu
+from benchmarks.utils import print_report, summarize, timer
+
+
+ACTIVITY_ENDPOINT = "/api/v1/public/user-activities/"
+
+
+async def run(client, events: List[dict], concurrency: int) -> List[float]:
+    """Отправляет активности с заданной параллельностью, возвращает задержки."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def one(payload: dict) -> None:
+        async with semaphore:
+            with timer(latencies):
+                response = await client.post(ACTIVITY_ENDPOINT, json=payload)
+            response.raise_for_status()
+
+    await asyncio.gather(*(one(payload) for payload in events))
+    return latencies
+
+
+async def main(events_count: int, users: int, concurrency: int, staleness: float) -> None:
+    """Сравнивает немедленную и отложенную запись строк пользователей."""
+    engine = await create_benchmark_engine()
+    AsyncSessionLocal.session_factory.configure(bind=engine)
+    user_updates = {"count": 0}
+
+    def count_user_updates(conn, cursor, statement, *args) -> None:
+        if statement.lstrip().startswith("UPDATE telegram_users"):
+            user_updates["count"] += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count_user_updates)
+
+    rng = random.Random(42)
+    rows, updates = {}, {}
+    try:
+        telegram_ids, menu_ids = await seed_users_and_menu(engine, users, 50)
+        events = [
+            {
+                "telegram_user_id": rng.choice(telegram_ids),
+                "menu_item_id": rng.choice(menu_ids),
+                "activity_type": "text_view",
+            }
+            for _ in range(events_count)
+        ]
+
+        async with api_client(engine) as client:
+            user_updates["count"] = 0
+            rows["немедленный UPDATE"] = summarize(await run(client, events, concurrency))
+            updates["немедленный UPDATE"] = user_updates["count"]
+
+            user_touch_writer.max_staleness = staleness
+            user_updates["count"] = 0
+            user_touch_writer.start()
+            latencies = await run(client, events, concurrency)
+            await user_touch_writer.stop()
+            name = f"отложенная запись, {staleness} с"
+            rows[name] = summarize(latencies)
+            updates[name] = user_updates["count"]
+    finally:
+        await engine.dispose()
+
+    print_report(f"{events_count} активностей от {users} пользователей, параллельность {concurrency}", rows)
+    print(f"\n{'вариант':<32}{'UPDATE telegram_users':>24}")
+    for name, count in updates.items():
+        print(f"{name:<32}{count:>24}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=3000, help="Количество активностей")
+    parser.add_argument("--users", type=int, default=20, help="Количество активных пользователей")
+    parser.add_argument("--concurrency", type=int, default=20, help="Параллельных запросов")
+    parser.add_argument("--staleness", type=float, default=1.0, help="Максимальная задержка записи (сек)")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    asyncio.run(main(args.events, args.users, args.concurrency, args.staleness))
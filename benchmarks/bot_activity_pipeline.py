@@ -0,0 +1,120 @@
+"""Бенчмарк записи активностей в LoggingMiddleware: ожидание POST против фоновой очереди.
+
+Измеряется время, которое middleware добавляет к обработке апдейта до вызова
+хендлера, а также количество запросов к Backend и доставленных событий после
+дренирования очереди.
+
+Запуск:
+    python -m benchmarks.bot_activity_pipeline --updates 2000 --concurrency 50 --backend-delay 0.01
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+from typing import List
+
+from aiohttp import web
+
+from benchmarks.utils import print_report, summarize, timer
+from bot.utils.activity_pipeline import ActivityPipeline
+from bot.utils.api_client import api_client
+
+
+async def start_fake_backend(delay: float) -> tuple[web.AppRunner, str, dict]:
+    """Запускает имитацию Backend, считающую запросы и записанные активности."""
+    counters = {"requests": 0, "activities": 0}
+
+    async def activity(request: web.Request) -> web.Response:
+        counters["requests"] += 1
+        payload = await request.json()
+        counters["activities"] += len(payload.get("activities", [payload]))
+        await asyncio.sleep(delay)
+        return web.json_response({"message": "ok"}, status=201)
+
+    app = web.Application()
+    app.router.add_post("/api/v1/public/user-activities/", activity)
+    app.router.add_post("/api/v1/public/user-activities/batch", activity)
+
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}", counters
+
+
+def activity_for(update_id: int) -> dict:
+    """Событие, которое формирует middleware при нажатии кнопки меню."""
+    return {"telegram_user_id": 1000 + update_id % 100, "activity_type": "navigation", "menu_item_id": update_id % 30}
+
+
+async def run_inline(updates: int, concurrency: int) -> List[float]:
+    """Прежнее поведение: middleware ждет POST до вызова хендлера."""
+    latencies: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(update_id: int) -> None:
+        async with semaphore:
+            with timer(latencies):
+                await api_client._make_request("POST", "api/v1/public/user-activities/", data=activity_for(update_id))
+
+    await asyncio.gather(*(one(i) for i in range(updates)))
+    return latencies
+
+
+async def run_pipeline(pipeline: ActivityPipeline, updates: int, concurrency: int) -> List[float]:
+    """Новое поведение: middleware кладет событие в очередь."""
+    latencies: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(update_id: int) -> None:
+        async with semaphore:
+            with timer(latencies):
+                pipeline.submit(activity_for(update_id))
+            # Имитация работы хендлера, за время которой фоновая задача отправляет пачки
+            await asyncio.sleep(0.001)
+
+    await asyncio.gather(*(one(i) for i in range(updates)))
+    return latencies
+
+
+async def main(updates: int, concurrency: int, backend_delay: float) -> None:
+    """Сравнивает запись активностей в middleware до и после изменений."""
+    runner, base_url, counters = await start_fake_backend(backend_delay)
+    api_client.base_url = base_url
+    try:
+        rows = {}
+        backend = {}
+
+        counters.update(requests=0, activities=0)
+        rows["ожидание POST"] = summarize(await run_inline(updates, concurrency))
+        backend["ожидание POST"] = dict(counters)
+
+        counters.update(requests=0, activities=0)
+        pipeline = ActivityPipeline(batch_size=50, flush_interval=0.2)
+        pipeline.start()
+        rows["фоновая очередь"] = summarize(await run_pipeline(pipeline, updates, concurrency))
+        await pipeline.stop()
+        backend["фоновая очередь"] = dict(counters)
+
+        print_report(f"Задержка, добавляемая LoggingMiddleware ({updates} апдейтов)", rows)
+        print()
+        for name, counts in backend.items():
+            print(f"{name}: запросов к Backend={counts['requests']}, записано активностей={counts['activities']}")
+        print(f"Счетчики очереди: {pipeline.get_stats()}")
+    finally:
+        await api_client.close()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--updates", type=int, default=2000, help="Количество апдейтов")
+    parser.add_argument("--concurrency", type=int, default=50, help="Параллельно обрабатываемых апдейтов")
+    parser.add_argument("--backend-delay", type=float, default=0.01, help="Задержка ответа Backend в секундах")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    asyncio.run(main(args.updates, args.concurrency, args.backend_delay))
@@ -0,0 +1,123 @@
+"""Бенчмарк задержки обработки апдейта ботом: новая сессия на запрос против общего пула.
+
+Поднимает локальный aiohttp сервер, имитирующий эндпоинты Backend, и
+прогоняет "апдейты" Telegram: каждый апдейт делает три последовательных
+запроса, как middleware и хендлер меню (регистрация, запись активности,
+загрузка меню).
+
+Запуск:
+    python -m benchmarks.bot_api_client --updates 500 --concurrency 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from typing import Awaitable, Callable, List
+
+from aiohttp import ClientSession, ClientTimeout, web
+
+from benchmarks.utils import print_report, summarize, timer
+from bot.utils.api_client import APIClient
+
+
+async def _register(request: web.Request) -> web.Response:
+    return web.json_response({"user": {"id": 1}, "user_created": False})
+
+
+async def _activity(request: web.Request) -> web.Response:
+    return web.json_response({"message": "Активность успешно записана"}, status=201)
+
+
+async def _menu_items(request: web.Request) -> web.Response:
+    return web.json_response({"items": [{"id": i, "title": f"Раздел {i}"} for i in range(8)]})
+
+
+async def start_fake_backend() -> tuple[web.AppRunner, str]:
+    """Запускает имитацию Backend на свободном локальном порту."""
+    app = web.Application()
+    app.router.add_post("/api/v1/bot/telegram-user/register", _register)
+    app.router.add_post("/api/v1/public/user-activities/", _activity)
+    app.router.add_get("/api/v1/public/menu-items/", _menu_items)
+
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+class PerCallSessionClient(APIClient):
+    """Прежнее поведение клиента: новая сессия и TCP соединение на каждый запрос."""
+
+    async def _make_request(self, method, endpoint, data=None, params=None):
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        async with ClientSession(timeout=ClientTimeout(total=self.timeout)) as session:
+            async with session.request(method=method, url=url, json=data, params=params) as response:
+                return await response.json()
+
+
+async def handle_update(client: APIClient, telegram_user_id: int) -> None:
+    """Запросы к API, которые бот делает при нажатии кнопки меню."""
+    await client._make_request(
+        "POST", "api/v1/bot/telegram-user/register", data={"message": {"from": {"id": telegram_user_id}}}
+    )
+    await client._make_request(
+        "POST",
+        "api/v1/public/user-activities/",
+        data={"telegram_user_id": telegram_user_id, "activity_type": "navigation"},
+    )
+    await client._make_request("GET", "api/v1/public/menu-items/", params={"telegram_user_id": telegram_user_id})
+
+
+async def run_updates(client: APIClient, updates: int, concurrency: int) -> List[float]:
+    """Прогоняет апдейты с ограничением параллелизма и возвращает задержки в мс."""
+    latencies: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(update_id: int) -> None:
+        async with semaphore:
+            with timer(latencies):
+                await handle_update(client, 1000 + update_id)
+
+    await asyncio.gather(*(one(i) for i in range(updates)))
+    return latencies
+
+
+async def measure(
+    factory: Callable[[], APIClient], updates: int, concurrency: int, warmup: Callable[[APIClient], Awaitable[None]]
+) -> dict:
+    """Замеряет один вариант клиента."""
+    client = factory()
+    await warmup(client)
+    try:
+        return summarize(await run_updates(client, updates, concurrency))
+    finally:
+        await client.close()
+
+
+async def main(updates: int, concurrency: int) -> None:
+    """Сравнивает оба варианта клиента на одинаковой нагрузке."""
+    runner, base_url = await start_fake_backend()
+    try:
+        rows = {}
+        for level in sorted({1, concurrency}):
+            rows[f"новая сессия, c={level}"] = await measure(
+                lambda: PerCallSessionClient(base_url), updates, level, lambda c: handle_update(c, 1)
+            )
+            rows[f"общий пул, c={level}"] = await measure(
+                lambda: APIClient(base_url), updates, level, lambda c: handle_update(c, 1)
+            )
+        print_report("Задержка обработки одного апдейта (3 запроса к API)", rows)
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--updates", type=int, default=500, help="Количество апдейтов")
+    parser.add_argument("--concurrency", type=int, default=20, help="Параллельно обрабатываемых апдейтов")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.updates, args.concurrency))
@@ -0,0 +1,131 @@
+"""Бенчмарк поведения клиента бота при деградации Backend.
+
+Backend "зависает" (не отвечает дольше таймаута). Апдейты приходят с
+постоянной частотой; сравнивается клиент без ограничений (как раньше: длинный
+таймаут, повторы с экспоненциальной задержкой) и клиент с circuit breaker,
+bulkhead и бюджетом повторов. Измеряются время до ответа хендлеру, пиковое
+число зависших корутин и количество запросов, дошедших до Backend.
+
+Все таймауты уменьшены, чтобы прогон занимал секунды.
+
+Запуск:
+    python -m benchmarks.bot_api_resilience --updates 200 --rate 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+from typing import List
+
+from aiohttp import web
+
+from benchmarks.utils import print_report, summarize, timer
+from bot.utils.api_client import HOT_PATH, APIClient, APIClientError
+from bot.utils.resilience import Bulkhead, CircuitBreaker, EndpointPolicy, RetryBudget
+
+
+async def start_hanging_backend(hang: float) -> tuple[web.AppRunner, str, dict]:
+    """Запускает Backend, который отвечает только через ``hang`` секунд."""
+    counters = {"requests": 0}
+
+    async def menu_items(request: web.Request) -> web.Response:
+        counters["requests"] += 1
+        await asyncio.sleep(hang)
+        return web.json_response({"items": []})
+
+    app = web.Application()
+    app.router.add_get("/api/v1/public/menu-items/", menu_items)
+
+    runner = web.AppRunner(app, access_log=None, shutdown_timeout=0.1)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}", counters
+
+
+def unbounded_client(base_url: str) -> APIClient:
+    """Клиент с прежним поведением: без размыкания цепи и лимитов, экспоненциальные паузы."""
+    unlimited = 10**6
+    policy = EndpointPolicy(
+        name=HOT_PATH,
+        timeout=1.0,
+        breaker=CircuitBreaker(HOT_PATH, failure_threshold=unlimited),
+        bulkhead=Bulkhead(HOT_PATH, max_concurrent=unlimited),
+        retry_budget=RetryBudget(min_retries=unlimited),
+    )
+    return APIClient(base_url, retries=3, policies={HOT_PATH: policy}, retry_backoff_base=1.0, retry_backoff_max=4.0)
+
+
+def resilient_client(base_url: str) -> APIClient:
+    """Клиент с circuit breaker, bulkhead и бюджетом повторов."""
+    policy = EndpointPolicy(
+        name=HOT_PATH,
+        timeout=0.3,
+        breaker=CircuitBreaker(HOT_PATH, failure_threshold=5, recovery_timeout=5.0),
+        bulkhead=Bulkhead(HOT_PATH, max_concurrent=10, acquire_timeout=0.1),
+        retry_budget=RetryBudget(ratio=0.2, min_retries=5),
+    )
+    return APIClient(base_url, retries=3, policies={HOT_PATH: policy}, retry_backoff_base=0.05, retry_backoff_max=0.5)
+
+
+async def run_brownout(client: APIClient, updates: int, rate: float) -> tuple[List[float], int]:
+    """Подает апдейты с заданной частотой и возвращает задержки и пик зависших хендлеров."""
+    latencies: List[float] = []
+    pending = 0
+    peak_pending = 0
+
+    async def one() -> None:
+        nonlocal pending, peak_pending
+        pending += 1
+        peak_pending = max(peak_pending, pending)
+        try:
+            with timer(latencies):
+                await client._make_request("GET", "api/v1/public/menu-items/", params={"telegram_user_id": 1})
+        except APIClientError:
+            pass
+        finally:
+            pending -= 1
+
+    tasks = []
+    for _ in range(updates):
+        tasks.append(asyncio.create_task(one()))
+        await asyncio.sleep(1 / rate)
+    await asyncio.gather(*tasks)
+    return latencies, peak_pending
+
+
+async def main(updates: int, rate: float) -> None:
+    """Сравнивает оба клиента при зависшем Backend."""
+    runner, base_url, counters = await start_hanging_backend(hang=60.0)
+    try:
+        rows = {}
+        extra = {}
+        for name, factory in (("без ограничений", unbounded_client), ("breaker + bulkhead", resilient_client)):
+            client = factory(base_url)
+            counters["requests"] = 0
+            try:
+                latencies, peak = await run_brownout(client, updates, rate)
+            finally:
+                await client.close()
+            rows[name] = summarize(latencies)
+            extra[name] = (peak, counters["requests"], client.get_resilience_stats()[HOT_PATH])
+
+        print_report(f"Время до ответа хендлеру при зависшем Backend ({updates} апдейтов, {rate:.0f}/с)", rows)
+        print()
+        for name, (peak, backend_requests, stats) in extra.items():
+            print(f"{name}: пик зависших хендлеров={peak}, запросов к Backend={backend_requests}, {stats}")
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--updates", type=int, default=200, help="Количество апдейтов")
+    parser.add_argument("--rate", type=float, default=100.0, help="Апдейтов в секунду")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    asyncio.run(main(args.updates, args.rate))
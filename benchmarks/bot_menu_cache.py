@@ -0,0 +1,117 @@
+"""Бенчмарк кэша меню в боте: TTL + LRU + ревалидация по ETag.
+
+Пользователи двух уровней доступа случайно перемещаются по разделам меню.
+Backend отвечает с задержкой и поддерживает If-None-Match. Сравниваются
+прогоны без кэша и с кэшем: задержка нажатия, число полных ответов и 304.
+
+Запуск:
+    python -m benchmarks.bot_menu_cache --clicks 2000 --users 200 --sections 30 --ttl 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+from typing import List
+
+from aiohttp import web
+
+from benchmarks.utils import print_report, summarize, timer
+from bot.services.menu_service import MenuService
+from bot.utils.api_client import api_client
+from bot.utils.menu_cache import menu_cache
+
+
+MENU_VERSION_ETAG = '"menu-v1"'
+
+
+async def start_fake_backend(delay: float) -> tuple[web.AppRunner, str, dict]:
+    """Запускает имитацию Backend с поддержкой ETag."""
+    counters = {"full": 0, "not_modified": 0}
+
+    async def menu_items(request: web.Request) -> web.Response:
+        await asyncio.sleep(delay)
+        if request.headers.get("If-None-Match") == MENU_VERSION_ETAG:
+            counters["not_modified"] += 1
+            return web.Response(status=304, headers={"ETag": MENU_VERSION_ETAG})
+        counters["full"] += 1
+        parent_id = request.query.get("parent_id", "root")
+        items = [{"id": i, "title": f"Раздел {parent_id}.{i}"} for i in range(8)]
+        return web.json_response({"items": items}, headers={"ETag": MENU_VERSION_ETAG})
+
+    app = web.Application()
+    app.router.add_get("/api/v1/public/menu-items/", menu_items)
+
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}", counters
+
+
+class UncachedMenuService(MenuService):
+    """Прежнее поведение: запрос к Backend на каждое нажатие."""
+
+    async def _get_cached(self, telegram_user_id, endpoint, params):
+        return await api_client._make_request("GET", endpoint, params=params)
+
+
+async def run_clicks(service: MenuService, clicks: int, users: int, sections: int, seed: int) -> List[float]:
+    """Имитирует нажатия кнопок меню и возвращает задержки в мс."""
+    rng = random.Random(seed)
+    latencies: List[float] = []
+
+    async def click(telegram_user_id: int, parent_id: int) -> None:
+        with timer(latencies):
+            await service.get_menu_items(telegram_user_id, parent_id)
+
+    batch = []
+    for _ in range(clicks):
+        batch.append(click(rng.randrange(users), rng.randrange(sections)))
+        if len(batch) == 20:
+            await asyncio.gather(*batch)
+            batch = []
+    await asyncio.gather(*batch)
+    return latencies
+
+
+async def main(clicks: int, users: int, sections: int, ttl: float, delay: float) -> None:
+    """Сравнивает навигацию без кэша и с кэшем."""
+    runner, base_url, counters = await start_fake_backend(delay)
+    api_client.base_url = base_url
+
+    # Уровни доступа, которые в боте запоминает middleware регистрации
+    for telegram_user_id in range(users):
+        menu_cache.remember_access_level(telegram_user_id, "premium" if telegram_user_id % 5 == 0 else "free")
+    menu_cache.ttl = ttl
+
+    try:
+        rows = {}
+        backend = {}
+        for name, service in (("без кэша", UncachedMenuService()), ("кэш TTL + ETag", MenuService())):
+            counters.update(full=0, not_modified=0)
+            rows[name] = summarize(await run_clicks(service, clicks, users, sections, seed=42))
+            backend[name] = dict(counters)
+
+        print_report(f"Нажатия кнопок меню ({users} пользователей, {sections} разделов, TTL {ttl} с)", rows)
+        print()
+        for name, counts in backend.items():
+            print(f"{name}: полных ответов Backend={counts['full']}, ответов 304={counts['not_modified']}")
+        print(f"Счетчики кэша: {menu_cache.get_stats()}")
+    finally:
+        await api_client.close()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clicks", type=int, default=2000, help="Количество нажатий")
+    parser.add_argument("--users", type=int, default=200, help="Количество пользователей")
+    parser.add_argument("--sections", type=int, default=30, help="Количество разделов меню")
+    parser.add_argument("--ttl", type=float, default=0.05, help="TTL кэша в секундах")
+    parser.add_argument("--backend-delay", type=float, default=0.01, help="Задержка ответа Backend в секундах")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.clicks, args.users, args.sections, args.ttl, args.backend_delay))
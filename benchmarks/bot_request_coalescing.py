@@ -0,0 +1,95 @@
+"""Бенчмарк объединения одинаковых одновременных GET запросов в клиенте бота.
+
+Имитирует "волну" пользователей, одновременно открывающих один и тот же
+раздел меню. Backend отвечает с искусственной задержкой; сравнивается
+количество дошедших до него запросов и задержка ответа без объединения и с ним.
+
+Запуск:
+    python -m benchmarks.bot_request_coalescing --waves 50 --fanout 40 --backend-delay 0.02
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from typing import List
+
+from aiohttp import web
+
+from benchmarks.utils import print_report, summarize, timer
+from bot.utils.api_client import APIClient
+
+
+ENDPOINT = "api/v1/public/menu-items/"
+
+
+async def start_fake_backend(delay: float) -> tuple[web.AppRunner, str, dict]:
+    """Запускает имитацию Backend, считающую входящие запросы."""
+    counters = {"requests": 0}
+
+    async def menu_items(request: web.Request) -> web.Response:
+        counters["requests"] += 1
+        await asyncio.sleep(delay)
+        return web.json_response({"items": [{"id": i, "title": f"Раздел {i}"} for i in range(8)]})
+
+    app = web.Application()
+    app.router.add_get(f"/{ENDPOINT}", menu_items)
+
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}", counters
+
+
+async def run_waves(client: APIClient, waves: int, fanout: int, coalesce: bool) -> List[float]:
+    """Отправляет волны одинаковых запросов и возвращает задержки в мс."""
+    latencies: List[float] = []
+
+    async def one(parent_id: int) -> None:
+        with timer(latencies):
+            await client._make_request(
+                "GET", ENDPOINT, params={"telegram_user_id": 1, "parent_id": parent_id}, coalesce=coalesce
+            )
+
+    for wave in range(waves):
+        await asyncio.gather(*(one(wave) for _ in range(fanout)))
+    return latencies
+
+
+async def main(waves: int, fanout: int, backend_delay: float) -> None:
+    """Сравнивает работу клиента без объединения запросов и с ним."""
+    runner, base_url, counters = await start_fake_backend(backend_delay)
+    try:
+        rows = {}
+        backend_requests = {}
+        for coalesce in (False, True):
+            name = "с объединением" if coalesce else "без объединения"
+            client = APIClient(base_url)
+            counters["requests"] = 0
+            try:
+                rows[name] = summarize(await run_waves(client, waves, fanout, coalesce))
+            finally:
+                await client.close()
+            backend_requests[name] = counters["requests"]
+            if coalesce:
+                stats = client.get_coalescing_stats()
+
+        print_report(f"Волны по {fanout} одинаковых GET, задержка Backend {backend_delay * 1000:.0f} мс", rows)
+        print()
+        for name, count in backend_requests.items():
+            print(f"Запросов дошло до Backend ({name}): {count}")
+        print(f"Счетчики клиента: {stats}")
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--waves", type=int, default=50, help="Количество волн запросов")
+    parser.add_argument("--fanout", type=int, default=40, help="Одновременных одинаковых запросов в волне")
+    parser.add_argument("--backend-delay", type=float, default=0.02, help="Задержка ответа Backend в секундах")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.waves, args.fanout, args.backend_delay))
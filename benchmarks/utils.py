@@ -0,0 +1,49 @@
+"""Общие утилиты для бенчмарков."""
+
+from __future__ import annotations
+
+import statistics
+import time
+from contextlib import contextmanager
+from typing import Iterator, List
+
+
+@contextmanager
+def timer(latencies: List[float]) -> Iterator[None]:
+    """Замеряет время выполнения блока и добавляет его (в мс) в список."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        latencies.append((time.perf_counter() - started) * 1000)
+
+
+def percentile(values: List[float], percent: float) -> float:
+    """Вычисляет перцентиль по отсортированной выборке."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(percent / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(latencies: List[float]) -> dict:
+    """Сводная статистика по задержкам в миллисекундах."""
+    return {
+        "count": len(latencies),
+        "mean": statistics.fmean(latencies) if latencies else 0.0,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+    }
+
+
+def print_report(title: str, rows: dict) -> None:
+    """Печатает таблицу результатов: название варианта -> сводная статистика."""
+    print(f"\n{title}")
+    print(f"{'вариант':<32}{'n':>8}{'mean, мс':>12}{'p50, мс':>12}{'p95, мс':>12}{'p99, мс':>12}")
+    for name, stats in rows.items():
+        print(
+            f"{name:<32}{stats['count']:>8}{stats['mean']:>12.3f}{stats['p50']:>12.3f}"
+            f"{stats['p95']:>12.3f}{stats['p99']:>12.3f}"
+        )
@@ -1,6 +1,6 @@
 """Конфигурация Telegram бота."""
 
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings
@@ -18,6 +18,44 @@ class BotSettings(BaseSettings):
     api_base_url: str = Field(default="http://localhost:8001", description="URL API Backend")
     api_timeout: int = Field(default=30, description="Таймаут API запросов")
     api_retries: int = Field(default=3, description="Количество повторных попыток")
+    api_pool_limit: int = Field(default=100, description="Максимум одновременных соединений с API")
+    api_pool_limit_per_host: int = Field(default=50, description="Максимум соединений с одним хостом API")
+    api_keepalive_timeout: float = Field(default=30.0, description="Время жизни keep-alive соединения (сек)")
+    api_dns_cache_ttl: int = Field(default=300, description="Время жизни DNS кэша (сек)")
+
+    # Отказоустойчивость API клиента (по классам эндпоинтов)
+    api_hot_path_timeout: float = Field(default=5.0, description="Таймаут запросов горячего пути (сек)")
+    api_activity_timeout: float = Field(default=3.0, description="Таймаут запросов записи активности (сек)")
+    api_reminder_timeout: float = Field(default=30.0, description="Таймаут запросов сервиса напоминаний (сек)")
+    api_hot_path_concurrency: int = Field(default=50, description="Одновременных запросов горячего пути")
+    api_activity_concurrency: int = Field(default=20, description="Одновременных запросов записи активности")
+    api_reminder_concurrency: int = Field(default=5, description="Одновременных запросов сервиса напоминаний")
+    api_bulkhead_acquire_timeout: float = Field(default=1.0, description="Ожидание свободного слота запроса (сек)")
+    api_breaker_failure_threshold: int = Field(default=5, description="Ошибок подряд для размыкания цепи")
+    api_breaker_recovery_timeout: float = Field(default=15.0, description="Время до пробного запроса (сек)")
+    api_retry_budget_ratio: float = Field(default=0.2, description="Доля повторов от числа запросов")
+    api_retry_budget_min: int = Field(default=10, description="Минимум повторов в окне бюджета")
+    api_retry_backoff_base: float = Field(default=0.5, description="Базовая задержка перед повтором (сек)")
+    api_retry_backoff_max: float = Field(default=5.0, description="Максимальная задержка перед повтором (сек)")
+
+    # Кэш меню
+    menu_cache_ttl: float = Field(default=60.0, description="Время жизни ответа меню в кэше (сек)")
+    menu_cache_max_entries: int = Field(default=1000, description="Максимум закэшированных ответов меню")
+    menu_cache_max_users: int = Field(default=10000, description="Максимум запоминаемых уровней доступа")
+
+    # Кэш зарегистрированных пользователей
+    registration_cache_ttl: float = Field(default=300.0, description="Интервал повторной регистрации (сек)")
+    registration_cache_max_users: int = Field(default=10000, description="Максимум запоминаемых пользователей")
+
+    # Фоновая отправка активностей
+    activity_queue_size: int = Field(default=10000, description="Максимум активностей в очереди отправки")
+    activity_batch_size: int = Field(default=50, description="Размер пачки активностей")
+    activity_flush_interval: float = Field(default=1.0, description="Максимальное ожидание пачки (сек)")
+    activity_overflow_policy: Literal["drop_oldest", "sample"] = Field(
+        default="drop_oldest", description="Политика при переполнении очереди активностей"
+    )
+    activity_sample_rate: float = Field(default=0.1, description="Доля принимаемых активностей в режиме sample")
+    activity_drain_timeout: float = Field(default=10.0, description="Время дренирования очереди при остановке (сек)")
 
     # Настройки напоминаний
     inactive_days_threshold: int = Field(default=10, description="Дней неактивности для напоминаний")
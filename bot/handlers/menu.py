@@ -7,7 +7,6 @@ from aiogram.fsm.context import FSMContext
 
 from ..config import settings
 from ..services.menu_service import MenuService
-from ..services.user_activity_service import UserActivityService
 from ..utils.keyboards import create_content_actions_keyboard, create_menu_keyboard
 from .start import UserStates
 
@@ -16,7 +15,6 @@ logger = logging.getLogger(__name__)
 
 router = Router()
 menu_service = MenuService()
-activity_adviser = UserActivityService()
 
 
 @router.callback_query(F.data.startswith("menu_"))
@@ -29,19 +27,23 @@ async def menu_navigation_handler(callback: types.CallbackQuery, state: FSMConte
         # Извлекаем ID пункта меню
         menu_item_id = int(callback.data.split("_")[1])
 
-        # Загружаем контент пункта меню
-        menu_content = await menu_service.get_menu_content(telegram_user_id, menu_item_id)
+        # Открываем пункт меню: контент, дочерние пункты и запись активности одним запросом
+        navigation = await menu_service.navigate(telegram_user_id, menu_item_id)
+        menu_content = navigation.get("item") if navigation else None
 
         if not menu_content:
             await callback.answer("Пункт меню не найден", show_alert=True)
             return
 
+        parent = navigation.get("parent")
+        parent_id = parent["id"] if parent else None
+
         item_type = menu_content.get("item_type")
         logger.debug(f"Menu item {menu_item_id} has type: {item_type}, content: {menu_content}")
 
         if item_type == "navigation":
             # Навигационный пункт - показываем дочерние элементы
-            children = menu_content.get("children", [])
+            children = navigation.get("children", [])
 
             if children:
                 keyboard = create_menu_keyboard(children)
@@ -57,10 +59,7 @@ async def menu_navigation_handler(callback: types.CallbackQuery, state: FSMConte
 
                 # Обновляем состояние навигации
                 await state.set_state(UserStates.menu_navigation)
-                await state.update_data(current_parent=menu_item_id, parent_id=menu_content.get("parent_id"))
-
-                # Записываем активность
-                await activity_adviser.log_menu_navigation(telegram_user_id, menu_item_id)
+                await state.update_data(current_parent=menu_item_id, parent_id=parent_id)
 
             else:
                 await callback.answer("Нет доступных подразделов", show_alert=True)
@@ -82,11 +81,6 @@ async def menu_navigation_handler(callback: types.CallbackQuery, state: FSMConte
                     viewed_content_id=menu_item_id, content_title=menu_content.get("title", "Материал")
                 )
 
-                # Записываем активность просмотра контента
-                await activity_adviser.log_content_view(
-                    telegram_user_id, menu_item_id, menu_content.get("title", "Unknown")
-                )
-
                 await callback.answer()
             else:
                 await callback.answer("Ошибка загрузки контента", show_alert=True)
@@ -129,17 +123,16 @@ async def content_menu_handler(callback: types.CallbackQuery, state: FSMContext)
         # Извлекаем ID контента
         content_id = int(callback.data.split("_")[2])
 
-        # Получаем данные контента для определения родительского пункта
-        menu_content = await menu_service.get_menu_content(telegram_user_id, content_id)
+        # Открываем родительский раздел контента одним запросом
+        navigation = await menu_service.navigate(telegram_user_id, content_id, back=True)
 
-        if not menu_content:
+        if not navigation:
             await callback.answer("Контент не найден", show_alert=True)
             return
 
-        parent_id = menu_content.get("parent_id")
-
-        # Загружаем родительское меню
-        menu_items = await menu_service.get_menu_items(telegram_user_id, parent_id)
+        parent = navigation.get("item")
+        parent_id = parent["id"] if parent else None
+        menu_items = navigation.get("children", [])
 
         if menu_items:
             keyboard = create_menu_keyboard(menu_items)
@@ -1,10 +1,11 @@
 """Обработчик поиска по материалам."""
 
 import logging
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
 from aiogram import F, Router, types
 from aiogram.fsm.context import FSMContext
+from aiogram.types import InlineKeyboardMarkup
 
 from ..config import settings
 from ..services.menu_service import MenuService
@@ -23,6 +24,9 @@ router = Router()
 menu_service = MenuService()
 activity_service = UserActivityService()
 
+# Количество результатов поиска на одной странице
+SEARCH_PAGE_SIZE = 5
+
 
 @router.callback_query(F.data == "search")
 @router.callback_query(F.data.startswith("search_page_"))
@@ -37,8 +41,11 @@ async def search_handler(callback: types.CallbackQuery, state: FSMContext):
             page = int(callback.data.split("_")[-1])
             state_data = await state.get_data()
             search_query = state_data.get("search_query")
+            # Курсор первой страницы сохраняется при поиске, следующих - при показе предыдущей страницы.
+            # Возврат на первую страницу по курсору не записывается как новый поиск
+            cursor = state_data.get("search_cursors", {}).get(str(page))
 
-            if not search_query:
+            if not search_query or cursor is None:
                 await callback.answer("Результаты поиска устарели", show_alert=True)
                 return
         else:
@@ -52,8 +59,8 @@ async def search_handler(callback: types.CallbackQuery, state: FSMContext):
             await callback.answer()
             return
 
-        # Выполняем поиск
-        await perform_search(callback, telegram_user_id, search_query, page)
+        # Загружаем запрошенную страницу результатов
+        await perform_search(callback, state, telegram_user_id, search_query, page, cursor)
 
     except Exception as e:
         logger.error(f"Error in search_handler: {e}")
@@ -80,10 +87,10 @@ async def search_text_handler(message: types.Message, state: FSMContext):
             return
 
         # Сохраняем запрос поиска
-        await state.update_data(search_query=search_query)
+        await state.update_data(search_query=search_query, search_cursors={})
 
         # Выполняем поиск
-        await perform_text_search(message, telegram_user_id, search_query)
+        await perform_text_search(message, state, telegram_user_id, search_query)
 
     except Exception as e:
         logger.error(f"Error in search_text_handler: {e}")
@@ -138,13 +145,31 @@ async def search_result_handler(callback: types.CallbackQuery, state: FSMContext
         await callback.answer("Произошла ошибка", show_alert=True)
 
 
-async def perform_search(callback: types.CallbackQuery, telegram_user_id: int, search_query: str, page: int = 1):
-    """Выполняет поиск и отправляет результаты."""
+async def remember_next_cursor(state: FSMContext, page: int, search_page: Dict[str, Any]) -> None:
+    """Сохраняет курсоры показанной и следующей страниц результатов для кнопок пагинации."""
+    page_cursors = {str(page): search_page.get("cursor"), str(page + 1): search_page.get("next_cursor")}
+    page_cursors = {key: cursor for key, cursor in page_cursors.items() if cursor}
+    if page_cursors:
+        state_data = await state.get_data()
+        await state.update_data(search_cursors={**state_data.get("search_cursors", {}), **page_cursors})
+
+
+async def perform_search(
+    callback: types.CallbackQuery,
+    state: FSMContext,
+    telegram_user_id: int,
+    search_query: str,
+    page: int = 1,
+    cursor: Optional[str] = None,
+):
+    """Загружает страницу результатов поиска по курсору и отправляет ее."""
     try:
-        # Вызываем поиск через API
-        search_results = await menu_service.search_materials(telegram_user_id, search_query, limit=5, page=page)
+        # Бэкенд отдает только запрошенную страницу из сохраненного набора результатов
+        search_page = await menu_service.search_materials(
+            telegram_user_id, search_query, limit=SEARCH_PAGE_SIZE, cursor=cursor
+        )
 
-        if not search_results:
+        if not search_page["items"]:
             await callback.message.edit_text(
                 text=f"😔 По запросу «{search_query}» ничего не найдено.\n\n"
                 "Попробуйте изменить формулировку или использовать синонимы.",
@@ -154,11 +179,10 @@ async def perform_search(callback: types.CallbackQuery, telegram_user_id: int, s
             await callback.answer("Результаты не найдены", show_alert=True)
             return
 
-        # Логируем поисковый запрос
-        await activity_service.log_search(telegram_user_id, search_query)
+        await remember_next_cursor(state, page, search_page)
 
         # Отправляем результаты поиска
-        await send_search_results(callback, search_query, search_results, page)
+        await send_search_results(callback, search_query, search_page, page)
 
         await callback.answer()
 
@@ -171,13 +195,13 @@ async def perform_search(callback: types.CallbackQuery, telegram_user_id: int, s
         )
 
 
-async def perform_text_search(message: types.Message, telegram_user_id: int, search_query: str):
+async def perform_text_search(message: types.Message, state: FSMContext, telegram_user_id: int, search_query: str):
     """Выполняет поиск по текстовому запросу."""
     try:
         # Вызываем поиск через API
-        search_results = await menu_service.search_materials(telegram_user_id, search_query, limit=5, page=1)
+        search_page = await menu_service.search_materials(telegram_user_id, search_query, limit=SEARCH_PAGE_SIZE)
 
-        if not search_results:
+        if not search_page["items"]:
             await message.answer(
                 text=f"😔 По запросу «{search_query}» ничего не найдено.\n\n"
                 "Попробуйте изменить формулировку или использовать синонимы.",
@@ -185,34 +209,32 @@ async def perform_text_search(message: types.Message, telegram_user_id: int, sea
             )
             return
 
+        await remember_next_cursor(state, 1, search_page)
+
         # Логируем поисковый запрос
         await activity_service.log_search(telegram_user_id, search_query)
 
         # Отправляем результаты поиска
-        await send_text_search_results(message, search_query, search_results)
+        await send_text_search_results(message, search_query, search_page)
 
     except Exception as e:
         logger.error(f"Error performing text search: {e}")
         await message.answer("😔 Произошла ошибка при поиске. Попробуйте позже.")
 
 
-async def send_search_results(
-    callback: types.CallbackQuery, search_query: str, results: List[Dict[str, Any]], current_page: int
-):
-    """Отправляет результаты поиска через callback."""
-    # Определяем общее количество страниц
-    total_results = len(results)
-    total_pages = (total_results + 4) // 5  # Округление вверх
+def build_search_results(
+    search_query: str, search_page: Dict[str, Any], current_page: int
+) -> Tuple[str, InlineKeyboardMarkup]:
+    """Формирует текст и клавиатуру страницы результатов поиска."""
+    results: List[Dict[str, Any]] = search_page["items"]
+    total_pages = (search_page["total"] + SEARCH_PAGE_SIZE - 1) // SEARCH_PAGE_SIZE  # Округление вверх
+    start_index = (current_page - 1) * SEARCH_PAGE_SIZE
 
     # Создаем текстовое сообщение
     message_text = f"🔍 Результаты поиска «{search_query}»:\n\n"
 
-    start_index = (current_page - 1) * 5
-    end_index = min(start_index + 5, total_results)
-
-    for i in range(start_index, end_index):
-        result = results[i]
-        message_text += f"{i + 1}. {result['title']}\n"
+    for i, result in enumerate(results, start_index + 1):
+        message_text += f"{i}. {result['title']}\n"
 
         if result.get("description"):
             description = result["description"][:100]
@@ -220,12 +242,21 @@ async def send_search_results(
         message_text += "\n"
 
     # Создаем клавиатуру с результатами
-    keyboard = create_search_results_keyboard(results[start_index:end_index])
+    keyboard = create_search_results_keyboard(results)
 
     # Добавляем пагинацию если нужно
     if total_pages > 1:
         keyboard = create_search_pagination_keyboard(current_page, total_pages, search_query, keyboard)
 
+    return message_text, keyboard
+
+
+async def send_search_results(
+    callback: types.CallbackQuery, search_query: str, search_page: Dict[str, Any], current_page: int
+):
+    """Отправляет страницу результатов поиска через callback."""
+    message_text, keyboard = build_search_results(search_query, search_page, current_page)
+
     await callback.message.edit_text(
         text=message_text,
         reply_markup=keyboard,
@@ -234,21 +265,9 @@ async def send_search_results(
     )
 
 
-async def send_text_search_results(message: types.Message, search_query: str, results: List[Dict[str, Any]]):
-    """Отправляет результаты поиска через новое сообщение."""
-    # Создаем текстовое сообщение
-    message_text = f"🔍 Результаты поиска «{search_query}»:\n\n"
-
-    for i, result in enumerate(results[:5], 1):  # Показываем первые 5 результатов
-        message_text += f"{i}. {result['title']}\n"
-
-        if result.get("description"):
-            description = result["description"][:100]
-            message_text += f"   {description}{'...' if len(result['description']) > 100 else ''}\n"
-        message_text += "\n"
-
-    # Создаем клавиатуру с результатами
-    keyboard = create_search_results_keyboard(results[:5])
+async def send_text_search_results(message: types.Message, search_query: str, search_page: Dict[str, Any]):
+    """Отправляет первую страницу результатов поиска через новое сообщение."""
+    message_text, keyboard = build_search_results(search_query, search_page, 1)
 
     await message.answer(
         text=message_text,
@@ -19,6 +19,10 @@ from .handlers import menu, question, rating, search, start
 from .middleware.logging import LoggingMiddleware
 from .middleware.user_registration import UserRegistrationMiddleware
 from .services.reminder_service import ReminderService
+from .utils.activity_pipeline import activity_pipeline
+from .utils.api_client import api_client
+from .utils.menu_cache import menu_cache
+from .utils.registration_cache import registration_cache
 
 
 # Настройка логирования
@@ -70,6 +74,12 @@ async def on_startup(bot: Bot, reminder_service: ReminderService):
     """Обработчик запуска бота."""
     logger.info("Запускаем Telegram бот...")
 
+    # Открываем пул соединений с API Backend
+    await api_client.start()
+
+    # Запускаем фоновую отправку активностей
+    activity_pipeline.start()
+
     # Удаляем webhook если он был установлен
     webhook_info = await bot.get_webhook_info()
     if webhook_info.url:
@@ -101,8 +111,16 @@ async def on_shutdown(bot: Bot, reminder_service: ReminderService):
     # Удаляем webhook перед остановкой
     await bot.delete_webhook(drop_pending_updates=True)
 
+    # Отправляем накопленные активности, пока соединение с API открыто
+    await activity_pipeline.stop()
+
     # Закрываем соединения
     await bot.session.close()
+    await api_client.close()
+    logger.info(f"Статистика объединения запросов к API: {api_client.get_coalescing_stats()}")
+    logger.info(f"Состояние отказоустойчивости API клиента: {api_client.get_resilience_stats()}")
+    logger.info(f"Статистика кэша меню: {menu_cache.get_stats()}")
+    logger.info(f"Статистика кэша регистраций: {registration_cache.get_stats()}")
 
     logger.info("Бот остановлен!")
 
@@ -6,7 +6,7 @@ from typing import Any, Awaitable, Callable, Dict
 from aiogram import BaseMiddleware
 from aiogram.types import CallbackQuery, Message, TelegramObject
 
-from ..utils.api_client import APIClientError, api_client
+from ..utils.activity_pipeline import activity_pipeline
 
 
 logger = logging.getLogger(__name__)
@@ -61,7 +61,8 @@ class LoggingMiddleware(BaseMiddleware):
             if callback_data == "start_command":
                 return "start_command"
             elif callback_data.startswith("menu_"):
-                return "navigation"
+                # Навигацию по меню записывает Backend при обработке клика
+                return None
             elif callback_data.startswith("search"):
                 return "search"
             elif callback_data.startswith("ask_question"):
@@ -76,7 +77,7 @@ class LoggingMiddleware(BaseMiddleware):
     async def _log_user_activity(
         self, telegram_user_id: int, activity_type: str, event: TelegramObject, data: Dict[str, Any]
     ):
-        """Логирует активность пользователя в API."""
+        """Ставит активность пользователя в очередь фоновой отправки в API."""
         try:
             # Определяем дополнительные данные активности
             search_query = None
@@ -93,14 +94,7 @@ class LoggingMiddleware(BaseMiddleware):
             elif isinstance(event, CallbackQuery):
                 callback_data = event.data
 
-                if callback_data.startswith("menu_"):
-                    # Извлекаем ID пункта меню
-                    try:
-                        menu_item_id = int(callback_data.split("_")[1])
-                    except (IndexError, ValueError):
-                        pass
-
-                elif callback_data.startswith("search"):
+                if callback_data.startswith("search"):
                     # Извлекаем поисковый запрос если есть
                     if ":" in callback_data:
                         search_query = callback_data.split(":", 1)[1]
@@ -113,15 +107,9 @@ class LoggingMiddleware(BaseMiddleware):
                 "menu_item_id": menu_item_id,
             }
 
-            async with api_client as client:
-                response = await client._make_request(
-                    method="POST", endpoint="api/v1/public/user-activities/", data=activity_data
-                )
-
-                logger.debug(f"Logged activity for user {telegram_user_id}: {response}")
-
-        except APIClientError as e:
-            logger.warning(f"API error logging activity for user {telegram_user_id}: {e}")
+            # Отправка идет в фоне, хендлер не ждет записи активности
+            if not activity_pipeline.submit(activity_data):
+                logger.debug(f"Activity for user {telegram_user_id} dropped by overflow policy")
 
         except Exception as e:
             logger.error(f"Unexpected error logging activity for user {telegram_user_id}: {e}")
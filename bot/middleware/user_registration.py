@@ -7,6 +7,8 @@ from aiogram import BaseMiddleware
 from aiogram.types import TelegramObject
 
 from ..utils.api_client import APIClientError, api_client
+from ..utils.menu_cache import menu_cache
+from ..utils.registration_cache import registration_cache
 
 
 logger = logging.getLogger(__name__)
@@ -29,8 +31,9 @@ class UserRegistrationMiddleware(BaseMiddleware):
             return await handler(event, data)
 
         try:
-            # Регистрируем/обновляем пользователя в API
-            await self._register_user(user, event)
+            # Регистрируем/обновляем пользователя в API, если он не регистрировался недавно с теми же данными
+            if not registration_cache.is_registered(user.id, self._profile(user)):
+                await self._register_user(user, event)
 
             # Добавляем информацию о пользователе в данные
             data["user"] = user
@@ -42,6 +45,11 @@ class UserRegistrationMiddleware(BaseMiddleware):
 
         return await handler(event, data)
 
+    @staticmethod
+    def _profile(user):
+        """Данные профиля, изменение которых требует повторной регистрации."""
+        return (user.first_name or "Пользователь", user.last_name, user.username)
+
     async def _register_user(self, user, event):
         """Регистрирует/обновляет пользователя в API."""
         try:
@@ -121,6 +129,12 @@ class UserRegistrationMiddleware(BaseMiddleware):
 
                 logger.debug(f"User {telegram_user_id} registration response: {response}")
 
+                # Уровень доступа нужен кэшу меню, чтобы пользователи одного уровня делили записи
+                menu_cache.remember_access_level(
+                    telegram_user_id, (response.get("user") or {}).get("subscription_type")
+                )
+                registration_cache.remember(telegram_user_id, self._profile(user))
+
         except APIClientError as e:
             logger.warning(f"API error registering user {user.id}: {e}")
             # Не прерываем обработку событий при ошибках API
@@ -1,9 +1,11 @@
 """Сервис для работы с меню и навигацией."""
 
+import copy
 import logging
 from typing import Any, Dict, List, Optional
 
 from ..utils.api_client import APIClientError, api_client
+from ..utils.menu_cache import menu_cache
 
 
 logger = logging.getLogger(__name__)
@@ -27,10 +29,9 @@ class MenuService:
             if parent_id is not None:
                 params["parent_id"] = parent_id
 
-            async with api_client as client:
-                response = await client._make_request(method="GET", endpoint="api/v1/public/menu-items/", params=params)
+            response = await self._get_cached(telegram_user_id, "api/v1/public/menu-items/", params)
 
-                return response.get("items", [])
+            return response.get("items", [])
 
         except APIClientError as e:
             logger.error(f"API error getting menu items: {e}")
@@ -52,12 +53,7 @@ class MenuService:
         try:
             params = {"telegram_user_id": telegram_user_id}
 
-            async with api_client as client:
-                response = await client._make_request(
-                    method="GET", endpoint=f"api/v1/public/menu-items/{menu_item_id}/content", params=params
-                )
-
-                return response
+            return await self._get_cached(telegram_user_id, f"api/v1/public/menu-items/{menu_item_id}/content", params)
 
         except APIClientError as e:
             logger.error(f"API error getting menu content: {e}")
@@ -68,6 +64,71 @@ class MenuService:
             logger.error(f"Unexpected error getting menu content: {e}")
             raise
 
+    async def navigate(self, telegram_user_id: int, menu_item_id: int, back: bool = False) -> Optional[Dict[str, Any]]:
+        """Открывает пункт меню одним запросом к Backend.
+
+        Backend в одной транзакции возвращает пункт с контентом, его дочерние
+        пункты, родителя и цепочку разделов и записывает активность навигации
+        или открытия материала.
+
+        Args:
+            telegram_user_id: ID пользователя в Telegram
+            menu_item_id: ID нажатого пункта меню
+            back: Открыть родительский раздел пункта вместо самого пункта
+
+        Returns:
+            Данные навигации или None если пункт не найден
+        """
+        try:
+            data = {"telegram_user_id": telegram_user_id, "menu_item_id": menu_item_id, "back": back}
+
+            async with api_client as client:
+                return await client._make_request(method="POST", endpoint="api/v1/bot/menu/navigate", data=data)
+
+        except APIClientError as e:
+            logger.error(f"API error navigating menu: {e}")
+            if "404" in str(e):
+                return None
+            raise
+        except Exception as e:
+            logger.error(f"Unexpected error navigating menu: {e}")
+            raise
+
+    async def _get_cached(self, telegram_user_id: int, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Получает ответ эндпоинта меню через кэш.
+
+        Свежий ответ отдается из кэша, устаревший ревалидируется по ETag,
+        одновременные промахи по одному ключу объединяются в один запрос.
+
+        Args:
+            telegram_user_id: ID пользователя в Telegram
+            endpoint: Путь к эндпоинту меню
+            params: URL параметры
+
+        Returns:
+            Ответ Backend (копия, которую можно изменять)
+        """
+        key = menu_cache.make_key(endpoint, params, telegram_user_id)
+        entry = menu_cache.get(key)
+
+        if entry is not None and entry.is_fresh:
+            menu_cache.record("hits")
+            return copy.deepcopy(entry.data)
+
+        async with api_client as client:
+            response = await client.get_conditional(
+                endpoint=endpoint, params=params, etag=entry.etag if entry else None, coalesce_key=key
+            )
+
+        if response.status == 304 and entry is not None:
+            menu_cache.record("revalidated")
+            menu_cache.touch(key)
+            return copy.deepcopy(entry.data)
+
+        menu_cache.record("misses")
+        menu_cache.put(key, response.data, response.etag)
+        return response.data
+
     async def send_content_user(
         self,
         menu_content: Dict[str, Any],
@@ -148,26 +209,35 @@ class MenuService:
         return getattr(message_or_callback, "bot", None) or message_or_callback.bot
 
     async def search_materials(
-        self, telegram_user_id: int, query: str, limit: int = 10, page: int = 1
-    ) -> List[Dict[str, Any]]:
-        """Выполняет поиск материалов.
+        self, telegram_user_id: int, query: str, limit: int = 10, cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Выполняет поиск материалов и возвращает одну страницу результатов.
 
         Args:
             telegram_user_id: ID пользователя в Telegram
             query: Поисковый запрос
             limit: Количество результатов на страницу
-            page: Номер страницы
+            cursor: Курсор страницы из next_cursor предыдущего ответа (None - первая страница)
 
         Returns:
-            Список найденных материалов
+            Страница результатов: items, cursor (курсор этой страницы), next_cursor
+            (None для последней страницы) и total
         """
         try:
             params = {"telegram_user_id": telegram_user_id, "query": query, "limit": limit}
+            if cursor is not None:
+                params["cursor"] = cursor
 
             async with api_client as client:
                 response = await client._make_request(method="GET", endpoint="api/v1/public/search/", params=params)
 
-                return response.get("items", [])
+                items = response.get("items", [])
+                return {
+                    "items": items,
+                    "cursor": response.get("cursor"),
+                    "next_cursor": response.get("next_cursor"),
+                    "total": response.get("total", len(items)),
+                }
 
         except APIClientError as e:
             logger.error(f"API error searching materials: {e}")
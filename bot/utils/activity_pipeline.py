@@ -0,0 +1,201 @@
+"""Фоновая отправка активностей пользователей в API Backend пачками."""
+
+import asyncio
+import logging
+import random
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from .api_client import APIClientError, api_client
+
+
+logger = logging.getLogger(__name__)
+
+DROP_OLDEST = "drop_oldest"
+SAMPLE = "sample"
+
+
+class ActivityPipeline:
+    """Очередь активностей с фоновой отправкой пачками.
+
+    Middleware кладет событие в ограниченную очередь и сразу передает
+    управление хендлеру. Фоновая задача отправляет накопленные события, когда
+    набирается ``batch_size`` событий или проходит ``flush_interval`` секунд,
+    одним запросом к пакетному эндпоинту Backend.
+
+    Политики при переполнении очереди:
+        drop_oldest - новое событие вытесняет самое старое;
+        sample - начиная с заполнения на ``sample_watermark`` новые события
+            принимаются с вероятностью ``sample_rate``, при полной очереди
+            новые события отбрасываются.
+    """
+
+    def __init__(
+        self,
+        max_queue_size: int = 10000,
+        batch_size: int = 50,
+        flush_interval: float = 1.0,
+        overflow_policy: str = DROP_OLDEST,
+        sample_rate: float = 0.1,
+        sample_watermark: float = 0.8,
+        drain_timeout: float = 10.0,
+    ):
+        """Инициализация очереди.
+
+        Args:
+            max_queue_size: Максимальное количество событий в очереди
+            batch_size: Размер пачки, при котором отправка начинается сразу
+            flush_interval: Максимальное время ожидания пачки в секундах
+            overflow_policy: Политика при переполнении (drop_oldest или sample)
+            sample_rate: Доля принимаемых событий в режиме sample
+            sample_watermark: Доля заполнения очереди, с которой включается sample
+            drain_timeout: Максимальное время дренирования очереди при остановке
+        """
+        if overflow_policy not in (DROP_OLDEST, SAMPLE):
+            raise ValueError(f"Неизвестная политика переполнения: {overflow_policy}")
+
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self.sample_rate = sample_rate
+        self.sample_watermark = sample_watermark
+        self.drain_timeout = drain_timeout
+
+        self._queue: Deque[Dict[str, Any]] = deque()
+        self._batch_ready = asyncio.Event()
+        self._flusher: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._stats = {"enqueued": 0, "sent": 0, "failed": 0, "dropped": 0, "sampled_out": 0}
+
+    @property
+    def is_running(self) -> bool:
+        """Запущена ли фоновая отправка."""
+        return self._flusher is not None and not self._flusher.done()
+
+    def start(self) -> None:
+        """Запускает фоновую задачу отправки."""
+        if self.is_running:
+            return
+        self._stopping = False
+        self._flusher = asyncio.create_task(self._run(), name="activity-pipeline-flusher")
+        logger.info(
+            f"Activity pipeline started: queue={self.max_queue_size}, batch={self.batch_size}, "
+            f"interval={self.flush_interval}s, policy={self.overflow_policy}"
+        )
+
+    def submit(self, activity: Dict[str, Any]) -> bool:
+        """Кладет активность в очередь без ожидания отправки.
+
+        Args:
+            activity: Данные активности для API
+
+        Returns:
+            True если событие принято в очередь
+        """
+        if not self.is_running and not self._stopping:
+            # В режиме webhook on_startup может не вызываться до первого апдейта
+            self.start()
+
+        depth = len(self._queue)
+        if self.overflow_policy == SAMPLE and depth >= self.max_queue_size * self.sample_watermark:
+            if depth >= self.max_queue_size or random.random() >= self.sample_rate:
+                self._stats["sampled_out"] += 1
+                return False
+        elif depth >= self.max_queue_size:
+            self._queue.popleft()
+            self._stats["dropped"] += 1
+
+        self._queue.append(activity)
+        self._stats["enqueued"] += 1
+        if len(self._queue) >= self.batch_size:
+            self._batch_ready.set()
+        return True
+
+    async def stop(self) -> None:
+        """Останавливает фоновую отправку и дренирует очередь."""
+        self._stopping = True
+        self._batch_ready.set()
+
+        try:
+            await asyncio.wait_for(self._finish(), timeout=self.drain_timeout)
+        except asyncio.TimeoutError:
+            self._stats["dropped"] += len(self._queue)
+            logger.warning(f"Activity pipeline drain timed out, {len(self._queue)} events dropped")
+            self._queue.clear()
+
+        self._flusher = None
+        logger.info(f"Activity pipeline stopped: {self.get_stats()}")
+
+    def get_stats(self) -> Dict[str, int]:
+        """Возвращает счетчики очереди и ее текущую глубину."""
+        return {**self._stats, "queue_depth": len(self._queue)}
+
+    async def _run(self) -> None:
+        """Цикл фоновой отправки: по размеру пачки или по таймеру."""
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._batch_ready.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._batch_ready.clear()
+
+            while self._queue:
+                await self._send_batch(self._take_batch())
+                if len(self._queue) < self.batch_size:
+                    break
+
+    async def _finish(self) -> None:
+        """Дожидается текущей пачки фоновой задачи и отправляет остаток очереди."""
+        if self._flusher is not None:
+            await self._flusher
+        await self._drain()
+
+    async def _drain(self) -> None:
+        """Отправляет все оставшиеся в очереди события."""
+        while self._queue:
+            await self._send_batch(self._take_batch())
+
+    def _take_batch(self) -> List[Dict[str, Any]]:
+        """Забирает из очереди не более batch_size событий."""
+        return [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+
+    async def _send_batch(self, batch: List[Dict[str, Any]]) -> None:
+        """Отправляет пачку событий в API Backend одним запросом.
+
+        Любая ошибка отправки или разбора ответа учитывается как неудачная
+        пачка и не останавливает фоновую задачу.
+        """
+        try:
+            async with api_client as client:
+                response = await client._make_request(
+                    method="POST", endpoint="api/v1/public/user-activities/batch", data={"activities": batch}
+                )
+            accepted = response.get("accepted", len(batch))
+        except APIClientError as e:
+            self._stats["failed"] += len(batch)
+            logger.warning(f"Failed to send batch of {len(batch)} activities: {e}")
+            return
+        except Exception as e:
+            self._stats["failed"] += len(batch)
+            logger.error(f"Unexpected error sending batch of {len(batch)} activities: {e!r}")
+            return
+
+        self._stats["sent"] += accepted
+        self._stats["failed"] += len(batch) - accepted
+        if response.get("rejected"):
+            logger.debug(f"Backend rejected {response['rejected']} activities: {response.get('errors')}")
+
+
+# Экземпляр очереди по умолчанию
+from ..config import settings  # noqa: E402
+
+
+activity_pipeline = ActivityPipeline(
+    max_queue_size=settings.activity_queue_size,
+    batch_size=settings.activity_batch_size,
+    flush_interval=settings.activity_flush_interval,
+    overflow_policy=settings.activity_overflow_policy,
+    sample_rate=settings.activity_sample_rate,
+    drain_timeout=settings.activity_drain_timeout,
+)
@@ -1,35 +1,211 @@
 """HTTP клиент для работы с API Backend."""
 
 import asyncio
+import copy
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, Hashable, NamedTuple, Optional, Tuple
 
 import aiohttp
-from aiohttp import ClientSession, ClientTimeout
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+
+from .resilience import Bulkhead, CircuitBreaker, EndpointPolicy, RetryBudget, full_jitter_backoff
+
+
+# Классы эндпоинтов с раздельными бюджетами отказоустойчивости
+HOT_PATH = "hot_path"
+ACTIVITY = "activity"
+REMINDER = "reminder"
+
+ENDPOINT_CLASS_PREFIXES = (
+    ("api/v1/public/user-activities", ACTIVITY),
+    ("api/v1/bot/telegram-user/inactive-users", REMINDER),
+    ("api/v1/bot/telegram-user/update-reminder-status", REMINDER),
+    ("api/v1/bot/message-template", REMINDER),
+)
+
+
+# Методы, запросы которых можно повторить после таймаута или обрыва ответа
+RETRYABLE_METHODS = frozenset({"GET", "HEAD"})
+
+
+def is_retryable(method: str, error: Exception) -> bool:
+    """Можно ли повторить запрос после сетевой ошибки.
+
+    GET и HEAD повторяются после любой сетевой ошибки и таймаута. Остальные
+    запросы (вопросы, оценки, активности) могли уже выполниться на Backend,
+    поэтому повторяются, только если соединение с Backend не установлено.
+    """
+    if method.upper() in RETRYABLE_METHODS:
+        return True
+    return isinstance(error, aiohttp.ClientConnectorError)
+
+
+def classify_endpoint(endpoint: str) -> str:
+    """Определяет класс эндпоинта. Все, что не активность и не напоминания, — горячий путь."""
+    path = endpoint.strip("/")
+    for prefix, endpoint_class in ENDPOINT_CLASS_PREFIXES:
+        if path.startswith(prefix):
+            return endpoint_class
+    return HOT_PATH
+
+
+class APIResponse(NamedTuple):
+    """Ответ Backend: статус, тело и ETag (для 304 тело отсутствует)."""
+
+    status: int
+    data: Optional[Dict[str, Any]]
+    etag: Optional[str] = None
 
 
 class APIClient:
-    """Асинхронный клиент для работы с API Backend."""
+    """Асинхронный клиент для работы с API Backend.
+
+    Клиент владеет одной долгоживущей HTTP сессией с пулом keep-alive
+    соединений и кэшем DNS. Сессия открывается в ``start()`` (при запуске бота)
+    и закрывается в ``close()`` (при остановке). Если ``start()`` не был вызван,
+    сессия создается лениво при первом запросе.
+
+    GET запросы, вызванные с ``coalesce=True``, объединяются: пока запрос с тем же
+    нормализованным эндпоинтом и параметрами находится в полете, повторные вызовы
+    не идут в Backend, а дожидаются результата первого.
+
+    Каждый класс эндпоинтов (горячий путь, активность, напоминания) имеет свою
+    политику: таймаут, circuit breaker, bulkhead и бюджет повторов. Когда цепь
+    открыта или bulkhead переполнен, запрос сразу завершается ошибкой.
+    """
 
-    def __init__(self, base_url: str, timeout: int = 30, retries: int = 3):
+    def __init__(
+        self,
+        base_url: str,
+        timeout: int = 30,
+        retries: int = 3,
+        pool_limit: int = 100,
+        pool_limit_per_host: int = 50,
+        keepalive_timeout: float = 30.0,
+        dns_cache_ttl: int = 300,
+        policies: Optional[Dict[str, EndpointPolicy]] = None,
+        retry_backoff_base: float = 0.5,
+        retry_backoff_max: float = 5.0,
+    ):
         """Инициализация API клиента.
 
         Args:
             base_url: Базовый URL API
             timeout: Таймаут запросов в секундах
             retries: Количество повторных попыток
+            pool_limit: Максимальное количество одновременных соединений в пуле
+            pool_limit_per_host: Максимальное количество соединений к одному хосту
+            keepalive_timeout: Время жизни простаивающего keep-alive соединения в секундах
+            dns_cache_ttl: Время жизни записей DNS кэша в секундах
+            policies: Политики отказоустойчивости по классам эндпоинтов
+            retry_backoff_base: Базовая задержка перед повтором в секундах
+            retry_backoff_max: Максимальная задержка перед повтором в секундах
         """
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
         self.retries = retries
+        self.pool_limit = pool_limit
+        self.pool_limit_per_host = pool_limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.retry_backoff_base = retry_backoff_base
+        self.retry_backoff_max = retry_backoff_max
+        self.policies = policies or self._default_policies()
         self.logger = logging.getLogger(__name__)
 
+        self._session: Optional[ClientSession] = None
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._coalescing_stats = {"requests": 0, "backend_calls": 0, "coalesced": 0}
+
+    def _default_policies(self) -> Dict[str, EndpointPolicy]:
+        """Политики по умолчанию: общий таймаут и лимит пула для всех классов."""
+        return {
+            name: EndpointPolicy(
+                name=name,
+                timeout=self.timeout,
+                breaker=CircuitBreaker(name),
+                bulkhead=Bulkhead(name, max_concurrent=self.pool_limit),
+            )
+            for name in (HOT_PATH, ACTIVITY, REMINDER)
+        }
+
+    @property
+    def is_started(self) -> bool:
+        """Открыта ли общая HTTP сессия."""
+        return self._session is not None and not self._session.closed
+
+    async def start(self) -> None:
+        """Открывает общую HTTP сессию с пулом соединений."""
+        if self.is_started:
+            return
+
+        connector = TCPConnector(
+            limit=self.pool_limit,
+            limit_per_host=self.pool_limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            use_dns_cache=True,
+            ttl_dns_cache=self.dns_cache_ttl,
+        )
+        self._session = ClientSession(
+            connector=connector,
+            timeout=ClientTimeout(total=self.timeout),
+            headers={"Content-Type": "application/json"},
+        )
+        self.logger.info(
+            f"API client session opened: pool_limit={self.pool_limit}, "
+            f"limit_per_host={self.pool_limit_per_host}, keepalive={self.keepalive_timeout}s"
+        )
+
+    async def close(self) -> None:
+        """Закрывает общую HTTP сессию и освобождает соединения пула."""
+        if self._session is None:
+            return
+
+        session, self._session = self._session, None
+        if not session.closed:
+            await session.close()
+            self.logger.info("API client session closed")
+
+    async def _get_session(self) -> ClientSession:
+        """Возвращает открытую сессию, при необходимости открывая ее."""
+        if not self.is_started:
+            await self.start()
+        return self._session
+
+    @staticmethod
+    def _clean_params(params: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Убирает из URL параметров значения None."""
+        return params and {k: v for k, v in params.items() if v is not None}
+
+    @staticmethod
+    def _coalescing_key(method: str, endpoint: str, params: Optional[Dict[str, Any]]) -> Tuple[Hashable, ...]:
+        """Ключ объединения запросов: метод, нормализованный путь и отсортированные параметры."""
+        normalized_endpoint = "/" + endpoint.strip("/")
+        normalized_params = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items() if v is not None))
+        return method.upper(), normalized_endpoint, normalized_params
+
+    def get_coalescing_stats(self) -> Dict[str, int]:
+        """Возвращает счетчики объединения запросов.
+
+        Returns:
+            requests - GET запросов с включенным объединением,
+            backend_calls - из них реально отправлено в Backend,
+            coalesced - сэкономлено запросов (дождались чужого результата),
+            inflight - запросов в полете на текущий момент
+        """
+        return {**self._coalescing_stats, "inflight": len(self._inflight)}
+
+    def get_resilience_stats(self) -> Dict[str, Dict[str, object]]:
+        """Возвращает состояние circuit breaker и bulkhead по классам эндпоинтов."""
+        return {name: policy.stats() for name, policy in self.policies.items()}
+
     async def _make_request(
         self,
         method: str,
         endpoint: str,
         data: Optional[Dict[str, Any]] = None,
         params: Optional[Dict[str, Any]] = None,
+        coalesce: bool = False,
     ) -> Dict[str, Any]:
         """Выполняем HTTP запрос с повторными попытками.
 
@@ -38,48 +214,219 @@ class APIClient:
             endpoint: Путь к эндпоинту
             data: Данные для отправки в теле запроса
             params: URL параметры
+            coalesce: Объединять одинаковые одновременные GET запросы в один
         """
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        if not coalesce or method.upper() != "GET":
+            response = await self._send_request(method, endpoint, data=data, params=params)
+            return response.data
+
+        key = self._coalescing_key(method, endpoint, params)
+        response = await self._coalesced(key, lambda: self._send_request(method, endpoint, data=data, params=params))
+        return response.data
+
+    async def get_conditional(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        etag: Optional[str] = None,
+        coalesce_key: Optional[Hashable] = None,
+    ) -> APIResponse:
+        """Выполняет условный GET запрос с заголовком If-None-Match.
+
+        Args:
+            endpoint: Путь к эндпоинту
+            params: URL параметры
+            etag: ETag закэшированного ответа (None - обычный запрос)
+            coalesce_key: Ключ объединения одновременных запросов (None - без объединения)
+
+        Returns:
+            Ответ Backend; при статусе 304 тело отсутствует
+        """
+        headers = {"If-None-Match": etag} if etag else None
+
+        def send() -> Awaitable[APIResponse]:
+            return self._send_request("GET", endpoint, params=params, headers=headers)
+
+        if coalesce_key is None:
+            return await send()
+        return await self._coalesced(("conditional", coalesce_key, etag), send)
+
+    async def _coalesced(self, key: Hashable, send: Callable[[], Awaitable[APIResponse]]) -> APIResponse:
+        """Объединяет одновременные запросы с одинаковым ключом в один запрос к Backend."""
+        self._coalescing_stats["requests"] += 1
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self._coalescing_stats["coalesced"] += 1
+            # Ожидающие получают копию, чтобы не делить изменяемый ответ с другими хендлерами
+            return copy.deepcopy(await asyncio.shield(task))
+
+        self._coalescing_stats["backend_calls"] += 1
+        task = asyncio.create_task(send())
+        self._inflight[key] = task
+        task.add_done_callback(lambda done: self._on_inflight_done(key, done))
+
+        # shield: отмена первого вызывающего не должна отменять запрос для остальных ожидающих
+        return await asyncio.shield(task)
+
+    def _on_inflight_done(self, key: Hashable, task: asyncio.Task) -> None:
+        """Снимает завершенный запрос с учета объединения."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Помечаем исключение полученным, даже если все ожидающие были отменены
+            task.exception()
+
+    async def _send_request(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> APIResponse:
+        """Отправляет HTTP запрос в Backend с учетом политики класса эндпоинта."""
+        policy = self.policies[classify_endpoint(endpoint)]
+
+        # Открытая цепь отклоняет запрос сразу, не дожидаясь слота bulkhead
+        if policy.breaker.reject_if_open():
+            raise CircuitOpenError(f"Circuit breaker '{policy.name}' is open, request to {endpoint} rejected")
+
+        # Слот bulkhead занимается до пробного слота цепи: отказ bulkhead не должен тратить пробный запрос
+        if not await policy.bulkhead.acquire():
+            raise BulkheadFullError(f"Too many concurrent '{policy.name}' requests, request to {endpoint} rejected")
+
+        try:
+            return await self._send_with_retries(policy, method, endpoint, data, params, headers)
+        finally:
+            policy.bulkhead.release()
 
-        timeout = ClientTimeout(total=self.timeout)
+    async def _send_with_retries(
+        self,
+        policy: EndpointPolicy,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]],
+        params: Optional[Dict[str, Any]],
+        headers: Optional[Dict[str, str]] = None,
+    ) -> APIResponse:
+        """Выполняет запрос с повторами, ограниченными бюджетом и состоянием цепи.
+
+        Повторяются только запросы, которые безопасно выполнить еще раз (см.
+        ``is_retryable``). Каждая попытка фиксирует в circuit breaker успех или ошибку. Если
+        запрос завершился без результата (отмена вызывающего), пробный слот
+        HALF_OPEN возвращается цепи.
+        """
+        if not policy.breaker.allow_request():
+            raise CircuitOpenError(f"Circuit breaker '{policy.name}' is open, request to {endpoint} rejected")
+        generation = policy.breaker.generation
 
-        for attempt in range(self.retries):
-            try:
-                async with ClientSession(timeout=timeout) as session:
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        policy.retry_budget.record_request()
+
+        try:
+            for attempt in range(self.retries):
+                try:
+                    session = await self._get_session()
                     async with session.request(
                         method=method,
                         url=url,
                         json=data,
-                        headers={"Content-Type": "application/json"},
-                        params=params and {k: v for k, v in params.items() if v is not None},
+                        params=self._clean_params(params),
+                        headers=headers,
+                        timeout=ClientTimeout(total=policy.timeout),
                     ) as response:
-                        response_data = await response.json()
+                        etag = response.headers.get("ETag")
+                        if response.status == 304:
+                            policy.breaker.record_success()
+                            return APIResponse(status=304, data=None, etag=etag)
+
+                        response_data, error_msg = await self._parse_response(policy, endpoint, response)
+
+                        # 4xx - ошибка запроса, а не признак деградации Backend
+                        if response.status >= 500:
+                            policy.breaker.record_failure()
+                        else:
+                            policy.breaker.record_success()
 
                         if response.status >= 400:
-                            error_msg = response_data.get("detail", "Unknown error")
-                            raise APIClientError(f"API Error {response.status}: {error_msg}")
+                            raise APIClientError(f"API Error {response.status}: {error_msg}", status=response.status)
+
+                        return APIResponse(status=response.status, data=response_data, etag=etag)
+
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    policy.breaker.record_failure()
+                    self.logger.warning(f"Attempt {attempt + 1} to {endpoint} failed: {e!r}")
 
-                        return response_data
+                    if not is_retryable(method, e):
+                        raise APIClientError(f"{method.upper()} request to {endpoint} failed: {e!r}")
+                    if attempt == self.retries - 1:
+                        raise APIClientError(f"Request failed after {self.retries} attempts: {e!r}")
+                    if not policy.retry_budget.try_acquire_retry():
+                        raise APIClientError(f"Request failed, retry budget '{policy.name}' exhausted: {e!r}")
+                    if not policy.breaker.allow_request():
+                        raise CircuitOpenError(f"Circuit breaker '{policy.name}' opened, request to {endpoint} aborted")
+                    generation = policy.breaker.generation
 
-            except aiohttp.ClientError as e:
-                self.logger.warning(f"Attempt {attempt + 1} failed: {e}")
-                if attempt == self.retries - 1:
-                    raise APIClientError(f"Request failed after {self.retries} attempts: {e}")
+                    await asyncio.sleep(full_jitter_backoff(attempt, self.retry_backoff_base, self.retry_backoff_max))
+        finally:
+            policy.breaker.release_probe(generation)
 
-                await asyncio.sleep(2**attempt)  # Exponential backoff
+    async def _parse_response(
+        self, policy: EndpointPolicy, endpoint: str, response: aiohttp.ClientResponse
+    ) -> Tuple[Any, Optional[str]]:
+        """Читает тело ответа и текст ошибки для статуса 4xx/5xx.
+
+        Некорректное тело (не JSON или ошибка не в виде объекта) считается
+        ошибкой Backend и фиксируется в circuit breaker.
+
+        Returns:
+            Тело ответа и текст ошибки (None для успешного статуса)
+        """
+        try:
+            response_data = await response.json()
+            error_msg = response_data.get("detail", "Unknown error") if response.status >= 400 else None
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            raise
+        except Exception as e:
+            policy.breaker.record_failure()
+            raise APIClientError(
+                f"Invalid response from {endpoint} ({response.status}): {e!r}", status=response.status
+            ) from e
+        return response_data, error_msg
 
     async def __aenter__(self):
         """Поддержка контекстного менеджера."""
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Очистка ресурсов."""
+        """Сессия общая для всех вызовов и закрывается только в close()."""
         pass
 
 
 class APIClientError(Exception):
     """Ошибка API клиента."""
 
+    def __init__(self, message: str, status: Optional[int] = None):
+        """Инициализация ошибки.
+
+        Args:
+            message: Текст ошибки
+            status: HTTP статус ответа Backend, если ответ был получен
+        """
+        super().__init__(message)
+        self.status = status
+
+
+class CircuitOpenError(APIClientError):
+    """Запрос отклонен: circuit breaker класса эндпоинтов открыт."""
+
+    pass
+
+
+class BulkheadFullError(APIClientError):
+    """Запрос отклонен: превышен лимит одновременных запросов класса эндпоинтов."""
+
     pass
 
 
@@ -87,4 +434,38 @@ class APIClientError(Exception):
 from ..config import settings  # noqa: E402
 
 
-api_client = APIClient(base_url=settings.api_base_url, timeout=settings.api_timeout, retries=settings.api_retries)
+def _policies_from_settings() -> Dict[str, EndpointPolicy]:
+    """Создает политики отказоустойчивости из настроек бота."""
+    limits = {
+        HOT_PATH: (settings.api_hot_path_timeout, settings.api_hot_path_concurrency),
+        ACTIVITY: (settings.api_activity_timeout, settings.api_activity_concurrency),
+        REMINDER: (settings.api_reminder_timeout, settings.api_reminder_concurrency),
+    }
+    return {
+        name: EndpointPolicy(
+            name=name,
+            timeout=timeout,
+            breaker=CircuitBreaker(
+                name,
+                failure_threshold=settings.api_breaker_failure_threshold,
+                recovery_timeout=settings.api_breaker_recovery_timeout,
+            ),
+            bulkhead=Bulkhead(name, max_concurrent=concurrency, acquire_timeout=settings.api_bulkhead_acquire_timeout),
+            retry_budget=RetryBudget(ratio=settings.api_retry_budget_ratio, min_retries=settings.api_retry_budget_min),
+        )
+        for name, (timeout, concurrency) in limits.items()
+    }
+
+
+api_client = APIClient(
+    base_url=settings.api_base_url,
+    timeout=settings.api_timeout,
+    retries=settings.api_retries,
+    pool_limit=settings.api_pool_limit,
+    pool_limit_per_host=settings.api_pool_limit_per_host,
+    keepalive_timeout=settings.api_keepalive_timeout,
+    dns_cache_ttl=settings.api_dns_cache_ttl,
+    policies=_policies_from_settings(),
+    retry_backoff_base=settings.api_retry_backoff_base,
+    retry_backoff_max=settings.api_retry_backoff_max,
+)
@@ -0,0 +1,118 @@
+"""Кэш ответов эндпоинтов меню с TTL, вытеснением LRU и ревалидацией по ETag."""
+
+import copy
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+@dataclass
+class CacheEntry:
+    """Закэшированный ответ Backend."""
+
+    data: Dict[str, Any]
+    etag: Optional[str]
+    expires_at: float
+
+    @property
+    def is_fresh(self) -> bool:
+        """Не истек ли TTL записи."""
+        return time.monotonic() < self.expires_at
+
+
+class MenuCache:
+    """Кэш ответов меню в памяти процесса бота.
+
+    Ответы эндпоинтов меню зависят только от пути, параметров и уровня доступа
+    пользователя, поэтому ключ не содержит telegram_user_id: пользователи
+    одного уровня доступа делят записи. Пока уровень доступа пользователя
+    неизвестен (он приходит в ответе регистрации), ключ строится по его ID.
+
+    Свежая запись отдается без запроса к Backend. Устаревшая запись с ETag
+    ревалидируется условным запросом: ответ 304 продлевает ее TTL.
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl: float = 60.0, max_users: int = 10000):
+        """Инициализация кэша.
+
+        Args:
+            max_entries: Максимальное количество закэшированных ответов
+            ttl: Время жизни записи в секундах
+            max_users: Максимальное количество запоминаемых уровней доступа пользователей
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_users = max_users
+
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._access_levels: "OrderedDict[int, str]" = OrderedDict()
+        self._stats = {"hits": 0, "revalidated": 0, "misses": 0, "evictions": 0}
+
+    def remember_access_level(self, telegram_user_id: int, subscription_type: Optional[str]) -> None:
+        """Запоминает уровень доступа пользователя из ответа регистрации."""
+        if not subscription_type:
+            return
+        self._access_levels[telegram_user_id] = subscription_type
+        self._access_levels.move_to_end(telegram_user_id)
+        while len(self._access_levels) > self.max_users:
+            self._access_levels.popitem(last=False)
+
+    def make_key(self, endpoint: str, params: Dict[str, Any], telegram_user_id: int) -> Tuple[Hashable, ...]:
+        """Строит ключ кэша: путь, параметры без telegram_user_id и уровень доступа."""
+        access_level = self._access_levels.get(telegram_user_id)
+        scope = ("access_level", access_level) if access_level else ("user", telegram_user_id)
+        normalized_params = tuple(
+            sorted((str(k), str(v)) for k, v in params.items() if v is not None and k != "telegram_user_id")
+        )
+        return "/" + endpoint.strip("/"), normalized_params, scope
+
+    def get(self, key: Hashable) -> Optional[CacheEntry]:
+        """Возвращает запись (в том числе устаревшую) и отмечает ее как недавно использованную."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: Hashable, data: Dict[str, Any], etag: Optional[str]) -> None:
+        """Сохраняет ответ Backend, вытесняя давно не использованные записи."""
+        self._entries[key] = CacheEntry(data=copy.deepcopy(data), etag=etag, expires_at=time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def touch(self, key: Hashable) -> None:
+        """Продлевает TTL записи после ответа 304."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.expires_at = time.monotonic() + self.ttl
+
+    def record(self, outcome: str) -> None:
+        """Учитывает результат обращения: hits, revalidated или misses."""
+        self._stats[outcome] += 1
+
+    def clear(self) -> None:
+        """Очищает закэшированные ответы."""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, float]:
+        """Возвращает счетчики кэша и долю ответов без полной загрузки."""
+        total = self._stats["hits"] + self._stats["revalidated"] + self._stats["misses"]
+        served = self._stats["hits"] + self._stats["revalidated"]
+        return {
+            **self._stats,
+            "entries": len(self._entries),
+            "hit_rate": round(served / total, 4) if total else 0.0,
+        }
+
+
+# Экземпляр кэша по умолчанию
+from ..config import settings  # noqa: E402
+
+
+menu_cache = MenuCache(
+    max_entries=settings.menu_cache_max_entries,
+    ttl=settings.menu_cache_ttl,
+    max_users=settings.menu_cache_max_users,
+)
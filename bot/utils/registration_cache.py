@@ -0,0 +1,77 @@
+"""Кэш недавно зарегистрированных пользователей для пропуска повторных регистраций."""
+
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+
+UserProfile = Tuple[str, Optional[str], Optional[str]]
+
+
+class RegistrationCache:
+    """Ограниченный кэш пользователей, уже зарегистрированных в Backend.
+
+    Middleware регистрации обращается к Backend только для новых
+    пользователей, для пользователей с изменившимися именем, фамилией или
+    username и после истечения ``ttl`` - так время последней активности в
+    Backend обновляется не реже одного раза за ``ttl`` секунд.
+    """
+
+    def __init__(self, max_users: int = 10000, ttl: float = 300.0):
+        """Инициализация кэша.
+
+        Args:
+            max_users: Максимальное количество запоминаемых пользователей
+            ttl: Время в секундах, в течение которого регистрация не повторяется
+        """
+        self.max_users = max_users
+        self.ttl = ttl
+
+        self._users: "OrderedDict[int, Tuple[UserProfile, float]]" = OrderedDict()
+        self._stats = {"skipped": 0, "registered": 0, "evictions": 0}
+
+    def is_registered(self, telegram_user_id: int, profile: UserProfile) -> bool:
+        """Зарегистрирован ли пользователь недавно с теми же данными профиля."""
+        cached = self._users.get(telegram_user_id)
+        if cached is None:
+            return False
+
+        cached_profile, expires_at = cached
+        if cached_profile != profile or time.monotonic() >= expires_at:
+            return False
+
+        self._users.move_to_end(telegram_user_id)
+        self._stats["skipped"] += 1
+        return True
+
+    def remember(self, telegram_user_id: int, profile: UserProfile) -> None:
+        """Запоминает успешную регистрацию, вытесняя давно не появлявшихся пользователей."""
+        self._users[telegram_user_id] = (profile, time.monotonic() + self.ttl)
+        self._users.move_to_end(telegram_user_id)
+        self._stats["registered"] += 1
+        while len(self._users) > self.max_users:
+            self._users.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def forget(self, telegram_user_id: int) -> None:
+        """Удаляет пользователя, чтобы следующее событие снова его зарегистрировало."""
+        self._users.pop(telegram_user_id, None)
+
+    def get_stats(self) -> Dict[str, float]:
+        """Возвращает счетчики кэша и долю пропущенных регистраций."""
+        total = self._stats["skipped"] + self._stats["registered"]
+        return {
+            **self._stats,
+            "users": len(self._users),
+            "skip_rate": round(self._stats["skipped"] / total, 4) if total else 0.0,
+        }
+
+
+# Экземпляр кэша по умолчанию
+from ..config import settings  # noqa: E402
+
+
+registration_cache = RegistrationCache(
+    max_users=settings.registration_cache_max_users,
+    ttl=settings.registration_cache_ttl,
+)
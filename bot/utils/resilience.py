@@ -0,0 +1,236 @@
+"""Механизмы отказоустойчивости клиента API: circuit breaker, bulkhead и бюджет повторов."""
+
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Deque, Dict
+
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(str, Enum):
+    """Состояния circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Circuit breaker для класса эндпоинтов.
+
+    После ``failure_threshold`` ошибок подряд переходит в состояние OPEN и
+    сразу отклоняет запросы. Через ``recovery_timeout`` секунд переходит в
+    HALF_OPEN и пропускает не более ``half_open_max_calls`` пробных запросов:
+    успех закрывает цепь, ошибка снова ее открывает. Пробный запрос,
+    завершившийся без результата (отмена, отказ bulkhead), возвращает слот
+    через ``release_probe``, иначе цепь навсегда осталась бы в HALF_OPEN.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 15.0,
+        half_open_max_calls: int = 1,
+    ):
+        """Инициализация circuit breaker.
+
+        Args:
+            name: Имя класса эндпоинтов (для логов и статистики)
+            failure_threshold: Количество ошибок подряд для открытия цепи
+            recovery_timeout: Время в секундах до пробного запроса
+            half_open_max_calls: Количество одновременных пробных запросов
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._generation = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """Текущее состояние с учетом истечения recovery_timeout."""
+        if self._state == CircuitState.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._transition(CircuitState.HALF_OPEN)
+        return self._state
+
+    @property
+    def generation(self) -> int:
+        """Номер текущего состояния цепи, увеличивается при каждом переходе."""
+        return self._generation
+
+    def reject_if_open(self) -> bool:
+        """Отклоняет запрос, если цепь открыта. Пробный слот при этом не резервируется."""
+        if self.state == CircuitState.OPEN:
+            self.rejected += 1
+            return True
+        return False
+
+    def allow_request(self) -> bool:
+        """Проверяет, можно ли отправить запрос, и резервирует пробный слот в HALF_OPEN."""
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return True
+        if state == CircuitState.HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+            self._half_open_calls += 1
+            return True
+
+        self.rejected += 1
+        return False
+
+    def release_probe(self, generation: int) -> None:
+        """Возвращает пробный слот запроса, не зафиксировавшего результат.
+
+        Любой результат в HALF_OPEN переводит цепь в другое состояние, поэтому
+        слот возвращается, только если состояние не менялось с момента
+        резервирования (``generation``). Вне HALF_OPEN вызов ничего не делает.
+
+        Args:
+            generation: Номер состояния цепи на момент резервирования слота
+        """
+        if generation == self._generation and self._state == CircuitState.HALF_OPEN and self._half_open_calls > 0:
+            self._half_open_calls -= 1
+
+    def record_success(self) -> None:
+        """Фиксирует успешный ответ Backend."""
+        self._failures = 0
+        if self._state != CircuitState.CLOSED:
+            self._transition(CircuitState.CLOSED)
+
+    def record_failure(self) -> None:
+        """Фиксирует ошибку Backend (таймаут, сетевая ошибка или 5xx)."""
+        self._failures += 1
+        if self._state == CircuitState.HALF_OPEN or self._failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+            if self._state != CircuitState.OPEN:
+                self._transition(CircuitState.OPEN)
+
+    def _transition(self, state: CircuitState) -> None:
+        """Переводит цепь в новое состояние."""
+        logger.warning(f"Circuit breaker '{self.name}': {self._state.value} -> {state.value}")
+        self._state = state
+        self._generation += 1
+        self._half_open_calls = 0
+        if state == CircuitState.CLOSED:
+            self._failures = 0
+
+
+class Bulkhead:
+    """Ограничение количества одновременных запросов класса эндпоинтов.
+
+    Если свободный слот не появился за ``acquire_timeout`` секунд, запрос
+    отклоняется, а не копится в памяти вместе с ожидающими хендлерами.
+    """
+
+    def __init__(self, name: str, max_concurrent: int, acquire_timeout: float = 1.0):
+        """Инициализация bulkhead.
+
+        Args:
+            name: Имя класса эндпоинтов
+            max_concurrent: Максимум одновременных запросов
+            acquire_timeout: Максимальное ожидание свободного слота в секундах
+        """
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.acquire_timeout = acquire_timeout
+
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self.in_flight = 0
+        self.rejected = 0
+
+    async def acquire(self) -> bool:
+        """Занимает слот. Возвращает False, если слот не освободился вовремя."""
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.acquire_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            return False
+
+        self.in_flight += 1
+        return True
+
+    def release(self) -> None:
+        """Освобождает слот."""
+        self.in_flight -= 1
+        self._semaphore.release()
+
+
+class RetryBudget:
+    """Бюджет повторных попыток в скользящем окне.
+
+    Повторы разрешены, пока их число в окне не превышает
+    ``min_retries + ratio * запросов в окне``. При деградации Backend это не
+    дает повторам умножить нагрузку на него.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 10, window: float = 10.0):
+        """Инициализация бюджета.
+
+        Args:
+            ratio: Доля повторов от числа запросов в окне
+            min_retries: Количество повторов, доступное всегда
+            window: Размер окна в секундах
+        """
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+
+        self._requests: Deque[float] = deque()
+        self._retries: Deque[float] = deque()
+        self.exhausted = 0
+
+    def record_request(self) -> None:
+        """Учитывает первичный запрос."""
+        self._requests.append(time.monotonic())
+
+    def try_acquire_retry(self) -> bool:
+        """Пытается взять повтор из бюджета."""
+        now = time.monotonic()
+        for events in (self._requests, self._retries):
+            while events and now - events[0] > self.window:
+                events.popleft()
+
+        if len(self._retries) >= self.min_retries + self.ratio * len(self._requests):
+            self.exhausted += 1
+            return False
+
+        self._retries.append(now)
+        return True
+
+
+def full_jitter_backoff(attempt: int, base: float, cap: float) -> float:
+    """Задержка перед повтором: случайная величина в [0, min(cap, base * 2^attempt)]."""
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+@dataclass
+class EndpointPolicy:
+    """Политика отказоустойчивости для класса эндпоинтов."""
+
+    name: str
+    timeout: float
+    breaker: CircuitBreaker
+    bulkhead: Bulkhead
+    retry_budget: RetryBudget = field(default_factory=RetryBudget)
+
+    def stats(self) -> Dict[str, object]:
+        """Статистика политики для логов и мониторинга."""
+        return {
+            "state": self.breaker.state.value,
+            "in_flight": self.bulkhead.in_flight,
+            "breaker_rejected": self.breaker.rejected,
+            "bulkhead_rejected": self.bulkhead.rejected,
+            "retry_budget_exhausted": self.retry_budget.exhausted,
+        }